@@ -10,12 +10,29 @@ Version: 1.0
 """
 
 import json
+import os
 import re
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+from ceo_insights_engine import SECTOR_TRANSLATIONS
+from stage_tracing import traced
 
 
-@dataclass
+def parse_cost_estimate(cost_estimate: str) -> Tuple[float, float]:
+    """
+    تحويل تقدير التكلفة النصي إلى (الحد الأدنى، الحد الأعلى) بالريال
+    
+    مثال: "15,000 - 25,000 ريال" → (15000.0, 25000.0)، "0 ريال (وقت الفريق فقط)" → (0.0, 0.0)
+    """
+    numbers = [float(n.replace(",", "")) for n in re.findall(r"\d[\d,]*(?:\.\d+)?", cost_estimate or "")]
+    if not numbers:
+        return (0.0, 0.0)
+    return (numbers[0], numbers[1] if len(numbers) > 1 else numbers[0])
+
+
+@dataclass(slots=True)
 class TacticalMove:
     """خطوة تكتيكية واحدة"""
     step: int
@@ -29,7 +46,7 @@ class TacticalMove:
     success_criteria: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionableRoadmap:
     """خارطة طريق عملية"""
     roadmap_id: str
@@ -42,389 +59,73 @@ class ActionableRoadmap:
     risk_mitigation: List[str]
 
 
+# ملف بيانات قاعدة المعرفة (ISO 56002) وإصدار مخططه المدعوم
+KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iso56002_knowledge_base.json")
+KNOWLEDGE_BASE_SCHEMA_VERSION = 1
+
+# عدد خرائط الطريق المُولَّدة المحفوظة في الذاكرة
+ROADMAP_CACHE_SIZE = 1024
+
+
 class ISO56002KnowledgeBase:
-    """قاعدة معرفة ISO 56002"""
+    """
+    قاعدة معرفة ISO 56002 محمّلة من ملف بيانات ذي إصدار
     
-    # أفضل الممارسات حسب فئة المخاطر
-    BEST_PRACTICES = {
-        "financial_risk": {
-            "relevant_clauses": [
-                "5.2 - Innovation Strategy",
-                "7.4 - Collaboration and Partnerships",
-                "8.3 - Innovation Process"
-            ],
-            "tactical_moves_templates": {
-                "funding": [
-                    {
-                        "title": "تحسين Financial Model وإعداد Pitch Deck احترافي",
-                        "description": "بناء نموذج مالي متقدم يوضح Unit Economics، CAC/LTV ratio، وتوقعات الإيرادات لـ 3 سنوات. إعداد Pitch Deck يركز على حجم السوق (TAM/SAM/SOM) والميزة التنافسية.",
-                        "iso_reference": "Clause 5.2 - Innovation Strategy",
-                        "deliverables": [
-                            "Financial Model (Excel/Google Sheets) مع 3 سيناريوهات",
-                            "Pitch Deck احترافي (15-20 شريحة)",
-                            "One-pager تنفيذي للمستثمرين"
-                        ],
-                        "resources": [
-                            "استشاري مالي متخصص في {sector}",
-                            "مصمم جرافيك للـ Pitch Deck"
-                        ],
-                        "timeline": "2-3 أسابيع",
-                        "cost": "15,000 - 25,000 ريال",
-                        "success": "موافقة 3 مستشارين على جودة النموذج المالي"
-                    },
-                    {
-                        "title": "استهداف برامج التسريع والحاضنات السعودية",
-                        "description": "التقديم على برامج Monsha'at، Badir، KAUST Innovation، وPIF Accelerator. هذه البرامج توفر تمويل أولي (50K-200K ريال) + إرشاد + شبكة علاقات.",
-                        "iso_reference": "Clause 7.4 - Collaboration and Partnerships",
-                        "deliverables": [
-                            "طلبات تقديم لـ 5 برامج تسريع على الأقل",
-                            "فيديو pitch (2-3 دقائق)",
-                            "خطة استخدام التمويل المتوقع"
-                        ],
-                        "resources": [
-                            "وقت المؤسسين (20 ساعة/أسبوع لمدة شهر)",
-                            "مستشار لمراجعة الطلبات"
-                        ],
-                        "timeline": "1-2 أشهر",
-                        "cost": "5,000 - 10,000 ريال",
-                        "success": "قبول في برنامج تسريع واحد على الأقل"
-                    },
-                    {
-                        "title": "تخفيض Burn Rate عبر Lean Operations",
-                        "description": "تطبيق منهجية Lean Startup لتخفيض التكاليف التشغيلية بنسبة 30%. التركيز على MVP بدلاً من Full Product، استخدام No-code tools، والاستعانة بـ Freelancers بدلاً من Full-time employees.",
-                        "iso_reference": "Clause 8.3 - Innovation Process",
-                        "deliverables": [
-                            "خطة تخفيض التكاليف التفصيلية",
-                            "MVP محدد بوضوح (Core Features فقط)",
-                            "جدول زمني لـ Lean Launch"
-                        ],
-                        "resources": [
-                            "مستشار Lean Startup",
-                            "أدوات No-code (Bubble, Webflow, Zapier)"
-                        ],
-                        "timeline": "1 شهر",
-                        "cost": "10,000 - 15,000 ريال",
-                        "success": "تخفيض Burn Rate بنسبة 30%"
-                    }
-                ]
-            }
-        },
-        "market_validation": {
-            "relevant_clauses": [
-                "8.2.2 - Idea Assessment",
-                "8.2.3 - Concept Development",
-                "8.3.4 - Validation"
-            ],
-            "tactical_moves_templates": {
-                "customer_discovery": [
-                    {
-                        "title": "إجراء 50 مقابلة مع العملاء المحتملين (Customer Discovery)",
-                        "description": "تطبيق منهجية Customer Development لإجراء مقابلات متعمقة مع 50 عميل محتمل. التركيز على فهم المشاكل الحقيقية، الحلول الحالية، والاستعداد للدفع.",
-                        "iso_reference": "Clause 8.2.2 - Idea Assessment",
-                        "deliverables": [
-                            "دليل المقابلات (Interview Script)",
-                            "تقرير تحليل المقابلات (50 مقابلة)",
-                            "Customer Personas محدثة بناءً على البيانات الفعلية"
-                        ],
-                        "resources": [
-                            "وقت المؤسسين (3-4 ساعات/يوم لمدة شهر)",
-                            "أداة تسجيل المقابلات (Otter.ai أو مشابه)"
-                        ],
-                        "timeline": "1-1.5 شهر",
-                        "cost": "2,000 - 5,000 ريال (حوافز للمشاركين)",
-                        "success": "تحديد 3 مشاكل رئيسية يواجهها 80%+ من العملاء"
-                    },
-                    {
-                        "title": "بناء Landing Page + A/B Testing",
-                        "description": "إنشاء Landing Page احترافية تشرح Value Proposition وإجراء A/B Testing لـ 3 رسائل تسويقية مختلفة. قياس Conversion Rate وجمع بريد إلكتروني لـ 200+ عميل محتمل.",
-                        "iso_reference": "Clause 8.2.3 - Concept Development",
-                        "deliverables": [
-                            "Landing Page احترافية (Webflow أو Unbounce)",
-                            "3 نسخ مختلفة للـ A/B Testing",
-                            "تقرير تحليل النتائج (Conversion Rate، Bounce Rate، Time on Page)"
-                        ],
-                        "resources": [
-                            "مصمم UI/UX",
-                            "Copywriter متخصص",
-                            "ميزانية إعلانات (Google Ads / Facebook Ads)"
-                        ],
-                        "timeline": "2-3 أسابيع",
-                        "cost": "8,000 - 15,000 ريال",
-                        "success": "Conversion Rate > 5% وجمع 200+ بريد إلكتروني"
-                    },
-                    {
-                        "title": "إطلاق MVP وقياس Engagement Metrics",
-                        "description": "إطلاق MVP لـ 50-100 مستخدم تجريبي (Beta Users) وقياس Engagement Metrics (DAU/MAU، Retention Rate، Feature Usage). جمع Feedback نوعي وكمي.",
-                        "iso_reference": "Clause 8.3.4 - Validation",
-                        "deliverables": [
-                            "MVP جاهز للإطلاق (Core Features فقط)",
-                            "Dashboard لقياس Engagement Metrics",
-                            "تقرير تحليل الـ Beta Testing"
-                        ],
-                        "resources": [
-                            "فريق تطوير (2-3 مطورين)",
-                            "أداة Analytics (Mixpanel أو Amplitude)",
-                            "Beta Users (50-100 مستخدم)"
-                        ],
-                        "timeline": "2-3 أشهر",
-                        "cost": "30,000 - 60,000 ريال",
-                        "success": "Retention Rate > 40% بعد 7 أيام"
-                    }
-                ]
-            }
-        },
-        "execution_risk": {
-            "relevant_clauses": [
-                "8.3 - Innovation Process",
-                "9.1 - Monitoring and Measurement",
-                "10.2 - Continual Improvement"
-            ],
-            "tactical_moves_templates": {
-                "project_management": [
-                    {
-                        "title": "تطبيق Agile/Scrum للتنفيذ السريع",
-                        "description": "تبني منهجية Agile/Scrum مع Sprints أسبوعية، Daily Standups، وSprint Reviews. استخدام أدوات مثل Jira أو Trello لتتبع المهام والتقدم.",
-                        "iso_reference": "Clause 8.3 - Innovation Process",
-                        "deliverables": [
-                            "Sprint Planning لـ 8 Sprints (شهرين)",
-                            "Backlog منظم حسب الأولوية",
-                            "Sprint Review Reports أسبوعية"
-                        ],
-                        "resources": [
-                            "Scrum Master (أو مؤسس يتولى الدور)",
-                            "أداة إدارة مشاريع (Jira، Trello، Asana)"
-                        ],
-                        "timeline": "مستمر (2-3 أشهر للبداية)",
-                        "cost": "5,000 - 10,000 ريال (أدوات + تدريب)",
-                        "success": "إكمال 80%+ من المهام المخططة في كل Sprint"
-                    },
-                    {
-                        "title": "تحديد KPIs وOKRs واضحة",
-                        "description": "تحديد 3-5 KPIs رئيسية (مثل Revenue، User Growth، Churn Rate) و3 OKRs ربع سنوية. مراجعة أسبوعية للتقدم وتعديل الاستراتيجية حسب الحاجة.",
-                        "iso_reference": "Clause 9.1 - Monitoring and Measurement",
-                        "deliverables": [
-                            "قائمة KPIs مع Targets واضحة",
-                            "3 OKRs ربع سنوية",
-                            "Dashboard لتتبع KPIs في الوقت الفعلي"
-                        ],
-                        "resources": [
-                            "مستشار استراتيجي",
-                            "أداة BI (Google Data Studio أو Tableau)"
-                        ],
-                        "timeline": "1-2 أسابيع (للإعداد)",
-                        "cost": "3,000 - 8,000 ريال",
-                        "success": "تحقيق 70%+ من OKRs الربع سنوية"
-                    },
-                    {
-                        "title": "Weekly Sprint Reviews مع الفريق",
-                        "description": "عقد اجتماعات أسبوعية لمراجعة التقدم، تحديد العوائق، والاحتفال بالإنجازات. تطبيق Retrospectives لتحسين العمليات بشكل مستمر.",
-                        "iso_reference": "Clause 10.2 - Continual Improvement",
-                        "deliverables": [
-                            "محاضر اجتماعات أسبوعية",
-                            "قائمة العوائق والحلول المقترحة",
-                            "Retrospective Reports شهرية"
-                        ],
-                        "resources": [
-                            "وقت الفريق (2 ساعة/أسبوع)",
-                            "أداة تسجيل المحاضر"
-                        ],
-                        "timeline": "مستمر",
-                        "cost": "0 ريال (وقت الفريق فقط)",
-                        "success": "حل 90%+ من العوائق خلال أسبوع"
-                    }
-                ]
-            }
-        },
-        "market_risk": {
-            "relevant_clauses": [
-                "5.3 - Strategic Direction",
-                "7.2 - Competence",
-                "8.2 - Ideation"
-            ],
-            "tactical_moves_templates": {
-                "market_strategy": [
-                    {
-                        "title": "تطوير استراتيجية تسويق مبتكرة (Growth Hacking)",
-                        "description": "تطبيق تكتيكات Growth Hacking لزيادة الوعي بالمنتج بتكلفة منخفضة. التركيز على Viral Loops، Referral Programs، وContent Marketing.",
-                        "iso_reference": "Clause 5.3 - Strategic Direction",
-                        "deliverables": [
-                            "خطة Growth Hacking (10 تكتيكات)",
-                            "Referral Program جاهز للإطلاق",
-                            "Content Calendar (3 أشهر)"
-                        ],
-                        "resources": [
-                            "Growth Marketer",
-                            "Content Creator",
-                            "ميزانية تسويق محدودة (10K-20K ريال/شهر)"
-                        ],
-                        "timeline": "1-2 أشهر",
-                        "cost": "15,000 - 30,000 ريال",
-                        "success": "تحقيق 30% نمو شهري في User Acquisition"
-                    },
-                    {
-                        "title": "بناء شراكات استراتيجية مع شركات مكملة",
-                        "description": "تحديد 5-10 شركات مكملة (غير منافسة) والتفاوض على شراكات توزيع أو co-marketing. مثال: شركة Fintech تتشارك مع منصة E-commerce.",
-                        "iso_reference": "Clause 7.4 - Collaboration",
-                        "deliverables": [
-                            "قائمة 10 شركاء محتملين",
-                            "Pitch Deck للشراكات",
-                            "2-3 اتفاقيات شراكة موقعة"
-                        ],
-                        "resources": [
-                            "Business Development Manager",
-                            "محامي لمراجعة العقود"
-                        ],
-                        "timeline": "2-3 أشهر",
-                        "cost": "10,000 - 20,000 ريال",
-                        "success": "توقيع 2 شراكات تجلب 500+ مستخدم شهرياً"
-                    },
-                    {
-                        "title": "تحسين Product-Market Fit عبر Pivoting الجزئي",
-                        "description": "إذا كانت البيانات تشير إلى ضعف PMF، إجراء Pivot جزئي (تغيير Target Audience أو Value Proposition) بناءً على Feedback الفعلي.",
-                        "iso_reference": "Clause 8.2 - Ideation",
-                        "deliverables": [
-                            "تحليل PMF الحالي",
-                            "خطة Pivot (إذا لزم الأمر)",
-                            "MVP محدث بعد Pivot"
-                        ],
-                        "resources": [
-                            "Product Manager",
-                            "فريق تطوير",
-                            "ميزانية إضافية (20K-40K ريال)"
-                        ],
-                        "timeline": "1-2 أشهر",
-                        "cost": "25,000 - 50,000 ريال",
-                        "success": "تحسين Retention Rate بنسبة 50%+"
-                    }
-                ]
-            }
-        },
-        "team_capacity": {
-            "relevant_clauses": [
-                "7.1 - Resources",
-                "7.2 - Competence",
-                "7.3 - Awareness"
-            ],
-            "tactical_moves_templates": {
-                "team_building": [
-                    {
-                        "title": "توظيف استراتيجي للأدوار الحرجة",
-                        "description": "تحديد الأدوار الأكثر حرجة (مثل CTO، Lead Developer، Growth Marketer) والتوظيف التدريجي بناءً على الأولوية والميزانية.",
-                        "iso_reference": "Clause 7.1 - Resources",
-                        "deliverables": [
-                            "خطة توظيف (6 أشهر)",
-                            "Job Descriptions للأدوار الحرجة",
-                            "2-3 موظفين جدد"
-                        ],
-                        "resources": [
-                            "منصات توظيف (LinkedIn، Bayt)",
-                            "Recruiter (اختياري)",
-                            "ميزانية رواتب"
-                        ],
-                        "timeline": "2-4 أشهر",
-                        "cost": "60,000 - 120,000 ريال (رواتب 3 أشهر)",
-                        "success": "توظيف 2 أعضاء فريق ذوي خبرة"
-                    },
-                    {
-                        "title": "الاستعانة بـ Freelancers للمهام المؤقتة",
-                        "description": "استخدام منصات Freelancing (Upwork، Fiverr، Mostaql) للحصول على خبرات متخصصة بتكلفة أقل للمهام المؤقتة (مثل تصميم، تطوير، تسويق).",
-                        "iso_reference": "Clause 7.2 - Competence",
-                        "deliverables": [
-                            "قائمة المهام المناسبة للـ Freelancing",
-                            "3-5 Freelancers موثوقين",
-                            "إكمال 5 مشاريع صغيرة"
-                        ],
-                        "resources": [
-                            "منصات Freelancing",
-                            "ميزانية محدودة (5K-10K ريال/شهر)"
-                        ],
-                        "timeline": "مستمر",
-                        "cost": "5,000 - 10,000 ريال/شهر",
-                        "success": "إكمال 80%+ من المشاريع في الوقت المحدد"
-                    },
-                    {
-                        "title": "تدريب الفريق الحالي على مهارات جديدة",
-                        "description": "الاستثمار في تدريب الفريق الحالي على مهارات جديدة (مثل Agile، Growth Hacking، Data Analysis) لزيادة الإنتاجية.",
-                        "iso_reference": "Clause 7.3 - Awareness",
-                        "deliverables": [
-                            "خطة تدريب (3 أشهر)",
-                            "3 دورات تدريبية مكتملة",
-                            "شهادات للفريق"
-                        ],
-                        "resources": [
-                            "منصات تعليمية (Coursera، Udemy)",
-                            "ميزانية تدريب"
-                        ],
-                        "timeline": "2-3 أشهر",
-                        "cost": "3,000 - 8,000 ريال",
-                        "success": "تحسين الإنتاجية بنسبة 20%+"
-                    }
-                ]
-            }
-        }
-    }
+    القوالب مفهرسة حسب (نوع المخاطر، مفتاح القالب)، والقالب الافتراضي لكل نوع
+    مخاطر هو أول مفتاح في الملف.
+    """
     
-    # مسارات بديلة
-    ALTERNATIVE_PATHS = {
-        "financial_risk": [
-            {
-                "title": "Bootstrap + Revenue-first Approach",
-                "description": "إذا فشلت محاولات التمويل، التركيز على توليد إيرادات مبكرة عبر خدمات استشارية أو SaaS بسيط.",
-                "viability": "medium"
-            },
-            {
-                "title": "Strategic Partnership مع شركة كبيرة",
-                "description": "البحث عن شريك استراتيجي (Corporate) يوفر تمويل مقابل حصة أو حقوق توزيع.",
-                "viability": "medium"
-            }
-        ],
-        "market_validation": [
-            {
-                "title": "Pivot إلى B2B بدلاً من B2C",
-                "description": "إذا كان السوق الاستهلاكي صعباً، التحول إلى B2B حيث دورة المبيعات أقصر والعملاء أكثر استعداداً للدفع.",
-                "viability": "high"
-            }
-        ],
-        "execution_risk": [
-            {
-                "title": "الاستعانة بـ Fractional CTO",
-                "description": "توظيف CTO بدوام جزئي (Fractional) لتوفير الخبرة التقنية بتكلفة أقل.",
-                "viability": "high"
-            }
-        ]
-    }
+    def __init__(self, path: str = KNOWLEDGE_BASE_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        
+        schema_version = data.get("schema_version")
+        if schema_version != KNOWLEDGE_BASE_SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported knowledge base schema {schema_version} in {path} "
+                f"(expected {KNOWLEDGE_BASE_SCHEMA_VERSION})"
+            )
+        
+        self.version = data["version"]
+        # أفضل الممارسات حسب فئة المخاطر
+        self.best_practices: Dict[str, Dict[str, Any]] = data["best_practices"]
+        # مسارات بديلة
+        self.alternative_paths: Dict[str, List[Dict[str, str]]] = data.get("alternative_paths", {})
+        # استراتيجيات تخفيف المخاطر
+        self.risk_mitigation: Dict[str, List[str]] = data.get("risk_mitigation", {})
+        
+        # (نوع المخاطر، مفتاح القالب) -> قوالب الخطوات التكتيكية
+        self.template_index: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        # نوع المخاطر -> مفتاح القالب الافتراضي
+        self.default_template_keys: Dict[str, str] = {}
+        for risk_type, practices in self.best_practices.items():
+            for template_key, moves in practices.get("tactical_moves_templates", {}).items():
+                self.template_index[(risk_type, template_key)] = moves
+                self.default_template_keys.setdefault(risk_type, template_key)
     
-    # استراتيجيات تخفيف المخاطر
-    RISK_MITIGATION = {
-        "financial_risk": [
-            "الاحتفاظ بـ 3 أشهر runway كاحتياطي طوارئ",
-            "عدم التوسع في التوظيف قبل تأمين التمويل",
-            "التفاوض على payment terms مع الموردين (Net 30/60)"
-        ],
-        "market_validation": [
-            "إجراء اختبارات سوقية صغيرة قبل الإطلاق الكامل",
-            "الاحتفاظ بمرونة في Product Roadmap للتكيف مع Feedback",
-            "بناء علاقات مبكرة مع Early Adopters"
-        ],
-        "execution_risk": [
-            "تطبيق Buffer Time في التقديرات الزمنية (20-30%)",
-            "إجراء Code Reviews منتظمة لتجنب Technical Debt",
-            "الاحتفاظ بـ Backup للمطورين الرئيسيين"
-        ],
-        "market_risk": [
-            "تنويع قنوات التسويق (عدم الاعتماد على قناة واحدة)",
-            "بناء Brand قوي للتمايز عن المنافسين",
-            "مراقبة المنافسين بشكل مستمر"
-        ]
-    }
+    def move_templates(self, risk_type: str, template_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """قوالب الخطوات التكتيكية لنوع المخاطر (القالب الافتراضي إذا لم يُحدَّد المفتاح)"""
+        if template_key is None:
+            template_key = self.default_template_keys.get(risk_type, "default")
+        return self.template_index.get((risk_type, template_key), [])
 
 
 class ActionableRoadmapEngine:
     """محرك توليد خرائط الطريق العملية"""
     
-    def __init__(self):
-        self.kb = ISO56002KnowledgeBase()
+    def __init__(
+        self,
+        knowledge_base: Optional[ISO56002KnowledgeBase] = None,
+        cache_size: int = ROADMAP_CACHE_SIZE
+    ):
+        self.kb = knowledge_base or ISO56002KnowledgeBase()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._roadmap_cache: "OrderedDict[tuple, ActionableRoadmap]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
+    @traced()
     def generate_roadmap(
         self,
         critical_insight: Dict[str, Any],
@@ -435,6 +136,10 @@ class ActionableRoadmapEngine:
         """
         توليد خارطة طريق عملية لرؤية حرجة
         
+        خارطة الطريق حتمية لمفتاح (نوع المخاطر، القطاع، الميزة، الخطورة) مع عنوان
+        الرؤية وقيمة الميزة عندما تدخل في معايير النجاح، لذا تُعاد النسخة المحفوظة
+        عند تكرار نفس المفتاح. النسخة المحفوظة مشتركة ويجب عدم تعديلها.
+        
         Args:
             critical_insight: الرؤية الحرجة من CEO Insights Engine
             sector: القطاع
@@ -444,30 +149,71 @@ class ActionableRoadmapEngine:
         Returns:
             ActionableRoadmap: خارطة الطريق العملية
         """
-        category = critical_insight["category"]
-        severity = critical_insight["severity"]
-        feature_name = critical_insight["feature_name"]
-        
         # تحديد النوع الرئيسي للمخاطر
-        risk_type = self._map_category_to_risk_type(category)
+        risk_type = self._map_category_to_risk_type(critical_insight["category"])
+        key = (
+            risk_type,
+            sector,
+            critical_insight["feature_name"],
+            critical_insight["severity"],
+            critical_insight["title"],
+            self._success_metrics_input(risk_type, critical_insight)
+        )
         
-        # الحصول على القوالب المناسبة
-        templates = self.kb.BEST_PRACTICES.get(risk_type, {}).get("tactical_moves_templates", {})
+        with self._cache_lock:
+            roadmap = self._roadmap_cache.get(key)
+            if roadmap is not None:
+                self._roadmap_cache.move_to_end(key)
+                self.cache_hits += 1
+                return roadmap
+            self.cache_misses += 1
         
-        # اختيار القالب المناسب
-        template_key = list(templates.keys())[0] if templates else "default"
-        moves_templates = templates.get(template_key, [])
+        roadmap = self._render_roadmap(risk_type, critical_insight, sector)
+        
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._roadmap_cache[key] = roadmap
+                while len(self._roadmap_cache) > self.cache_size:
+                    self._roadmap_cache.popitem(last=False)
+        return roadmap
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """إحصائيات ذاكرة خرائط الطريق"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "knowledge_base_version": self.kb.version,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "entries": len(self._roadmap_cache)
+        }
+    
+    def clear_cache(self):
+        """مسح خرائط الطريق المحفوظة وعدادات الإصابة"""
+        with self._cache_lock:
+            self._roadmap_cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+    
+    def _render_roadmap(
+        self,
+        risk_type: str,
+        critical_insight: Dict[str, Any],
+        sector: str
+    ) -> ActionableRoadmap:
+        """بناء خارطة الطريق من قوالب قاعدة المعرفة"""
+        sector_name = self._translate_sector(sector)
         
         # توليد الخطوات التكتيكية
         tactical_moves = []
-        for idx, template in enumerate(moves_templates[:3], 1):  # أول 3 خطوات فقط
+        for idx, template in enumerate(self.kb.move_templates(risk_type)[:3], 1):  # أول 3 خطوات فقط
             move = TacticalMove(
                 step=idx,
                 title=template["title"],
-                description=template["description"].format(sector=self._translate_sector(sector)),
+                description=template["description"].format(sector=sector_name),
                 iso_56002_reference=template["iso_reference"],
                 deliverables=template["deliverables"],
-                resources_needed=[r.format(sector=self._translate_sector(sector)) for r in template["resources"]],
+                resources_needed=[r.format(sector=sector_name) for r in template["resources"]],
                 timeline=template["timeline"],
                 cost_estimate=template["cost"],
                 success_criteria=template["success"]
@@ -478,24 +224,22 @@ class ActionableRoadmapEngine:
         success_metrics = self._generate_success_metrics(risk_type, critical_insight)
         
         # الحصول على المسارات البديلة
-        alternative_paths = self.kb.ALTERNATIVE_PATHS.get(risk_type, [])
+        alternative_paths = self.kb.alternative_paths.get(risk_type, [])
         
         # الحصول على استراتيجيات تخفيف المخاطر
-        risk_mitigation = self.kb.RISK_MITIGATION.get(risk_type, [])
+        risk_mitigation = self.kb.risk_mitigation.get(risk_type, [])
         
         # إنشاء خارطة الطريق
-        roadmap = ActionableRoadmap(
-            roadmap_id=f"{risk_type.upper()}_{feature_name.upper()}",
+        return ActionableRoadmap(
+            roadmap_id=f"{risk_type.upper()}_{critical_insight['feature_name'].upper()}",
             title=f"خطة معالجة: {critical_insight['title']}",
-            priority=severity,
+            priority=critical_insight["severity"],
             estimated_timeline=self._calculate_total_timeline(tactical_moves),
             success_metrics=success_metrics,
             tactical_moves=tactical_moves,
             alternative_paths=alternative_paths,
             risk_mitigation=risk_mitigation
         )
-        
-        return roadmap
     
     def _map_category_to_risk_type(self, category: str) -> str:
         """تحويل فئة الرؤية إلى نوع المخاطر"""
@@ -520,20 +264,15 @@ class ActionableRoadmapEngine:
     
     def _translate_sector(self, sector: str) -> str:
         """ترجمة اسم القطاع"""
-        translations = {
-            "fintech": "التقنية المالية",
-            "digital_health": "الصحة الرقمية",
-            "smart_agriculture": "الزراعة الذكية",
-            "renewable_energy": "الطاقة المتجددة",
-            "ecommerce": "التجارة الإلكترونية",
-            "edtech": "التقنية التعليمية",
-            "proptech": "تقنية العقارات",
-            "logistics": "اللوجستيات",
-            "food_delivery": "توصيل الطعام",
-            "tourism": "السياحة"
-        }
-        return translations.get(sector, sector)
+        return SECTOR_TRANSLATIONS.get(sector, sector)
+    
+    def _success_metrics_input(self, risk_type: str, insight: Dict) -> Optional[float]:
+        """قيمة الميزة التي تدخل في معايير النجاح (None إذا كانت المعايير ثابتة لنوع المخاطر)"""
+        if risk_type == "financial_risk" and "budget" in insight.get("feature_name", ""):
+            return insight.get("feature_value", 0)
+        return None
     
+    @traced()
     def _generate_success_metrics(self, risk_type: str, insight: Dict) -> List[str]:
         """توليد معايير النجاح"""
         metrics = {
@@ -567,13 +306,14 @@ class ActionableRoadmapEngine:
         base_metrics = metrics.get(risk_type, metrics["execution_risk"])
         
         # تخصيص بناءً على الرؤية
-        if risk_type == "financial_risk" and "budget" in insight.get("feature_name", ""):
-            feature_value = insight.get("feature_value", 0)
+        feature_value = self._success_metrics_input(risk_type, insight)
+        if feature_value is not None:
             target_funding = max(500000, feature_value * 2)
             base_metrics[0] = base_metrics[0].format(target_funding=target_funding)
         
         return base_metrics
     
+    @traced()
     def _calculate_total_timeline(self, moves: List[TacticalMove]) -> str:
         """حساب الجدول الزمني الإجمالي"""
         # تحليل بسيط للجدول الزمني
@@ -596,6 +336,19 @@ class ActionableRoadmapEngine:
             months = total_weeks // 4
             return f"{months} أشهر"
     
+    def estimate_program_cost(self, risk_type: str) -> float:
+        """
+        التكلفة التقديرية لخطة نوع المخاطر (بالريال)
+        
+        مجموع متوسطات cost_estimate للخطوات التكتيكية التي يولدها generate_roadmap
+        (القالب الأول، أول 3 خطوات)
+        """
+        total = 0.0
+        for template in self.kb.move_templates(risk_type)[:3]:
+            low, high = parse_cost_estimate(template["cost"])
+            total += (low + high) / 2
+        return total
+    
     def to_dict(self, roadmap: ActionableRoadmap) -> Dict[str, Any]:
         """تحويل خارطة الطريق إلى قاموس"""
         return {
@@ -603,10 +356,29 @@ class ActionableRoadmapEngine:
             "title": roadmap.title,
             "priority": roadmap.priority,
             "estimated_timeline": roadmap.estimated_timeline,
-            "success_metrics": roadmap.success_metrics,
-            "tactical_moves": [asdict(move) for move in roadmap.tactical_moves],
-            "alternative_paths": roadmap.alternative_paths,
-            "risk_mitigation": roadmap.risk_mitigation
+            "success_metrics": list(roadmap.success_metrics),
+            "tactical_moves": [self._move_to_dict(move) for move in roadmap.tactical_moves],
+            "alternative_paths": [dict(path) for path in roadmap.alternative_paths],
+            "risk_mitigation": list(roadmap.risk_mitigation)
+        }
+    
+    def _move_to_dict(self, move: TacticalMove) -> Dict[str, Any]:
+        """
+        تحويل خطوة تكتيكية إلى قاموس
+        
+        نسخ سطحي للقوائم بدلاً من asdict (نسخ عميق): الخطوات محفوظة في الذاكرة المؤقتة
+        وعناصر القوائم نصوص غير قابلة للتعديل
+        """
+        return {
+            "step": move.step,
+            "title": move.title,
+            "description": move.description,
+            "iso_56002_reference": move.iso_56002_reference,
+            "deliverables": list(move.deliverables),
+            "resources_needed": list(move.resources_needed),
+            "timeline": move.timeline,
+            "cost_estimate": move.cost_estimate,
+            "success_criteria": move.success_criteria
         }
 
 
@@ -0,0 +1,108 @@
+"""
+Analysis Deltas for UPLINK 5.0
+Structural diff of a what-if analysis against its cached baseline
+
+A modified scenario's full analysis is tens of KB, yet most of it equals the
+baseline analysis the UI already holds. json_patch() describes only the
+differences as an RFC 6902 JSON Patch (add / remove / replace operations
+with JSON Pointer paths). Any JSON Patch library can apply it, as can
+apply_patch() below. analysis_etag() identifies the baseline document a patch
+was computed against, so a client holding a stale baseline can tell.
+
+Diff rules:
+- equal subtrees are skipped with one C-level == comparison
+- dicts are diffed key by key (insertion order of the target is kept)
+- lists of equal length are diffed element by element; otherwise replaced
+- anything else that differs is replaced
+"""
+
+import copy
+import hashlib
+from typing import Any, Dict, List
+
+from result_serializer import dumps
+
+Patch = List[Dict[str, Any]]
+
+
+def analysis_etag(analysis: Any) -> str:
+    """Content hash of an analysis document (stable within one deployment)"""
+    return hashlib.sha1(dumps(analysis)).hexdigest()
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_patch(base: Any, target: Any) -> Patch:
+    """RFC 6902 operations that turn `base` into `target`"""
+    operations: Patch = []
+    _diff(base, target, "", operations)
+    return operations
+
+
+def _diff(base: Any, target: Any, path: str, operations: Patch):
+    if base == target and type(base) is type(target):
+        return
+    if isinstance(base, dict) and isinstance(target, dict):
+        for key in base:
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in base:
+                _diff(base[key], value, child, operations)
+            else:
+                operations.append({"op": "add", "path": child, "value": value})
+    elif isinstance(base, list) and isinstance(target, list) and len(base) == len(target):
+        for i, (old, new) in enumerate(zip(base, target)):
+            _diff(old, new, f"{path}/{i}", operations)
+    else:
+        operations.append({"op": "replace", "path": path, "value": target})
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """
+    Apply add / remove / replace operations to a copy of `document`
+
+    Raises:
+        ValueError: unsupported operation or a path that does not exist
+    """
+    document = copy.deepcopy(document)
+    for operation in patch:
+        op, path = operation["op"], operation["path"]
+        if op not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported patch operation: {op}")
+        if path == "":
+            if op == "remove":
+                raise ValueError("Cannot remove the document root")
+            document = copy.deepcopy(operation["value"])
+            continue
+
+        *parents, last = [_unescape(token) for token in path[1:].split("/")]
+        container = document
+        try:
+            for token in parents:
+                container = container[int(token)] if isinstance(container, list) else container[token]
+            if isinstance(container, list):
+                index = len(container) if last == "-" else int(last)
+                if op == "add":
+                    container.insert(index, copy.deepcopy(operation["value"]))
+                elif op == "remove":
+                    del container[index]
+                else:
+                    container[index] = copy.deepcopy(operation["value"])
+            else:
+                if op != "add" and last not in container:
+                    raise KeyError(last)
+                if op == "remove":
+                    del container[last]
+                else:
+                    container[last] = copy.deepcopy(operation["value"])
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Cannot apply {op} at {path}: {e}") from None
+    return document
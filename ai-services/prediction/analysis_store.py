@@ -0,0 +1,348 @@
+"""
+Persistent Analysis Store for UPLINK 5.0
+Every StrategicAnalysisResult kept by id in embedded SQLite
+
+Each analysis is stored as zlib-compressed JSON (the bytes /analyze sends,
+from result_serializer.dumps), typically 3-4 KB instead of 12-14 KB.
+Exports and dashboard reloads read it back in well under a millisecond
+instead of re-running the pipeline. An index on (project_id, created_at)
+serves a project's analysis history newest first. Analyses without a
+project id (the protocol reports those as "unknown") are filed under their
+own analysis id, so they never share one project's history.
+
+Retention and eviction:
+    retention_days  analyses older than this are deleted (0 keeps them forever)
+    max_entries     above this many analyses, the least recently read ones
+                    are evicted (0 means no cap)
+Both policies run when the store opens and then every EVICTION_INTERVAL saves.
+
+Configuration:
+    STRATEGIC_ANALYSIS_STORE           database path, or "off" (default: analysis_store.sqlite3 next to this module)
+    STRATEGIC_ANALYSIS_RETENTION_DAYS  default 90
+    STRATEGIC_ANALYSIS_MAX_ENTRIES     default 100000
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from result_serializer import dumps
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_store.sqlite3")
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Saves between two runs of the retention / eviction policies
+EVICTION_INTERVAL = 100
+
+# project_id the protocol reports when the input carried no id
+ANONYMOUS_PROJECT_ID = "unknown"
+
+# zlib level: 6 is within a few percent of 9 on analysis JSON at a third of the cost
+COMPRESSION_LEVEL = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    analysis_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_project_created ON analyses (project_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_last_accessed ON analyses (last_accessed);
+"""
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class AnalysisStore:
+    """StrategicAnalysisResult documents by id, with retention and LRU eviction"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_STORE_PATH,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        if retention_days < 0 or max_entries < 0:
+            raise ValueError("retention_days and max_entries must be >= 0")
+        self.path = path
+        self.retention_days = retention_days
+        self.max_entries = max_entries
+        self.evicted = 0
+        self._saves_since_eviction = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Stores written before anonymous analyses got their own id kept them in one bucket
+        self._conn.execute(
+            "UPDATE analyses SET project_id = analysis_id WHERE project_id = ?", (ANONYMOUS_PROJECT_ID,)
+        )
+        self.evict()
+
+    def save(self, result: Any, analysis_id: Optional[str] = None) -> str:
+        """
+        Store a StrategicAnalysisResult (or its dict form) and return its id
+
+        An existing analysis with the same id is replaced.
+        """
+        if isinstance(result, dict):
+            project_id = result.get("project_id")
+        else:
+            project_id = result.project_id
+        return self.save_json(dumps(result), project_id, analysis_id)
+
+    def save_json(self, payload: bytes, project_id: Optional[str], analysis_id: Optional[str] = None) -> str:
+        """
+        save() for an analysis already serialized with result_serializer.dumps
+
+        Without a project id (None or ANONYMOUS_PROJECT_ID) the analysis is
+        filed under its own analysis id.
+        """
+        analysis_id = str(analysis_id) if analysis_id is not None else uuid.uuid4().hex
+        if project_id is None or project_id == ANONYMOUS_PROJECT_ID:
+            project_id = analysis_id
+        blob = zlib.compress(payload, COMPRESSION_LEVEL)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses "
+                "(analysis_id, project_id, created_at, last_accessed, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (analysis_id, str(project_id), now, now, len(payload), blob)
+            )
+            self._saves_since_eviction += 1
+            run_eviction = self._saves_since_eviction >= EVICTION_INTERVAL
+        if run_eviction:
+            self.evict()
+        return analysis_id
+
+    def get_json(self, analysis_id: str) -> Optional[bytes]:
+        """The stored JSON document, ready to send as-is (None if unknown or evicted)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM analyses WHERE analysis_id = ?", (str(analysis_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE analyses SET last_accessed = ? WHERE analysis_id = ?",
+                (time.time(), str(analysis_id))
+            )
+        return zlib.decompress(row[0])
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """The stored analysis as a dict (None if unknown or evicted)"""
+        payload = self.get_json(analysis_id)
+        return json.loads(payload) if payload is not None else None
+
+    def list_project(self, project_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """A project's stored analyses, newest first: [{'analysis_id', 'created_at', 'size'}]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT analysis_id, created_at, size FROM analyses "
+                "WHERE project_id = ? ORDER BY created_at DESC LIMIT ?",
+                (str(project_id), int(limit))
+            ).fetchall()
+        return [
+            {"analysis_id": analysis_id, "created_at": _iso(created_at), "size": size}
+            for analysis_id, created_at, size in rows
+        ]
+
+    def iter_analyses(
+        self,
+        latest_per_project: bool = False,
+        batch_size: int = 500
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Every stored analysis as (analysis_id, created_at, analysis), oldest first
+
+        Rows are read in keyset-paginated batches, so memory stays bounded by
+        batch_size however large the store is. With latest_per_project only the
+        newest analysis of each project is returned, ordered by project id;
+        analyses without a project id are filed under their own id, so each
+        of them is returned.
+        Bulk reads do not count as accesses for LRU eviction.
+        """
+        if latest_per_project:
+            # SQLite takes bare columns from the row that holds MAX(created_at)
+            query = (
+                "SELECT project_id, analysis_id, MAX(created_at), payload FROM analyses "
+                "WHERE project_id > ? GROUP BY project_id ORDER BY project_id LIMIT ?"
+            )
+            key: Tuple = ("",)
+        else:
+            query = (
+                "SELECT created_at, analysis_id, created_at, payload FROM analyses "
+                "WHERE (created_at, analysis_id) > (?, ?) "
+                "ORDER BY created_at, analysis_id LIMIT ?"
+            )
+            key = (float("-inf"), "")
+
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, (*key, int(batch_size))).fetchall()
+            for _, analysis_id, created_at, payload in rows:
+                yield analysis_id, _iso(created_at), json.loads(zlib.decompress(payload))
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            key = (last[0],) if latest_per_project else (last[0], last[1])
+
+    def delete(self, analysis_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM analyses WHERE analysis_id = ?", (str(analysis_id),))
+        return cursor.rowcount > 0
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Apply the retention and capacity policies; returns the number of analyses removed"""
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            if self.retention_days:
+                cutoff = now - self.retention_days * 86400
+                removed += self._conn.execute(
+                    "DELETE FROM analyses WHERE created_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_entries:
+                count = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+                if count > self.max_entries:
+                    removed += self._conn.execute(
+                        "DELETE FROM analyses WHERE analysis_id IN ("
+                        "SELECT analysis_id FROM analyses ORDER BY last_accessed LIMIT ?)",
+                        (count - self.max_entries,)
+                    ).rowcount
+            self._saves_since_eviction = 0
+            self.evicted += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, raw_bytes, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM analyses"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "analyses": count,
+            "json_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+            "compression_ratio": raw_bytes / stored_bytes if stored_bytes else 0.0,
+            "retention_days": self.retention_days,
+            "max_entries": self.max_entries,
+            "evicted": self.evicted
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def to_report_data(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reshape a stored analysis into the report data read by the PDF and
+    Excel exporters (pdf_export / excel_export)
+    """
+    dashboard = analysis.get("strategic_dashboard", {})
+    ici = dashboard.get("ici", {})
+    readiness = analysis.get("investor_readiness", {})
+    valuation = readiness.get("estimated_valuation_range", {})
+    funding = readiness.get("estimated_funding_potential", {})
+
+    def money_range(bounds: Dict[str, float]) -> str:
+        if not bounds:
+            return "N/A"
+        return f"{bounds.get('min', 0):,.0f} - {bounds.get('max', 0):,.0f} SAR"
+
+    return {
+        "project_title": analysis.get("project_title", "Untitled Project"),
+        "ici_score": round(ici.get("ici_score", 0), 1),
+        "ici_level": ici.get("confidence_level", "N/A"),
+        "irl_score": round(readiness.get("irl_score", 0), 1),
+        "success_probability": ici.get("success_probability", 0),
+        "risk_level": ici.get("risk_level", "N/A"),
+        "investor_appeal": readiness.get("investor_appeal", "N/A"),
+        "executive_summary": dashboard.get("executive_summary") or analysis.get("executive_summary", ""),
+        "dimensions": {
+            "success_probability": ici.get("success_probability", 0) * 100,
+            "market_fit": ici.get("market_fit_score", 0),
+            "execution_readiness": ici.get("execution_readiness", 0),
+            "investor_readiness": ici.get("investor_readiness", 0),
+            "financial_sustainability": ici.get("financial_sustainability", 0)
+        },
+        "ceo_insights": [
+            {
+                "insight": insight.get("title", ""),
+                "impact": insight.get("business_impact", ""),
+                "priority": insight.get("severity", "medium").upper()
+            }
+            for insight in analysis.get("ceo_insights", {}).get("critical_insights", [])
+        ],
+        "roadmap": {
+            "steps": [
+                {
+                    "title": move.get("title", ""),
+                    "description": move.get("description", ""),
+                    "timeline": move.get("timeline", "N/A"),
+                    "priority": analysis.get("actionable_roadmap", {}).get("priority", "medium").upper()
+                }
+                for move in analysis.get("actionable_roadmap", {}).get("tactical_moves", [])
+            ]
+        },
+        "investment": {
+            "valuation_range": money_range(valuation),
+            "funding_potential": money_range(funding),
+            "recommended_investors": [
+                {
+                    "name": scenario.get("scenario_name", "Unknown"),
+                    "probability": scenario.get("probability", 0),
+                    "amount": f"{scenario.get('funding_amount', 0):,.0f} SAR",
+                    "timeline": f"{scenario.get('timeline_months', 0)} months"
+                }
+                for scenario in dashboard.get("investment_scenarios", [])
+            ]
+        },
+        "critical_path": [
+            {
+                "title": stage.get("title", ""),
+                "description": "، ".join(stage.get("key_actions", [])),
+                "duration": stage.get("duration", "N/A")
+            }
+            for stage in ici.get("critical_path_stages", [])
+        ]
+    }
+
+
+_analysis_store: Optional[AnalysisStore] = None
+_analysis_store_configured = False
+_configure_lock = threading.Lock()
+
+def get_analysis_store() -> Optional[AnalysisStore]:
+    """Process-wide store configured from STRATEGIC_ANALYSIS_STORE (None when off)"""
+    global _analysis_store, _analysis_store_configured
+    with _configure_lock:
+        if not _analysis_store_configured:
+            path = os.getenv("STRATEGIC_ANALYSIS_STORE", DEFAULT_STORE_PATH).strip()
+            if path.lower() not in ("", "off"):
+                _analysis_store = AnalysisStore(
+                    path,
+                    retention_days=float(os.getenv("STRATEGIC_ANALYSIS_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)),
+                    max_entries=int(os.getenv("STRATEGIC_ANALYSIS_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+                )
+            _analysis_store_configured = True
+    return _analysis_store
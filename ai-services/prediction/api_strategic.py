@@ -5,12 +5,28 @@ UPLINK 5.0 Platform
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from strategic_bridge_protocol import StrategicBridgeProtocol
+from whatif_simulator import WhatIfSimulator, DEFAULT_PERCENTILES
+from model_runtime import get_model_runtime
+from stage_tracing import get_tracer
+from portfolio_irl import get_portfolio_irl_engine
+from funding_round_simulator import get_funding_round_simulator, DEFAULT_PATHS, DEFAULT_ROUNDS
+from investor_matching import get_investor_matching_engine
+from valuation_cache import get_valuation_cache
+from portfolio_benchmarks import get_portfolio_benchmarks
+from analysis_store import get_analysis_store, to_report_data
+from result_serializer import dumps
+from strategic_dashboard_generator import resolve_visualizations
+from datetime import datetime
+from typing import Optional, Tuple
 import uvicorn
 
 app = FastAPI(title="UPLINK Strategic Analysis API")
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,8 +36,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Strategic Bridge Protocol
-strategic_bridge = StrategicBridgeProtocol()
+# Initialize Strategic Bridge Protocol (shares the process-wide model runtime)
+model_runtime = get_model_runtime()
+strategic_bridge = StrategicBridgeProtocol(model_runtime=model_runtime)
+
+# Warm What-If Simulator (shares the bridge and keeps its baseline cache)
+whatif_simulator = WhatIfSimulator(strategic_bridge=strategic_bridge)
+
+@app.on_event("startup")
+async def load_model_runtime():
+    """Load the success model and SHAP explainer once before serving requests"""
+    model_runtime.load()
+
+@app.on_event("startup")
+async def build_valuation_cache():
+    """Attach the bucketed valuation cache (tables are built here in table mode)"""
+    strategic_bridge.investment_simulator.valuation_cache = get_valuation_cache()
+
+@app.on_event("startup")
+async def attach_portfolio_benchmarks():
+    """Rank analyzed projects against their sector and stage peers"""
+    strategic_bridge.portfolio_benchmarks = get_portfolio_benchmarks()
+
+@app.on_event("startup")
+async def open_analysis_store():
+    """Open the persistent analysis store (applies retention before serving)"""
+    get_analysis_store()
+
+@app.on_event("startup")
+async def build_pdf_exporter():
+    """Set up report fonts and styles once instead of per export"""
+    from pdf_export import get_pdf_exporter
+    get_pdf_exporter()
+
+@app.on_event("shutdown")
+async def stop_whatif_workers():
+    """Stop the What-If worker pool"""
+    whatif_simulator.shutdown()
 
 class ProjectInput(BaseModel):
     title: str
@@ -36,52 +87,357 @@ class ProjectInput(BaseModel):
     rat_completion_rate: str
     user_count: str
     revenue_growth: str
+    sector: Optional[str] = None
+    stage: Optional[str] = None
+    project_id: Optional[str] = None
+
+def _project_to_features(project: ProjectInput) -> dict:
+    """Convert the request model into the features dict used by the protocol"""
+    features = {
+        'title': project.title,
+        'description': project.description,
+        'budget': project.budget,
+        'team_size': project.team_size,
+        'timeline_months': project.timeline_months,
+        'market_demand': project.market_demand,
+        'technical_feasibility': project.technical_feasibility,
+        'user_engagement': project.user_engagement,
+        'hypothesis_validation_rate': project.hypothesis_validation_rate,
+        'rat_completion_rate': project.rat_completion_rate,
+        'user_count': project.user_count,
+        'revenue_growth': project.revenue_growth
+    }
+    # Sector and stage pick the benchmark cohort (the protocol defaults to fintech / seed)
+    if project.sector:
+        features['sector'] = project.sector
+    if project.stage:
+        features['stage'] = project.stage
+    # Project id keys the stored analysis history (GET /projects/{id}/analyses)
+    if project.project_id:
+        features['id'] = project.project_id
+    return features
+
+def _store_analysis(result) -> Tuple[bytes, Optional[str]]:
+    """Serialize a result once and persist it; returns (json bytes, analysis id or None)"""
+    payload = dumps(result)
+    store = get_analysis_store()
+    analysis_id = store.save_json(payload, result.project_id) if store else None
+    return payload, analysis_id
+
+def _load_analysis(analysis_id) -> dict:
+    """Stored analysis by id (404 when unknown, evicted or the store is off)"""
+    store = get_analysis_store()
+    analysis = store.get(analysis_id) if store and analysis_id else None
+    if analysis is None:
+        raise HTTPException(status_code=404, detail=f"Analysis not found: {analysis_id}")
+    return analysis
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single server-sent event"""
+    payload = dumps(data).decode("utf-8")
+    return f"event: {event}\ndata: {payload}\n\n"
+
+def _json_response(content, etag: Optional[str] = None) -> Response:
+    """
+    Serialize an analysis result in one pass
+
+    Returning a Response skips FastAPI's asdict copy and jsonable_encoder walk.
+    """
+    headers = {"ETag": f'"{etag}"'} if etag else None
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
+
+def _parse_visualizations(visualizations: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Comma-separated dashboard visualization selection (None keeps all of them)"""
+    if visualizations is None:
+        return None
+    try:
+        return resolve_visualizations(visualizations.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/analyze")
-async def analyze_project(project: ProjectInput):
+async def analyze_project(project: ProjectInput, visualizations: Optional[str] = None):
     """
     Analyze project using Strategic Bridge Protocol
+
+    Query: ?visualizations=gauge,radar builds and returns only those dashboard
+    visualizations (gauge, radar, timeline, waterfall, heatmap); omit for all,
+    pass an empty value for none.
+
+    The result is stored; its id is returned in the X-Analysis-Id header
+    for GET /analyses/{id} and the export endpoints.
     """
+    selection = _parse_visualizations(visualizations)
     try:
         # Convert input to features dict
-        features = {
-            'title': project.title,
-            'description': project.description,
-            'budget': project.budget,
-            'team_size': project.team_size,
-            'timeline_months': project.timeline_months,
-            'market_demand': project.market_demand,
-            'technical_feasibility': project.technical_feasibility,
-            'user_engagement': project.user_engagement,
-            'hypothesis_validation_rate': project.hypothesis_validation_rate,
-            'rat_completion_rate': project.rat_completion_rate,
-            'user_count': project.user_count,
-            'revenue_growth': project.revenue_growth
-        }
+        features = _project_to_features(project)
         
         # Analyze using Strategic Bridge Protocol
-        result = strategic_bridge.analyze_project(features)
+        result = strategic_bridge.analyze_project(features, visualizations=selection, benchmark=True)
         
-        return result
+        payload, analysis_id = _store_analysis(result)
+        headers = {"X-Analysis-Id": analysis_id} if analysis_id else None
+        return Response(content=payload, media_type="application/json", headers=headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/stream")
+async def analyze_project_stream(project: ProjectInput, visualizations: Optional[str] = None):
+    """
+    Analyze project and stream each stage as a server-sent event
+
+    Events are emitted in pipeline order as soon as each stage is ready:
+    ceo_insights, actionable_roadmap, investor_readiness, strategic_dashboard,
+    summary, followed by a final "complete" event (or "error" on failure).
+    ?visualizations= selects dashboard visualizations as in /analyze.
+    The assembled result is stored; "complete" carries its analysis_id.
+    """
+    features = _project_to_features(project)
+    selection = _parse_visualizations(visualizations)
+
+    def event_stream():
+        try:
+            stages = {}
+            for stage_name, payload in strategic_bridge.iter_analysis_stages(
+                features, visualizations=selection, benchmark=True
+            ):
+                stages[stage_name] = payload
+                yield _sse_event(stage_name, payload)
+            _, analysis_id = _store_analysis(strategic_bridge.result_from_stages(features, stages))
+            yield _sse_event("complete", {
+                "analysis_id": analysis_id,
+                "project_id": features.get("id", "unknown"),
+                "project_title": features.get("title", "مشروع غير معروف"),
+                "version": strategic_bridge.version
+            })
+        except Exception as e:
+            yield _sse_event("error", {"detail": str(e)})
+
+    # Sync generator: Starlette iterates it in a threadpool so the pipeline
+    # does not block the event loop between stages
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/whatif")
 async def simulate_whatif(request: dict):
-    """What-If Scenario Simulation endpoint"""
+    """
+    What-If Scenario Simulation endpoint
+
+    Body: {"baseline_features": {...}, "modifications": {...},
+           "response_mode": "full" | "delta", "baseline_etag": "..."}
+
+    In delta mode the result carries features_delta and analysis_delta (a
+    JSON Patch against the baseline from /whatif/baseline) instead of
+    modified_features and full_analysis. A baseline_etag that no longer
+    matches gets a full result; baseline_etag in the response (and the ETag
+    header) identifies the current baseline.
+    """
     try:
-        from whatif_simulator import WhatIfSimulator
-        
-        simulator = WhatIfSimulator()
-        
-        result = simulator.simulate_scenario(
+        result = whatif_simulator.simulate_scenario(
             baseline_features=request['baseline_features'],
-            modifications=request['modifications']
+            modifications=request['modifications'],
+            response_mode=request.get('response_mode', 'full'),
+            baseline_etag=request.get('baseline_etag')
         )
         
-        return result
+        return _json_response(result, result.get('baseline_etag'))
         
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/baseline")
+async def whatif_baseline(request: dict):
+    """
+    Cached baseline analysis that delta-mode what-if results are diffed against
+
+    Body: {"baseline_features": {...}}
+    """
+    try:
+        analysis, etag = whatif_simulator.analyze_baseline_with_etag(request['baseline_features'])
+        return _json_response({"baseline_etag": etag, "analysis": analysis}, etag)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/sweep")
+async def sweep_whatif(request: dict):
+    """
+    Vectorized What-If grid sweep (ICI/IRL/probability heat-maps)
+    
+    Body: {"baseline_features": {...},
+           "ranges": {"budget": {"start": 100000, "stop": 2000000, "steps": 20},
+                      "team_size": [2, 3, 4, 5]}}
+    """
+    try:
+        return whatif_simulator.sweep(
+            baseline_features=request['baseline_features'],
+            ranges=request['ranges']
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/goal-seek")
+async def goal_seek_whatif(request: dict):
+    """
+    Cheapest modifications that reach a target ICI or IRL score
+    
+    Body: {"baseline_features": {...}, "target": 70, "metric": "ici_score",
+           "cost_weights": {"team_size": 1.0, "market_demand": 0.5}, "steps": 10}
+    """
+    try:
+        return whatif_simulator.goal_seek(
+            baseline_features=request['baseline_features'],
+            target=float(request['target']),
+            metric=request.get('metric', 'ici_score'),
+            cost_weights=request.get('cost_weights'),
+            steps=int(request.get('steps', 10)),
+            upper_bounds=request.get('upper_bounds')
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/montecarlo")
+def montecarlo_whatif(request: dict):
+    """
+    Monte Carlo ICI/IRL percentile bands over uncertain inputs
+    
+    Body: {"baseline_features": {...},
+           "distributions": {"market_demand": {"type": "normal", "std": 10},
+                             "revenue_growth": {"type": "uniform", "low": 0, "high": 0.5}},
+           "n_samples": 20000, "seed": 42}
+    """
+    try:
+        return whatif_simulator.simulate_uncertainty(
+            baseline_features=request['baseline_features'],
+            distributions=request['distributions'],
+            n_samples=int(request.get('n_samples', 20000)),
+            percentiles=request.get('percentiles', DEFAULT_PERCENTILES),
+            seed=request.get('seed')
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/sensitivity")
+async def sensitivity_whatif(request: dict):
+    """
+    Tornado chart: ICI/IRL/probability deltas for every numeric feature
+    
+    Body: {"baseline_features": {...}, "step": 0.1, "absolute_steps": {"team_size": 1}}
+    """
+    try:
+        return whatif_simulator.sensitivity(
+            baseline_features=request['baseline_features'],
+            step=float(request.get('step', 0.10)),
+            absolute_steps=request.get('absolute_steps')
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/whatif/pareto")
+async def pareto_whatif(request: dict):
+    """
+    Pareto frontier of scenarios (ICI gain, IRL gain, implementation cost)
+    
+    Body: {"baseline_features": {...}, "scenarios": [{"name": "...", "budget": "+50000"}, ...],
+           "response_mode": "full" | "delta", "baseline_etag": "..."} (modes as in /whatif)
+    """
+    try:
+        result = whatif_simulator.rank_scenarios(
+            baseline_features=request['baseline_features'],
+            scenarios=request['scenarios'],
+            response_mode=request.get('response_mode', 'full'),
+            baseline_etag=request.get('baseline_etag')
+        )
+        return _json_response(result)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/portfolio/irl")
+async def portfolio_irl(request: dict):
+    """
+    Rank a whole portfolio by Investor Readiness Level (vectorized)
+    
+    Body: {"projects": [{...}, ...], "top": 20}
+    """
+    try:
+        result = get_portfolio_irl_engine().score_projects(request['projects'])
+        top = request.get('top')
+        ranking = result.ranking(top=int(top) if top is not None else None)
+        return {
+            "count": len(result),
+            "ranking": result.to_records(ranking)
+        }
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/portfolio/benchmarks")
+async def portfolio_benchmark_summary(sector: Optional[str] = None, stage: Optional[str] = None):
+    """
+    Size and score quantiles of a benchmark cohort
+
+    Omit sector and/or stage to summarize across all sectors / stages.
+    """
+    return get_portfolio_benchmarks().summary(sector, stage)
+
+@app.post("/investment/funding-rounds")
+def simulate_funding_rounds(request: dict):
+    """
+    Monte Carlo funding-round outcomes (time-to-funding, dilution, ownership)
+    
+    Body: {"baseline_features": {...}, "n_paths": 100000, "max_rounds": 3, "seed": 42}
+    """
+    try:
+        features = request['baseline_features']
+        analysis = whatif_simulator.analyze_baseline(features)
+        return get_funding_round_simulator().simulate_readiness(
+            analysis['investor_readiness'],
+            stage=features.get('stage', 'seed'),
+            sector=features.get('sector', 'fintech'),
+            n_paths=int(request.get('n_paths', DEFAULT_PATHS)),
+            max_rounds=int(request.get('max_rounds', DEFAULT_ROUNDS)),
+            seed=request.get('seed')
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/investment/matching")
+def match_investors(request: dict):
+    """
+    Capacity-constrained project-to-investor matching over a whole portfolio
+    
+    Body: {"projects": [{...}, ...],
+           "investors": [{"id": "...", "investor_type": "vc_seed", "capacity": 5}, ...],
+           "method": "auto"}
+    """
+    try:
+        return get_investor_matching_engine().match(
+            projects=request['projects'],
+            investors=request['investors'],
+            method=request.get('method', 'auto')
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -108,83 +464,116 @@ async def submit_feedback(request: dict):
         print(f"Feedback error: {e}")
         return {"success": True, "message": "Feedback recorded locally"}
 
+@app.get("/analyses/{analysis_id}")
+async def get_analysis(analysis_id: str):
+    """Stored analysis as returned by /analyze (no pipeline re-run)"""
+    store = get_analysis_store()
+    payload = store.get_json(analysis_id) if store else None
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Analysis not found: {analysis_id}")
+    return Response(content=payload, media_type="application/json")
+
+@app.get("/projects/{project_id}/analyses")
+async def list_project_analyses(project_id: str, limit: int = 20):
+    """A project's stored analyses, newest first"""
+    store = get_analysis_store()
+    return {
+        "project_id": project_id,
+        "analyses": store.list_project(project_id, limit) if store else []
+    }
+
 @app.post("/export/pdf")
 async def export_pdf(request: dict):
-    """Export strategic analysis to PDF"""
+    """
+    Export a stored strategic analysis to PDF
+
+    The report is rendered in memory by the process-wide exporter and sent
+    as the response body (application/pdf, as an attachment).
+    """
+    analysis = _load_analysis(request.get('analysis_id'))
     try:
-        from pdf_export import export_to_pdf
-        
-        analysis_id = request.get('analysis_id')
-        
-        # TODO: Fetch analysis data from database using analysis_id
-        # For now, use sample data
-        sample_data = {
-            'project_title': 'Strategic Analysis Report',
-            'ici_score': 65.5,
-            'irl_score': 58.2,
-            'success_probability': 0.72,
-            'risk_level': 'MEDIUM',
-            'investor_appeal': 'HIGH',
-            'executive_summary': 'This project shows promising potential.',
-            'ceo_insights': [],
-            'roadmap': {'steps': []},
-            'investment': {},
-            'critical_path': []
-        }
+        from pdf_export import render_pdf
         
         # Generate PDF
-        output_path = f"/tmp/strategic_analysis_{analysis_id}.pdf"
-        export_to_pdf(sample_data, output_path)
-        
-        return {"success": True, "file_path": output_path}
+        pdf = render_pdf(to_report_data(analysis))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    filename = f"strategic_analysis_{request['analysis_id']}.pdf"
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @app.post("/export/excel")
 async def export_excel(request: dict):
-    """Export strategic analysis to Excel"""
+    """Export a stored strategic analysis to Excel (sent as an .xlsx attachment)"""
+    analysis = _load_analysis(request.get('analysis_id'))
     try:
-        from excel_export import export_to_excel
-        
-        analysis_id = request.get('analysis_id')
-        
-        # TODO: Fetch analysis data from database using analysis_id
-        # For now, use sample data
-        sample_data = {
-            'project_title': 'Strategic Analysis Report',
-            'ici_score': 65.5,
-            'irl_score': 58.2,
-            'success_probability': 0.72,
-            'risk_level': 'MEDIUM',
-            'investor_appeal': 'HIGH',
-            'executive_summary': 'This project shows promising potential.',
-            'dimensions': {
-                'success_probability': 72.0,
-                'market_fit': 68.5,
-                'execution_readiness': 65.0,
-                'investor_readiness': 58.2,
-                'financial_sustainability': 52.0
-            },
-            'ceo_insights': [],
-            'roadmap': {'steps': []},
-            'investment': {'recommended_investors': []},
-            'critical_path': []
-        }
+        from excel_export import render_excel
         
         # Generate Excel
-        output_path = f"/tmp/strategic_analysis_{analysis_id}.xlsx"
-        export_to_excel(sample_data, output_path)
-        
-        return {"success": True, "file_path": output_path}
+        workbook = render_excel(to_report_data(analysis))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    filename = f"strategic_analysis_{request['analysis_id']}.xlsx"
+    return Response(
+        content=workbook,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/export/portfolio/excel")
+async def export_portfolio_excel(request: Optional[dict] = None):
+    """
+    Export the stored portfolio to Excel, one row per project
+
+    Body (optional): {"all_analyses": true} writes every stored analysis
+    instead of each project's latest one. The workbook is written in
+    write-only mode with bounded memory and streamed to the client.
+    """
+    store = get_analysis_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Analysis store is disabled")
+    from excel_export import stream_portfolio_excel
+    
+    all_analyses = bool((request or {}).get('all_analyses', False))
+    analyses = store.iter_analyses(latest_per_project=not all_analyses)
+    filename = f"strategic_portfolio_{datetime.now():%Y%m%d_%H%M}.xlsx"
+    # Sync generator: Starlette builds the workbook in a threadpool
+    return StreamingResponse(
+        stream_portfolio_excel(analyses),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/traces")
+async def export_traces(limit: int = 20):
+    """
+    Export recently sampled pipeline traces as Chrome trace-event JSON
+
+    Sampling is controlled by STRATEGIC_TRACE_SAMPLE_RATE (0 disables tracing).
+    Load the response in chrome://tracing or https://ui.perfetto.dev.
+    """
+    tracer = get_tracer()
+    return tracer.export_chrome_trace(tracer.recent_traces(limit))
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "strategic-analysis"}
+    valuation_cache = strategic_bridge.investment_simulator.valuation_cache
+    analysis_store = get_analysis_store()
+    return {
+        "status": "healthy",
+        "service": "strategic-analysis",
+        "valuation_cache": valuation_cache.stats() if valuation_cache else None,
+        "portfolio_benchmarks": get_portfolio_benchmarks().stats(),
+        "analysis_store": analysis_store.stats() if analysis_store else None
+    }
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -11,6 +11,9 @@ from whatif_simulator import WhatIfSimulator
 
 app = FastAPI()
 
+# Warm simulator reused across requests (keeps its baseline cache)
+simulator = WhatIfSimulator()
+
 class WhatIfRequest(BaseModel):
     baseline_features: Dict[str, Any]
     modifications: Dict[str, Any]
@@ -19,8 +22,6 @@ class WhatIfRequest(BaseModel):
 async def simulate_whatif(request: WhatIfRequest):
     """What-If Scenario Simulation endpoint"""
     try:
-        simulator = WhatIfSimulator()
-        
         result = simulator.simulate_scenario(
             baseline_features=request.baseline_features,
             modifications=request.modifications
@@ -31,6 +32,10 @@ async def simulate_whatif(request: WhatIfRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.on_event("shutdown")
+async def stop_workers():
+    simulator.shutdown()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "whatif-simulator"}
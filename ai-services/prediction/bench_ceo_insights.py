@@ -0,0 +1,112 @@
+"""
+Benchmark: CEO insights over a whole portfolio
+
+A random SHAP matrix (n projects × 8 features) is classified with:
+1. SHAPClassifier.classify_shap_impact, one call per negative value
+   (how generate_ceo_insights walks a single project)
+2. CEOInsightsEngine.critical_insight_candidates: the threshold table
+   applied to the whole matrix in one NumPy pass
+
+Every insight template in SHAP_TO_CEO_MAPPING is then rendered 1,000 times
+with str.format and with its pre-parsed INSIGHT_TEMPLATES entry, and
+generate_ceo_insights is timed per project on the golden fixture inputs
+(ceo_insights_golden_fixture.json).
+
+Reports the best of 3 runs in ms and the speedup over the first method.
+
+Usage:
+    python bench_ceo_insights.py [n_projects]
+"""
+
+import json
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from ceo_insights_engine import (
+    INSIGHT_TEMPLATES,
+    CEOInsightsEngine,
+    SHAPClassifier,
+    TranslationDictionary
+)
+
+FEATURES = [
+    "budget",
+    "team_size",
+    "market_demand",
+    "technical_feasibility",
+    "hypothesis_validation_rate",
+    "rat_completion_rate",
+    "competitive_advantage",
+    "user_count"
+]
+
+
+def _best_of_3(run):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    matrix = np.random.default_rng(1).uniform(-0.5, 0.5, (n, len(FEATURES)))
+    engine = CEOInsightsEngine()
+    rows = matrix.tolist()
+
+    def scalar():
+        for row in rows:
+            for feature_name, shap_value in zip(FEATURES, row):
+                if shap_value < -0.05:
+                    SHAPClassifier.classify_shap_impact(shap_value, feature_name)
+
+    scalar_ms = _best_of_3(scalar)
+    batch_ms = _best_of_3(lambda: engine.critical_insight_candidates(matrix, FEATURES))
+    candidates = len(engine.critical_insight_candidates(matrix, FEATURES)["row"])
+
+    print("=" * 70)
+    print(f"SHAP impact classification: {n:,} projects × {len(FEATURES)} features ({candidates:,} candidates)")
+    print("=" * 70)
+    print(f"{'method':<36}{'ms':>12}{'speedup':>12}")
+    print(f"{'classify_shap_impact per value':<36}{scalar_ms:>12.1f}{1:>11.1f}x")
+    print(f"{'critical_insight_candidates':<36}{batch_ms:>12.1f}{scalar_ms / batch_ms:>11.1f}x")
+
+
+    impact = {"gap_percentage": 76.49, "months": 10, "failure_probability": 85.0, "liquidity_risk": "مرتفع"}
+    templates = [
+        (template, TranslationDictionary.SHAP_TO_CEO_MAPPING[feature_name][impact_class]["template"])
+        for (feature_name, impact_class), template in INSIGHT_TEMPLATES.items()
+    ]
+
+    def formatted():
+        for _ in range(1000):
+            for _, original in templates:
+                original.format(value=188060, sector="fintech", **impact)
+
+    def compiled():
+        for _ in range(1000):
+            for template, _ in templates:
+                template.render(188060, "fintech", impact)
+
+    format_ms = _best_of_3(formatted)
+    compiled_ms = _best_of_3(compiled)
+
+    with open("ceo_insights_golden_fixture.json", "r", encoding="utf-8") as f:
+        cases = [case["inputs"] for case in json.load(f)["cases"]] * 50
+    generate_ms = _best_of_3(lambda: [engine.generate_ceo_insights(**inputs) for inputs in cases])
+
+    print()
+    print(f"Insight templates: {len(templates)} templates × 1,000 renders")
+    print(f"{'str.format':<36}{format_ms:>12.1f}{1:>11.1f}x")
+    print(f"{'INSIGHT_TEMPLATES render':<36}{compiled_ms:>12.1f}{format_ms / compiled_ms:>11.1f}x")
+    print(f"generate_ceo_insights: {generate_ms / len(cases) * 1000:.1f} µs per project ({len(cases):,} projects)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: dashboard generation with and without visualization selection
+
+For samples from ideas_outcomes_seed_data.json, the earlier pipeline stages
+(CEO insights, roadmap, investor readiness) are computed once. The
+strategic_dashboard stage (generate_dashboard + to_dict) is then timed for:
+1. every visualization (default)
+2. each visualization on its own
+3. no visualizations
+
+Reports time per dashboard, serialized dashboard size and the size of the
+full /analyze JSON response.
+
+Usage:
+    python bench_dashboard_visualizations.py [n_projects]
+"""
+
+import json
+import logging
+import sys
+import time
+import warnings
+
+from strategic_bridge_protocol import StrategicBridgeProtocol
+from strategic_dashboard_generator import VISUALIZATION_TYPES
+
+REPEATS = 5
+
+
+def _stage_inputs(bridge, project):
+    project = bridge._clean_all_features(project)
+    ceo_insights = bridge._generate_ceo_insights(project, None)
+    roadmap = bridge._generate_roadmap(project, ceo_insights)
+    irl, scenarios = bridge._simulate_investment(project)
+    return project, ceo_insights, roadmap, irl, scenarios
+
+
+def _json_size(payload) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    projects = (data * (n // len(data) + 1))[:n]
+
+    bridge = StrategicBridgeProtocol()
+    inputs = [_stage_inputs(bridge, project) for project in projects]
+
+    selections = [("all (default)", None)]
+    selections += [(viz_type, (viz_type,)) for viz_type in VISUALIZATION_TYPES]
+    selections.append(("none", ()))
+
+    print("=" * 78)
+    print(f"Dashboard visualization selection: {n} projects × {REPEATS} repeats")
+    print("=" * 78)
+    print(f"{'selection':<16}{'µs/dashboard':>14}{'dashboard bytes':>18}{'/analyze bytes':>16}{'vs all':>10}")
+
+    baseline_us = None
+    for label, selection in selections:
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            dashboards = [bridge._generate_dashboard(*stage, selection) for stage in inputs]
+        us = (time.perf_counter() - start) / (REPEATS * n) * 1e6
+        baseline_us = baseline_us or us
+
+        dashboard_bytes = sum(_json_size(d) for d in dashboards) / n
+        response_bytes = sum(
+            _json_size(bridge.analyze_project(dict(p), visualizations=selection).to_dict())
+            for p in projects[:50]
+        ) / min(n, 50)
+        print(f"{label:<16}{us:>14.1f}{dashboard_bytes:>18.0f}{response_bytes:>16.0f}{us / baseline_us:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: added cost of model-based SHAP in the Strategic Bridge
+
+Compares, on samples from ideas_outcomes_seed_data.json:
+1. analyze_project with the heuristic default SHAP values (no model)
+2. analyze_project with the shared ModelRuntime (one model call per project)
+3. analyze_projects with the shared ModelRuntime (one batched model call)
+
+Usage:
+    python bench_model_runtime.py [n_projects]
+"""
+
+import json
+import sys
+import time
+import warnings
+
+from model_runtime import get_model_runtime
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _time_per_project(fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / n * 1000
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    projects = (data * (n // len(data) + 1))[:n]
+
+    runtime = get_model_runtime()
+    load_start = time.perf_counter()
+    if not runtime.load():
+        print(f"❌ Model not found at {runtime.model_path}")
+        return
+    load_ms = (time.perf_counter() - load_start) * 1000
+
+    heuristic = StrategicBridgeProtocol()
+    with_model = StrategicBridgeProtocol(model_runtime=runtime)
+
+    # Warm-up
+    heuristic.analyze_project(projects[0])
+    with_model.analyze_project(projects[0])
+
+    baseline_ms = _time_per_project(lambda: [heuristic.analyze_project(p) for p in projects], n)
+    single_ms = _time_per_project(lambda: [with_model.analyze_project(p) for p in projects], n)
+    batch_ms = _time_per_project(lambda: with_model.analyze_projects(projects), n)
+
+    print("=" * 70)
+    print(f"Model-based SHAP benchmark ({n} projects)")
+    print("=" * 70)
+    print(f"One-time model + TreeExplainer load: {load_ms:8.2f} ms")
+    print(f"Heuristic SHAP (baseline):           {baseline_ms:8.3f} ms/analysis")
+    print(f"Model SHAP, per-project call:        {single_ms:8.3f} ms/analysis "
+          f"(+{single_ms - baseline_ms:.3f} ms)")
+    print(f"Model SHAP, batched call:            {batch_ms:8.3f} ms/analysis "
+          f"(+{batch_ms - baseline_ms:.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: PDF report exports per second
+
+Samples from ideas_outcomes_seed_data.json are analyzed once and reshaped with
+analysis_store.to_report_data, the data /export/pdf renders. Each report is
+then exported with:
+1. a new exporter per request, written to a temp file (the previous /export/pdf path)
+2. the process-wide exporter, written to a temp file
+3. the process-wide exporter, rendered in memory (the current /export/pdf path)
+
+Reports ms per report, reports/sec and the average PDF size. It also reports
+the one-off exporter setup cost that the shared exporter pays only once.
+
+Usage:
+    python bench_pdf_export.py [n_reports]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+from analysis_store import to_report_data
+from pdf_export import StrategicAnalysisPDFExporter, get_pdf_exporter
+from result_serializer import dumps
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _per_request_file(data, path):
+    StrategicAnalysisPDFExporter().generate_report(data, path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _shared_file(data, path):
+    get_pdf_exporter().generate_report(data, path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _shared_memory(data, path):
+    return get_pdf_exporter().render(data)
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    projects = data[:min(n, len(data))]
+
+    bridge = StrategicBridgeProtocol()
+    reports = [
+        to_report_data(json.loads(dumps(bridge.analyze_project(dict(project)))))
+        for project in projects
+    ]
+    reports = (reports * (n // len(reports) + 1))[:n]
+
+    start = time.perf_counter()
+    for _ in range(20):
+        StrategicAnalysisPDFExporter()
+    setup_ms = (time.perf_counter() - start) / 20 * 1e3
+    get_pdf_exporter()
+
+    methods = [
+        ("new exporter + temp file", _per_request_file),
+        ("shared exporter + temp file", _shared_file),
+        ("shared exporter in memory", _shared_memory)
+    ]
+
+    print("=" * 70)
+    print(f"PDF export: {n} reports")
+    print(f"exporter setup (fonts + styles): {setup_ms:.2f} ms")
+    print("=" * 70)
+    print(f"{'method':<30}{'ms/report':>12}{'reports/s':>12}{'avg KB':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.pdf")
+        for label, export in methods:
+            start = time.perf_counter()
+            sizes = [len(export(report, path)) for report in reports]
+            elapsed = time.perf_counter() - start
+            print(f"{label:<30}{elapsed / n * 1e3:>12.2f}{n / elapsed:>12.1f}"
+                  f"{sum(sizes) / n / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
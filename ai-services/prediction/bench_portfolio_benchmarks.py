@@ -0,0 +1,60 @@
+"""
+Benchmark: portfolio percentile lookups at growing portfolio sizes
+
+For each portfolio size a fintech/seed cohort is filled with uniform random
+scores, then 500 analyses are replayed as StrategicBridgeProtocol does for
+each request: lookup() of the project's percentiles followed by record()
+of its scores. Time per request should stay flat as the cohort grows: new
+scores go to a sorted buffer merged about every sqrt(n) records instead of
+a re-sort per lookup. Cohorts past DEFAULT_MAX_EXACT switch to a t-digest.
+
+Usage:
+    python bench_portfolio_benchmarks.py [size ...]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from portfolio_benchmarks import PortfolioBenchmarks
+
+REQUESTS = 500
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 40_000, 200_000]
+    rng = np.random.default_rng(3)
+
+    print("=" * 60)
+    print(f"Portfolio benchmarks: lookup + record per request ({REQUESTS} requests)")
+    print("=" * 60)
+    print(f"{'cohort size':>12}{'µs/request':>14}{'exact':>10}")
+    for n in sizes:
+        benchmarks = PortfolioBenchmarks()
+        benchmarks.record_many(
+            ["fintech"] * n,
+            ["seed"] * n,
+            {metric: rng.uniform(0, 100, n) for metric in benchmarks.metrics}
+        )
+        requests = [
+            {metric: float(value) for metric in benchmarks.metrics}
+            for value in rng.uniform(0, 100, REQUESTS + 100)
+        ]
+        # Warm-up: the first requests merge the buffer filled by record_many
+        for scores in requests[:100]:
+            benchmarks.lookup("fintech", "seed", scores)
+            benchmarks.record("fintech", "seed", scores)
+        start = time.perf_counter()
+        for scores in requests[100:]:
+            benchmarks.lookup("fintech", "seed", scores)
+            benchmarks.record("fintech", "seed", scores)
+        us = (time.perf_counter() - start) / REQUESTS * 1e6
+        exact = benchmarks.summary("fintech", "seed")["metrics"]["ici_score"]["exact"]
+        print(f"{n:>12,}{us:>14.1f}{str(exact):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: investor readiness (IRL) for a whole portfolio
+
+ideas_outcomes_seed_data.json is repeated to `n` projects and scored with:
+1. InvestmentSimulator.calculate_irl, one project at a time (how the
+   strategic bridge scores a single analysis); timed on the first 500
+   projects and extrapolated
+2. PortfolioIRLEngine.score plus ranking(): NumPy columns for the whole
+   portfolio (best of 3 runs)
+
+Usage:
+    python bench_portfolio_irl.py [n_projects]
+"""
+
+import json
+import sys
+import time
+import warnings
+
+from investment_simulator import InvestmentSimulator
+from portfolio_irl import PortfolioIRLEngine, columns_from_projects
+from vectorized_scoring import NUMERIC_FEATURE_DEFAULTS
+
+SCALAR_SAMPLE = 500
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        samples = json.load(f)
+    portfolio = [samples[i % len(samples)] for i in range(n)]
+
+    engine = PortfolioIRLEngine()
+    inputs = columns_from_projects(portfolio)
+    vectorized_ms = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        engine.score(**inputs).ranking()
+        vectorized_ms = min(vectorized_ms, (time.perf_counter() - start) * 1000)
+
+    simulator = InvestmentSimulator()
+    sample = portfolio[:SCALAR_SAMPLE]
+    features = [
+        {name: columns_from_projects([project])["columns"][name][0] for name in NUMERIC_FEATURE_DEFAULTS}
+        for project in sample
+    ]
+    start = time.perf_counter()
+    for project, project_features in zip(sample, features):
+        simulator.calculate_irl(
+            features=project_features,
+            sector=project.get("sector", "fintech"),
+            organization=project.get("organization", "startup"),
+            stage=project.get("stage", "seed"),
+            success_probability=project.get("success_probability", 50)
+        )
+    scalar_ms = (time.perf_counter() - start) * 1000 * n / len(sample)
+
+    print("=" * 70)
+    print(f"Portfolio IRL: {n:,} projects")
+    print("=" * 70)
+    print(f"{'method':<40}{'ms':>12}{'speedup':>12}")
+    print(f"{'calculate_irl per project (estimated)':<40}{scalar_ms:>12.0f}{1:>11.1f}x")
+    print(f"{'PortfolioIRLEngine.score + ranking':<40}{vectorized_ms:>12.1f}{scalar_ms / vectorized_ms:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
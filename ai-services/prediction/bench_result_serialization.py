@@ -0,0 +1,143 @@
+"""
+Benchmark: serializing StrategicAnalysisResult trees to JSON
+
+Samples from ideas_outcomes_seed_data.json are analyzed once. The results
+are about the size of strategic_analysis_result.json. Each result is then
+serialized to the bytes /analyze sends, using:
+1. FastAPI's default path (asdict copy + jsonable_encoder + json.dumps)
+2. result.to_dict() + json.dumps
+3. result_serializer.dumps with the json module (fallback without orjson)
+4. result_serializer.dumps with orjson (when installed)
+
+Reports µs per result, results/sec and whether the output matches FastAPI's.
+It also reports the per-instance memory of the slotted result dataclasses
+against plain (dict-backed) equivalents.
+
+Usage:
+    python bench_result_serialization.py [n_projects]
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+
+import result_serializer
+from actionable_roadmap_engine import TacticalMove
+from ceo_insights_engine import CriticalInsight
+from investment_simulator import InvestmentScenario, InvestorReadinessLevel
+from result_serializer import dumps
+from strategic_bridge_protocol import StrategicAnalysisResult, StrategicBridgeProtocol
+from strategic_dashboard_generator import DashboardVisualization, InnovationConfidenceIndex
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+REPEATS = 5
+
+SLOTTED_CLASSES = (
+    CriticalInsight,
+    TacticalMove,
+    InvestorReadinessLevel,
+    InvestmentScenario,
+    InnovationConfidenceIndex,
+    DashboardVisualization,
+    StrategicAnalysisResult
+)
+
+
+def _fastapi(result) -> bytes:
+    # What JSONResponse renders for a returned dataclass
+    return json.dumps(
+        jsonable_encoder(result),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _to_dict(result) -> bytes:
+    return json.dumps(result.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_module(result) -> bytes:
+    available = result_serializer.ORJSON_AVAILABLE
+    result_serializer.ORJSON_AVAILABLE = False
+    try:
+        return dumps(result)
+    finally:
+        result_serializer.ORJSON_AVAILABLE = available
+
+
+def _time(serialize, results):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        outputs = [serialize(result) for result in results]
+    elapsed = time.perf_counter() - start
+    return outputs, elapsed / (REPEATS * len(results)) * 1e6
+
+
+def _instance_bytes(cls) -> tuple:
+    """(slotted, dict-backed) size of one instance, attribute dict included"""
+    names = [field.name for field in dataclasses.fields(cls)]
+    plain_cls = dataclasses.make_dataclass(cls.__name__, names)
+    values = [None] * len(names)
+    slotted, plain = cls(*values), plain_cls(*values)
+    return sys.getsizeof(slotted), sys.getsizeof(plain) + sys.getsizeof(plain.__dict__)
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    projects = (data * (n // len(data) + 1))[:n]
+
+    bridge = StrategicBridgeProtocol()
+    results = [bridge.analyze_project(dict(project)) for project in projects]
+    reference_size = os.path.getsize("strategic_analysis_result.json")
+
+    methods = []
+    if jsonable_encoder is not None:
+        methods.append(("FastAPI default", _fastapi))
+    methods.append(("to_dict + json.dumps", _to_dict))
+    methods.append(("dumps (json module)", _json_module))
+    if result_serializer.ORJSON_AVAILABLE:
+        methods.append(("dumps (orjson)", dumps))
+
+    print("=" * 78)
+    print(f"Result serialization: {n} analyses × {REPEATS} repeats")
+    print("=" * 78)
+
+    expected = None
+    for label, serialize in methods:
+        outputs, us = _time(serialize, results)
+        documents = [json.loads(output) for output in outputs]
+        if expected is None:
+            expected = documents
+            size = sum(len(output) for output in outputs) / len(outputs)
+            print(f"average response: {size / 1024:.1f} KB "
+                  f"(strategic_analysis_result.json: {reference_size / 1024:.1f} KB)")
+            print(f"{'method':<26}{'µs/result':>12}{'results/s':>14}{'same JSON':>12}")
+        same = "yes" if documents == expected else "no"
+        if serialize is _to_dict:
+            # to_dict adds the what-if summary fields on top of the dataclass fields
+            same = "superset"
+        print(f"{label:<26}{us:>12.1f}{1e6 / us:>14,.0f}{same:>12}")
+
+    print()
+    print(f"{'dataclass':<28}{'slotted':>10}{'plain':>10}  (bytes per instance)")
+    for cls in SLOTTED_CLASSES:
+        slotted, plain = _instance_bytes(cls)
+        print(f"{cls.__name__:<28}{slotted:>10}{plain:>10}")
+
+
+if __name__ == "__main__":
+    main()
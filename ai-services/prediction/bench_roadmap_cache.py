@@ -0,0 +1,79 @@
+"""
+Benchmark: cached actionable roadmaps
+
+One insight is built for every template in SHAP_TO_CEO_MAPPING at three
+feature values, and a roadmap is generated for each with:
+1. ActionableRoadmapEngine(cache_size=0): the full knowledge-base render
+2. ActionableRoadmapEngine(): the roadmap cache (warmed with one pass)
+
+Then StrategicBridgeProtocol.analyze_project is run repeatedly on one
+high-risk project, which is served from the roadmap cache after the first
+analysis. Reports µs per roadmap and the cache hit rate.
+
+Usage:
+    python bench_roadmap_cache.py [passes]
+"""
+
+import logging
+import sys
+import time
+import warnings
+
+from actionable_roadmap_engine import ActionableRoadmapEngine
+from ceo_insights_engine import TranslationDictionary
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _insights():
+    for feature_name, classes in TranslationDictionary.SHAP_TO_CEO_MAPPING.items():
+        for template in classes.values():
+            for feature_value in (150000, 400000, 0.3):
+                yield {
+                    "category": template["category"],
+                    "severity": template["severity"],
+                    "title": template["title"],
+                    "feature_name": feature_name,
+                    "feature_value": feature_value
+                }
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    insights = list(_insights())
+
+    print("=" * 70)
+    print(f"Roadmap generation: {len(insights)} insights × {passes} passes")
+    print("=" * 70)
+    print(f"{'engine':<36}{'µs/roadmap':>14}{'speedup':>12}")
+    timings = {}
+    for label, engine in (
+        ("full render (cache_size=0)", ActionableRoadmapEngine(cache_size=0)),
+        ("roadmap cache", ActionableRoadmapEngine())
+    ):
+        for insight in insights:
+            engine.generate_roadmap(insight, "fintech", "startup")
+        start = time.perf_counter()
+        for _ in range(passes):
+            for insight in insights:
+                engine.generate_roadmap(insight, "fintech", "startup")
+        timings[label] = (time.perf_counter() - start) / (passes * len(insights)) * 1e6
+        base = next(iter(timings.values()))
+        print(f"{label:<36}{timings[label]:>14.1f}{base / timings[label]:>11.1f}x")
+
+    bridge = StrategicBridgeProtocol()
+    project = {"id": "bench-1", "title": "مشروع", "budget": "90000", "team_size": "2", "sector": "fintech"}
+    shap_values = {"budget": -0.35, "hypothesis_validation_rate": -0.42, "rat_completion_rate": -0.38}
+    start = time.perf_counter()
+    for _ in range(passes):
+        bridge.analyze_project(dict(project), shap_values=dict(shap_values))
+    per_analysis_ms = (time.perf_counter() - start) / passes * 1000
+    stats = bridge.roadmap_engine.cache_stats()
+    print()
+    print(f"analyze_project: {per_analysis_ms:.2f} ms per analysis, "
+          f"roadmap cache {stats['hits']} hits / {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: bucketed valuation / funding cache on a what-if sweep workload
+
+A WhatIfSimulator.sweep over budget × team_size × market_demand ×
+revenue_growth gives the IRL score of every grid point. Each point's
+(IRL, sector, stage, revenue growth) is then passed to the valuation and
+funding estimates, as calculate_irl does for every scenario, using:
+1. the exact InvestmentSimulator methods (no cache)
+2. ValuationCache in memo mode at several precisions
+3. ValuationCache in table mode (grids built up front)
+
+Reports hit rate, time per lookup and the worst relative valuation error.
+The sweep is replayed `passes` times, as repeated UI sweeps would be.
+
+Usage:
+    python bench_valuation_cache.py [passes]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from investment_simulator import InvestmentSimulator
+from valuation_cache import ValuationCache
+from whatif_simulator import WhatIfSimulator
+
+BASELINE = {
+    'title': 'مشروع تجريبي',
+    'description': 'وصف المشروع',
+    'budget': '150000',
+    'team_size': '3',
+    'timeline_months': '6',
+    'market_demand': '35',
+    'technical_feasibility': '75',
+    'user_engagement': '40',
+    'hypothesis_validation_rate': '0.2',
+    'rat_completion_rate': '0.3',
+    'user_count': '0',
+    'revenue_growth': '0'
+}
+
+RANGES = {
+    'budget': (50000, 2000000, 12),
+    'team_size': [2, 3, 4, 5, 6, 8, 10, 12],
+    'market_demand': (20, 95, 16),
+    'revenue_growth': (0, 1.5, 16)
+}
+
+
+def _sweep_workload():
+    sweep = WhatIfSimulator(max_workers=1).sweep(BASELINE, RANGES)
+    irl = np.asarray(sweep['irl_score'], dtype=float)
+    growth_axis = np.asarray(sweep['axes']['revenue_growth'], dtype=float)
+    growth = np.broadcast_to(growth_axis, irl.shape)
+    return list(zip(irl.ravel().tolist(), growth.ravel().tolist()))
+
+
+def _run(estimate, points, passes):
+    start = time.perf_counter()
+    results = []
+    for _ in range(passes):
+        results = [estimate(irl, 'fintech', 'seed', growth) for irl, growth in points]
+    elapsed = time.perf_counter() - start
+    return results, elapsed / (passes * len(points)) * 1e6
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    points = _sweep_workload()
+
+    simulator = InvestmentSimulator()
+
+    def exact(irl, sector, stage, growth):
+        valuation = simulator._estimate_valuation_range(irl, sector, stage, growth)
+        return valuation, simulator._estimate_funding_potential(irl, valuation, stage)
+
+    exact_results, exact_us = _run(exact, points, passes)
+    exact_min = np.array([r[0][0] for r in exact_results])
+
+    print("=" * 78)
+    print(f"Valuation cache benchmark: {len(points)} sweep points × {passes} passes")
+    print("=" * 78)
+    print(f"{'mode':<28}{'hit rate':>10}{'µs/lookup':>12}{'max rel. error':>16}{'entries':>12}")
+    print(f"{'exact (no cache)':<28}{'-':>10}{exact_us:>12.2f}{0:>16.2e}{'-':>12}")
+
+    configs = [
+        ("memo", 0.001, 0.001),
+        ("memo", 0.01, 0.01),
+        ("memo", 0.1, 0.05),
+        ("table", 0.1, 0.05)
+    ]
+    for mode, irl_precision, growth_precision in configs:
+        build_start = time.perf_counter()
+        cache = ValuationCache(mode, irl_precision=irl_precision, growth_precision=growth_precision)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        results, us = _run(cache.estimate, points, passes)
+        stats = cache.stats()
+        error = np.max(np.abs(np.array([r[0][0] for r in results]) - exact_min) / exact_min)
+        label = f"{mode} ({irl_precision:g} IRL, {growth_precision:g} growth)"
+        entries = stats['entries'] + stats['table_cells']
+        print(f"{label:<28}{stats['hit_rate']:>10.1%}{us:>12.2f}{error:>16.2e}{entries:>12}")
+        if mode == "table":
+            print(f"  (table build at startup: {build_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,15 @@ Version: 1.0
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import string
+from bisect import bisect_left
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
+from stage_tracing import traced
 
 
-@dataclass
+@dataclass(slots=True)
 class CriticalInsight:
     """نموذج بيانات للرؤية الحرجة"""
     category: str
@@ -29,7 +32,7 @@ class CriticalInsight:
     feature_value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class CEOInsightsOutput:
     """نموذج بيانات لمخرجات CEO Insights"""
     executive_summary: str
@@ -243,6 +246,198 @@ class TranslationDictionary:
     }
 
 
+# ترجمة أسماء القطاعات إلى العربية
+SECTOR_TRANSLATIONS = {
+    "fintech": "التقنية المالية",
+    "digital_health": "الصحة الرقمية",
+    "smart_agriculture": "الزراعة الذكية",
+    "renewable_energy": "الطاقة المتجددة",
+    "ecommerce": "التجارة الإلكترونية",
+    "edtech": "التقنية التعليمية",
+    "proptech": "تقنية العقارات",
+    "logistics": "اللوجستيات",
+    "food_delivery": "توصيل الطعام",
+    "tourism": "السياحة"
+}
+
+# القطاع المرجعي للقطاعات غير المعروفة
+DEFAULT_BENCHMARK_SECTOR = "fintech"
+
+
+@dataclass(frozen=True)
+class SectorBenchmark:
+    """معايير القطاع المرجعية (من SECTOR_BUDGET_BENCHMARKS) مع القيم المشتقة"""
+    sector: str
+    display_name: str
+    minimum: float
+    average: float
+    optimal: float
+    avg_team_size: float
+    avg_timeline_months: float
+
+
+def _build_sector_index() -> Dict[str, SectorBenchmark]:
+    return {
+        sector: SectorBenchmark(
+            sector=sector,
+            display_name=SECTOR_TRANSLATIONS.get(sector, sector),
+            minimum=benchmarks["minimum"],
+            average=benchmarks["average"],
+            optimal=benchmarks["optimal"],
+            avg_team_size=benchmarks["avg_team_size"],
+            avg_timeline_months=benchmarks["avg_timeline_months"]
+        )
+        for sector, benchmarks in TranslationDictionary.SECTOR_BUDGET_BENCHMARKS.items()
+    }
+
+
+SECTOR_BENCHMARK_INDEX = _build_sector_index()
+
+
+def sector_benchmark(sector: str) -> SectorBenchmark:
+    """معايير القطاع، أو معايير القطاع المرجعي إذا كان غير معروف"""
+    return SECTOR_BENCHMARK_INDEX.get(sector) or SECTOR_BENCHMARK_INDEX[DEFAULT_BENCHMARK_SECTOR]
+
+
+# دالة تنسيق القالب: (value, sector, business_impact) -> النص
+TemplateFormatter = Callable[[Any, str, Dict[str, Any]], str]
+
+
+@dataclass(frozen=True)
+class CompiledInsightTemplate:
+    """قالب رؤية مُجمَّع من SHAP_TO_CEO_MAPPING"""
+    title: str
+    category: str
+    severity: str
+    template: str
+    fields: Tuple[str, ...]
+    render: TemplateFormatter
+
+
+_CONVERSIONS: Dict[str, Callable[[Any], str]] = {"r": repr, "s": str, "a": ascii}
+
+
+def _compile_formatter(template: str) -> Tuple[Tuple[str, ...], TemplateFormatter]:
+    """
+    تحليل القالب مرة واحدة إلى قطع (نص ثابت، حقل، تحويل، مواصفة) تُدمج عند التنسيق،
+    بما يكافئ template.format(value=value, sector=sector, **business_impact)
+    
+    القوالب ذات الحقول غير البسيطة (سمات، فهارس، مواصفات متداخلة) تبقى على str.format.
+    """
+    parsed = list(string.Formatter().parse(template))
+    fields = tuple(dict.fromkeys(name for _, name, _, _ in parsed if name is not None))
+    
+    def fallback(value: Any, sector: str, impact: Dict[str, Any]) -> str:
+        return template.format(value=value, sector=sector, **impact)
+    
+    simple = all(name.isidentifier() for name in fields) and not any(
+        "{" in (spec or "") or (conversion and conversion not in _CONVERSIONS)
+        for _, _, spec, conversion in parsed
+    )
+    if not simple:
+        return fields, fallback
+    
+    pieces = tuple(
+        (literal, name, _CONVERSIONS[conversion] if conversion else None, spec or "")
+        for literal, name, spec, conversion in parsed
+    )
+    
+    def render(value: Any, sector: str, impact: Dict[str, Any]) -> str:
+        parts = []
+        for literal, name, convert, spec in pieces:
+            parts.append(literal)
+            if name is None:
+                continue
+            field = value if name == "value" else sector if name == "sector" else impact[name]
+            if convert is not None:
+                field = convert(field)
+            parts.append(format(field, spec))
+        return "".join(parts)
+    
+    return fields, render
+
+
+def _compile_templates() -> Dict[Tuple[str, str], CompiledInsightTemplate]:
+    compiled = {}
+    for feature_name, classes in TranslationDictionary.SHAP_TO_CEO_MAPPING.items():
+        for impact_class, template_data in classes.items():
+            fields, render = _compile_formatter(template_data["template"])
+            compiled[(feature_name, impact_class)] = CompiledInsightTemplate(
+                title=template_data["title"],
+                category=template_data["category"],
+                severity=template_data["severity"],
+                template=template_data["template"],
+                fields=fields,
+                render=render
+            )
+    return compiled
+
+
+# قوالب الرؤى المُجمَّعة عند تحميل الوحدة: (الميزة، فئة التأثير) -> القالب
+INSIGHT_TEMPLATES = _compile_templates()
+
+
+# عتبة قيمة SHAP السلبية المؤثرة التي تُولَّد منها الرؤى
+NEGATIVE_SHAP_THRESHOLD = -0.05
+
+# ترتيب الخطورة لفرز الرؤى (الأصغر أخطر)
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+@dataclass(frozen=True)
+class SHAPThresholdRule:
+    """صف في جدول العتبات: مجموعة ميزات وعتباتها تصاعدياً ومستوى التأثير عند تجاوز كل عتبة"""
+    features: Tuple[str, ...]
+    bounds: Tuple[float, ...]
+    levels: Tuple[str, ...]
+
+
+# جدول عتبات تصنيف SHAP (التجاوز بمعنى |shap| > العتبة)
+SHAP_THRESHOLD_TABLE = (
+    # Critical features (hypothesis_validation, RAT)
+    SHAPThresholdRule(("hypothesis_validation_rate", "rat_completion_rate"), (0.10, 0.20, 0.35), ("low", "medium", "high")),
+    # Financial features (budget)
+    SHAPThresholdRule(("budget",), (0.08, 0.15, 0.30), ("low", "medium", "high")),
+    # Market features (market_demand, competitive_advantage)
+    SHAPThresholdRule(("market_demand", "competitive_advantage"), (0.08, 0.15, 0.25), ("low", "medium", "high")),
+    # Team features
+    SHAPThresholdRule(("team_size",), (0.10, 0.20), ("low", "medium")),
+    # Technical features
+    SHAPThresholdRule(("technical_feasibility",), (0.15, 0.25), ("medium", "high")),
+)
+
+
+@dataclass(frozen=True)
+class CompiledSHAPRule:
+    """صف مُجمَّع لميزة واحدة: الفئة حسب عدد العتبات المتجاوزة (0 = neutral)"""
+    bounds: Tuple[float, ...]
+    bounds_array: np.ndarray
+    negative: Tuple[str, ...]
+    positive: Tuple[str, ...]
+    negative_array: np.ndarray
+    positive_array: np.ndarray
+
+
+def _compile_shap_rules() -> Dict[str, CompiledSHAPRule]:
+    compiled = {}
+    for rule in SHAP_THRESHOLD_TABLE:
+        negative = ("neutral",) + tuple(f"negative_{level}" for level in rule.levels)
+        positive = ("neutral",) + tuple(f"positive_{level}" for level in rule.levels)
+        for feature_name in rule.features:
+            compiled[feature_name] = CompiledSHAPRule(
+                bounds=rule.bounds,
+                bounds_array=np.array(rule.bounds, dtype=float),
+                negative=negative,
+                positive=positive,
+                negative_array=np.array(negative, dtype=object),
+                positive_array=np.array(positive, dtype=object)
+            )
+    return compiled
+
+
+SHAP_RULES = _compile_shap_rules()
+
+
 class SHAPClassifier:
     """تصنيف تأثير SHAP إلى فئات"""
     
@@ -258,50 +453,54 @@ class SHAPClassifier:
         Returns:
             str: فئة التأثير
         """
-        abs_value = abs(shap_value)
-        
-        # Critical features (hypothesis_validation, RAT)
-        if feature_name in ["hypothesis_validation_rate", "rat_completion_rate"]:
-            if abs_value > 0.35:
-                return "negative_high" if shap_value < 0 else "positive_high"
-            elif abs_value > 0.20:
-                return "negative_medium" if shap_value < 0 else "positive_medium"
-            elif abs_value > 0.10:
-                return "negative_low" if shap_value < 0 else "positive_low"
-        
-        # Financial features (budget)
-        elif feature_name == "budget":
-            if abs_value > 0.30:
-                return "negative_high" if shap_value < 0 else "positive_high"
-            elif abs_value > 0.15:
-                return "negative_medium" if shap_value < 0 else "positive_medium"
-            elif abs_value > 0.08:
-                return "negative_low" if shap_value < 0 else "positive_low"
-        
-        # Market features (market_demand, competitive_advantage)
-        elif feature_name in ["market_demand", "competitive_advantage"]:
-            if abs_value > 0.25:
-                return "negative_high" if shap_value < 0 else "positive_high"
-            elif abs_value > 0.15:
-                return "negative_medium" if shap_value < 0 else "positive_medium"
-            elif abs_value > 0.08:
-                return "negative_low" if shap_value < 0 else "positive_low"
-        
-        # Team features
-        elif feature_name == "team_size":
-            if abs_value > 0.20:
-                return "negative_medium" if shap_value < 0 else "positive_medium"
-            elif abs_value > 0.10:
-                return "negative_low" if shap_value < 0 else "positive_low"
+        rule = SHAP_RULES.get(feature_name)
+        if rule is None:
+            return "neutral"
+        # عدد العتبات الأصغر تماماً من |shap|
+        level = bisect_left(rule.bounds, abs(shap_value))
+        return rule.negative[level] if shap_value < 0 else rule.positive[level]
+    
+    @staticmethod
+    def impact_levels(shap_matrix: np.ndarray, feature_names: List[str]) -> np.ndarray:
+        """
+        مستوى التأثير لكل خلية في مصفوفة SHAP (N×F) دفعة واحدة
+        
+        Returns:
+            np.ndarray: عدد العتبات المتجاوزة (0 = neutral أو ميزة بدون عتبات)
+        """
+        shap_matrix = np.asarray(shap_matrix, dtype=float)
+        if shap_matrix.ndim != 2 or shap_matrix.shape[1] != len(feature_names):
+            raise ValueError(f"Expected an N×{len(feature_names)} SHAP matrix, got shape {shap_matrix.shape}")
         
-        # Technical features
-        elif feature_name == "technical_feasibility":
-            if abs_value > 0.25:
-                return "negative_high" if shap_value < 0 else "positive_high"
-            elif abs_value > 0.15:
-                return "negative_medium" if shap_value < 0 else "positive_medium"
+        levels = np.zeros(shap_matrix.shape, dtype=np.intp)
+        # NaN لا يتجاوز أي عتبة (كما في المقارنة العادية)
+        magnitude = np.abs(np.nan_to_num(shap_matrix, nan=0.0))
+        for j, feature_name in enumerate(feature_names):
+            rule = SHAP_RULES.get(feature_name)
+            if rule is not None:
+                levels[:, j] = np.searchsorted(rule.bounds_array, magnitude[:, j], side="left")
+        return levels
+    
+    @staticmethod
+    def classify_batch(shap_matrix: np.ndarray, feature_names: List[str]) -> np.ndarray:
+        """
+        تصنيف مصفوفة SHAP (N×F) دفعة واحدة، مطابق لـ classify_shap_impact لكل خلية
         
-        return "neutral"
+        Returns:
+            np.ndarray: مصفوفة فئات التأثير (N×F)
+        """
+        shap_matrix = np.asarray(shap_matrix, dtype=float)
+        levels = SHAPClassifier.impact_levels(shap_matrix, feature_names)
+        impact = np.full(shap_matrix.shape, "neutral", dtype=object)
+        for j, feature_name in enumerate(feature_names):
+            rule = SHAP_RULES.get(feature_name)
+            if rule is not None:
+                impact[:, j] = np.where(
+                    shap_matrix[:, j] < 0,
+                    rule.negative_array[levels[:, j]],
+                    rule.positive_array[levels[:, j]]
+                )
+        return impact
 
 
 class BusinessImpactCalculator:
@@ -330,11 +529,7 @@ class BusinessImpactCalculator:
         
         if feature_name == "budget":
             # حساب الفجوة التمويلية
-            benchmarks = TranslationDictionary.SECTOR_BUDGET_BENCHMARKS.get(
-                sector,
-                TranslationDictionary.SECTOR_BUDGET_BENCHMARKS["fintech"]
-            )
-            sector_avg = benchmarks["average"]
+            sector_avg = sector_benchmark(sector).average
             gap_percentage = ((sector_avg - feature_value) / sector_avg) * 100
             
             # تقدير runway (بافتراض burn rate = 10% من الميزانية شهرياً)
@@ -371,11 +566,7 @@ class BusinessImpactCalculator:
         
         elif feature_name == "team_size":
             # حساب خطر الفريق
-            benchmarks = TranslationDictionary.SECTOR_BUDGET_BENCHMARKS.get(
-                sector,
-                TranslationDictionary.SECTOR_BUDGET_BENCHMARKS["fintech"]
-            )
-            optimal_team = benchmarks["avg_team_size"]
+            optimal_team = sector_benchmark(sector).avg_team_size
             team_gap = optimal_team - feature_value
             
             impact = {
@@ -394,6 +585,7 @@ class CEOInsightsEngine:
         self.classifier = SHAPClassifier()
         self.impact_calculator = BusinessImpactCalculator()
     
+    @traced()
     def generate_ceo_insights(
         self,
         shap_values: Dict[str, float],
@@ -419,7 +611,7 @@ class CEOInsightsEngine:
         
         # معالجة كل ميزة سلبية
         for feature_name, shap_value in shap_values.items():
-            if shap_value < -0.05:  # فقط القيم السلبية المؤثرة
+            if shap_value < NEGATIVE_SHAP_THRESHOLD:  # فقط القيم السلبية المؤثرة
                 # تصنيف التأثير
                 impact_class = self.classifier.classify_shap_impact(shap_value, feature_name)
                 
@@ -427,49 +619,165 @@ class CEOInsightsEngine:
                     continue
                 
                 # الحصول على القالب المناسب
-                feature_mapping = self.translator.SHAP_TO_CEO_MAPPING.get(feature_name)
-                if not feature_mapping:
-                    continue
-                
-                template_data = feature_mapping.get(impact_class)
-                if not template_data:
+                template = INSIGHT_TEMPLATES.get((feature_name, impact_class))
+                if template is None:
                     continue
                 
-                # حساب التأثير التجاري
-                business_impact = self.impact_calculator.calculate_business_impact(
-                    shap_value,
-                    feature_name,
-                    feature_values.get(feature_name, 0),
-                    sector
+                critical_insights.append(
+                    self._build_insight(template, feature_name, shap_value, feature_values, sector)
                 )
-                
-                # توليد الوصف
-                description = template_data["template"].format(
-                    value=feature_values.get(feature_name, 0),
-                    sector=self._translate_sector(sector),
-                    **business_impact
-                )
-                
-                # توليد business_impact text
-                impact_text = self._format_business_impact(feature_name, business_impact, shap_value)
-                
-                # إنشاء Insight
-                insight = CriticalInsight(
-                    category=template_data["category"],
-                    severity=template_data["severity"],
-                    title=template_data["title"],
-                    description=description,
-                    business_impact=impact_text,
-                    shap_contribution=shap_value,
-                    feature_name=feature_name,
-                    feature_value=feature_values.get(feature_name, 0)
-                )
-                
-                critical_insights.append(insight)
         
+        return self._summarize(critical_insights, success_probability)
+    
+    def critical_insight_candidates(
+        self,
+        shap_matrix: np.ndarray,
+        feature_names: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        مرشحو الرؤى الحرجة لمحفظة كاملة في مرور واحد
+        
+        الخلايا ذات قيمة SHAP سلبية مؤثرة وفئة غير محايدة ولها قالب في
+        SHAP_TO_CEO_MAPPING، بنفس شروط generate_ceo_insights.
+        
+        Args:
+            shap_matrix: مصفوفة SHAP (N مشروع × F ميزة)
+            feature_names: أسماء الأعمدة
+            
+        Returns:
+            dict: مصفوفات متوازية مرتبة حسب (المشروع، الميزة):
+                  row, column, feature_name, impact_class, category, severity, shap_value
+        """
+        shap_matrix = np.asarray(shap_matrix, dtype=float)
+        levels = self.classifier.impact_levels(shap_matrix, feature_names)
+        
+        # لكل ميزة: خلاياها المرشحة وحقول قالبها حسب المستوى
+        parts = []
+        for j, feature_name in enumerate(feature_names):
+            rule = SHAP_RULES.get(feature_name)
+            if rule is None:
+                continue
+            by_level = [INSIGHT_TEMPLATES.get((feature_name, impact_class)) for impact_class in rule.negative]
+            templated = np.array([template is not None for template in by_level])
+            rows = np.flatnonzero((shap_matrix[:, j] < NEGATIVE_SHAP_THRESHOLD) & templated[levels[:, j]])
+            if rows.size == 0:
+                continue
+            level = levels[rows, j]
+            parts.append((
+                rows,
+                np.full(rows.size, j),
+                rule.negative_array[level],
+                np.array([t and t.category for t in by_level], dtype=object)[level],
+                np.array([t and t.severity for t in by_level], dtype=object)[level]
+            ))
+        
+        if parts:
+            rows, columns, impact_classes, categories, severities = (np.concatenate(p) for p in zip(*parts))
+            order = np.lexsort((columns, rows))
+        else:
+            rows = columns = order = np.array([], dtype=np.intp)
+            impact_classes = categories = severities = np.array([], dtype=object)
+        rows, columns = rows[order], columns[order]
+        return {
+            "row": rows,
+            "column": columns,
+            "feature_name": np.array(feature_names, dtype=object)[columns],
+            "impact_class": impact_classes[order],
+            "category": categories[order],
+            "severity": severities[order],
+            "shap_value": shap_matrix[rows, columns]
+        }
+    
+    @traced()
+    def generate_ceo_insights_batch(
+        self,
+        shap_matrix: np.ndarray,
+        feature_names: List[str],
+        feature_values: List[Dict[str, float]],
+        sectors: List[str],
+        organizations: List[str],
+        success_probabilities: List[float]
+    ) -> List[CEOInsightsOutput]:
+        """
+        توليد CEO Insights لمحفظة كاملة، مطابق لـ generate_ceo_insights لكل مشروع
+        
+        التصنيف وتصفية المرشحين يتمان دفعة واحدة، ويُحسب التأثير التجاري
+        والنص فقط للمرشحين.
+        
+        Args:
+            shap_matrix: مصفوفة SHAP (N×F) بترتيب أعمدة feature_names
+            feature_names: أسماء الميزات (بنفس ترتيب قاموس SHAP في المسار العادي)
+            feature_values: قيم الميزات لكل مشروع
+            sectors: القطاع لكل مشروع
+            organizations: نوع المنظمة لكل مشروع
+            success_probabilities: احتمالية النجاح لكل مشروع
+            
+        Returns:
+            List[CEOInsightsOutput]: رؤى كل مشروع بنفس الترتيب
+        """
+        n = len(feature_values)
+        if not (len(sectors) == len(organizations) == len(success_probabilities) == n):
+            raise ValueError("All per-project inputs must have the same length")
+        if np.shape(shap_matrix)[0] != n:
+            raise ValueError(f"SHAP matrix has {np.shape(shap_matrix)[0]} rows for {n} projects")
+        
+        candidates = self.critical_insight_candidates(shap_matrix, feature_names)
+        per_project: List[List[CriticalInsight]] = [[] for _ in range(n)]
+        for i, feature_name, impact_class, shap_value in zip(
+            candidates["row"].tolist(),
+            candidates["feature_name"].tolist(),
+            candidates["impact_class"].tolist(),
+            candidates["shap_value"].tolist()
+        ):
+            per_project[i].append(self._build_insight(
+                INSIGHT_TEMPLATES[(feature_name, impact_class)], feature_name, shap_value, feature_values[i], sectors[i]
+            ))
+        
+        return [
+            self._summarize(insights, success_probability)
+            for insights, success_probability in zip(per_project, success_probabilities)
+        ]
+    
+    def _build_insight(
+        self,
+        template: CompiledInsightTemplate,
+        feature_name: str,
+        shap_value: float,
+        feature_values: Dict[str, float],
+        sector: str
+    ) -> CriticalInsight:
+        """بناء رؤية واحدة من القالب المُجمَّع والتأثير التجاري"""
+        feature_value = feature_values.get(feature_name, 0)
+        
+        # حساب التأثير التجاري
+        business_impact = self.impact_calculator.calculate_business_impact(
+            shap_value,
+            feature_name,
+            feature_value,
+            sector
+        )
+        
+        # توليد الوصف
+        description = template.render(feature_value, self._translate_sector(sector), business_impact)
+        
+        # توليد business_impact text
+        impact_text = self._format_business_impact(feature_name, business_impact, shap_value)
+        
+        return CriticalInsight(
+            category=template.category,
+            severity=template.severity,
+            title=template.title,
+            description=description,
+            business_impact=impact_text,
+            shap_contribution=shap_value,
+            feature_name=feature_name,
+            feature_value=feature_value
+        )
+    
+    def _summarize(self, critical_insights: List[CriticalInsight], success_probability: float) -> CEOInsightsOutput:
+        """ترتيب الرؤى وتوليد الملخص ومستوى الخطر والجاذبية"""
         # ترتيب حسب الخطورة
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        critical_insights.sort(key=lambda x: (severity_order.get(x.severity, 4), abs(x.shap_contribution)), reverse=True)
+        critical_insights.sort(key=lambda x: (SEVERITY_ORDER.get(x.severity, 4), abs(x.shap_contribution)), reverse=True)
         
         # توليد الملخص التنفيذي
         executive_summary = self._generate_executive_summary(critical_insights, success_probability)
@@ -490,19 +798,7 @@ class CEOInsightsEngine:
     
     def _translate_sector(self, sector: str) -> str:
         """ترجمة اسم القطاع إلى العربية"""
-        translations = {
-            "fintech": "التقنية المالية",
-            "digital_health": "الصحة الرقمية",
-            "smart_agriculture": "الزراعة الذكية",
-            "renewable_energy": "الطاقة المتجددة",
-            "ecommerce": "التجارة الإلكترونية",
-            "edtech": "التقنية التعليمية",
-            "proptech": "تقنية العقارات",
-            "logistics": "اللوجستيات",
-            "food_delivery": "توصيل الطعام",
-            "tourism": "السياحة"
-        }
-        return translations.get(sector, sector)
+        return SECTOR_TRANSLATIONS.get(sector, sector)
     
     def _format_business_impact(self, feature_name: str, impact: Dict, shap_value: float) -> str:
         """تنسيق التأثير التجاري كنص"""
@@ -519,6 +815,7 @@ class CEOInsightsEngine:
         else:
             return f"تأثير SHAP: {shap_value:.2f}"
     
+    @traced()
     def _generate_executive_summary(self, insights: List[CriticalInsight], success_prob: float) -> str:
         """توليد الملخص التنفيذي"""
         critical_count = sum(1 for i in insights if i.severity in ["critical", "high"])
@@ -532,6 +829,7 @@ class CEOInsightsEngine:
         else:
             return f"المشروع في وضع جيد مع {critical_count} نقاط تحسين محتملة. احتمالية النجاح ({success_prob:.0f}%) عالية."
     
+    @traced()
     def _determine_risk_level(self, insights: List[CriticalInsight], success_prob: float) -> str:
         """تحديد مستوى الخطر الإجمالي"""
         critical_count = sum(1 for i in insights if i.severity == "critical")
@@ -1,14 +1,26 @@
 """
 Excel Export Service for Strategic Analysis Reports
 Generates comprehensive Excel workbooks from strategic analysis data
+
+Portfolio exports (one row per project) use a write-only workbook: rows are
+serialized as they are appended and cells refer to named styles registered
+once per workbook, so memory stays flat across tens of thousands of rows.
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.chart import BarChart, PieChart, Reference
 from openpyxl.utils import get_column_letter
+from analysis_store import to_report_data
 from datetime import datetime
-from typing import Dict, Any, List
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Any, List, BinaryIO, Iterable, Iterator, Tuple, Union
+
+# Portfolio workbooks up to this size stay in memory while streaming; larger ones spill to disk
+PORTFOLIO_SPOOL_BYTES = 8 * 1024 * 1024
+PORTFOLIO_CHUNK_BYTES = 64 * 1024
 
 class StrategicAnalysisExcelExporter:
     def __init__(self):
@@ -26,16 +38,34 @@ class StrategicAnalysisExcelExporter:
             bottom=Side(style='thin')
         )
     
-    def generate_report(self, analysis_data: Dict[str, Any], output_path: str) -> str:
+    def render(self, analysis_data: Dict[str, Any]) -> bytes:
+        """
+        Generate Excel report in memory
+        
+        Args:
+            analysis_data: Dictionary containing strategic analysis results
+            
+        Returns:
+            Workbook (.xlsx) bytes
+        """
+        buffer = BytesIO()
+        self.generate_report(analysis_data, buffer)
+        return buffer.getvalue()
+    
+    def generate_report(
+        self,
+        analysis_data: Dict[str, Any],
+        output_path: Union[str, BinaryIO]
+    ) -> Union[str, BinaryIO]:
         """
         Generate Excel report from strategic analysis data
         
         Args:
             analysis_data: Dictionary containing strategic analysis results
-            output_path: Path where Excel file should be saved
+            output_path: Path where Excel file should be saved, or a binary file object
             
         Returns:
-            Path to generated Excel file
+            Path to generated Excel file (or the file object written to)
         """
         # Create sheets
         self._create_summary_sheet(analysis_data)
@@ -396,6 +426,157 @@ def export_to_excel(analysis_data: Dict[str, Any], output_path: str) -> str:
     return exporter.generate_report(analysis_data, output_path)
 
 
+def render_excel(analysis_data: Dict[str, Any]) -> bytes:
+    """
+    Export strategic analysis to Excel bytes (no file I/O)
+    
+    Args:
+        analysis_data: Strategic analysis data dictionary
+        
+    Returns:
+        Workbook (.xlsx) bytes
+    """
+    return StrategicAnalysisExcelExporter().render(analysis_data)
+
+
+# (header, column width, named style) for each portfolio column
+PORTFOLIO_COLUMNS = (
+    ("Analysis ID", 34, "portfolio_text"),
+    ("Project ID", 16, "portfolio_text"),
+    ("Project", 40, "portfolio_text"),
+    ("Analyzed At", 26, "portfolio_text"),
+    ("ICI Score", 11, "portfolio_score"),
+    ("ICI Level", 12, "portfolio_text"),
+    ("IRL Score", 11, "portfolio_score"),
+    ("Success Probability", 13, "portfolio_percent"),
+    ("Risk Level", 12, "portfolio_text"),
+    ("Investor Appeal", 14, "portfolio_text"),
+    ("Market Fit", 12, "portfolio_score"),
+    ("Execution Readiness", 12, "portfolio_score"),
+    ("Investor Readiness", 12, "portfolio_score"),
+    ("Financial Sustainability", 13, "portfolio_score"),
+    ("Valuation Range", 30, "portfolio_text"),
+    ("Funding Potential", 30, "portfolio_text"),
+    ("CEO Insights", 10, "portfolio_count"),
+    ("Roadmap Steps", 10, "portfolio_count")
+)
+
+
+def _portfolio_named_styles() -> List[NamedStyle]:
+    """Named styles for portfolio cells (NamedStyle binds to one workbook, so built per workbook)"""
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    header = NamedStyle(
+        name="portfolio_header",
+        font=Font(bold=True, color="FFFFFF", size=12),
+        fill=PatternFill(start_color="1E40AF", end_color="1E40AF", fill_type="solid"),
+        alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+        border=border
+    )
+    styles = [header, NamedStyle(name="portfolio_text", border=border)]
+    for name, number_format in (
+        ("portfolio_score", "0.0"),
+        ("portfolio_percent", "0.0%"),
+        ("portfolio_count", "0")
+    ):
+        styles.append(NamedStyle(name=name, number_format=number_format, border=border))
+    return styles
+
+
+def _portfolio_row(analysis_id: str, created_at: str, analysis: Dict[str, Any]) -> Tuple:
+    """Values of one portfolio row, in PORTFOLIO_COLUMNS order"""
+    data = to_report_data(analysis)
+    dimensions = data['dimensions']
+    return (
+        analysis_id,
+        str(analysis.get('project_id', '')),
+        data['project_title'],
+        created_at,
+        data['ici_score'],
+        data['ici_level'],
+        data['irl_score'],
+        data['success_probability'],
+        data['risk_level'],
+        data['investor_appeal'],
+        dimensions['market_fit'],
+        dimensions['execution_readiness'],
+        dimensions['investor_readiness'],
+        dimensions['financial_sustainability'],
+        data['investment']['valuation_range'],
+        data['investment']['funding_potential'],
+        len(data['ceo_insights']),
+        len(data['roadmap']['steps'])
+    )
+
+
+def write_portfolio_excel(
+    analyses: Iterable[Tuple[str, str, Dict[str, Any]]],
+    output: Union[str, BinaryIO]
+) -> int:
+    """
+    Write a portfolio workbook with one row per analysis (write-only mode)
+    
+    Args:
+        analyses: (analysis_id, created_at, analysis) tuples, e.g. AnalysisStore.iter_analyses()
+        output: Path or binary file object the .xlsx is saved to
+        
+    Returns:
+        Number of project rows written
+    """
+    workbook = Workbook(write_only=True)
+    for style in _portfolio_named_styles():
+        workbook.add_named_style(style)
+    
+    ws = workbook.create_sheet("Portfolio")
+    ws.freeze_panes = 'A2'
+    for col_idx, (_, width, _) in enumerate(PORTFOLIO_COLUMNS, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    
+    def styled_cell(style: str, value: Any = None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+    
+    ws.append([styled_cell("portfolio_header", title) for title, _, _ in PORTFOLIO_COLUMNS])
+    
+    # Each row is serialized on append, so one set of styled cells is reused for all rows
+    row_cells = [styled_cell(style) for _, _, style in PORTFOLIO_COLUMNS]
+    
+    rows = 0
+    for analysis_id, created_at, analysis in analyses:
+        for cell, value in zip(row_cells, _portfolio_row(analysis_id, created_at, analysis)):
+            cell.value = value
+        ws.append(row_cells)
+        rows += 1
+    
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(PORTFOLIO_COLUMNS))}{rows + 1}"
+    workbook.save(output)
+    return rows
+
+
+def stream_portfolio_excel(
+    analyses: Iterable[Tuple[str, str, Dict[str, Any]]],
+    chunk_size: int = PORTFOLIO_CHUNK_BYTES
+) -> Iterator[bytes]:
+    """
+    Build a portfolio workbook and yield it in chunks for a streaming HTTP response
+    
+    The workbook is spooled in memory up to PORTFOLIO_SPOOL_BYTES, then on disk.
+    """
+    with SpooledTemporaryFile(max_size=PORTFOLIO_SPOOL_BYTES) as spool:
+        write_portfolio_excel(analyses, spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
 if __name__ == "__main__":
     # Test with sample data
     sample_data = {
@@ -0,0 +1,126 @@
+"""
+Copy-on-Write Feature Overlays for UPLINK 5.0
+A project's features as a shared, read-only baseline plus a small delta
+
+What-if scenarios, grid points and cleaned feature sets differ from their
+baseline in a handful of fields. FeatureOverlay stores only those fields and
+reads everything else from the baseline, so building thousands of scenarios
+no longer copies (or deep-copies) the whole feature dict each time. Writes go
+to the delta; the baseline is never mutated.
+
+An overlay built on a plain mapping takes a shallow snapshot of it (the cost
+of the dict.copy() it replaces), so later changes by the caller do not leak
+in. Overlays derived from an overlay share that snapshot: derive scenarios
+from one overlay rather than from the caller's dict.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+
+class FeatureOverlay(MutableMapping):
+    """
+    Mapping view of a snapshot of `base` with `delta` applied on top
+
+    Overlays of overlays are flattened: the new overlay points at the
+    innermost baseline and carries the merged delta, so lookups stay O(1)
+    however many times a scenario is derived.
+    """
+
+    __slots__ = ("_base", "_delta", "_deleted")
+
+    def __init__(
+        self,
+        base: Mapping,
+        delta: Optional[Dict[str, Any]] = None,
+        deleted: Iterable[str] = ()
+    ):
+        deleted = set(deleted)
+        if isinstance(base, FeatureOverlay):
+            merged = dict(base._delta)
+            for key in deleted:
+                merged.pop(key, None)
+            merged.update(delta or {})
+            deleted = (base._deleted | deleted) - set(delta or {})
+            base, delta = base._base, merged
+        else:
+            base = dict(base)
+        self._base = base
+        self._delta = dict(delta) if delta else {}
+        self._deleted = deleted
+
+    @property
+    def base(self) -> Mapping:
+        """The shared baseline (must not be mutated)"""
+        return self._base
+
+    @property
+    def delta(self) -> Dict[str, Any]:
+        """Fields that differ from the baseline"""
+        return dict(self._delta)
+
+    def derive(self, delta: Dict[str, Any]) -> "FeatureOverlay":
+        """New overlay on the same baseline with `delta` applied on top of this one"""
+        return FeatureOverlay(self, delta)
+
+    def copy(self) -> "FeatureOverlay":
+        """Cheap copy (shares the baseline, copies only the delta)"""
+        return FeatureOverlay(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize as a plain dict (for JSON responses)"""
+        return dict(self.items())
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._delta:
+            return self._delta[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._delta:
+            return True
+        return key not in self._deleted and key in self._base
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._delta:
+            return self._delta[key]
+        if key in self._deleted:
+            return default
+        return self._base.get(key, default)
+
+    def __setitem__(self, key: str, value: Any):
+        self._delta[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self._delta.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._delta:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return (_restore, (self._base, self._delta, self._deleted))
+
+    def __repr__(self) -> str:
+        return f"FeatureOverlay(base={len(self._base)} keys, delta={self._delta!r})"
+
+
+def _restore(base: Dict[str, Any], delta: Dict[str, Any], deleted: Set[str]) -> FeatureOverlay:
+    """Unpickle without snapshotting again (the unpickled base is already private)"""
+    overlay = FeatureOverlay.__new__(FeatureOverlay)
+    overlay._base, overlay._delta, overlay._deleted = base, delta, deleted
+    return overlay
@@ -0,0 +1,328 @@
+"""
+Monte Carlo Funding-Round Simulator for UPLINK 5.0
+Distributions of time-to-funding, dilution and ownership over successive rounds
+
+InvestmentSimulator.simulate_investment_scenarios gives one deterministic
+probability per investor type. FundingRoundSimulator runs many simulated
+paths from the project's current stage instead: in each round the eligible
+investors race to close (noisy timeline, and an IRL-based closing probability
+scaled by how well the project fits each investor's criteria), the winner's
+check sets the dilution, and the next round is priced at a random
+valuation step-up. All paths advance together as NumPy arrays, so 100k paths
+per project fit comfortably inside an API call.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from investment_simulator import (
+    CRITERIA_BY_TYPE,
+    CRITERIA_ORDER,
+    EQUITY_DILUTION_BOUNDS,
+    FALLBACK_INVESTOR_TYPES,
+    INVESTOR_TIMELINE_MONTHS,
+    InvestorReadinessLevel,
+    InvestorType,
+    closing_probability
+)
+
+STAGE_SEQUENCE = ("pre_seed", "seed", "series_a", "series_b", "growth")
+
+# Median step-up from the previous post-money to the pre-money of this stage
+STAGE_STEP_UP = {
+    "seed": 2.5,
+    "series_a": 3.0,
+    "series_b": 2.5,
+    "growth": 2.0
+}
+STEP_UP_SIGMA = 0.5
+
+# Months between closing a round and starting to raise the next one
+ROUND_GAP_MONTHS = {
+    "pre_seed": 12,
+    "seed": 15,
+    "series_a": 18,
+    "series_b": 24,
+    "growth": 24
+}
+
+# Lognormal noise on INVESTOR_TIMELINE_MONTHS
+TIMELINE_SIGMA = 0.35
+
+# Fundraising attempts per round before a path stops
+MAX_ATTEMPTS = 3
+
+# readiness_breakdown key -> InvestorCriteria minimum it is checked against
+CRITERIA_SCORES = (
+    ("traction", "min_traction"),
+    ("team_quality", "min_team_quality"),
+    ("technical_feasibility", "min_technical_feasibility"),
+    ("financial_health", "min_financial_health")
+)
+
+DEFAULT_PATHS = 100_000
+MAX_PATHS = 500_000
+DEFAULT_ROUNDS = 3
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def investor_fit(
+    investor_type: InvestorType,
+    stage: str,
+    irl_score: float,
+    readiness_breakdown: Optional[Dict[str, float]] = None,
+    sector: Optional[str] = None
+) -> float:
+    """
+    Share of an investor type's criteria the project meets (0-1)
+
+    The criteria are the ones _recommend_investor_types counts: four minimum
+    component scores plus the preferred sectors and stages. Scores missing
+    from readiness_breakdown are taken to be the IRL score; without a sector
+    the sector criterion is left out.
+    """
+    criteria = CRITERIA_BY_TYPE[investor_type]
+    breakdown = readiness_breakdown or {}
+    matches = sum(breakdown.get(key, irl_score) >= getattr(criteria, minimum) for key, minimum in CRITERIA_SCORES)
+    matches += stage in criteria.preferred_stages
+    checked = len(CRITERIA_SCORES) + 1
+    if sector is not None:
+        matches += sector in criteria.preferred_sectors
+        checked += 1
+    return matches / checked
+
+
+def _bands(values: np.ndarray, percentiles: Sequence[float]) -> Optional[Dict[str, float]]:
+    if values.size == 0:
+        return None
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+
+
+def _summary(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, Any]:
+    return {
+        "mean": float(values.mean()) if values.size else None,
+        "bands": _bands(values, percentiles)
+    }
+
+
+class FundingRoundSimulator:
+    """Vectorized Monte Carlo over successive funding rounds"""
+
+    def simulate(
+        self,
+        irl_score: float,
+        valuation_range: Tuple[float, float],
+        stage: str,
+        recommended_investor_types: Optional[List[InvestorType]] = None,
+        n_paths: int = DEFAULT_PATHS,
+        max_rounds: int = DEFAULT_ROUNDS,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        seed: Optional[int] = None,
+        readiness_breakdown: Optional[Dict[str, float]] = None,
+        sector: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Simulate up to `max_rounds` rounds starting at `stage`
+
+        An investor closes an attempt with closing_probability(irl_score)
+        times investor_fit for the round's stage, so investors whose bar the
+        project clears close more often than those it barely qualifies for.
+
+        Args:
+            irl_score: IRL score (0-100)
+            valuation_range: (min, max) pre-money for the first round
+            stage: Current stage (one of STAGE_SEQUENCE)
+            recommended_investor_types: Investors for the first round (default:
+                every investor type targeting `stage`); later rounds use the
+                investor types that target each later stage
+            n_paths: Number of simulated paths
+            max_rounds: Rounds to simulate (stops at "growth")
+            percentiles: Percentiles to report
+            seed: Random seed for reproducible distributions
+            readiness_breakdown: Component scores from calculate_irl (see investor_fit)
+            sector: Project sector (see investor_fit)
+
+        Returns:
+            {'n_paths', 'stages', 'closing_probability' (IRL-based, before fit),
+             'time_to_funding': {'probability', 'months'},
+             'rounds': [{'stage', 'probability', 'conditional_probability',
+                         'investor_closing_probability', 'months', 'dilution',
+                         'post_money', 'investor_mix'}],
+             'rounds_closed': {'0': share, '1': share, ...},
+             'ownership': {'final', 'if_all_rounds_closed'},
+             'total_months'}
+        """
+        if stage not in STAGE_SEQUENCE:
+            raise ValueError(f"Unknown stage: {stage}")
+        n_paths = int(n_paths)
+        if not 1 <= n_paths <= MAX_PATHS:
+            raise ValueError(f"n_paths must be between 1 and {MAX_PATHS}")
+        max_rounds = int(max_rounds)
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be at least 1")
+        percentiles = [float(p) for p in percentiles]
+
+        start = STAGE_SEQUENCE.index(stage)
+        stages = STAGE_SEQUENCE[start:start + max_rounds]
+        probability = closing_probability(irl_score)
+        rng = np.random.default_rng(seed)
+
+        ownership = np.ones(n_paths)
+        total_months = np.zeros(n_paths)
+        rounds_closed = np.zeros(n_paths, dtype=int)
+        post_money = np.zeros(n_paths)
+        active = np.arange(n_paths)
+        time_to_funding = None
+        rounds = []
+
+        for r, round_stage in enumerate(stages):
+            investors = self._round_investors(round_stage, recommended_investor_types if r == 0 else None)
+            attempted = active.size
+            investor_probability = {
+                t: probability * investor_fit(t, round_stage, irl_score, readiness_breakdown, sector)
+                for t in investors
+            }
+            closed, winner, months = self._race(
+                active, investors, np.array([investor_probability[t] for t in investors]), rng
+            )
+
+            if r == 0:
+                time_to_funding = months
+            else:
+                months = months + ROUND_GAP_MONTHS[stages[r - 1]]
+
+            check_low = np.array([CRITERIA_BY_TYPE[t].typical_check_size[0] for t in investors], dtype=float)
+            check_high = np.array([CRITERIA_BY_TYPE[t].typical_check_size[1] for t in investors], dtype=float)
+            check = rng.uniform(check_low[winner], check_high[winner])
+
+            if r == 0:
+                pre_money = rng.uniform(valuation_range[0], valuation_range[1], closed.size)
+            else:
+                step_up = rng.lognormal(np.log(STAGE_STEP_UP[round_stage]), STEP_UP_SIGMA, closed.size)
+                pre_money = post_money[closed] * step_up
+
+            # The check's share of post-money, clipped to EQUITY_DILUTION_BOUNDS;
+            # post-money then follows from the clipped dilution
+            dilution = np.clip(check / (pre_money + check), *EQUITY_DILUTION_BOUNDS)
+            post_money[closed] = check / dilution
+            ownership[closed] *= 1 - dilution
+            total_months[closed] += months
+            rounds_closed[closed] += 1
+
+            rounds.append({
+                "stage": round_stage,
+                "probability": closed.size / n_paths,
+                "conditional_probability": closed.size / attempted if attempted else 0.0,
+                "investor_closing_probability": {t.value: p for t, p in investor_probability.items()},
+                "months": _summary(months, percentiles),
+                "dilution": _summary(dilution, percentiles),
+                "post_money": _summary(post_money[closed], percentiles),
+                "investor_mix": {
+                    investors[i].value: float(count) / closed.size
+                    for i, count in enumerate(np.bincount(winner, minlength=len(investors)))
+                    if count
+                }
+            })
+            active = closed
+
+        completed = rounds_closed == len(stages)
+        return {
+            "n_paths": n_paths,
+            "stages": list(stages),
+            "percentiles": percentiles,
+            "closing_probability": probability,
+            "time_to_funding": {
+                "probability": rounds[0]["probability"],
+                **_summary(time_to_funding, percentiles)
+            },
+            "rounds": rounds,
+            "rounds_closed": {
+                str(k): float(share)
+                for k, share in enumerate(np.bincount(rounds_closed, minlength=len(stages) + 1) / n_paths)
+            },
+            "ownership": {
+                "final": _summary(ownership, percentiles),
+                "if_all_rounds_closed": _summary(ownership[completed], percentiles)
+            },
+            "total_months": _summary(total_months[completed], percentiles)
+        }
+
+    def simulate_irl(self, irl: InvestorReadinessLevel, stage: str, **kwargs) -> Dict[str, Any]:
+        """simulate() for an InvestorReadinessLevel from calculate_irl"""
+        return self.simulate(
+            irl.irl_score,
+            irl.estimated_valuation_range,
+            stage,
+            irl.recommended_investor_types,
+            readiness_breakdown=irl.readiness_breakdown,
+            **kwargs
+        )
+
+    def simulate_readiness(self, readiness: Dict[str, Any], stage: str, **kwargs) -> Dict[str, Any]:
+        """simulate() for the 'investor_readiness' dict of an analysis result"""
+        valuation = readiness["estimated_valuation_range"]
+        return self.simulate(
+            readiness["irl_score"],
+            (valuation["min"], valuation["max"]),
+            stage,
+            [InvestorType(value) for value in readiness.get("recommended_investor_types", [])] or None,
+            readiness_breakdown=readiness.get("readiness_breakdown"),
+            **kwargs
+        )
+
+    def _round_investors(
+        self,
+        stage: str,
+        recommended: Optional[List[InvestorType]]
+    ) -> List[InvestorType]:
+        if recommended:
+            return list(recommended)
+        investors = [c.investor_type for c in CRITERIA_ORDER if stage in c.preferred_stages]
+        return investors or list(FALLBACK_INVESTOR_TYPES)
+
+    def _race(
+        self,
+        paths: np.ndarray,
+        investors: List[InvestorType],
+        probabilities: np.ndarray,
+        rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every pending path pitches all investors at once; the earliest to close
+        wins. If none closes, the attempt costs the slowest answer and the path
+        tries again (up to MAX_ATTEMPTS). `probabilities` holds each
+        investor's chance of closing one attempt.
+
+        Returns (closed path indices, winner index per closed path, months per
+        closed path), all in the order of `paths`.
+        """
+        timelines = np.array([INVESTOR_TIMELINE_MONTHS.get(t, 3) for t in investors], dtype=float)
+        elapsed = np.zeros(paths.size)
+        winner = np.full(paths.size, -1)
+        pending = np.arange(paths.size)
+
+        for _ in range(MAX_ATTEMPTS):
+            if pending.size == 0:
+                break
+            shape = (pending.size, len(investors))
+            times = timelines * rng.lognormal(0.0, TIMELINE_SIGMA, shape)
+            closes = rng.random(shape) < probabilities
+            first = np.where(closes, times, np.inf)
+            best = first.argmin(axis=1)
+            done = closes[np.arange(pending.size), best]
+
+            elapsed[pending] += np.where(done, first[np.arange(pending.size), best], times.max(axis=1))
+            winner[pending[done]] = best[done]
+            pending = pending[~done]
+
+        closed = winner >= 0
+        return paths[closed], winner[closed], elapsed[closed]
+
+
+# Global instance
+funding_round_simulator = FundingRoundSimulator()
+
+def get_funding_round_simulator() -> FundingRoundSimulator:
+    """Get the process-wide funding-round simulator"""
+    return funding_round_simulator
@@ -10,9 +10,11 @@ Version: 1.0
 """
 
 import json
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from stage_tracing import traced
 
 
 class InvestorType(Enum):
@@ -39,7 +41,7 @@ class InvestorCriteria:
     typical_check_size: tuple  # (min, max) بالريال
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestorReadinessLevel:
     """مستوى الجاهزية الاستثمارية"""
     irl_score: float  # 0-100
@@ -53,7 +55,7 @@ class InvestorReadinessLevel:
     readiness_breakdown: Dict[str, float]
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestmentScenario:
     """سيناريو استثماري"""
     scenario_name: str
@@ -189,40 +191,310 @@ class SaudiVCCriteria:
     )
 
 
+# نقاط جودة الفريق الأساسية حسب نوع المنظمة (سمعة المنظمة)
+ORGANIZATION_TEAM_SCORES = {
+    "kaust": 85,  # سمعة قوية
+    "pif": 80,
+    "roshn": 75,
+    "startup": 50
+}
+
+# TAM estimates for Saudi market (بالمليون ريال)
+SECTOR_TAM = {
+    "fintech": 15000,
+    "ecommerce": 50000,
+    "digital_health": 20000,
+    "edtech": 8000,
+    "renewable_energy": 100000,
+    "smart_agriculture": 25000,
+    "proptech": 30000,
+    "logistics": 40000,
+    "food_delivery": 10000,
+    "tourism": 35000
+}
+
+# Base valuation حسب المرحلة (بالريال)
+STAGE_BASE_VALUATION = {
+    "pre_seed": 2_000_000,
+    "seed": 5_000_000,
+    "series_a": 15_000_000,
+    "series_b": 50_000_000,
+    "growth": 150_000_000
+}
+
+# مضاعفات التقييم حسب القطاع (بعض القطاعات لها تقييمات أعلى)
+SECTOR_VALUATION_MULTIPLIERS = {
+    "fintech": 1.3,
+    "digital_health": 1.2,
+    "renewable_energy": 1.4,
+    "ecommerce": 1.0,
+    "edtech": 1.1
+}
+
+# نسبة التمويل المعتادة حسب المرحلة
+STAGE_EQUITY_PERCENTAGE = {
+    "pre_seed": 0.15,  # 10-20%
+    "seed": 0.20,  # 15-25%
+    "series_a": 0.25,  # 20-30%
+    "series_b": 0.20,  # 15-25%
+    "growth": 0.15  # 10-20%
+}
+
+
+# ============================================================================
+# جداول مفهرسة تُبنى مرة واحدة عند تحميل الوحدة
+# ============================================================================
+
+# ترتيب فحص أنواع المستثمرين (نفس ترتيب التوصيات)
+CRITERIA_ORDER = (
+    SaudiVCCriteria.PIF_CRITERIA,
+    SaudiVCCriteria.SAUDI_VC_SERIES_A_CRITERIA,
+    SaudiVCCriteria.SAUDI_VC_SEED_CRITERIA,
+    SaudiVCCriteria.CORPORATE_VC_CRITERIA,
+    SaudiVCCriteria.ANGEL_CRITERIA,
+    SaudiVCCriteria.GOVERNMENT_CRITERIA
+)
+CRITERIA_BY_TYPE = {criteria.investor_type: criteria for criteria in CRITERIA_ORDER}
+
+# عند عدم تطابق أي مستثمر
+FALLBACK_INVESTOR_TYPES = (InvestorType.GOVERNMENT, InvestorType.ANGEL)
+
+# أقل عدد من المعايير الستة يحقق نسبة تطابق 60%
+MIN_CRITERIA_MATCHES = next(k for k in range(7) if k / 6 >= 0.6)
+
+# المدة المتوقعة لإغلاق الجولة حسب نوع المستثمر (بالأشهر)
+INVESTOR_TIMELINE_MONTHS = {
+    InvestorType.ANGEL: 1,
+    InvestorType.GOVERNMENT: 2,
+    InvestorType.VC_SEED: 3,
+    InvestorType.CORPORATE: 4,
+    InvestorType.VC_SERIES_A: 6,
+    InvestorType.PIF: 9
+}
+
+# حدود نسبة التخفيف في الجولة الواحدة
+EQUITY_DILUTION_BOUNDS = (0.10, 0.30)
+
+
+def clean_value(value: Any, default: float = 0.0) -> float:
+    """تنظيف القيم - تحويل النصوص إلى أرقام ("45%" -> 0.45، والقيم غير الصالحة -> default)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        # إزالة علامة %
+        has_percent = "%" in value
+        value = value.replace("%", "").strip()
+        try:
+            num = float(value)
+            return num / 100 if has_percent else num
+        except ValueError:
+            return default
+    return default
+
+
+def closing_probability(irl_score: float) -> float:
+    """احتمالية إغلاق جولة مع مستثمر مؤهل حسب IRL Score"""
+    if irl_score >= 80:
+        return 0.7
+    elif irl_score >= 65:
+        return 0.5
+    elif irl_score >= 50:
+        return 0.3
+    else:
+        return 0.1
+
+
+@dataclass(frozen=True)
+class EligibilityRule:
+    """قاعدة أهلية مُجمَّعة لنوع مستثمر ضمن (قطاع، مرحلة) محددين"""
+    investor_type: InvestorType
+    required_checks: int  # عدد المعايير الرقمية الأربعة المطلوب تحقيقها
+    min_traction: float
+    min_team_quality: float
+    min_technical_feasibility: float
+    min_financial_health: float
+
+
+@dataclass(frozen=True)
+class ValuationMultiples:
+    """مضاعفات التقييم والتمويل لـ (قطاع، مرحلة)"""
+    base_valuation: float
+    sector_multiplier: float
+    equity_percentage: float
+
+
+@lru_cache(maxsize=1024)
+def _compile_eligibility(sector: str, stage: str) -> Tuple[EligibilityRule, ...]:
+    """
+    تجميع معايير المستثمرين لـ (قطاع، مرحلة): مطابقة القطاع والمرحلة معروفة مسبقاً،
+    فيبقى فقط عدد المعايير الرقمية اللازم لبلوغ نسبة التطابق
+    """
+    rules = []
+    for criteria in CRITERIA_ORDER:
+        preference_matches = (sector in criteria.preferred_sectors) + (stage in criteria.preferred_stages)
+        rules.append(EligibilityRule(
+            investor_type=criteria.investor_type,
+            required_checks=MIN_CRITERIA_MATCHES - preference_matches,
+            min_traction=criteria.min_traction,
+            min_team_quality=criteria.min_team_quality,
+            min_technical_feasibility=criteria.min_technical_feasibility,
+            min_financial_health=criteria.min_financial_health
+        ))
+    return tuple(rules)
+
+
+@lru_cache(maxsize=1024)
+def _compile_valuation(sector: str, stage: str) -> ValuationMultiples:
+    return ValuationMultiples(
+        base_valuation=STAGE_BASE_VALUATION.get(stage, 2_000_000),
+        sector_multiplier=SECTOR_VALUATION_MULTIPLIERS.get(sector, 1.0),
+        equity_percentage=STAGE_EQUITY_PERCENTAGE.get(stage, 0.20)
+    )
+
+
+KNOWN_SECTORS = tuple(sorted(
+    set(SECTOR_TAM) | set(SECTOR_VALUATION_MULTIPLIERS) |
+    {sector for criteria in CRITERIA_ORDER for sector in criteria.preferred_sectors}
+))
+KNOWN_STAGES = tuple(sorted(
+    set(STAGE_BASE_VALUATION) | set(STAGE_EQUITY_PERCENTAGE) |
+    {stage for criteria in CRITERIA_ORDER for stage in criteria.preferred_stages}
+))
+
+# (sector, stage) -> قواعد الأهلية بترتيب CRITERIA_ORDER
+ELIGIBILITY_INDEX: Dict[Tuple[str, str], Tuple[EligibilityRule, ...]] = {
+    (sector, stage): _compile_eligibility(sector, stage)
+    for sector in KNOWN_SECTORS
+    for stage in KNOWN_STAGES
+}
+
+# (sector, stage) -> مضاعفات التقييم
+VALUATION_INDEX: Dict[Tuple[str, str], ValuationMultiples] = {
+    (sector, stage): _compile_valuation(sector, stage)
+    for sector in KNOWN_SECTORS
+    for stage in KNOWN_STAGES
+}
+
+
+def eligibility_rules(sector: str, stage: str) -> Tuple[EligibilityRule, ...]:
+    """قواعد الأهلية لـ (قطاع، مرحلة) - O(1)؛ القيم غير المعروفة تُجمَّع مرة وتُخزَّن"""
+    rules = ELIGIBILITY_INDEX.get((sector, stage))
+    if rules is None:
+        rules = _compile_eligibility(sector, stage)
+    return rules
+
+
+def valuation_multiples(sector: str, stage: str) -> ValuationMultiples:
+    """مضاعفات التقييم لـ (قطاع، مرحلة) - O(1)؛ القيم غير المعروفة تُجمَّع مرة وتُخزَّن"""
+    multiples = VALUATION_INDEX.get((sector, stage))
+    if multiples is None:
+        multiples = _compile_valuation(sector, stage)
+    return multiples
+
+
+def eligible_investor_types(
+    traction: float,
+    team: float,
+    technical: float,
+    financial: float,
+    sector: str,
+    stage: str
+) -> List[InvestorType]:
+    """
+    المسار السريع لتحديد أنواع المستثمرين المؤهلين
+
+    نفس نتيجة InvestmentSimulator._recommend_investor_types بدون مسح قوائم
+    القطاعات والمراحل المفضلة في كل استدعاء
+    """
+    recommended = []
+    for rule in eligibility_rules(sector, stage):
+        if rule.required_checks <= 0:
+            recommended.append(rule.investor_type)
+            continue
+        checks = (
+            (traction >= rule.min_traction) +
+            (team >= rule.min_team_quality) +
+            (technical >= rule.min_technical_feasibility) +
+            (financial >= rule.min_financial_health)
+        )
+        if checks >= rule.required_checks:
+            recommended.append(rule.investor_type)
+    return recommended or list(FALLBACK_INVESTOR_TYPES)
+
+
+def estimate_valuation_range(
+    irl_score: float,
+    sector: str,
+    stage: str,
+    revenue_growth: float
+) -> tuple:
+    """تقدير نطاق التقييم (دالة نقية في IRL والقطاع والمرحلة ونمو الإيرادات)"""
+    multiples = valuation_multiples(sector, stage)
+    
+    # Base valuation حسب المرحلة
+    base = multiples.base_valuation
+    
+    # تعديل بناءً على IRL Score
+    irl_multiplier = 0.5 + (irl_score / 100) * 1.5  # 0.5x to 2x
+    
+    # تعديل بناءً على القطاع (بعض القطاعات لها تقييمات أعلى)
+    sector_multiplier = multiples.sector_multiplier
+    
+    # تعديل بناءً على نمو الإيرادات
+    revenue_multiplier = 1.0 + (revenue_growth * 0.5)
+    
+    # حساب التقييم
+    valuation = base * irl_multiplier * sector_multiplier * revenue_multiplier
+    
+    # نطاق ±30%
+    min_val = valuation * 0.7
+    max_val = valuation * 1.3
+    
+    return (min_val, max_val)
+
+
+def estimate_funding_potential(
+    irl_score: float,
+    valuation_range: tuple,
+    stage: str
+) -> tuple:
+    """تقدير إمكانية التمويل (دالة نقية في IRL ونطاق التقييم والمرحلة)"""
+    # نسبة التمويل المعتادة حسب المرحلة
+    equity_percentage = STAGE_EQUITY_PERCENTAGE.get(stage, 0.20)
+    
+    # حساب التمويل
+    min_funding = valuation_range[0] * equity_percentage
+    max_funding = valuation_range[1] * equity_percentage
+    
+    # تعديل بناءً على IRL Score
+    if irl_score < 50:
+        min_funding *= 0.5
+        max_funding *= 0.7
+    elif irl_score > 80:
+        min_funding *= 1.2
+        max_funding *= 1.5
+    
+    return (min_funding, max_funding)
+
+
 class InvestmentSimulator:
     """محاكي السيناريوهات الاستثمارية"""
     
-    def __init__(self):
+    def __init__(self, valuation_cache=None):
+        """
+        Args:
+            valuation_cache: ValuationCache (اختياري) لتقديرات التقييم والتمويل
+                على مدخلات مُقرَّبة بدلاً من حسابها في كل استدعاء
+        """
         self.criteria = SaudiVCCriteria()
+        self.valuation_cache = valuation_cache
     
     
-    def _clean_value(self, value) -> float:
-        """تنظيف القيم - تحويل النصوص إلى أرقام"""
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            has_percent = "%" in value
-            value = value.replace("%", "").strip()
-            try:
-                num = float(value)
-                return num / 100 if has_percent else num
-            except:
-                return 0.0
-        return 0.0
     def _clean_value(self, value: Any) -> float:
         """تنظيف القيم - تحويل النصوص إلى أرقام"""
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            has_percent = "%" in value
-            value = value.replace("%", "").strip()
-            try:
-                num = float(value)
-                return num / 100 if has_percent else num
-            except:
-                return 0.0
-        return 0.0
+        return clean_value(value)
     
+    @traced()
     def calculate_irl(
         self,
         features: Dict[str, float],
@@ -298,20 +570,30 @@ class InvestmentSimulator:
             financial_health_score
         )
         
-        # تقدير نطاق التقييم
-        valuation_range = self._estimate_valuation_range(
-            irl_score,
-            sector,
-            stage,
-            self._clean_value(features.get("revenue_growth", 0))
-        )
-        
-        # تقدير إمكانية التمويل
-        funding_potential = self._estimate_funding_potential(
-            irl_score,
-            valuation_range,
-            stage
-        )
+        revenue_growth = self._clean_value(features.get("revenue_growth", 0))
+        if self.valuation_cache is not None:
+            # تقدير التقييم والتمويل من الذاكرة المؤقتة (مدخلات مُقرَّبة)
+            valuation_range, funding_potential = self.valuation_cache.estimate(
+                irl_score,
+                sector,
+                stage,
+                revenue_growth
+            )
+        else:
+            # تقدير نطاق التقييم
+            valuation_range = self._estimate_valuation_range(
+                irl_score,
+                sector,
+                stage,
+                revenue_growth
+            )
+            
+            # تقدير إمكانية التمويل
+            funding_potential = self._estimate_funding_potential(
+                irl_score,
+                valuation_range,
+                stage
+            )
         
         # تفصيل الجاهزية
         readiness_breakdown = {
@@ -334,6 +616,7 @@ class InvestmentSimulator:
             readiness_breakdown=readiness_breakdown
         )
     
+    @traced()
     def simulate_investment_scenarios(
         self,
         irl: InvestorReadinessLevel,
@@ -368,6 +651,27 @@ class InvestmentSimulator:
         
         return scenarios
     
+    def simulate_funding_rounds(
+        self,
+        irl: InvestorReadinessLevel,
+        stage: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        محاكاة مونت كارلو لجولات التمويل المتتالية (توزيعات بدلاً من احتمالية ثابتة)
+        
+        Args:
+            irl: مستوى الجاهزية
+            stage: المرحلة الحالية
+            **kwargs: n_paths, max_rounds, percentiles, seed
+            
+        Returns:
+            Dict: توزيعات مدة الحصول على التمويل والتخفيف والملكية لكل جولة
+        """
+        from funding_round_simulator import get_funding_round_simulator
+        return get_funding_round_simulator().simulate_irl(irl, stage, **kwargs)
+    
+    @traced()
     def _calculate_traction_score(self, features: Dict[str, float]) -> float:
         """حساب نقاط الجذب"""
         user_count = self._clean_value(features.get("user_count", 0))
@@ -391,19 +695,13 @@ class InvestmentSimulator:
         
         return min(100, traction)
     
+    @traced()
     def _calculate_team_quality_score(self, features: Dict[str, float], organization: str) -> float:
         """حساب جودة الفريق"""
         team_size = self._clean_value(features.get("team_size", 0))
         
         # أوزان حسب نوع المنظمة
-        org_weights = {
-            "kaust": 85,  # سمعة قوية
-            "pif": 80,
-            "roshn": 75,
-            "startup": 50
-        }
-        
-        base_score = org_weights.get(organization, 50)
+        base_score = ORGANIZATION_TEAM_SCORES.get(organization, 50)
         
         # تعديل بناءً على حجم الفريق
         if team_size < 3:
@@ -417,25 +715,13 @@ class InvestmentSimulator:
         
         return team_score
     
+    @traced()
     def _calculate_market_size_score(self, features: Dict[str, float], sector: str) -> float:
         """حساب حجم السوق"""
         market_demand = self._clean_value(features.get("market_demand", 0))
         
         # TAM estimates for Saudi market (بالمليون ريال)
-        sector_tam = {
-            "fintech": 15000,
-            "ecommerce": 50000,
-            "digital_health": 20000,
-            "edtech": 8000,
-            "renewable_energy": 100000,
-            "smart_agriculture": 25000,
-            "proptech": 30000,
-            "logistics": 40000,
-            "food_delivery": 10000,
-            "tourism": 35000
-        }
-        
-        tam = sector_tam.get(sector, 10000)
+        tam = SECTOR_TAM.get(sector, 10000)
         
         # تقدير SAM (10-30% من TAM)
         sam_percentage = market_demand / 100 * 0.3
@@ -449,6 +735,7 @@ class InvestmentSimulator:
         
         return min(100, score)
     
+    @traced()
     def _calculate_financial_health_score(self, features: Dict[str, float]) -> float:
         """حساب الصحة المالية"""
         budget = self._clean_value(features.get("budget", 0))
@@ -509,6 +796,7 @@ class InvestmentSimulator:
         else:
             return "very_low"
     
+    @traced()
     def _recommend_investor_types(
         self,
         traction: float,
@@ -520,47 +808,10 @@ class InvestmentSimulator:
         stage: str
     ) -> List[InvestorType]:
         """تحديد أنواع المستثمرين الموصى بهم"""
-        recommended = []
-        
-        # فحص كل نوع مستثمر
-        all_criteria = [
-            self.criteria.PIF_CRITERIA,
-            self.criteria.SAUDI_VC_SERIES_A_CRITERIA,
-            self.criteria.SAUDI_VC_SEED_CRITERIA,
-            self.criteria.CORPORATE_VC_CRITERIA,
-            self.criteria.ANGEL_CRITERIA,
-            self.criteria.GOVERNMENT_CRITERIA
-        ]
-        
-        for criteria in all_criteria:
-            # فحص المعايير
-            meets_traction = traction >= criteria.min_traction
-            meets_team = team >= criteria.min_team_quality
-            meets_technical = technical >= criteria.min_technical_feasibility
-            meets_financial = financial >= criteria.min_financial_health
-            meets_sector = sector in criteria.preferred_sectors
-            meets_stage = stage in criteria.preferred_stages
-            
-            # حساب نسبة التطابق
-            match_score = sum([
-                meets_traction,
-                meets_team,
-                meets_technical,
-                meets_financial,
-                meets_sector,
-                meets_stage
-            ]) / 6
-            
-            # إذا كان التطابق > 60%، أضف إلى القائمة
-            if match_score >= 0.6:
-                recommended.append(criteria.investor_type)
-        
-        # إذا لم يتم العثور على أي مستثمر، أضف Government و Angel
-        if not recommended:
-            recommended = [InvestorType.GOVERNMENT, InvestorType.ANGEL]
-        
-        return recommended
+        # المعايير مُجمَّعة مسبقاً في ELIGIBILITY_INDEX حسب (القطاع، المرحلة)
+        return eligible_investor_types(traction, team, technical, financial, sector, stage)
     
+    @traced()
     def _identify_strengths_weaknesses(
         self,
         traction: float,
@@ -589,6 +840,7 @@ class InvestmentSimulator:
         
         return strengths, weaknesses
     
+    @traced()
     def _estimate_valuation_range(
         self,
         irl_score: float,
@@ -597,42 +849,9 @@ class InvestmentSimulator:
         revenue_growth: float
     ) -> tuple:
         """تقدير نطاق التقييم"""
-        # Base valuation حسب المرحلة
-        stage_base = {
-            "pre_seed": 2_000_000,
-            "seed": 5_000_000,
-            "series_a": 15_000_000,
-            "series_b": 50_000_000,
-            "growth": 150_000_000
-        }
-        
-        base = stage_base.get(stage, 2_000_000)
-        
-        # تعديل بناءً على IRL Score
-        irl_multiplier = 0.5 + (irl_score / 100) * 1.5  # 0.5x to 2x
-        
-        # تعديل بناءً على القطاع (بعض القطاعات لها تقييمات أعلى)
-        sector_multipliers = {
-            "fintech": 1.3,
-            "digital_health": 1.2,
-            "renewable_energy": 1.4,
-            "ecommerce": 1.0,
-            "edtech": 1.1
-        }
-        sector_multiplier = sector_multipliers.get(sector, 1.0)
-        
-        # تعديل بناءً على نمو الإيرادات
-        revenue_multiplier = 1.0 + (revenue_growth * 0.5)
-        
-        # حساب التقييم
-        valuation = base * irl_multiplier * sector_multiplier * revenue_multiplier
-        
-        # نطاق ±30%
-        min_val = valuation * 0.7
-        max_val = valuation * 1.3
-        
-        return (min_val, max_val)
+        return estimate_valuation_range(irl_score, sector, stage, revenue_growth)
     
+    @traced()
     def _estimate_funding_potential(
         self,
         irl_score: float,
@@ -640,31 +859,9 @@ class InvestmentSimulator:
         stage: str
     ) -> tuple:
         """تقدير إمكانية التمويل"""
-        # نسبة التمويل المعتادة حسب المرحلة
-        stage_equity = {
-            "pre_seed": 0.15,  # 10-20%
-            "seed": 0.20,  # 15-25%
-            "series_a": 0.25,  # 20-30%
-            "series_b": 0.20,  # 15-25%
-            "growth": 0.15  # 10-20%
-        }
-        
-        equity_percentage = stage_equity.get(stage, 0.20)
-        
-        # حساب التمويل
-        min_funding = valuation_range[0] * equity_percentage
-        max_funding = valuation_range[1] * equity_percentage
-        
-        # تعديل بناءً على IRL Score
-        if irl_score < 50:
-            min_funding *= 0.5
-            max_funding *= 0.7
-        elif irl_score > 80:
-            min_funding *= 1.2
-            max_funding *= 1.5
-        
-        return (min_funding, max_funding)
+        return estimate_funding_potential(irl_score, valuation_range, stage)
     
+    @traced()
     def _generate_scenario(
         self,
         investor_type: InvestorType,
@@ -675,46 +872,23 @@ class InvestmentSimulator:
     ) -> InvestmentScenario:
         """توليد سيناريو استثماري"""
         # الحصول على المعايير
-        criteria_map = {
-            InvestorType.PIF: self.criteria.PIF_CRITERIA,
-            InvestorType.VC_SERIES_A: self.criteria.SAUDI_VC_SERIES_A_CRITERIA,
-            InvestorType.VC_SEED: self.criteria.SAUDI_VC_SEED_CRITERIA,
-            InvestorType.CORPORATE: self.criteria.CORPORATE_VC_CRITERIA,
-            InvestorType.ANGEL: self.criteria.ANGEL_CRITERIA,
-            InvestorType.GOVERNMENT: self.criteria.GOVERNMENT_CRITERIA
-        }
-        
-        criteria = criteria_map.get(investor_type, self.criteria.ANGEL_CRITERIA)
+        criteria = CRITERIA_BY_TYPE.get(investor_type, SaudiVCCriteria.ANGEL_CRITERIA)
         
         # حساب الاحتمالية
-        if irl_score >= 80:
-            probability = 0.7
-        elif irl_score >= 65:
-            probability = 0.5
-        elif irl_score >= 50:
-            probability = 0.3
-        else:
-            probability = 0.1
+        probability = closing_probability(irl_score)
         
         # تحديد مبلغ التمويل
         funding_amount = (criteria.typical_check_size[0] + criteria.typical_check_size[1]) / 2
         
         # تحديد التخفيف
         equity_dilution = funding_amount / ((funding_potential[0] + funding_potential[1]) / 2)
-        equity_dilution = min(0.30, max(0.10, equity_dilution))
+        equity_dilution = min(EQUITY_DILUTION_BOUNDS[1], max(EQUITY_DILUTION_BOUNDS[0], equity_dilution))
         
         # حساب Post-money valuation
         post_money_valuation = funding_amount / equity_dilution
         
         # تحديد الجدول الزمني
-        timeline_months = {
-            InvestorType.ANGEL: 1,
-            InvestorType.GOVERNMENT: 2,
-            InvestorType.VC_SEED: 3,
-            InvestorType.CORPORATE: 4,
-            InvestorType.VC_SERIES_A: 6,
-            InvestorType.PIF: 9
-        }.get(investor_type, 3)
+        timeline_months = INVESTOR_TIMELINE_MONTHS.get(investor_type, 3)
         
         # الشروط
         conditions = self._generate_conditions(investor_type, irl_score)
@@ -0,0 +1,241 @@
+"""
+Bulk Project-to-Investor Matching for UPLINK 5.0
+N×M compatibility matrix and capacity-constrained assignment
+
+Each project is scored against each investor profile in one set of NumPy
+operations. The score combines three things: the six InvestorCriteria checks
+used by InvestmentSimulator._recommend_investor_types, the project's IRL
+score, and how well the investor's typical check overlaps the project's
+funding potential. Projects are then assigned to investors, each investor
+taking at most `capacity` deals. The assignment is optimal when SciPy's
+linear_sum_assignment is available and greedy otherwise.
+"""
+
+import logging
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from investment_simulator import (
+    CRITERIA_BY_TYPE,
+    MIN_CRITERIA_MATCHES,
+    InvestorCriteria,
+    InvestorType
+)
+from portfolio_irl import PortfolioIRL, PortfolioIRLEngine, columns_from_projects, criteria_match_counts
+
+# Optional: optimal assignment
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    logging.warning("⚠️ scipy not installed - investor matching falls back to greedy assignment")
+
+logger = logging.getLogger(__name__)
+
+# Share of each signal in the 0-100 compatibility score
+COMPATIBILITY_WEIGHTS = {
+    "criteria": 0.5,    # fraction of the six InvestorCriteria checks met
+    "irl": 0.3,         # project IRL score
+    "check_size": 0.2   # overlap of the typical check with the funding potential
+}
+
+# Above this many matrix cells (projects × investor slots) use greedy assignment
+MAX_OPTIMAL_CELLS = 20_000_000
+
+ASSIGNMENT_METHODS = ("auto", "optimal", "greedy")
+
+_CRITERIA_FIELDS = {f.name for f in fields(InvestorCriteria)} - {"investor_type"}
+
+
+@dataclass
+class InvestorProfile:
+    """A concrete investor: criteria (usually a SaudiVCCriteria template) and deal capacity"""
+    investor_id: str
+    criteria: InvestorCriteria
+    capacity: int = 1
+    name: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InvestorProfile":
+        """
+        Build from {"id", "investor_type", "capacity", "name", ...criteria overrides}
+
+        Criteria default to the SaudiVCCriteria template for the investor type;
+        any InvestorCriteria field (min_traction, preferred_sectors, ...) may
+        be overridden.
+        """
+        investor_type = InvestorType(data["investor_type"])
+        overrides = {key: value for key, value in data.items() if key in _CRITERIA_FIELDS}
+        if "typical_check_size" in overrides:
+            overrides["typical_check_size"] = tuple(overrides["typical_check_size"])
+        capacity = int(data.get("capacity", 1))
+        if capacity < 0:
+            raise ValueError(f"Investor {data['id']}: capacity must be >= 0")
+        return cls(
+            investor_id=str(data["id"]),
+            criteria=replace(CRITERIA_BY_TYPE[investor_type], **overrides),
+            capacity=capacity,
+            name=data.get("name")
+        )
+
+
+class InvestorMatchingEngine:
+    """Scores N projects × M investors and solves the capacity-constrained assignment"""
+
+    def __init__(self, portfolio_engine: Optional[PortfolioIRLEngine] = None):
+        self.portfolio_engine = portfolio_engine or PortfolioIRLEngine()
+
+    def compatibility(
+        self,
+        portfolio: PortfolioIRL,
+        sector: Union[str, np.ndarray],
+        stage: Union[str, np.ndarray],
+        investors: Sequence[InvestorProfile]
+    ) -> Dict[str, np.ndarray]:
+        """
+        N×M compatibility matrix
+
+        Returns:
+            {'score': 0-100 (0 where not eligible), 'eligible': bool,
+             'criteria_fraction': share of the six checks met}
+        """
+        criteria = [investor.criteria for investor in investors]
+        checks = criteria_match_counts(portfolio.breakdown, sector, stage, criteria)
+
+        eligible = checks >= MIN_CRITERIA_MATCHES
+        criteria_fraction = checks / 6
+
+        check_low = np.array([c.typical_check_size[0] for c in criteria], dtype=float)
+        check_high = np.array([c.typical_check_size[1] for c in criteria], dtype=float)
+        overlap = (
+            np.minimum(portfolio.funding_max[:, None], check_high) -
+            np.maximum(portfolio.funding_min[:, None], check_low)
+        )
+        check_fit = np.clip(overlap, 0, None) / np.maximum(check_high - check_low, 1.0)
+
+        score = 100 * (
+            COMPATIBILITY_WEIGHTS["criteria"] * criteria_fraction +
+            COMPATIBILITY_WEIGHTS["irl"] * portfolio.irl_score[:, None] / 100 +
+            COMPATIBILITY_WEIGHTS["check_size"] * check_fit
+        )
+        return {
+            "score": np.where(eligible, score, 0.0),
+            "eligible": eligible,
+            "criteria_fraction": criteria_fraction
+        }
+
+    def match(
+        self,
+        projects: List[Dict[str, Any]],
+        investors: Sequence[Union[InvestorProfile, Dict[str, Any]]],
+        method: str = "auto"
+    ) -> Dict[str, Any]:
+        """
+        Assign each project to at most one investor, each investor taking at
+        most its capacity, maximizing total compatibility
+
+        Args:
+            projects: Raw project dicts (as accepted by the Strategic Bridge)
+            investors: InvestorProfile objects or dicts for InvestorProfile.from_dict
+            method: 'optimal' (linear_sum_assignment), 'greedy', or 'auto'
+                    (optimal when SciPy is available and the problem fits)
+
+        Returns:
+            {'method', 'assignments': [{'project_id', 'investor_id',
+             'investor_type', 'compatibility'}], 'unmatched_projects',
+             'investor_load', 'total_compatibility'}
+        """
+        if method not in ASSIGNMENT_METHODS:
+            raise ValueError(f"Unknown method: {method} (expected one of {', '.join(ASSIGNMENT_METHODS)})")
+        profiles = [p if isinstance(p, InvestorProfile) else InvestorProfile.from_dict(p) for p in investors]
+        if not profiles:
+            raise ValueError("At least one investor is required")
+
+        inputs = columns_from_projects(projects)
+        portfolio = self.portfolio_engine.score(**inputs)
+        score = self.compatibility(portfolio, inputs["sector"], inputs["stage"], profiles)["score"]
+        capacity = np.array([p.capacity for p in profiles], dtype=int)
+
+        method = self._resolve_method(method, score, capacity)
+        if method == "optimal":
+            rows, cols = self._assign_optimal(score, capacity)
+        else:
+            rows, cols = self._assign_greedy(score, capacity)
+
+        order = np.argsort(-score[rows, cols], kind="stable")
+        rows, cols = rows[order], cols[order]
+        load = np.bincount(cols, minlength=len(profiles))
+        matched = np.zeros(len(portfolio), dtype=bool)
+        matched[rows] = True
+
+        return {
+            "method": method,
+            "assignments": [
+                {
+                    "project_id": portfolio.project_ids[i],
+                    "investor_id": profiles[j].investor_id,
+                    "investor_type": profiles[j].criteria.investor_type.value,
+                    "compatibility": float(score[i, j])
+                }
+                for i, j in zip(rows.tolist(), cols.tolist())
+            ],
+            "unmatched_projects": [portfolio.project_ids[i] for i in np.flatnonzero(~matched)],
+            "investor_load": {
+                profile.investor_id: int(count) for profile, count in zip(profiles, load)
+            },
+            "total_compatibility": float(score[rows, cols].sum())
+        }
+
+    def _resolve_method(self, method: str, score: np.ndarray, capacity: np.ndarray) -> str:
+        cells = score.shape[0] * int(capacity.sum())
+        if method == "optimal" and not SCIPY_AVAILABLE:
+            raise ValueError("Optimal assignment requires scipy")
+        if method == "auto":
+            return "optimal" if SCIPY_AVAILABLE and cells <= MAX_OPTIMAL_CELLS else "greedy"
+        return method
+
+    def _assign_optimal(self, score: np.ndarray, capacity: np.ndarray) -> tuple:
+        """linear_sum_assignment over investor slots (one column per unit of capacity)"""
+        rows = np.flatnonzero(score.any(axis=1))
+        investors = np.flatnonzero(score[rows].any(axis=0) & (capacity > 0))
+        if rows.size == 0 or investors.size == 0:
+            return np.array([], dtype=int), np.array([], dtype=int)
+
+        # No investor can take more deals than there are candidate projects
+        slots = np.repeat(investors, np.minimum(capacity[investors], rows.size))
+        r, c = linear_sum_assignment(score[np.ix_(rows, slots)], maximize=True)
+        keep = score[rows[r], slots[c]] > 0
+        return rows[r[keep]], slots[c[keep]]
+
+    def _assign_greedy(self, score: np.ndarray, capacity: np.ndarray) -> tuple:
+        """Highest-compatibility pairs first while project and investor are free"""
+        candidates = np.flatnonzero(score.ravel() > 0)
+        candidates = candidates[np.argsort(-score.ravel()[candidates], kind="stable")]
+        remaining = capacity.copy()
+        assigned = np.zeros(score.shape[0], dtype=bool)
+        rows, cols = [], []
+        n_investors = score.shape[1]
+        open_projects = int(score.any(axis=1).sum())
+
+        for flat in candidates.tolist():
+            i, j = divmod(flat, n_investors)
+            if assigned[i] or remaining[j] <= 0:
+                continue
+            assigned[i] = True
+            remaining[j] -= 1
+            rows.append(i)
+            cols.append(j)
+            if len(rows) == open_projects:
+                break
+        return np.array(rows, dtype=int), np.array(cols, dtype=int)
+
+
+# Global instance
+investor_matching_engine = InvestorMatchingEngine()
+
+def get_investor_matching_engine() -> InvestorMatchingEngine:
+    """Get the process-wide investor matching engine"""
+    return investor_matching_engine
@@ -9,11 +9,9 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import logging
 import numpy as np
-import pickle
-import os
 from embeddings_service import get_text_features, TRANSFORMERS_AVAILABLE
 from jwt_auth import get_auth_user_or_service, require_admin_dependency
-from shap_explainer import create_explainer, SHAP_AVAILABLE
+from model_runtime import get_model_runtime, DEFAULT_MODEL_PATH
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -38,32 +36,21 @@ app.add_middleware(
 # Global model and explainer (loaded once at startup)
 prediction_model = None
 shap_explainer = None
-MODEL_PATH = "/home/ubuntu/uplink-platform/ai-services/prediction/success_model.pkl"
+MODEL_PATH = DEFAULT_MODEL_PATH
 
 @app.on_event("startup")
 async def load_model():
-    """Load the trained XGBoost model and SHAP explainer on startup"""
+    """Load the trained XGBoost model and SHAP explainer on startup (shared model runtime)"""
     global prediction_model, shap_explainer
-    try:
-        if os.path.exists(MODEL_PATH):
-            logger.info(f"Loading trained XGBoost model from {MODEL_PATH}...")
-            with open(MODEL_PATH, 'rb') as f:
-                prediction_model = pickle.load(f)
-            logger.info("✅ Trained model loaded successfully")
-            
-            # Initialize SHAP explainer
-            if SHAP_AVAILABLE:
-                logger.info("📊 Initializing SHAP explainer...")
-                shap_explainer = create_explainer(prediction_model)
-                logger.info("✅ SHAP explainer initialized")
-            else:
-                logger.warning("⚠️ SHAP not available - explanations will be limited")
-        else:
-            logger.warning(f"⚠️ No trained model found at {MODEL_PATH}")
-            logger.info("Run 'python3 train_model.py' to train the model first")
-    except Exception as e:
-        logger.error(f"❌ Failed to load model: {e}")
-        raise
+    runtime = get_model_runtime(MODEL_PATH)
+    if runtime.load():
+        prediction_model = runtime.model
+        shap_explainer = runtime.shap_explainer
+    elif runtime.load_error is not None:
+        # A model file that exists but cannot be loaded fails startup
+        raise runtime.load_error
+    else:
+        logger.info("Run 'python3 train_model.py' to train the model first")
 
 # Request/Response models
 class IdeaInput(BaseModel):
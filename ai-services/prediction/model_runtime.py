@@ -0,0 +1,262 @@
+"""
+Shared Model Runtime for UPLINK 5.0
+Loads the trained XGBoost success model and its SHAP TreeExplainer once per
+process and serves batched probabilities and SHAP values to both the
+prediction API (main.py) and the Strategic Bridge (api_strategic.py)
+"""
+
+import os
+import pickle
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from investment_simulator import clean_value
+from shap_explainer import create_explainer, SHAP_AVAILABLE
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.getenv(
+    "SUCCESS_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "success_model.pkl")
+)
+
+# Column order used by train_model.extract_features (12 features)
+MODEL_FEATURES = [
+    'budget', 'team_size', 'timeline_months', 'market_demand',
+    'technical_feasibility', 'competitive_advantage', 'user_engagement',
+    'tags_count', 'hypothesis_validation_rate', 'rat_completion_rate',
+    'title_length', 'description_length'
+]
+
+# Raw project value = model input * divisor (same scaling as train_model.py)
+MODEL_FEATURE_DIVISORS = {
+    'budget': 100000,
+    'market_demand': 100,
+    'technical_feasibility': 100,
+    'competitive_advantage': 100,
+    'user_engagement': 100
+}
+
+# Features the Strategic Bridge understands (subset of MODEL_FEATURES)
+BRIDGE_SHAP_FEATURES = [
+    'budget', 'team_size', 'market_demand', 'technical_feasibility',
+    'user_engagement', 'hypothesis_validation_rate', 'rat_completion_rate'
+]
+
+
+@dataclass
+class ModelExplanation:
+    """Probability and per-feature SHAP contributions for one project"""
+    probability: float  # 0-1
+    shap_values: Dict[str, float]  # probability-space contributions
+    raw_shap_values: Dict[str, float]  # log-odds contributions from TreeExplainer
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    """Convert raw project values ("35", "15%", 0.2) to float"""
+    if isinstance(value, str):
+        # Thousands separators ("150,000")
+        value = value.replace(",", "")
+    return clean_value(value, default)
+
+
+def project_to_model_row(project: Mapping[str, Any]) -> List[float]:
+    """
+    Build one model input row from a project dict (same scaling as train_model.py)
+    """
+    tags_count = project.get('tags_count')
+    if tags_count is None:
+        tags_count = len(project.get('keywords') or [])
+
+    scale = MODEL_FEATURE_DIVISORS
+    return [
+        _to_float(project.get('budget'), 0) / scale['budget'],
+        _to_float(project.get('team_size'), 0),
+        _to_float(project.get('timeline_months'), 6),
+        _to_float(project.get('market_demand'), 50) / scale['market_demand'],
+        _to_float(project.get('technical_feasibility', project.get('tech_feasibility')), 50) / scale['technical_feasibility'],
+        _to_float(project.get('competitive_advantage'), 65) / scale['competitive_advantage'],
+        _to_float(project.get('user_engagement'), 50) / scale['user_engagement'],
+        _to_float(tags_count, 0),
+        _to_float(project.get('hypothesis_validation_rate'), 0.5),
+        _to_float(project.get('rat_completion_rate'), 0.5),
+        float(len(project.get('title') or '')),
+        float(len(project.get('description') or '')),
+    ]
+
+
+class ModelRuntime:
+    """
+    Process-wide holder for the success model and its SHAP explainer
+
+    The model and TreeExplainer are loaded lazily on first use and reused for
+    every subsequent call. All inference entry points are batched.
+    """
+
+    def __init__(self, model_path: Optional[str] = None):
+        self.model_path = model_path or DEFAULT_MODEL_PATH
+        self.model = None
+        self.shap_explainer = None  # SHAPExplainer wrapper (used by /explain)
+        self.load_error: Optional[Exception] = None  # set when the model file exists but fails to load
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self) -> bool:
+        """Load model and explainer once. Returns True if the model is usable."""
+        if self._loaded:
+            return self.model is not None
+
+        with self._lock:
+            if self._loaded:
+                return self.model is not None
+
+            if os.path.exists(self.model_path):
+                try:
+                    logger.info(f"Loading trained XGBoost model from {self.model_path}...")
+                    with open(self.model_path, 'rb') as f:
+                        self.model = pickle.load(f)
+                    logger.info("✅ Trained model loaded successfully")
+
+                    if SHAP_AVAILABLE:
+                        self.shap_explainer = create_explainer(self.model, MODEL_FEATURES)
+                    else:
+                        logger.warning("⚠️ SHAP not available - explanations will be limited")
+                except Exception as e:
+                    logger.error(f"❌ Failed to load model: {e}")
+                    self.load_error = e
+                    self.model = None
+                    self.shap_explainer = None
+            else:
+                logger.warning(f"⚠️ No trained model found at {self.model_path}")
+
+            self._loaded = True
+
+        return self.model is not None
+
+    @property
+    def available(self) -> bool:
+        """Whether a model is loaded and ready for inference"""
+        return self.load()
+
+    @property
+    def tree_explainer(self):
+        """The underlying shap.TreeExplainer (None if SHAP is unavailable)"""
+        if self.shap_explainer is None:
+            return None
+        return self.shap_explainer.explainer
+
+    def features_matrix(self, projects: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Build an (N, 12) model input matrix from project dicts"""
+        return np.array([project_to_model_row(p) for p in projects], dtype=float).reshape(-1, len(MODEL_FEATURES))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Success probability (0-1) for every row of X"""
+        if not self.load():
+            raise RuntimeError("Success model is not loaded")
+        return self.model.predict_proba(X)[:, 1]
+
+    def explain_matrix(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Batched probabilities and SHAP values for a model input matrix
+
+        Returns:
+            {'probability': (N,), 'shap_logodds': (N, F), 'shap_probability': (N, F)}
+        """
+        probabilities = self.predict_proba(X)
+        explainer = self.tree_explainer
+        if explainer is None:
+            raise RuntimeError("SHAP TreeExplainer is not available")
+
+        shap_logodds = np.asarray(explainer.shap_values(X), dtype=float).reshape(X.shape)
+
+        # TreeExplainer attributes log-odds. Redistribute the probability gap
+        # (p - sigmoid(base)) proportionally to each feature's log-odds share so
+        # contributions are additive in probability space, like the thresholds
+        # used by CEOInsightsEngine expect.
+        base_logodds = float(np.ravel(explainer.expected_value)[-1])
+        base_probability = 1.0 / (1.0 + np.exp(-base_logodds))
+        total = shap_logodds.sum(axis=1, keepdims=True)
+        gap = (probabilities - base_probability).reshape(-1, 1)
+        safe_total = np.where(np.abs(total) < 1e-12, 1.0, total)
+        shap_probability = np.where(np.abs(total) < 1e-12, 0.0, shap_logodds / safe_total * gap)
+
+        return {
+            'probability': probabilities,
+            'shap_logodds': shap_logodds,
+            'shap_probability': shap_probability
+        }
+
+    def explain_batch(self, projects: Sequence[Mapping[str, Any]]) -> List[ModelExplanation]:
+        """
+        Real model probabilities and SHAP values for many projects in one call
+
+        Args:
+            projects: Project dicts (raw or cleaned Strategic Bridge input)
+
+        Returns:
+            One ModelExplanation per project, restricted to the features the
+            Strategic Bridge understands
+        """
+        if not projects:
+            return []
+
+        result = self.explain_matrix(self.features_matrix(projects))
+        indices = [MODEL_FEATURES.index(name) for name in BRIDGE_SHAP_FEATURES]
+
+        explanations = []
+        for row in range(len(projects)):
+            explanations.append(ModelExplanation(
+                probability=float(result['probability'][row]),
+                shap_values={
+                    name: float(result['shap_probability'][row, idx])
+                    for name, idx in zip(BRIDGE_SHAP_FEATURES, indices)
+                },
+                raw_shap_values={
+                    name: float(result['shap_logodds'][row, idx])
+                    for name, idx in zip(BRIDGE_SHAP_FEATURES, indices)
+                }
+            ))
+        return explanations
+
+
+# Global instance
+_model_runtime = None
+_model_runtime_lock = threading.Lock()
+
+def get_model_runtime(model_path: Optional[str] = None) -> ModelRuntime:
+    """Get or create the process-wide model runtime"""
+    global _model_runtime
+    if _model_runtime is None:
+        with _model_runtime_lock:
+            if _model_runtime is None:
+                _model_runtime = ModelRuntime(model_path)
+    return _model_runtime
+
+
+if __name__ == "__main__":
+    runtime = get_model_runtime()
+    project = {
+        'title': 'منصة تقنية مالية مبتكرة',
+        'description': 'وصف المشروع',
+        'budget': 500000,
+        'team_size': 5,
+        'market_demand': 65,
+        'technical_feasibility': 75,
+        'hypothesis_validation_rate': 0.60,
+        'rat_completion_rate': 0.55,
+        'user_engagement': 60
+    }
+
+    if runtime.available:
+        explanation = runtime.explain_batch([project])[0]
+        print(f"Probability: {explanation.probability:.1%}")
+        for name, value in sorted(explanation.shap_values.items(), key=lambda x: x[1]):
+            print(f"  {name}: {value:+.4f}")
+    else:
+        print(f"❌ Model not found at {runtime.model_path}")
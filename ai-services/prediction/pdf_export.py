@@ -1,6 +1,10 @@
 """
 PDF Export Service for Strategic Analysis Reports
 Generates professional PDF reports from strategic analysis data
+
+Fonts, paragraph styles and table styles are set up once per exporter;
+get_pdf_exporter() shares one exporter across the process. render() builds
+the report in memory so the API can send it without temp files.
 """
 
 from reportlab.lib import colors
@@ -15,14 +19,17 @@ from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
+from io import BytesIO
 import json
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, BinaryIO, Union
 
 class StrategicAnalysisPDFExporter:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_arabic_support()
         self._setup_custom_styles()
+        self._setup_table_styles()
     
     def _setup_arabic_support(self):
         """Setup Arabic font support (using default fonts for now)"""
@@ -61,16 +68,57 @@ class StrategicAnalysisPDFExporter:
             spaceAfter=6
         ))
     
-    def generate_report(self, analysis_data: Dict[str, Any], output_path: str) -> str:
+    def _setup_table_styles(self):
+        """Setup table styles shared by every report"""
+        self.metadata_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+        
+        self.metrics_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    
+    def render(self, analysis_data: Dict[str, Any]) -> bytes:
+        """
+        Generate PDF report in memory
+        
+        Args:
+            analysis_data: Dictionary containing strategic analysis results
+            
+        Returns:
+            PDF document bytes
+        """
+        buffer = BytesIO()
+        self.generate_report(analysis_data, buffer)
+        return buffer.getvalue()
+    
+    def generate_report(
+        self,
+        analysis_data: Dict[str, Any],
+        output_path: Union[str, BinaryIO]
+    ) -> Union[str, BinaryIO]:
         """
         Generate PDF report from strategic analysis data
         
         Args:
             analysis_data: Dictionary containing strategic analysis results
-            output_path: Path where PDF should be saved
+            output_path: Path where PDF should be saved, or a binary file object
             
         Returns:
-            Path to generated PDF file
+            Path to generated PDF file (or the file object written to)
         """
         doc = SimpleDocTemplate(
             output_path,
@@ -145,15 +193,7 @@ class StrategicAnalysisPDFExporter:
         ]
         
         t = Table(metadata, colWidths=[2*inch, 3*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        t.setStyle(self.metadata_table_style)
         
         elements.append(t)
         elements.append(Spacer(1, 0.5*inch))
@@ -189,16 +229,7 @@ class StrategicAnalysisPDFExporter:
         ]
         
         t = Table(metrics_data, colWidths=[3*inch, 2*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(self.metrics_table_style)
         
         elements.append(t)
         
@@ -363,6 +394,19 @@ class StrategicAnalysisPDFExporter:
         return elements
 
 
+# Global instance
+_pdf_exporter = None
+_pdf_exporter_lock = threading.Lock()
+
+def get_pdf_exporter() -> StrategicAnalysisPDFExporter:
+    """Get or create the process-wide PDF exporter (styles are built once)"""
+    global _pdf_exporter
+    with _pdf_exporter_lock:
+        if _pdf_exporter is None:
+            _pdf_exporter = StrategicAnalysisPDFExporter()
+    return _pdf_exporter
+
+
 def export_to_pdf(analysis_data: Dict[str, Any], output_path: str) -> str:
     """
     Main function to export strategic analysis to PDF
@@ -374,8 +418,20 @@ def export_to_pdf(analysis_data: Dict[str, Any], output_path: str) -> str:
     Returns:
         Path to generated PDF file
     """
-    exporter = StrategicAnalysisPDFExporter()
-    return exporter.generate_report(analysis_data, output_path)
+    return get_pdf_exporter().generate_report(analysis_data, output_path)
+
+
+def render_pdf(analysis_data: Dict[str, Any]) -> bytes:
+    """
+    Export strategic analysis to PDF bytes (no file I/O)
+    
+    Args:
+        analysis_data: Strategic analysis data dictionary
+        
+    Returns:
+        PDF document bytes
+    """
+    return get_pdf_exporter().render(analysis_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,427 @@
+"""
+Portfolio Percentile Benchmarks for UPLINK 5.0
+Where a project's ICI, IRL and ICI dimensions rank within its sector and stage
+
+PortfolioBenchmarks keeps one score distribution per metric for each cohort:
+(sector, stage), (sector, any stage), (any sector, stage) and the whole
+portfolio. Distributions are updated incrementally as analyses are produced.
+A project without a sector or stage only joins the cohorts that span all
+sectors or stages, and a project id is counted once however often the
+project is re-analyzed.
+Small cohorts are exact sorted arrays. New scores go to a short sorted
+buffer that is merged into the array once it holds about sqrt(n) scores, so
+recording costs amortized O(sqrt(n)) instead of a re-sort per analysis. Once
+a cohort passes `max_exact` values it is compressed into a t-digest. A lookup
+such as "top 15% of fintech seed projects" is then a binary search (O(log n))
+over the sorted values and the buffer, or over the digest centroids, with no
+aggregation over stored analyses.
+"""
+
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Scores tracked per cohort: ICI, IRL and the ICI dimensions from
+# StrategicDashboardGenerator._calculate_ici (its investor_readiness dimension
+# is the IRL score)
+BENCHMARK_METRICS = (
+    "ici_score",
+    "irl_score",
+    "success_probability",
+    "market_fit_score",
+    "execution_readiness",
+    "financial_sustainability"
+)
+
+# Matches any sector or any stage in a cohort key
+ANY = "*"
+
+# Exact sorted values per cohort before switching to a t-digest
+DEFAULT_MAX_EXACT = 50_000
+
+# t-digest compression (more centroids and a closer approximation when higher)
+DEFAULT_COMPRESSION = 200
+
+# Smallest cohort used for a lookup; smaller cohorts fall back to a wider one
+DEFAULT_MIN_COHORT = 20
+
+# Pending scores always allowed before merging (the limit grows as sqrt(n))
+MIN_PENDING = 64
+
+CohortKey = Tuple[str, str]
+
+
+class TDigest:
+    """Merging t-digest: bounded-size approximation of a score distribution"""
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer: List[float] = []
+        self._buffer_size = 10 * compression
+        # Interpolation knots (value -> cumulative weight), rebuilt after merging
+        self._knot_values = np.empty(0)
+        self._knot_weights = np.empty(0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float):
+        self._buffer.append(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self._buffer_size:
+            self._merge()
+
+    def extend(self, values: Iterable[float]):
+        values = [float(value) for value in values]
+        if not values:
+            return
+        self._buffer.extend(values)
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        if len(self._buffer) >= self._buffer_size:
+            self._merge()
+
+    def percentile(self, value: float) -> float:
+        """Approximate percentile rank (0-100) of `value`"""
+        self._flush()
+        if self.count == 0:
+            return math.nan
+        return 100.0 * float(np.interp(value, self._knot_values, self._knot_weights)) / self.count
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0-1)"""
+        self._flush()
+        if self.count == 0:
+            return math.nan
+        return float(np.interp(q * self.count, self._knot_weights, self._knot_values))
+
+    def _flush(self):
+        if self._buffer:
+            self._merge()
+
+    def _merge(self):
+        values = np.concatenate((self._means, self._buffer))
+        weights = np.concatenate((self._weights, np.ones(len(self._buffer))))
+        self._buffer = []
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+
+        total = weights.sum()
+        means: List[float] = []
+        sizes: List[float] = []
+        cumulative = 0.0
+        mean, size = values[0], weights[0]
+        for value, weight in zip(values[1:].tolist(), weights[1:].tolist()):
+            q = (cumulative + (size + weight) / 2) / total
+            # Centroids near the tails stay small; the middle ones may grow
+            if size + weight <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                mean += (value - mean) * weight / (size + weight)
+                size += weight
+            else:
+                means.append(mean)
+                sizes.append(size)
+                cumulative += size
+                mean, size = value, weight
+        means.append(mean)
+        sizes.append(size)
+
+        self._means = np.array(means)
+        self._weights = np.array(sizes)
+        centers = np.cumsum(self._weights) - self._weights / 2
+        self._knot_values = np.concatenate(([self.min], self._means, [self.max]))
+        self._knot_weights = np.concatenate(([0.0], centers, [total]))
+
+
+class ScoreDistribution:
+    """Sorted scores for one metric and cohort; a TDigest once it grows past `max_exact`"""
+
+    def __init__(self, max_exact: int = DEFAULT_MAX_EXACT, compression: int = DEFAULT_COMPRESSION):
+        self.max_exact = max_exact
+        self.compression = compression
+        self._sorted = np.empty(0)
+        # Scores not yet merged into _sorted, kept sorted
+        self._pending: List[float] = []
+        self.digest: Optional[TDigest] = None
+
+    def __len__(self) -> int:
+        if self.digest is not None:
+            return len(self.digest)
+        return self._sorted.size + len(self._pending)
+
+    @property
+    def exact(self) -> bool:
+        return self.digest is None
+
+    def add(self, value: float):
+        if self.digest is not None:
+            self.digest.add(value)
+            return
+        insort(self._pending, float(value))
+        self._settle()
+
+    def extend(self, values: Iterable[float]):
+        if self.digest is not None:
+            self.digest.extend(values)
+            return
+        self._pending.extend(float(value) for value in values)
+        self._pending.sort()
+        self._settle()
+
+    def percentile(self, value: float) -> float:
+        """Percentile rank (0-100): share of scores below `value`, counting ties as half"""
+        if self.digest is not None:
+            return self.digest.percentile(value)
+        size = len(self)
+        if size == 0:
+            return math.nan
+        below = int(np.searchsorted(self._sorted, value, side="left")) + bisect_left(self._pending, value)
+        at_or_below = int(np.searchsorted(self._sorted, value, side="right")) + bisect_right(self._pending, value)
+        return 100.0 * (below + at_or_below) / (2 * size)
+
+    def quantile(self, q: float) -> float:
+        """Score at quantile q (0-1)"""
+        if self.digest is not None:
+            return self.digest.quantile(q)
+        values = self._values()
+        if values.size == 0:
+            return math.nan
+        return float(np.quantile(values, q))
+
+    def _settle(self):
+        """Compress past max_exact; merge the buffer once it outgrows sqrt(n)"""
+        if len(self) > self.max_exact:
+            self._compress()
+        elif len(self._pending) > max(MIN_PENDING, math.isqrt(self._sorted.size)):
+            self._values()
+
+    def _values(self) -> np.ndarray:
+        if self._pending:
+            # Two sorted runs: the stable sort merges them in linear time
+            merged = np.concatenate((self._sorted, np.asarray(self._pending, dtype=float)))
+            merged.sort(kind="stable")
+            self._sorted = merged
+            self._pending = []
+        return self._sorted
+
+    def _compress(self):
+        digest = TDigest(self.compression)
+        digest.extend(self._values().tolist())
+        self.digest = digest
+        self._sorted = np.empty(0)
+
+
+class PortfolioBenchmarks:
+    """Percentile ranks of portfolio scores by sector and stage, updated per analysis"""
+
+    def __init__(
+        self,
+        metrics: Sequence[str] = BENCHMARK_METRICS,
+        max_exact: int = DEFAULT_MAX_EXACT,
+        compression: int = DEFAULT_COMPRESSION,
+        min_cohort: int = DEFAULT_MIN_COHORT
+    ):
+        self.metrics = tuple(metrics)
+        self.max_exact = max_exact
+        self.compression = compression
+        self.min_cohort = min_cohort
+        self._cohorts: Dict[CohortKey, Dict[str, ScoreDistribution]] = {}
+        # Project ids already recorded (re-analyses are not counted again)
+        self._recorded: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        sector: Optional[str],
+        stage: Optional[str],
+        scores: Mapping[str, float],
+        project_id: Optional[str] = None
+    ) -> bool:
+        """
+        Add one project's scores to its cohorts (missing metrics are skipped)
+
+        A None sector or stage records into the cohorts spanning all of them
+        only. Returns False (and records nothing) when project_id was
+        already recorded.
+        """
+        values = {metric: float(scores[metric]) for metric in self.metrics if scores.get(metric) is not None}
+        with self._lock:
+            if project_id is not None:
+                if project_id in self._recorded:
+                    return False
+                self._recorded.add(project_id)
+            for key in self._cohort_keys(sector, stage):
+                cohort = self._cohort(key)
+                for metric, value in values.items():
+                    cohort[metric].add(value)
+        return True
+
+    def record_many(self, sectors: Sequence[str], stages: Sequence[str], scores: Mapping[str, Sequence[float]]):
+        """
+        Add a whole portfolio at once
+
+        Args:
+            sectors, stages: One entry per project
+            scores: metric -> one score per project (metrics not in self.metrics are ignored)
+        """
+        n = len(sectors)
+        if len(stages) != n:
+            raise ValueError("sectors and stages must have the same length")
+        columns = {}
+        for metric in self.metrics:
+            if metric in scores:
+                column = np.asarray(scores[metric], dtype=float)
+                if column.shape != (n,):
+                    raise ValueError(f"{metric}: expected {n} scores, got shape {column.shape}")
+                columns[metric] = column
+
+        groups: Dict[CohortKey, List[int]] = {}
+        for i, (sector, stage) in enumerate(zip(sectors, stages)):
+            for key in self._cohort_keys(sector, stage):
+                groups.setdefault(key, []).append(i)
+
+        with self._lock:
+            for key, rows in groups.items():
+                cohort = self._cohort(key)
+                for metric, column in columns.items():
+                    values = column[rows]
+                    cohort[metric].extend(values[~np.isnan(values)].tolist())
+
+    def lookup(
+        self,
+        sector: Optional[str],
+        stage: Optional[str],
+        scores: Mapping[str, float],
+        min_cohort: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Percentile of each score within the narrowest cohort holding at least
+        `min_cohort` projects: (sector, stage), then the sector, the stage and
+        the whole portfolio (None = unknown sector / stage, skipping the
+        cohorts that need it)
+
+        Returns:
+            {'cohort': {'sector', 'stage', 'size'} or None (no data yet),
+             'metrics': {metric: {'value', 'percentile', 'top_percent'}}}
+            where sector/stage are None when the cohort spans all of them and
+            top_percent is the "top X%" band (1-100) the score falls in
+        """
+        min_cohort = self.min_cohort if min_cohort is None else min_cohort
+        with self._lock:
+            key, cohort = self._select_cohort(sector, stage, min_cohort)
+            if cohort is None:
+                return {"cohort": None, "metrics": {}}
+
+            metrics = {}
+            for metric in self.metrics:
+                value = scores.get(metric)
+                if value is None or len(cohort[metric]) == 0:
+                    continue
+                percentile = cohort[metric].percentile(float(value))
+                metrics[metric] = {
+                    "value": float(value),
+                    "percentile": percentile,
+                    "top_percent": min(100, max(1, math.ceil(100 - percentile)))
+                }
+            size = max(len(distribution) for distribution in cohort.values())
+
+        return {
+            "cohort": {
+                "sector": None if key[0] == ANY else key[0],
+                "stage": None if key[1] == ANY else key[1],
+                "size": size
+            },
+            "metrics": metrics
+        }
+
+    def summary(
+        self,
+        sector: Optional[str] = None,
+        stage: Optional[str] = None,
+        quantiles: Sequence[float] = (0.25, 0.5, 0.75, 0.85, 0.9)
+    ) -> Dict[str, Any]:
+        """Size and score quantiles of one cohort (None = any sector / stage)"""
+        key = (sector or ANY, stage or ANY)
+        with self._lock:
+            cohort = self._cohorts.get(key)
+            if cohort is None:
+                return {"sector": sector, "stage": stage, "size": 0, "metrics": {}}
+            return {
+                "sector": sector,
+                "stage": stage,
+                "size": max(len(distribution) for distribution in cohort.values()),
+                "metrics": {
+                    metric: {
+                        "count": len(distribution),
+                        "exact": distribution.exact,
+                        "quantiles": {f"p{q * 100:g}": distribution.quantile(q) for q in quantiles}
+                    }
+                    for metric, distribution in cohort.items()
+                    if len(distribution)
+                }
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cohorts": len(self._cohorts),
+                "projects": max(
+                    (len(d) for d in self._cohorts.get((ANY, ANY), {}).values()),
+                    default=0
+                ),
+                "digest_cohorts": sum(
+                    1 for cohort in self._cohorts.values()
+                    if any(not d.exact for d in cohort.values())
+                )
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cohorts.clear()
+            self._recorded.clear()
+
+    def _cohort_keys(self, sector: Optional[str], stage: Optional[str]) -> Tuple[CohortKey, ...]:
+        sector = sector or ANY
+        stage = stage or ANY
+        return tuple(dict.fromkeys(((sector, stage), (sector, ANY), (ANY, stage), (ANY, ANY))))
+
+    def _cohort(self, key: CohortKey) -> Dict[str, ScoreDistribution]:
+        cohort = self._cohorts.get(key)
+        if cohort is None:
+            cohort = {
+                metric: ScoreDistribution(self.max_exact, self.compression)
+                for metric in self.metrics
+            }
+            self._cohorts[key] = cohort
+        return cohort
+
+    def _select_cohort(
+        self,
+        sector: Optional[str],
+        stage: Optional[str],
+        min_cohort: int
+    ) -> Tuple[CohortKey, Optional[Dict[str, ScoreDistribution]]]:
+        for key in self._cohort_keys(sector, stage):
+            cohort = self._cohorts.get(key)
+            if cohort is not None and max(len(d) for d in cohort.values()) >= min_cohort:
+                return key, cohort
+        # No cohort is large enough yet: rank against the whole portfolio
+        return (ANY, ANY), self._cohorts.get((ANY, ANY))
+
+
+# Global instance
+portfolio_benchmarks = PortfolioBenchmarks()
+
+def get_portfolio_benchmarks() -> PortfolioBenchmarks:
+    """Get the process-wide portfolio benchmarks"""
+    return portfolio_benchmarks
@@ -0,0 +1,302 @@
+"""
+Portfolio IRL Engine for UPLINK 5.0
+Investor Readiness Level for a whole portfolio in one pass of NumPy operations
+
+PortfolioIRLEngine mirrors InvestmentSimulator.calculate_irl over columnar
+features (one array per feature, one row per project): component scores,
+weighted IRL score, grade, investor appeal, recommended investor types,
+valuation range and funding potential. A portfolio of thousands of projects is
+scored and ranked in milliseconds instead of one calculate_irl call per
+project. Eligibility (MIN_CRITERIA_MATCHES) and the valuation multiples
+(VALUATION_INDEX) come from the tables compiled in investment_simulator;
+keep the remaining formulas in sync with the scalar path;
+test_batch_irl_parity.py checks parity project by project.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from investment_simulator import (
+    CRITERIA_ORDER,
+    FALLBACK_INVESTOR_TYPES,
+    InvestorCriteria,
+    MIN_CRITERIA_MATCHES,
+    InvestorType,
+    clean_value,
+    valuation_multiples
+)
+from vectorized_scoring import (
+    ArrayLike,
+    Categorical,
+    DEFAULT_SUCCESS_PROBABILITY,
+    NUMERIC_FEATURE_DEFAULTS,
+    factorize,
+    irl_scores
+)
+
+# Defaults InvestmentSimulator.calculate_irl applies to missing features
+# (everything cleans to 0 except technical_feasibility)
+IRL_FEATURE_DEFAULTS = {name: 0.0 for name in NUMERIC_FEATURE_DEFAULTS}
+IRL_FEATURE_DEFAULTS["technical_feasibility"] = 50.0
+
+# InvestmentSimulator._calculate_irl_grade (lower bound of each grade, ascending)
+IRL_GRADE_THRESHOLDS = np.array([50, 55, 60, 65, 70, 75, 80, 85, 90], dtype=float)
+IRL_GRADES = np.array(["D", "C-", "C", "C+", "B-", "B", "B+", "A-", "A", "A+"], dtype=object)
+
+# InvestmentSimulator._determine_investor_appeal
+APPEAL_THRESHOLDS = np.array([35, 50, 65, 80], dtype=float)
+APPEAL_LEVELS = np.array(["very_low", "low", "medium", "high", "very_high"], dtype=object)
+
+BREAKDOWN_FIELDS = ("traction", "team_quality", "market_size", "technical_feasibility", "financial_health")
+
+
+def criteria_match_counts(
+    breakdown: Mapping[str, np.ndarray],
+    sector: Categorical,
+    stage: Categorical,
+    criteria: Sequence[InvestorCriteria]
+) -> np.ndarray:
+    """
+    How many of the six InvestorCriteria checks each project meets for each
+    investor: the four component thresholds plus the preferred sector and
+    stage, as in InvestmentSimulator._recommend_investor_types
+
+    Returns:
+        (N, len(criteria)) int array
+    """
+    def thresholds(name: str) -> np.ndarray:
+        return np.array([getattr(c, name) for c in criteria], dtype=float)
+
+    n = len(breakdown["traction"])
+    counts = (
+        (breakdown["traction"][:, None] >= thresholds("min_traction")).astype(int) +
+        (breakdown["team_quality"][:, None] >= thresholds("min_team_quality")) +
+        (breakdown["technical_feasibility"][:, None] >= thresholds("min_technical_feasibility")) +
+        (breakdown["financial_health"][:, None] >= thresholds("min_financial_health"))
+    )
+    for keys, attribute in ((sector, "preferred_sectors"), (stage, "preferred_stages")):
+        unique, codes = factorize(np.broadcast_to(np.asarray(keys, dtype=object), (n,)))
+        preferred = np.array(
+            [[key in getattr(c, attribute) for c in criteria] for key in unique],
+            dtype=int
+        ).reshape(len(unique), len(criteria))
+        counts += preferred[codes]
+    return counts
+
+
+def _valuation_columns(
+    sector: Categorical,
+    stage: Categorical,
+    n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (base valuation, sector multiplier, equity percentage) per row, from the
+    compiled VALUATION_INDEX; each distinct (sector, stage) is looked up once
+    """
+    sectors = np.broadcast_to(np.asarray(sector, dtype=object), (n,)).tolist()
+    stages = np.broadcast_to(np.asarray(stage, dtype=object), (n,)).tolist()
+    index: Dict[Tuple[str, str], int] = {}
+    codes = np.fromiter(
+        (index.setdefault(pair, len(index)) for pair in zip(sectors, stages)),
+        dtype=np.intp,
+        count=n
+    )
+    table = np.array([
+        (multiples.base_valuation, multiples.sector_multiplier, multiples.equity_percentage)
+        for multiples in (valuation_multiples(*pair) for pair in index)
+    ], dtype=float).reshape(len(index), 3)
+    rows = table[codes]
+    return rows[:, 0], rows[:, 1], rows[:, 2]
+
+
+@dataclass
+class PortfolioIRL:
+    """IRL results for N projects (every array has length N)"""
+    project_ids: List[Any]
+    irl_score: np.ndarray
+    irl_grade: np.ndarray
+    investor_appeal: np.ndarray
+    breakdown: Dict[str, np.ndarray]
+    investor_matches: np.ndarray  # (N, len(CRITERIA_ORDER)) bool
+    valuation_min: np.ndarray
+    valuation_max: np.ndarray
+    funding_min: np.ndarray
+    funding_max: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.irl_score)
+
+    def recommended_investor_types(self, index: int) -> List[InvestorType]:
+        """Same list (and order) as InvestmentSimulator._recommend_investor_types"""
+        matched = [
+            criteria.investor_type
+            for criteria, match in zip(CRITERIA_ORDER, self.investor_matches[index])
+            if match
+        ]
+        return matched or list(FALLBACK_INVESTOR_TYPES)
+
+    def ranking(self, top: Optional[int] = None) -> np.ndarray:
+        """Row indices by IRL score, highest first (ties keep portfolio order)"""
+        order = np.argsort(-self.irl_score, kind="stable")
+        return order[:top] if top is not None else order
+
+    def to_records(self, indices: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """JSON-ready rows (all projects, or the given indices in that order)"""
+        if indices is None:
+            indices = range(len(self))
+        records = []
+        for i in indices:
+            i = int(i)
+            records.append({
+                "project_id": self.project_ids[i],
+                "irl_score": float(self.irl_score[i]),
+                "irl_grade": self.irl_grade[i],
+                "investor_appeal": self.investor_appeal[i],
+                "recommended_investors": [t.value for t in self.recommended_investor_types(i)],
+                "valuation_range": {
+                    "min": float(self.valuation_min[i]),
+                    "max": float(self.valuation_max[i])
+                },
+                "funding_potential": {
+                    "min": float(self.funding_min[i]),
+                    "max": float(self.funding_max[i])
+                },
+                "breakdown": {name: float(self.breakdown[name][i]) for name in BREAKDOWN_FIELDS}
+            })
+        return records
+
+
+class PortfolioIRLEngine:
+    """Vectorized InvestmentSimulator.calculate_irl for a whole portfolio"""
+
+    def score(
+        self,
+        columns: Mapping[str, ArrayLike],
+        sector: Categorical = "fintech",
+        organization: Categorical = "startup",
+        stage: Categorical = "seed",
+        success_probability: ArrayLike = DEFAULT_SUCCESS_PROBABILITY,
+        project_ids: Optional[List[Any]] = None
+    ) -> PortfolioIRL:
+        """
+        Score N projects given as columns
+
+        Args:
+            columns: Cleaned numeric features, one array (or scalar) per feature;
+                     missing features use calculate_irl's defaults
+            sector, organization, stage: One value for all rows, or one per row
+            success_probability: 0-100, one value or one per row
+            project_ids: Optional identifiers carried into the records
+
+        Returns:
+            PortfolioIRL
+        """
+        features = {
+            name: np.asarray(columns.get(name, default), dtype=float)
+            for name, default in IRL_FEATURE_DEFAULTS.items()
+        }
+        irl = irl_scores(features, sector, organization, success_probability)
+        shape = np.broadcast_shapes(
+            *(np.shape(v) for v in irl.values()),
+            np.shape(sector), np.shape(organization), np.shape(stage)
+        )
+        n = shape[0] if shape else 1
+
+        def column(value) -> np.ndarray:
+            return np.broadcast_to(np.asarray(value, dtype=float), (n,))
+
+        irl_score = column(irl["irl_score"])
+        breakdown = {name: column(irl[name]) for name in BREAKDOWN_FIELDS}
+
+        base_valuation, sector_multiplier, equity_percentage = _valuation_columns(sector, stage, n)
+        valuation_min, valuation_max = self._valuation_range(
+            irl_score, base_valuation, sector_multiplier, column(features["revenue_growth"])
+        )
+        funding_min, funding_max = self._funding_potential(
+            irl_score, valuation_min, valuation_max, equity_percentage
+        )
+
+        return PortfolioIRL(
+            project_ids=list(project_ids) if project_ids is not None else list(range(n)),
+            irl_score=irl_score,
+            irl_grade=IRL_GRADES[np.searchsorted(IRL_GRADE_THRESHOLDS, irl_score, side="right")],
+            investor_appeal=APPEAL_LEVELS[np.searchsorted(APPEAL_THRESHOLDS, irl_score, side="right")],
+            breakdown=breakdown,
+            investor_matches=criteria_match_counts(breakdown, sector, stage, CRITERIA_ORDER) >= MIN_CRITERIA_MATCHES,
+            valuation_min=valuation_min,
+            valuation_max=valuation_max,
+            funding_min=funding_min,
+            funding_max=funding_max
+        )
+
+    def score_projects(self, projects: List[Dict[str, Any]]) -> PortfolioIRL:
+        """Score raw project dicts the way the Strategic Bridge feeds calculate_irl"""
+        return self.score(**columns_from_projects(projects))
+
+    def _valuation_range(
+        self,
+        irl_score: np.ndarray,
+        base: np.ndarray,
+        sector_multiplier: np.ndarray,
+        revenue_growth: np.ndarray
+    ) -> tuple:
+        """estimate_valuation_range over columns"""
+        irl_multiplier = 0.5 + (irl_score / 100) * 1.5
+        revenue_multiplier = 1.0 + (revenue_growth * 0.5)
+
+        valuation = base * irl_multiplier * sector_multiplier * revenue_multiplier
+        return valuation * 0.7, valuation * 1.3
+
+    def _funding_potential(
+        self,
+        irl_score: np.ndarray,
+        valuation_min: np.ndarray,
+        valuation_max: np.ndarray,
+        equity_percentage: np.ndarray
+    ) -> tuple:
+        """estimate_funding_potential over columns"""
+        min_funding = valuation_min * equity_percentage
+        max_funding = valuation_max * equity_percentage
+
+        low, high = irl_score < 50, irl_score > 80
+        min_funding = min_funding * np.select([low, high], [0.5, 1.2], default=1.0)
+        max_funding = max_funding * np.select([low, high], [0.7, 1.5], default=1.0)
+        return min_funding, max_funding
+
+
+def columns_from_projects(projects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Columnar inputs for PortfolioIRLEngine.score from raw project dicts
+
+    Applies the Strategic Bridge defaults (NUMERIC_FEATURE_DEFAULTS, fintech /
+    startup / seed, success probability 50) and cleans values like "45%".
+    """
+    columns = {
+        name: np.fromiter(
+            (clean_value(p.get(name, default)) for p in projects),
+            dtype=float,
+            count=len(projects)
+        )
+        for name, default in NUMERIC_FEATURE_DEFAULTS.items()
+    }
+    return {
+        "columns": columns,
+        "sector": np.array([p.get("sector", "fintech") for p in projects], dtype=object),
+        "organization": np.array([p.get("organization", "startup") for p in projects], dtype=object),
+        "stage": np.array([p.get("stage", "seed") for p in projects], dtype=object),
+        "success_probability": np.array(
+            [clean_value(p.get("success_probability", DEFAULT_SUCCESS_PROBABILITY)) for p in projects],
+            dtype=float
+        ),
+        "project_ids": [p.get("id", p.get("idea_id", i)) for i, p in enumerate(projects)]
+    }
+
+
+# Global instance
+portfolio_irl_engine = PortfolioIRLEngine()
+
+def get_portfolio_irl_engine() -> PortfolioIRLEngine:
+    """Get the process-wide portfolio IRL engine"""
+    return portfolio_irl_engine
@@ -0,0 +1,112 @@
+"""
+Analysis Result Serializer for UPLINK 5.0
+One pass from a StrategicAnalysisResult (or any slotted result dataclass) to JSON bytes
+
+FastAPI encodes a returned dataclass by calling dataclasses.asdict, which
+deep-copies the whole tree. It then walks the copy again in jsonable_encoder
+before json.dumps makes a third pass. dumps() serializes the result tree in
+one pass instead:
+
+- orjson (when installed) reads dataclasses, enums, tuples and NumPy values
+  natively, so nothing is copied on the Python side;
+- otherwise the json module's C encoder walks the tree and only calls back
+  into Python for dataclasses (a shallow field dict), enums and NumPy values.
+
+Both paths produce compact UTF-8 JSON, the same document FastAPI would send,
+and agree on the values plain JSON cannot represent:
+
+- NaN and Infinity are written as null (orjson's behavior; the json module
+  would otherwise raise);
+- int, float, bool and None dict keys are written as strings ("1", "true",
+  "null"), as the json module does;
+- dates and times are written in ISO 8601, and any other unknown type as
+  str(obj), as /analyze/stream did with default=str.
+"""
+
+import dataclasses
+import datetime
+import json
+import logging
+import math
+from enum import Enum
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# Optional: fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("⚠️ orjson not installed - analysis results are serialized with the json module")
+
+# Field names per dataclass type, resolved once
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = tuple(field.name for field in dataclasses.fields(cls))
+        _FIELD_NAMES[cls] = names
+    return names
+
+
+def _default(obj: Any) -> Any:
+    """Types the JSON encoders do not handle natively; containers are left to the encoder"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of a tree with NaN and Infinity replaced by None, for the json module path"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, (str, int)) or obj is None:
+        return obj
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return _finite(_default(obj))
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize a result tree to UTF-8 JSON
+
+    Args:
+        obj: StrategicAnalysisResult, a result dataclass or a dict/list of them
+        indent: Pretty-print with two-space indentation
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def encode(tree: Any) -> bytes:
+        return json.dumps(
+            tree,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=2 if indent else None,
+            separators=(",", ": ") if indent else (",", ":")
+        ).encode("utf-8")
+
+    try:
+        return encode(obj)
+    except ValueError as exc:
+        # Results are almost always finite: only copy the tree when they are not
+        if "Out of range float" not in str(exc):
+            raise
+        return encode(_finite(obj))
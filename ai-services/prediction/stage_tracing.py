@@ -0,0 +1,325 @@
+"""
+Lightweight Stage Tracing for UPLINK 5.0
+Span-based tracing for the Strategic Bridge pipeline (analyze_project, the four
+engines and the What-If Simulator)
+
+Each sampled trace records start/end times, parent spans, input sizes and
+cache hits per stage and sub-call. Finished traces are kept in a bounded
+in-memory buffer and can be exported as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+Configuration:
+    STRATEGIC_TRACE_SAMPLE_RATE  fraction of traces recorded (0.0-1.0, default 0)
+    STRATEGIC_TRACE_BUFFER       number of finished traces kept (default 200)
+"""
+
+import os
+import random
+import threading
+import time
+import uuid
+import functools
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Process-wide span ids (next() on itertools.count is atomic under the GIL)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """A single timed stage or sub-call"""
+
+    __slots__ = ("name", "category", "span_id", "parent_id", "start_us", "end_us", "thread_id", "args")
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        args: Optional[Dict[str, Any]] = None,
+        parent: Optional["Span"] = None
+    ):
+        self.name = name
+        self.category = category
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_us = time.perf_counter_ns() // 1000
+        self.end_us = None
+        self.thread_id = threading.get_ident()
+        self.args = dict(args) if args else {}
+
+    def finish(self):
+        self.end_us = time.perf_counter_ns() // 1000
+
+    @property
+    def duration_us(self) -> int:
+        end = self.end_us if self.end_us is not None else time.perf_counter_ns() // 1000
+        return end - self.start_us
+
+
+class Trace:
+    """All spans recorded for one top-level operation"""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+
+class TraceHandle:
+    """Open trace that can be resumed across generator yields or threads"""
+
+    __slots__ = ("trace", "root", "owned")
+
+    def __init__(self, trace: Trace, root: Span, owned: bool):
+        self.trace = trace
+        self.root = root
+        self.owned = owned
+
+
+# (trace, innermost open span) for the current execution context
+_current: ContextVar[Optional[Tuple[Trace, Span]]] = ContextVar("strategic_trace", default=None)
+
+
+class StageTracer:
+    """Sampling span tracer with Chrome trace-event export"""
+
+    def __init__(self, sample_rate: Optional[float] = None, max_traces: Optional[int] = None):
+        if sample_rate is None:
+            sample_rate = float(os.getenv("STRATEGIC_TRACE_SAMPLE_RATE", "0") or 0)
+        if max_traces is None:
+            max_traces = int(os.getenv("STRATEGIC_TRACE_BUFFER", "200") or 200)
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self._finished = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def configure(self, sample_rate: Optional[float] = None, max_traces: Optional[int] = None):
+        """Change the sample rate and/or buffer size at runtime"""
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+        if max_traces is not None:
+            with self._lock:
+                self._finished = deque(self._finished, maxlen=max_traces)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @property
+    def active(self) -> bool:
+        """Whether the current context is inside a sampled trace"""
+        return _current.get() is not None
+
+    def begin(self, name: str, force: bool = False, **args) -> Optional[TraceHandle]:
+        """
+        Open a trace (or a child span if a trace is already active)
+
+        Returns None when the trace is not sampled. Use with resume() and end()
+        for code that suspends, such as generators.
+        """
+        current = _current.get()
+        if current is not None:
+            trace, parent = current
+            span = Span(name, "stage", args, parent)
+            return TraceHandle(trace, span, owned=False)
+
+        if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return None
+
+        trace = Trace(name)
+        span = Span(name, "trace", args)
+        span.args["trace_id"] = trace.trace_id
+        return TraceHandle(trace, span, owned=True)
+
+    @contextmanager
+    def resume(self, handle: Optional[TraceHandle]) -> Iterator[None]:
+        """Make an open trace current for the duration of the block"""
+        if handle is None:
+            yield
+            return
+        token = _current.set((handle.trace, handle.root))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def end(self, handle: Optional[TraceHandle], **args):
+        """Close a handle returned by begin()"""
+        if handle is None:
+            return
+        handle.root.args.update(args)
+        handle.root.finish()
+        handle.trace.add(handle.root)
+        if handle.owned:
+            with self._lock:
+                self._finished.append(handle.trace)
+
+    @contextmanager
+    def trace(self, name: str, force: bool = False, **args) -> Iterator[Optional[TraceHandle]]:
+        """Trace a block of synchronous code"""
+        handle = self.begin(name, force=force, **args)
+        try:
+            with self.resume(handle):
+                yield handle
+        finally:
+            self.end(handle)
+
+    @contextmanager
+    def stage(self, handle: Optional[TraceHandle], name: str, **args) -> Iterator[Optional[Span]]:
+        """Resume `handle` and record one stage span inside it"""
+        with self.resume(handle), self.span(name, "stage", **args) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args) -> Iterator[Optional[Span]]:
+        """Record a child span; a no-op outside a sampled trace"""
+        current = _current.get()
+        if current is None:
+            yield None
+            return
+        trace, parent = current
+        span = Span(name, category, args, parent)
+        token = _current.set((trace, span))
+        try:
+            yield span
+        finally:
+            _current.reset(token)
+            span.finish()
+            trace.add(span)
+
+    @contextmanager
+    def capture(self, name: str, **args) -> Iterator[TraceHandle]:
+        """
+        Record a trace regardless of sampling, without buffering it
+
+        For work done on behalf of a traced caller in another process: the
+        spans in handle.trace.spans are sent back and passed to adopt().
+        """
+        trace = Trace(name)
+        handle = TraceHandle(trace, Span(name, "stage", args), owned=False)
+        try:
+            with self.resume(handle):
+                yield handle
+        finally:
+            self.end(handle)
+
+    def adopt(self, spans: List[Span]):
+        """
+        Attach spans recorded by capture() to the innermost open span
+
+        Spans get fresh ids so they cannot collide with this process's. Start
+        times are comparable only where perf_counter is a system-wide clock
+        (as on Linux and macOS).
+        """
+        current = _current.get()
+        if current is None or not spans:
+            return
+        trace, parent = current
+        ids = {span.span_id: next(_span_ids) for span in spans}
+        for span in spans:
+            span.span_id = ids[span.span_id]
+            span.parent_id = ids.get(span.parent_id, parent.span_id)
+            trace.add(span)
+
+    def annotate(self, **args):
+        """Attach attributes (e.g. cache_hit=True) to the innermost open span"""
+        current = _current.get()
+        if current is not None:
+            current[1].args.update(args)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def recent_traces(self, limit: Optional[int] = None) -> List[Trace]:
+        """Most recent finished traces, newest last"""
+        with self._lock:
+            traces = list(self._finished)
+        return traces[-limit:] if limit else traces
+
+    def clear(self):
+        with self._lock:
+            self._finished.clear()
+
+    def export_chrome_trace(self, traces: Optional[List[Trace]] = None) -> Dict[str, Any]:
+        """
+        Export traces as Chrome trace-event JSON ("X" complete events)
+
+        Args:
+            traces: Traces to export (default: all buffered traces)
+        """
+        if traces is None:
+            traces = self.recent_traces()
+
+        pid = os.getpid()
+        events = []
+        for trace in traces:
+            # Spans created in the same microsecond keep creation (parent-first) order
+            for span in sorted(trace.spans, key=lambda s: (s.start_us, s.span_id)):
+                args = dict(span.args)
+                args.setdefault("trace_id", trace.trace_id)
+                args["span_id"] = span.span_id
+                if span.parent_id is not None:
+                    args["parent_id"] = span.parent_id
+                events.append({
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_us,
+                    "dur": span.duration_us,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _input_sizes(func: Callable, call_args: tuple, call_kwargs: Dict[str, Any]) -> Dict[str, int]:
+    """len() of every sized, non-string argument (recorded only when sampled)"""
+    names = func.__code__.co_varnames[:func.__code__.co_argcount]
+    sizes = {}
+    for name, value in list(zip(names, call_args)) + list(call_kwargs.items()):
+        if name == "self" or isinstance(value, (str, bytes)):
+            continue
+        try:
+            sizes[name] = len(value)
+        except TypeError:
+            continue
+    return sizes
+
+
+def traced(name: Optional[str] = None, category: str = "call"):
+    """
+    Decorator recording a span per call when the caller is inside a sampled trace
+
+    The span is named after the function unless `name` is given, and records
+    the len() of sized arguments as input sizes.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, category, **_input_sizes(func, args, kwargs)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# Global instance
+tracer = StageTracer()
+
+def get_tracer() -> StageTracer:
+    """Get the process-wide tracer"""
+    return tracer
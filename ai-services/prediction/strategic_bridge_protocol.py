@@ -8,17 +8,39 @@ Version: 1.0
 """
 
 import json
-from typing import Dict, List, Any, Optional
+import logging
+from typing import Dict, Iterable, List, Any, Optional, Iterator, Tuple
 from dataclasses import dataclass, asdict
 
 # استيراد المكونات
-from ceo_insights_engine import CEOInsightsEngine
+from ceo_insights_engine import CEOInsightsEngine, SECTOR_TRANSLATIONS
 from actionable_roadmap_engine import ActionableRoadmapEngine
-from investment_simulator import InvestmentSimulator
+from investment_simulator import InvestmentSimulator, clean_value
 from strategic_dashboard_generator import StrategicDashboardGenerator
+from stage_tracing import tracer, traced
+from feature_overlay import FeatureOverlay
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+# مراحل التحليل بترتيب تنفيذها (تُستخدم في البث التدريجي عبر SSE)
+ANALYSIS_STAGES = (
+    "ceo_insights",
+    "actionable_roadmap",
+    "investor_readiness",
+    "strategic_dashboard",
+    "summary"
+)
+
+# الحقول الرقمية التي يتم تنظيفها قبل التحليل
+NUMERIC_FIELDS = (
+    "budget", "team_size", "market_demand", "technical_feasibility",
+    "hypothesis_validation_rate", "rat_completion_rate", "user_count",
+    "revenue_growth", "user_engagement", "market_share", "roi"
+)
+
+
+@dataclass(slots=True)
 class StrategicAnalysisResult:
     """نتيجة التحليل الاستراتيجي الكامل"""
     project_id: str
@@ -40,6 +62,8 @@ class StrategicAnalysisResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """تحويل النتيجة إلى قاموس"""
+        # مؤشر ICI وأبعاده محفوظة داخل strategic_dashboard['ici']
+        ici = self.strategic_dashboard.get('ici', {})
         return {
             'project_id': self.project_id,
             'project_title': self.project_title,
@@ -52,10 +76,16 @@ class StrategicAnalysisResult:
             'generated_at': self.generated_at,
             'version': self.version,
             # إضافة الحقول المطلوبة للمحاكاة
-            'ici_score': self.strategic_dashboard.get('ici_score', 0),
+            'ici_score': ici.get('ici_score', 0),
             'irl_score': self.investor_readiness.get('irl_score', 0),
-            'success_probability': self.strategic_dashboard.get('success_probability', 0),
-            'dimensions': self.strategic_dashboard.get('dimensions', {})
+            'success_probability': ici.get('success_probability', 0),
+            'dimensions': {
+                'success_probability': ici.get('success_probability', 0) * 100,
+                'market_fit': ici.get('market_fit_score', 0),
+                'execution_readiness': ici.get('execution_readiness', 0),
+                'investor_readiness': ici.get('investor_readiness', 0),
+                'financial_sustainability': ici.get('financial_sustainability', 0)
+            }
         }
 
 
@@ -70,47 +100,45 @@ class StrategicBridgeProtocol:
     4. Strategic Dashboard Generator - لوحة التحكم الاستراتيجية + ICI
     """
     
-    def __init__(self):
+    def __init__(self, model_runtime=None):
+        """
+        Args:
+            model_runtime: ModelRuntime مشترك (اختياري) لحساب قيم SHAP واحتمالية
+                النجاح من النموذج المدرب بدلاً من القيم الافتراضية
+        """
+        self.model_runtime = model_runtime
         self.ceo_engine = CEOInsightsEngine()
         self.roadmap_engine = ActionableRoadmapEngine()
         self.investment_simulator = InvestmentSimulator()
         self.dashboard_generator = StrategicDashboardGenerator()
+        # PortfolioBenchmarks (اختياري) لترتيب المشروع مئينياً ضمن قطاعه ومرحلته
+        self.portfolio_benchmarks = None
         self.version = "1.0"
     
     def _clean_value(self, value: Any) -> float:
         """تنظيف القيم - تحويل النصوص إلى أرقام"""
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            # إزالة علامة %
-            has_percent = "%" in value
-            value = value.replace("%", "").strip()
-            try:
-                num = float(value)
-                return num / 100 if has_percent else num
-            except:
-                return 0.0
-        return 0.0
+        return clean_value(value)
     
     def _clean_all_features(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """تنظيف جميع القيم الرقمية في بيانات المشروع"""
-        numeric_fields = [
-            "budget", "team_size", "market_demand", "technical_feasibility",
-            "hypothesis_validation_rate", "rat_completion_rate", "user_count",
-            "revenue_growth", "user_engagement", "market_share", "roi"
-        ]
-        
-        cleaned_data = project_data.copy()
-        for field in numeric_fields:
-            if field in cleaned_data:
-                cleaned_data[field] = self._clean_value(cleaned_data[field])
+        """
+        تنظيف جميع القيم الرقمية في بيانات المشروع
         
-        return cleaned_data
+        تُعاد طبقة FeatureOverlay فوق البيانات الأصلية تحتوي على الحقول المنظفة فقط
+        (بدون نسخ القاموس كاملاً، ولا تُعدَّل البيانات الأصلية)
+        """
+        cleaned_fields = {
+            field: self._clean_value(project_data[field])
+            for field in NUMERIC_FIELDS
+            if field in project_data
+        }
+        return FeatureOverlay(project_data, cleaned_fields)
     
     def analyze_project(
         self,
         project_data: Dict[str, Any],
-        shap_values: Optional[Dict[str, float]] = None
+        shap_values: Optional[Dict[str, float]] = None,
+        visualizations: Optional[Iterable[str]] = None,
+        benchmark: bool = False
     ) -> StrategicAnalysisResult:
         """
         تحليل استراتيجي شامل للمشروع
@@ -118,67 +146,188 @@ class StrategicBridgeProtocol:
         Args:
             project_data: بيانات المشروع الكاملة
             shap_values: قيم SHAP (اختياري - سيتم حسابها إذا لم تُقدَّم)
+            visualizations: تصورات لوحة التحكم المطلوبة (None = جميعها)
+            benchmark: ترتيب المشروع ضمن المحفظة وإضافته إليها
+                (عند ربط portfolio_benchmarks فقط)
             
         Returns:
             StrategicAnalysisResult: النتيجة الكاملة
         """
-        print("🚀 بدء التحليل الاستراتيجي الشامل...")
-        
-        # تنظيف جميع القيم الرقمية أولاً
-        project_data = self._clean_all_features(project_data)
-        
-        # المرحلة 1: CEO Insights
-        print("\n📊 المرحلة 1/4: توليد CEO Insights...")
-        ceo_insights = self._generate_ceo_insights(project_data, shap_values)
-        
-        # المرحلة 2: Actionable Roadmap
-        print("🗺️  المرحلة 2/4: بناء Actionable Roadmap...")
-        roadmap = self._generate_roadmap(project_data, ceo_insights)
-        
-        # المرحلة 3: Investment Simulator
-        print("💰 المرحلة 3/4: محاكاة السيناريوهات الاستثمارية...")
-        irl, scenarios = self._simulate_investment(project_data)
-        
-        # المرحلة 4: Strategic Dashboard
-        print("📈 المرحلة 4/4: توليد Strategic Dashboard...")
-        dashboard = self._generate_dashboard(
-            project_data,
-            ceo_insights,
-            roadmap,
-            irl,
-            scenarios
-        )
-        
-        # توليد الملخص التنفيذي
-        executive_summary = self._generate_final_summary(
-            project_data,
-            ceo_insights,
-            irl,
-            dashboard
-        )
-        
-        # استخراج التوصيات الرئيسية
-        key_recommendations = self._extract_key_recommendations(
-            ceo_insights,
-            roadmap,
-            dashboard
-        )
+        stages = {}
+        for stage_name, payload in self.iter_analysis_stages(
+            project_data, shap_values, visualizations, benchmark
+        ):
+            stages[stage_name] = payload
         
-        print("\n✅ التحليل الاستراتيجي مكتمل!")
+        return self.result_from_stages(project_data, stages)
+    
+    def result_from_stages(
+        self,
+        project_data: Dict[str, Any],
+        stages: Dict[str, Dict[str, Any]]
+    ) -> StrategicAnalysisResult:
+        """
+        تجميع النتيجة الكاملة من مخرجات iter_analysis_stages
         
+        Args:
+            project_data: بيانات المشروع الكاملة
+            stages: اسم المرحلة ← نتيجتها (جميع مراحل ANALYSIS_STAGES)
+        """
         return StrategicAnalysisResult(
             project_id=project_data.get("id", "unknown"),
             project_title=project_data.get("title", "مشروع غير معروف"),
-            ceo_insights=ceo_insights,
-            actionable_roadmap=roadmap,
-            investor_readiness=irl,
-            strategic_dashboard=dashboard,
-            executive_summary=executive_summary,
-            key_recommendations=key_recommendations,
+            ceo_insights=stages["ceo_insights"],
+            actionable_roadmap=stages["actionable_roadmap"],
+            investor_readiness=stages["investor_readiness"]["investor_readiness"],
+            strategic_dashboard=stages["strategic_dashboard"],
+            executive_summary=stages["summary"]["executive_summary"],
+            key_recommendations=stages["summary"]["key_recommendations"],
             generated_at="2026-01-31",
             version=self.version
         )
     
+    def iter_analysis_stages(
+        self,
+        project_data: Dict[str, Any],
+        shap_values: Optional[Dict[str, float]] = None,
+        visualizations: Optional[Iterable[str]] = None,
+        benchmark: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        تنفيذ التحليل مرحلةً بمرحلة وإرجاع نتيجة كل مرحلة فور جاهزيتها
+        
+        المراحل بالترتيب (ANALYSIS_STAGES):
+        ceo_insights → actionable_roadmap → investor_readiness → strategic_dashboard → summary
+        
+        Args:
+            project_data: بيانات المشروع الكاملة
+            shap_values: قيم SHAP (اختياري)
+            visualizations: تصورات لوحة التحكم المطلوبة (None = جميعها)
+            benchmark: ترتيب المشروع ضمن المحفظة وإضافته إليها
+                (عند ربط portfolio_benchmarks فقط)
+            
+        Yields:
+            (اسم المرحلة، نتيجة المرحلة)
+        """
+        handle = tracer.begin(
+            "analyze_project",
+            project_id=str(project_data.get("id", "unknown")),
+            input_fields=len(project_data)
+        )
+        try:
+            # تنظيف جميع القيم الرقمية أولاً
+            with tracer.stage(handle, "clean_features"):
+                project_data = self._clean_all_features(project_data)
+                
+                # قيم SHAP واحتمالية النجاح من النموذج المدرب (إن توفر)
+                if shap_values is None:
+                    shap_values = self._apply_model_explanation(project_data)
+            
+            # المرحلة 1: CEO Insights
+            with tracer.stage(handle, "stage:ceo_insights", shap_values=len(shap_values or {})):
+                ceo_insights = self._generate_ceo_insights(project_data, shap_values)
+            yield "ceo_insights", ceo_insights
+            
+            # المرحلة 2: Actionable Roadmap
+            with tracer.stage(handle, "stage:actionable_roadmap",
+                              insights=len(ceo_insights.get("critical_insights", []))):
+                roadmap = self._generate_roadmap(project_data, ceo_insights)
+            yield "actionable_roadmap", roadmap
+            
+            # المرحلة 3: Investment Simulator
+            with tracer.stage(handle, "stage:investor_readiness"):
+                irl, scenarios = self._simulate_investment(project_data)
+            yield "investor_readiness", {
+                "investor_readiness": irl,
+                "investment_scenarios": scenarios
+            }
+            
+            # المرحلة 4: Strategic Dashboard
+            with tracer.stage(handle, "stage:strategic_dashboard", scenarios=len(scenarios)):
+                dashboard = self._generate_dashboard(
+                    project_data,
+                    ceo_insights,
+                    roadmap,
+                    irl,
+                    scenarios,
+                    visualizations
+                )
+                if benchmark and self.portfolio_benchmarks is not None:
+                    dashboard["benchmarks"] = self._benchmark_project(project_data, dashboard)
+            yield "strategic_dashboard", dashboard
+            
+            # الملخص التنفيذي والتوصيات الرئيسية
+            with tracer.stage(handle, "stage:summary"):
+                executive_summary = self._generate_final_summary(
+                    project_data,
+                    ceo_insights,
+                    irl,
+                    dashboard
+                )
+                key_recommendations = self._extract_key_recommendations(
+                    ceo_insights,
+                    roadmap,
+                    dashboard
+                )
+            yield "summary", {
+                "executive_summary": executive_summary,
+                "key_recommendations": key_recommendations
+            }
+        finally:
+            tracer.end(handle)
+    
+    def analyze_projects(
+        self,
+        projects: List[Dict[str, Any]]
+    ) -> List[StrategicAnalysisResult]:
+        """
+        تحليل عدة مشاريع مع حساب قيم SHAP والاحتمالات دفعة واحدة من النموذج
+        
+        Args:
+            projects: قائمة بيانات المشاريع
+            
+        Returns:
+            List[StrategicAnalysisResult]: نتيجة لكل مشروع بنفس الترتيب
+        """
+        cleaned = [self._clean_all_features(p) for p in projects]
+        explanations = self._explain_with_model(cleaned)
+        
+        results = []
+        for project_data, explanation in zip(cleaned, explanations):
+            shap_values = None
+            if explanation is not None:
+                shap_values = explanation.shap_values
+                project_data.setdefault("success_probability", explanation.probability * 100)
+            results.append(self.analyze_project(project_data, shap_values))
+        return results
+    
+    def _explain_with_model(self, projects: List[Dict[str, Any]]) -> List[Any]:
+        """حساب قيم SHAP الحقيقية دفعة واحدة (None لكل مشروع إذا لم يتوفر النموذج)"""
+        if self.model_runtime is None or not projects:
+            return [None] * len(projects)
+        try:
+            if not self.model_runtime.available:
+                return [None] * len(projects)
+            return self.model_runtime.explain_batch(projects)
+        except Exception as e:
+            logger.warning(f"⚠️ Model-based SHAP failed, using default values: {e}")
+            return [None] * len(projects)
+    
+    @traced()
+    def _apply_model_explanation(self, project_data: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """
+        حساب قيم SHAP من النموذج لمشروع واحد، وتعبئة احتمالية النجاح إذا لم تُقدَّم
+        
+        Returns:
+            قيم SHAP أو None (سيتم استخدام القيم الافتراضية)
+        """
+        explanation = self._explain_with_model([project_data])[0]
+        if explanation is None:
+            return None
+        project_data.setdefault("success_probability", explanation.probability * 100)
+        return explanation.shap_values
+    
+    @traced()
     def _generate_ceo_insights(
         self,
         project_data: Dict[str, Any],
@@ -215,9 +364,10 @@ class StrategicBridgeProtocol:
         
         return self.ceo_engine.to_dict(insights)
     
+    @traced()
     def _calculate_default_shap_values(self, features: Dict[str, float]) -> Dict[str, float]:
         """حساب قيم SHAP افتراضية بناءً على الميزات"""
-        # قيم افتراضية بسيطة (في الواقع، يجب أن تأتي من نموذج SHAP مدرب)
+        # قيم افتراضية بسيطة تُستخدم فقط عند عدم توفر النموذج المدرب (model_runtime)
         shap_values = {}
         
         # الميزانية
@@ -265,6 +415,7 @@ class StrategicBridgeProtocol:
         
         return shap_values
     
+    @traced()
     def _generate_roadmap(
         self,
         project_data: Dict[str, Any],
@@ -272,24 +423,20 @@ class StrategicBridgeProtocol:
     ) -> Dict[str, Any]:
         """توليد Actionable Roadmap"""
         # استخراج الرؤى الحرجة
-        insights = ceo_insights.get("insights", [])
+        insights = ceo_insights.get("critical_insights", [])
         critical_insights = [
             i for i in insights
             if i.get("severity") in ["critical", "high"]
         ]
         
-        # توليد خارطة طريق لكل رؤية حرجة
+        # توليد خارطة طريق لكل رؤية حرجة (محفوظة في ذاكرة المحرك لكل مفتاح)
         roadmaps = []
         for insight in critical_insights[:3]:  # أخذ أعلى 3
             roadmap = self.roadmap_engine.generate_roadmap(
-                risk_category=insight.get("category", "general"),
-                risk_description=insight.get("title", ""),
-                current_situation=insight.get("impact", ""),
-                project_context={
-                    "sector": project_data.get("sector", ""),
-                    "stage": project_data.get("stage", "seed"),
-                    "budget": project_data.get("budget", 0)
-                }
+                insight,
+                sector=project_data.get("sector", "fintech"),
+                organization=project_data.get("organization", "startup"),
+                current_stage=project_data.get("stage", "seed")
             )
             roadmaps.append(self.roadmap_engine.to_dict(roadmap))
         
@@ -305,6 +452,7 @@ class StrategicBridgeProtocol:
                 "tactical_moves": []
             }
     
+    @traced()
     def _simulate_investment(
         self,
         project_data: Dict[str, Any]
@@ -346,13 +494,15 @@ class StrategicBridgeProtocol:
             self.investment_simulator.scenarios_to_dict(scenarios)
         )
     
+    @traced()
     def _generate_dashboard(
         self,
         project_data: Dict[str, Any],
         ceo_insights: Dict[str, Any],
         roadmap: Dict[str, Any],
         irl: Dict[str, Any],
-        scenarios: List[Dict[str, Any]]
+        scenarios: List[Dict[str, Any]],
+        visualizations: Optional[Iterable[str]] = None
     ) -> Dict[str, Any]:
         """توليد Strategic Dashboard"""
         dashboard = self.dashboard_generator.generate_dashboard(
@@ -360,11 +510,62 @@ class StrategicBridgeProtocol:
             ceo_insights=ceo_insights,
             roadmap=roadmap,
             irl=irl,
-            scenarios=scenarios
+            scenarios=scenarios,
+            visualizations=visualizations
         )
         
         return self.dashboard_generator.to_dict(dashboard)
     
+    @traced()
+    def _benchmark_project(
+        self,
+        project_data: Dict[str, Any],
+        dashboard: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        الترتيب المئيني لمؤشرات المشروع ضمن مشاريع القطاع والمرحلة نفسها
+        
+        يُحسب الترتيب قبل إضافة المشروع إلى المحفظة حتى لا يُقارَن بنفسه،
+        وإعادة تحليل المشروع نفسه (بمعرّفه) لا تضيفه مرة أخرى
+        """
+        ici = dashboard.get("ici", {})
+        scores = {
+            "ici_score": ici.get("ici_score"),
+            "irl_score": ici.get("investor_readiness"),
+            "success_probability": ici.get("success_probability"),
+            "market_fit_score": ici.get("market_fit_score"),
+            "execution_readiness": ici.get("execution_readiness"),
+            "financial_sustainability": ici.get("financial_sustainability")
+        }
+        # بلا قطاع أو مرحلة يُقارَن المشروع بكل المحفظة، ولا يُحتسب في مجموعة افتراضية
+        sector = project_data.get("sector") or None
+        stage = project_data.get("stage") or None
+        project_id = project_data.get("id")
+        
+        benchmarks = self.portfolio_benchmarks.lookup(sector, stage, scores)
+        self.portfolio_benchmarks.record(
+            sector, stage, scores,
+            project_id=str(project_id) if project_id is not None else None
+        )
+        
+        cohort = benchmarks["cohort"]
+        if cohort is not None:
+            peers = self._format_cohort(cohort["sector"], cohort["stage"])
+            for metric in benchmarks["metrics"].values():
+                metric["label"] = f"ضمن أعلى {metric['top_percent']}% من {peers}"
+        return benchmarks
+    
+    def _format_cohort(self, sector: Optional[str], stage: Optional[str]) -> str:
+        """وصف مجموعة المقارنة، مثل: مشاريع التقنية المالية في مرحلة seed"""
+        if sector is not None and stage is not None:
+            return f"مشاريع {SECTOR_TRANSLATIONS.get(sector, sector)} في مرحلة {stage}"
+        if sector is not None:
+            return f"مشاريع {SECTOR_TRANSLATIONS.get(sector, sector)}"
+        if stage is not None:
+            return f"المشاريع في مرحلة {stage}"
+        return "جميع المشاريع"
+    
+    @traced()
     def _generate_final_summary(
         self,
         project_data: Dict[str, Any],
@@ -442,6 +643,7 @@ class StrategicBridgeProtocol:
         
         return "\n".join([f"- {r}" for r in recommendations[:5]])
     
+    @traced()
     def _extract_key_recommendations(
         self,
         ceo_insights: Dict[str, Any],
@@ -481,7 +683,7 @@ class StrategicBridgeProtocol:
         """حفظ النتيجة في ملف JSON"""
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(self.to_dict(result), f, ensure_ascii=False, indent=2)
-        print(f"✅ تم حفظ النتيجة في: {filepath}")
+        logger.info(f"✅ تم حفظ النتيجة في: {filepath}")
 
 
 # مثال على الاستخدام
@@ -10,9 +10,32 @@ Version: 1.0
 """
 
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from stage_tracing import traced
+
+# أنواع التصورات بترتيب ظهورها في لوحة التحكم
+VISUALIZATION_TYPES = ("gauge", "radar", "timeline", "waterfall", "heatmap")
+
+
+def resolve_visualizations(selection: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    التصورات المطلوبة بالترتيب القياسي (جميعها إذا كان الاختيار None)
+    
+    Raises:
+        ValueError: نوع تصور غير معروف
+    """
+    if selection is None:
+        return VISUALIZATION_TYPES
+    requested = {name.strip() for name in selection if name.strip()}
+    unknown = requested - set(VISUALIZATION_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unknown visualization(s): {', '.join(sorted(unknown))} "
+            f"(expected any of {', '.join(VISUALIZATION_TYPES)})"
+        )
+    return tuple(name for name in VISUALIZATION_TYPES if name in requested)
 
 
 class ConfidenceLevel(Enum):
@@ -24,7 +47,7 @@ class ConfidenceLevel(Enum):
     VERY_LOW = "very_low"  # 0-29
 
 
-@dataclass
+@dataclass(slots=True)
 class InnovationConfidenceIndex:
     """مؤشر الثقة في الابتكار (ICI)"""
     ici_score: float  # 0-100
@@ -47,7 +70,7 @@ class InnovationConfidenceIndex:
     long_term_initiatives: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class DashboardVisualization:
     """تصور لوحة التحكم"""
     viz_type: str  # gauge, radar, timeline, waterfall, heatmap
@@ -57,7 +80,7 @@ class DashboardVisualization:
     recommendations: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategicDashboard:
     """لوحة التحكم الاستراتيجية الكاملة"""
     project_id: str
@@ -85,15 +108,24 @@ class StrategicDashboardGenerator:
     """مولد لوحة التحكم الاستراتيجية"""
     
     def __init__(self):
-        pass
+        # نوع التصور -> دالة بنائه
+        self._visualization_builders = {
+            "gauge": self._build_gauge,
+            "radar": self._build_radar,
+            "timeline": self._build_timeline,
+            "waterfall": self._build_waterfall,
+            "heatmap": self._build_heatmap
+        }
     
+    @traced()
     def generate_dashboard(
         self,
         project_data: Dict[str, Any],
         ceo_insights: Dict[str, Any],
         roadmap: Dict[str, Any],
         irl: Dict[str, Any],
-        scenarios: List[Dict[str, Any]]
+        scenarios: List[Dict[str, Any]],
+        visualizations: Optional[Iterable[str]] = None
     ) -> StrategicDashboard:
         """
         توليد لوحة التحكم الاستراتيجية الكاملة
@@ -104,6 +136,8 @@ class StrategicDashboardGenerator:
             roadmap: خارطة الطريق من Component 2
             irl: IRL من Component 3
             scenarios: السيناريوهات الاستثمارية
+            visualizations: أنواع التصورات المطلوبة من VISUALIZATION_TYPES
+                (None = جميعها)؛ لا تُبنى التصورات غير المطلوبة
             
         Returns:
             StrategicDashboard: لوحة التحكم الكاملة
@@ -111,12 +145,13 @@ class StrategicDashboardGenerator:
         # حساب ICI
         ici = self._calculate_ici(project_data, ceo_insights, irl)
         
-        # توليد التصورات
+        # توليد التصورات المطلوبة فقط
         visualizations = self._generate_visualizations(
             project_data,
             ceo_insights,
             irl,
-            ici
+            ici,
+            resolve_visualizations(visualizations)
         )
         
         # الملخص التنفيذي
@@ -148,6 +183,7 @@ class StrategicDashboardGenerator:
             investment_scenarios=scenarios
         )
     
+    @traced()
     def _calculate_ici(
         self,
         project_data: Dict[str, Any],
@@ -229,6 +265,7 @@ class StrategicDashboardGenerator:
             long_term_initiatives=long_term
         )
     
+    @traced()
     def _calculate_market_fit(
         self,
         project_data: Dict[str, Any],
@@ -248,6 +285,7 @@ class StrategicDashboardGenerator:
         
         return min(100, market_fit)
     
+    @traced()
     def _calculate_execution_readiness(self, project_data: Dict[str, Any]) -> float:
         """حساب جاهزية التنفيذ"""
         team_size = project_data.get("team_size", 0)
@@ -266,6 +304,7 @@ class StrategicDashboardGenerator:
         
         return execution
     
+    @traced()
     def _calculate_financial_sustainability(self, project_data: Dict[str, Any]) -> float:
         """حساب الاستدامة المالية"""
         budget = project_data.get("budget", 0)
@@ -305,6 +344,7 @@ class StrategicDashboardGenerator:
         else:
             return ConfidenceLevel.VERY_LOW
     
+    @traced()
     def _generate_critical_path(
         self,
         ici_score: float,
@@ -371,6 +411,7 @@ class StrategicDashboardGenerator:
         
         return stages
     
+    @traced()
     def _estimate_time_to_success(self, ici_score: float, stage: str) -> str:
         """تقدير الوقت المتوقع للنجاح"""
         # Base timeline حسب المرحلة
@@ -398,6 +439,7 @@ class StrategicDashboardGenerator:
             years = months / 12
             return f"{years:.1f} سنة"
     
+    @traced()
     def _generate_key_milestones(
         self,
         project_data: Dict[str, Any],
@@ -448,6 +490,7 @@ class StrategicDashboardGenerator:
         
         return critical if critical else ["تحسين Product-Market Fit", "تأمين التمويل", "بناء الفريق"]
     
+    @traced()
     def _identify_quick_wins(
         self,
         ceo_insights: Dict[str, Any],
@@ -498,18 +541,27 @@ class StrategicDashboardGenerator:
         
         return initiatives[:4]
     
+    @traced()
     def _generate_visualizations(
         self,
         project_data: Dict[str, Any],
         ceo_insights: Dict[str, Any],
         irl: Dict[str, Any],
-        ici: InnovationConfidenceIndex
+        ici: InnovationConfidenceIndex,
+        selection: Tuple[str, ...] = VISUALIZATION_TYPES
     ) -> List[DashboardVisualization]:
-        """توليد التصورات"""
-        visualizations = []
-        
-        # 1. ICI Gauge
-        visualizations.append(DashboardVisualization(
+        """توليد التصورات المطلوبة"""
+        inputs = {"ceo_insights": ceo_insights, "irl": irl, "ici": ici}
+        return [self._visualization_builders[viz_type](**inputs) for viz_type in selection]
+    
+    def _build_gauge(
+        self,
+        ceo_insights: Dict[str, Any],
+        irl: Dict[str, Any],
+        ici: InnovationConfidenceIndex
+    ) -> DashboardVisualization:
+        """ICI Gauge"""
+        return DashboardVisualization(
             viz_type="gauge",
             title="مؤشر الثقة في الابتكار (ICI)",
             data={
@@ -532,10 +584,16 @@ class StrategicDashboardGenerator:
                 "التركيز على معالجة المخاطر الحرجة",
                 "تحسين جاهزية المستثمر (IRL)"
             ]
-        ))
-        
-        # 2. Radar Chart - الأبعاد الخمسة
-        visualizations.append(DashboardVisualization(
+        )
+    
+    def _build_radar(
+        self,
+        ceo_insights: Dict[str, Any],
+        irl: Dict[str, Any],
+        ici: InnovationConfidenceIndex
+    ) -> DashboardVisualization:
+        """Radar Chart - الأبعاد الخمسة"""
+        return DashboardVisualization(
             viz_type="radar",
             title="الأبعاد الخمسة للابتكار",
             data={
@@ -555,10 +613,16 @@ class StrategicDashboardGenerator:
                 "تحسين الأبعاد الضعيفة أولاً",
                 "الحفاظ على الأبعاد القوية"
             ]
-        ))
-        
-        # 3. Critical Path Timeline
-        visualizations.append(DashboardVisualization(
+        )
+    
+    def _build_timeline(
+        self,
+        ceo_insights: Dict[str, Any],
+        irl: Dict[str, Any],
+        ici: InnovationConfidenceIndex
+    ) -> DashboardVisualization:
+        """Critical Path Timeline"""
+        return DashboardVisualization(
             viz_type="timeline",
             title="المسار الحرج للنجاح",
             data={
@@ -573,10 +637,16 @@ class StrategicDashboardGenerator:
                 "البدء بالمرحلة الأولى فوراً",
                 "تتبع التقدم أسبوعياً"
             ]
-        ))
-        
-        # 4. Investment Readiness Breakdown
-        visualizations.append(DashboardVisualization(
+        )
+    
+    def _build_waterfall(
+        self,
+        ceo_insights: Dict[str, Any],
+        irl: Dict[str, Any],
+        ici: InnovationConfidenceIndex
+    ) -> DashboardVisualization:
+        """Investment Readiness Breakdown"""
+        return DashboardVisualization(
             viz_type="waterfall",
             title="تفصيل جاهزية المستثمر (IRL)",
             data={
@@ -588,10 +658,16 @@ class StrategicDashboardGenerator:
                 f"الدرجة: {irl.get('irl_grade', 'N/A')}"
             ],
             recommendations=irl.get("key_weaknesses", [])[:2]
-        ))
-        
-        # 5. Risk Heatmap
-        visualizations.append(DashboardVisualization(
+        )
+    
+    def _build_heatmap(
+        self,
+        ceo_insights: Dict[str, Any],
+        irl: Dict[str, Any],
+        ici: InnovationConfidenceIndex
+    ) -> DashboardVisualization:
+        """Risk Heatmap"""
+        return DashboardVisualization(
             viz_type="heatmap",
             title="خريطة المخاطر",
             data={
@@ -605,9 +681,7 @@ class StrategicDashboardGenerator:
                 "معالجة المخاطر الحمراء فوراً",
                 "وضع خطة تخفيف للمخاطر البرتقالية"
             ]
-        ))
-        
-        return visualizations
+        )
     
     def _translate_confidence_level(self, level: ConfidenceLevel) -> str:
         """ترجمة مستوى الثقة"""
@@ -667,6 +741,7 @@ class StrategicDashboardGenerator:
         
         return risks
     
+    @traced()
     def _generate_executive_summary(
         self,
         project_data: Dict[str, Any],
@@ -705,6 +780,7 @@ class StrategicDashboardGenerator:
 """
         return summary.strip()
     
+    @traced()
     def _generate_strategic_recommendations(
         self,
         ici: InnovationConfidenceIndex,
@@ -736,6 +812,7 @@ class StrategicDashboardGenerator:
         
         return recommendations[:5]
     
+    @traced()
     def _generate_roadmap_timeline(self, roadmap: Dict[str, Any]) -> Dict[str, Any]:
         """توليد الجدول الزمني لخارطة الطريق"""
         tactical_moves = roadmap.get("tactical_moves", [])
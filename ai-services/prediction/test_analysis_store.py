@@ -0,0 +1,163 @@
+"""
+اختبار مخزن التحليلات الدائم (analysis_store)
+حفظ النتائج واسترجاعها بالمعرّف، سجل المشروع، سياسات الاحتفاظ والإزالة، والتصدير
+"""
+
+import json
+import os
+import tempfile
+import time
+import warnings
+
+from analysis_store import ANONYMOUS_PROJECT_ID, AnalysisStore, to_report_data
+from result_serializer import dumps
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _results(n=5):
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        projects = json.load(f)[:n]
+    bridge = StrategicBridgeProtocol()
+    return [bridge.analyze_project(dict(project)) for project in projects]
+
+
+def test_round_trip():
+    """التحليل المسترجع بالمعرّف مطابق لما يرسله /analyze، ويُخزن مضغوطاً"""
+    store = AnalysisStore(":memory:")
+    results = _results()
+    ids = [store.save(result) for result in results]
+    assert len(set(ids)) == len(ids)
+
+    for analysis_id, result in zip(ids, results):
+        assert store.get_json(analysis_id) == dumps(result)
+        assert store.get(analysis_id) == json.loads(dumps(result))
+
+    assert store.get("missing") is None
+    assert store.delete(ids[0]) and store.get(ids[0]) is None
+    assert not store.delete(ids[0])
+
+    stats = store.stats()
+    assert stats["analyses"] == len(results) - 1
+    assert stats["compression_ratio"] > 2
+
+    start = time.perf_counter()
+    for _ in range(200):
+        store.get(ids[1])
+    per_get = (time.perf_counter() - start) / 200
+    print(f"     {stats['json_bytes'] / stats['analyses'] / 1024:.1f} KB JSON ← "
+          f"{stats['stored_bytes'] / stats['analyses'] / 1024:.1f} KB مخزنة، "
+          f"الاسترجاع {per_get * 1e6:.0f} µs")
+
+
+def test_project_history():
+    """سجل تحليلات المشروع مرتب من الأحدث، والحفظ بنفس المعرّف يستبدل التحليل"""
+    store = AnalysisStore(":memory:")
+    result = _results(1)[0]
+    document = json.loads(dumps(result))
+    for i in range(3):
+        store.save({**document, "project_id": "p-1"}, analysis_id=f"a{i}")
+        time.sleep(0.002)
+    store.save({**document, "project_id": "p-2"}, analysis_id="b0")
+
+    history = store.list_project("p-1")
+    assert [entry["analysis_id"] for entry in history] == ["a2", "a1", "a0"]
+    assert len(store.list_project("p-1", limit=2)) == 2
+    assert store.list_project("p-3") == []
+
+    store.save({**document, "project_id": "p-2", "project_title": "جديد"}, analysis_id="a0")
+    assert [entry["analysis_id"] for entry in store.list_project("p-1")] == ["a2", "a1"]
+    assert store.get("a0")["project_title"] == "جديد"
+
+
+def test_anonymous_analyses_use_own_id():
+    """التحليلات بلا معرّف مشروع تُحفظ كل منها تحت معرّفها لا في سجل مشترك"""
+    store = AnalysisStore(":memory:")
+    result = _results(1)[0]
+    assert result.project_id == ANONYMOUS_PROJECT_ID
+    document = json.loads(dumps(result))
+    del document["project_id"]
+
+    ids = [store.save(result), store.save(document), store.save_json(dumps(result), None)]
+    assert store.list_project(ANONYMOUS_PROJECT_ID) == []
+    for analysis_id in ids:
+        assert [entry["analysis_id"] for entry in store.list_project(analysis_id)] == [analysis_id]
+
+
+def test_retention_and_eviction():
+    """التحليلات الأقدم من مدة الاحتفاظ تُحذف، وعند تجاوز السعة يُزال الأقل استخداماً"""
+    document = json.loads(dumps(_results(1)[0]))
+
+    store = AnalysisStore(":memory:", retention_days=30)
+    store.save(document, analysis_id="old")
+    assert store.evict(now=time.time() + 29 * 86400) == 0
+    assert store.evict(now=time.time() + 31 * 86400) == 1
+    assert store.get("old") is None
+
+    store = AnalysisStore(":memory:", retention_days=0, max_entries=3)
+    for i in range(3):
+        store.save(document, analysis_id=f"a{i}")
+        time.sleep(0.002)
+    store.get("a0")
+    store.save(document, analysis_id="a3")
+    assert store.evict() == 1
+    assert store.get("a1") is None
+    assert all(store.get(f"a{i}") is not None for i in (0, 2, 3))
+    assert store.stats()["evicted"] == 1
+
+    try:
+        AnalysisStore(":memory:", retention_days=-1)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_persists_across_connections():
+    """المخزن على القرص يحتفظ بالتحليلات بعد إعادة فتحه"""
+    document = json.loads(dumps(_results(1)[0]))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "analyses.sqlite3")
+        store = AnalysisStore(path)
+        analysis_id = store.save(document)
+        store.close()
+
+        reopened = AnalysisStore(path)
+        assert reopened.get(analysis_id) == document
+        reopened.close()
+
+
+def test_report_data_exports():
+    """بيانات التقرير من التحليل المخزن تُصدّر إلى PDF وExcel"""
+    from excel_export import export_to_excel
+    from pdf_export import export_to_pdf
+
+    store = AnalysisStore(":memory:")
+    result = _results(1)[0]
+    data = to_report_data(store.get(store.save(result)))
+
+    assert data["project_title"] == result.project_title
+    assert data["irl_score"] == round(result.investor_readiness["irl_score"], 1)
+    assert len(data["ceo_insights"]) == len(result.ceo_insights["critical_insights"])
+    assert len(data["roadmap"]["steps"]) == len(result.actionable_roadmap.get("tactical_moves", []))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for export, name in ((export_to_pdf, "report.pdf"), (export_to_excel, "report.xlsx")):
+            path = os.path.join(directory, name)
+            export(data, path)
+            assert os.path.getsize(path) > 0
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار مخزن التحليلات الدائم...")
+    print("=" * 70)
+    for test in (
+        test_round_trip,
+        test_project_history,
+        test_anonymous_analyses_use_own_id,
+        test_retention_and_eviction,
+        test_persists_across_connections,
+        test_report_data_exports
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
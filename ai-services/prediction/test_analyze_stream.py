@@ -0,0 +1,110 @@
+"""
+اختبار بث مراحل التحليل عبر أحداث الخادم (/analyze/stream)
+المراحل تصل بترتيب خط التحليل، والخطأ أثناء التحليل يُرسل كحدث error
+"""
+
+import json
+import warnings
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+
+import analysis_store
+import api_strategic
+from analysis_store import AnalysisStore
+from strategic_bridge_protocol import ANALYSIS_STAGES
+
+PROJECT = {
+    'title': 'منصة تعليمية',
+    'description': 'منصة تعليم إلكتروني',
+    'budget': '250000',
+    'team_size': '4',
+    'timeline_months': '9',
+    'market_demand': '70',
+    'technical_feasibility': '80',
+    'user_engagement': '60',
+    'hypothesis_validation_rate': '0.6',
+    'rat_completion_rate': '0.5',
+    'user_count': '1200',
+    'revenue_growth': '0.2',
+    'project_id': 'stream-1'
+}
+
+
+@contextmanager
+def _memory_store():
+    store = AnalysisStore(":memory:")
+    previous = analysis_store._analysis_store, analysis_store._analysis_store_configured
+    analysis_store._analysis_store, analysis_store._analysis_store_configured = store, True
+    try:
+        yield store
+    finally:
+        analysis_store._analysis_store, analysis_store._analysis_store_configured = previous
+
+
+def _events(text):
+    """[(event, data)] من نص استجابة text/event-stream"""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stage_order():
+    """الأحداث بترتيب المراحل ثم complete، والنتيجة المجمعة تُحفظ بمعرّفها"""
+    with _memory_store() as store:
+        response = TestClient(api_strategic.app).post("/analyze/stream", json=PROJECT)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == [
+            "ceo_insights",
+            "actionable_roadmap",
+            "investor_readiness",
+            "strategic_dashboard",
+            "summary",
+            "complete"
+        ]
+        assert [name for name, _ in events[:-1]] == list(ANALYSIS_STAGES)
+
+        complete = events[-1][1]
+        assert complete["project_id"] == "stream-1"
+        stored = store.get(complete["analysis_id"])
+        assert stored["investor_readiness"] == events[2][1]["investor_readiness"]
+
+
+def test_error_event():
+    """استثناء أثناء التحليل يُنهي البث بحدث error بعد المراحل المكتملة"""
+    bridge = api_strategic.strategic_bridge
+    original = bridge.iter_analysis_stages
+
+    def failing_stages(*args, **kwargs):
+        stages = original(*args, **kwargs)
+        yield next(stages)
+        raise RuntimeError("model unavailable")
+
+    bridge.iter_analysis_stages = failing_stages
+    try:
+        with _memory_store() as store:
+            response = TestClient(api_strategic.app).post("/analyze/stream", json=PROJECT)
+            events = _events(response.text)
+            assert [name for name, _ in events] == ["ceo_insights", "error"]
+            assert events[-1][1] == {"detail": "model unavailable"}
+            assert store.stats()["analyses"] == 0
+    finally:
+        del bridge.iter_analysis_stages
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار بث مراحل التحليل...")
+    print("=" * 70)
+    for test in (
+        test_stage_order,
+        test_error_event
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,159 @@
+"""
+اختبار تطابق محرك IRL للمحفظة (PortfolioIRLEngine) مع InvestmentSimulator.calculate_irl
+مشروعاً بمشروع: المكونات والدرجة والجاذبية والمستثمرون الموصى بهم والتقييم والتمويل
+وتطابق جداول الأهلية المفهرسة مع المسح الخطي لمعايير SaudiVCCriteria
+"""
+
+import json
+import warnings
+
+import numpy as np
+
+from investment_simulator import (
+    CRITERIA_ORDER,
+    InvestmentSimulator,
+    InvestorType,
+    KNOWN_SECTORS,
+    KNOWN_STAGES,
+    SECTOR_TAM,
+    STAGE_BASE_VALUATION,
+    eligible_investor_types
+)
+from portfolio_irl import BREAKDOWN_FIELDS, PortfolioIRLEngine, columns_from_projects
+from vectorized_scoring import NUMERIC_FEATURE_DEFAULTS
+
+TOLERANCE = 1e-9
+
+
+def _load_portfolio():
+    """عينات البيانات مع قطاعات ومنظمات ومراحل واحتمالات متنوعة (بما فيها قيم غير معروفة)"""
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    rng = np.random.default_rng(11)
+    sectors = list(SECTOR_TAM) + ["unknown_sector"]
+    organizations = ["kaust", "pif", "roshn", "startup", "KAUST"]
+    stages = list(STAGE_BASE_VALUATION) + ["unknown_stage"]
+
+    portfolio = []
+    for i, sample in enumerate(samples):
+        project = dict(sample)
+        if i % 5:
+            project["sector"] = sectors[rng.integers(len(sectors))]
+            project["organization"] = organizations[rng.integers(len(organizations))]
+            project["stage"] = stages[rng.integers(len(stages))]
+            project["success_probability"] = float(rng.uniform(0, 100))
+        portfolio.append(project)
+    return portfolio
+
+
+def _scalar_irl(simulator, project):
+    """نفس مدخلات calculate_irl التي يمررها الجسر الاستراتيجي"""
+    features = {
+        name: columns_from_projects([project])["columns"][name][0]
+        for name in NUMERIC_FEATURE_DEFAULTS
+    }
+    return simulator.calculate_irl(
+        features=features,
+        sector=project.get("sector", "fintech"),
+        organization=project.get("organization", "startup"),
+        stage=project.get("stage", "seed"),
+        success_probability=project.get("success_probability", 50)
+    )
+
+
+def test_batch_irl_matches_scalar():
+    """المحرك المتجه يطابق calculate_irl لكل مشروع في المحفظة"""
+    portfolio = _load_portfolio()
+    simulator = InvestmentSimulator()
+    result = PortfolioIRLEngine().score_projects(portfolio)
+    assert len(result) == len(portfolio)
+
+    for i, project in enumerate(portfolio):
+        expected = _scalar_irl(simulator, project)
+        assert abs(result.irl_score[i] - expected.irl_score) < TOLERANCE, i
+        assert result.irl_grade[i] == expected.irl_grade, i
+        assert result.investor_appeal[i] == expected.investor_appeal, i
+        assert result.recommended_investor_types(i) == expected.recommended_investor_types, i
+        for name in BREAKDOWN_FIELDS:
+            assert abs(result.breakdown[name][i] - expected.readiness_breakdown[name]) < TOLERANCE, (i, name)
+        for got, want in zip(
+            (result.valuation_min[i], result.valuation_max[i], result.funding_min[i], result.funding_max[i]),
+            expected.estimated_valuation_range + expected.estimated_funding_potential
+        ):
+            assert abs(got - want) <= TOLERANCE * max(1.0, abs(want)), i
+
+
+def test_grade_boundaries():
+    """حدود الدرجات والجاذبية تطابق المسار العادي عند القيم الحدية تماماً"""
+    simulator = InvestmentSimulator()
+    engine = PortfolioIRLEngine()
+    # IRL = 0.3 * p عندما تكون جميع المكونات صفراً
+    irl_values = np.array([0, 34.9, 35, 49.99, 50, 55, 60, 65, 70, 75, 80, 85, 90, 100], dtype=float)
+    columns = {name: 0.0 for name in NUMERIC_FEATURE_DEFAULTS}
+    result = engine.score(columns, organization="none", success_probability=irl_values / 0.3)
+
+    for i, irl in enumerate(result.irl_score):
+        assert result.irl_grade[i] == simulator._calculate_irl_grade(irl), irl
+        assert result.investor_appeal[i] == simulator._determine_investor_appeal(irl), irl
+
+
+def test_ranking():
+    """الترتيب تنازلي حسب IRL ويحافظ على ترتيب المحفظة عند التساوي"""
+    result = PortfolioIRLEngine().score_projects(_load_portfolio())
+    order = result.ranking()
+    scores = result.irl_score[order]
+    assert (np.diff(scores) <= 0).all()
+    top = result.to_records(result.ranking(top=10))
+    assert len(top) == 10 and top[0]["irl_score"] == float(scores[0])
+
+
+def _linear_scan(traction, team, technical, financial, sector, stage):
+    """المسح الخطي الأصلي لمعايير المستثمرين"""
+    recommended = []
+    for criteria in CRITERIA_ORDER:
+        match_score = sum([
+            traction >= criteria.min_traction,
+            team >= criteria.min_team_quality,
+            technical >= criteria.min_technical_feasibility,
+            financial >= criteria.min_financial_health,
+            sector in criteria.preferred_sectors,
+            stage in criteria.preferred_stages
+        ]) / 6
+        if match_score >= 0.6:
+            recommended.append(criteria.investor_type)
+    return recommended or [InvestorType.GOVERNMENT, InvestorType.ANGEL]
+
+
+def test_indexed_eligibility_matches_linear_scan():
+    """جداول الأهلية المفهرسة تطابق المسح الخطي لكل (قطاع، مرحلة) بما فيها القيم غير المعروفة"""
+    rng = np.random.default_rng(5)
+    # قيم حدية تساوي الحدود الدنيا تماماً إضافة إلى قيم عشوائية
+    levels = [5, 10, 30, 40, 50, 55, 60, 65, 70, 75]
+    sectors = KNOWN_SECTORS + ("unknown_sector", "التقنية المالية")
+    stages = KNOWN_STAGES + ("unknown_stage",)
+
+    for sector in sectors:
+        for stage in stages:
+            for _ in range(200):
+                scores = [
+                    float(levels[rng.integers(len(levels))]) if rng.random() < 0.5 else float(rng.uniform(0, 100))
+                    for _ in range(4)
+                ]
+                assert eligible_investor_types(*scores, sector, stage) == _linear_scan(*scores, sector, stage), \
+                    (scores, sector, stage)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تطابق محرك IRL للمحفظة...")
+    print("=" * 70)
+    for test in (
+        test_batch_irl_matches_scalar,
+        test_grade_boundaries,
+        test_indexed_eligibility_matches_linear_scan,
+        test_ranking
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,84 @@
+"""
+اختبار ذهبي لمحرك CEO Insights: إعادة تشغيل مدخلات ceo_insights_golden_fixture.json
+والتحقق من تطابق المخرجات بايت ببايت، مع تطابق القوالب المُجمَّعة مع str.format
+وفهرس معايير القطاعات مع SECTOR_BUDGET_BENCHMARKS
+"""
+
+import json
+import warnings
+
+import numpy as np
+
+from ceo_insights_engine import (
+    DEFAULT_BENCHMARK_SECTOR,
+    INSIGHT_TEMPLATES,
+    CEOInsightsEngine,
+    TranslationDictionary,
+    sector_benchmark
+)
+
+# مخرجات مجمدة من المحرك قبل تجميع القوالب (لا تعيد الاختبارات الأخرى كتابتها):
+# مدخلات أول 20 نتيجة من ceo_insights_test_results.json و40 حالة عشوائية تغطي كل الميزات والقطاعات
+GOLDEN_FILE = "ceo_insights_golden_fixture.json"
+
+
+def _golden_cases():
+    """(المدخلات، JSON المتوقع) لكل حالة في الملف المجمد"""
+    with open(GOLDEN_FILE, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    return [
+        (case["inputs"], json.dumps(case["expected"], ensure_ascii=False, indent=2))
+        for case in cases
+    ]
+
+
+def test_golden_output_byte_identical():
+    """إعادة توليد الرؤى المسجلة تعطي نفس JSON بايت ببايت"""
+    engine = CEOInsightsEngine()
+    cases = _golden_cases()
+    assert cases
+    for i, (inputs, expected) in enumerate(cases):
+        output = engine.to_dict(engine.generate_ceo_insights(**inputs))
+        assert json.dumps(output, ensure_ascii=False, indent=2) == expected, i
+
+
+def test_compiled_templates_match_format():
+    """كل قالب مُجمَّع يطابق str.format على قيم عشوائية وحدية"""
+    rng = np.random.default_rng(4)
+    values = [0, 1, 3, 0.0, 0.5, 0.27, 188060, 1234567.891, -5, float(rng.uniform(0, 1e6))]
+    impact = {
+        "gap_percentage": 76.49,
+        "months": 10,
+        "failure_probability": 85.0,
+        "liquidity_risk": "مرتفع جداً"
+    }
+    for (feature_name, impact_class), template in INSIGHT_TEMPLATES.items():
+        original = TranslationDictionary.SHAP_TO_CEO_MAPPING[feature_name][impact_class]
+        assert template.title == original["title"] and template.severity == original["severity"]
+        for value in values:
+            for sector in ("التقنية المالية", "unknown_sector"):
+                expected = original["template"].format(value=value, sector=sector, **impact)
+                assert template.render(value, sector, impact) == expected, (feature_name, impact_class, value)
+
+
+def test_sector_benchmark_index():
+    """فهرس معايير القطاعات يطابق SECTOR_BUDGET_BENCHMARKS والقطاعات غير المعروفة تعود للقطاع المرجعي"""
+    for sector, benchmarks in TranslationDictionary.SECTOR_BUDGET_BENCHMARKS.items():
+        benchmark = sector_benchmark(sector)
+        assert benchmark.average == benchmarks["average"]
+        assert benchmark.avg_team_size == benchmarks["avg_team_size"]
+    assert sector_benchmark("unknown_sector") is sector_benchmark(DEFAULT_BENCHMARK_SECTOR)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار المخرجات الذهبية لمحرك CEO Insights...")
+    print("=" * 70)
+    for test in (
+        test_golden_output_byte_identical,
+        test_compiled_templates_match_format,
+        test_sector_benchmark_index
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
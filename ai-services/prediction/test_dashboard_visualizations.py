@@ -0,0 +1,56 @@
+"""
+اختبار اختيار تصورات لوحة التحكم: بناء التصورات المطلوبة فقط بنفس محتواها في اللوحة الكاملة
+"""
+
+import json
+import logging
+import warnings
+
+from strategic_bridge_protocol import StrategicBridgeProtocol
+from strategic_dashboard_generator import VISUALIZATION_TYPES, resolve_visualizations
+
+
+def _projects(n=20):
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        return json.load(f)[:n]
+
+
+def test_selected_visualizations_match_full_dashboard():
+    """التصورات المختارة مطابقة لنظيراتها في اللوحة الكاملة وباقي اللوحة لم يتغير"""
+    bridge = StrategicBridgeProtocol()
+    for project in _projects():
+        full = bridge.analyze_project(dict(project)).strategic_dashboard
+        by_type = {v["viz_type"]: v for v in full["visualizations"]}
+        assert tuple(by_type) == VISUALIZATION_TYPES
+
+        for selection in (("heatmap", "gauge"), ("radar",), ()):
+            partial = bridge.analyze_project(dict(project), visualizations=selection).strategic_dashboard
+            expected = [by_type[t] for t in VISUALIZATION_TYPES if t in selection]
+            assert partial["visualizations"] == expected, selection
+            assert {k: v for k, v in partial.items() if k != "visualizations"} == \
+                {k: v for k, v in full.items() if k != "visualizations"}
+
+
+def test_resolve_visualizations():
+    """None يعني جميع التصورات، والترتيب قياسي، والأنواع غير المعروفة تُرفض"""
+    assert resolve_visualizations(None) == VISUALIZATION_TYPES
+    assert resolve_visualizations(["waterfall", " gauge", "", "gauge"]) == ("gauge", "waterfall")
+    try:
+        resolve_visualizations(["gauge", "pie"])
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "pie" in str(e)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    print("🚀 اختبار اختيار تصورات لوحة التحكم...")
+    print("=" * 70)
+    for test in (
+        test_selected_visualizations_match_full_dashboard,
+        test_resolve_visualizations
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
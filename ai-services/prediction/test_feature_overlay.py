@@ -0,0 +1,150 @@
+"""
+اختبار طبقات الخصائص (FeatureOverlay)
+دلالات القاموس، والتسلسل عبر pickle، وتطابق to_dict مع مسار النسخ السابق،
+والعزل عن تعديلات المستدعي
+"""
+
+import json
+import pickle
+import warnings
+
+from feature_overlay import FeatureOverlay
+from strategic_bridge_protocol import NUMERIC_FIELDS, StrategicBridgeProtocol
+from whatif_simulator import WhatIfSimulator
+
+BASE = {'title': 'مشروع', 'budget': '150000', 'team_size': 3, 'tags': ['edtech'], 'sector': 'fintech'}
+
+
+def _old_clean_all_features(bridge, project_data):
+    """مسار التنظيف السابق: نسخ القاموس ثم تنظيف الحقول الرقمية"""
+    cleaned_data = project_data.copy()
+    for field in NUMERIC_FIELDS:
+        if field in cleaned_data:
+            cleaned_data[field] = bridge._clean_value(cleaned_data[field])
+    return cleaned_data
+
+
+def test_mapping_semantics():
+    """القراءة والكتابة والحذف والتكرار تتصرف كقاموس منسوخ دون تعديل الأساس"""
+    overlay = FeatureOverlay(BASE, {'budget': 200000.0, 'stage': 'seed'})
+    expected = {**BASE, 'budget': 200000.0, 'stage': 'seed'}
+
+    assert overlay == expected and dict(overlay) == expected
+    assert list(overlay) == list(expected) and len(overlay) == len(expected)
+    assert overlay['title'] == 'مشروع' and overlay.get('missing', 7) == 7
+    assert 'stage' in overlay and 'missing' not in overlay
+    assert overlay.delta == {'budget': 200000.0, 'stage': 'seed'}
+
+    overlay['team_size'] = 5
+    del overlay['title']
+    del overlay['stage']
+    assert 'title' not in overlay and overlay.get('title') is None
+    try:
+        overlay['title']
+        assert False, "KeyError expected"
+    except KeyError:
+        pass
+    try:
+        del overlay['title']
+        assert False, "KeyError expected"
+    except KeyError:
+        pass
+    overlay.setdefault('success_probability', 61.0)
+    assert overlay.to_dict() == {
+        'budget': 200000.0, 'team_size': 5, 'tags': ['edtech'], 'sector': 'fintech', 'success_probability': 61.0
+    }
+    overlay['title'] = 'جديد'
+    assert overlay['title'] == 'جديد'
+    assert BASE['title'] == 'مشروع' and BASE['team_size'] == 3 and 'stage' not in BASE
+
+    # الطبقات المشتقة تُسطَّح فوق الأساس نفسه
+    first = FeatureOverlay(BASE, {'budget': 1.0})
+    second = first.derive({'team_size': 9})
+    del second['sector']
+    third = FeatureOverlay(second, {'sector': 'health'})
+    assert second.base is first.base and third.base is first.base
+    assert third.delta == {'budget': 1.0, 'team_size': 9, 'sector': 'health'}
+    assert 'sector' not in second and first['team_size'] == 3
+
+    copied = third.copy()
+    copied['budget'] = 2.0
+    assert third['budget'] == 1.0 and copied.base is third.base
+
+
+def test_pickle_round_trip():
+    """الطبقة تُسلسل بأساسها وفروقها والحقول المحذوفة (لعمال What-If)"""
+    overlay = FeatureOverlay(BASE, {'budget': 5.0})
+    del overlay['tags']
+    restored = pickle.loads(pickle.dumps(overlay))
+    assert isinstance(restored, FeatureOverlay)
+    assert restored == overlay and list(restored) == list(overlay)
+    assert restored.delta == {'budget': 5.0} and 'tags' not in restored
+
+    restored['tags'] = []
+    assert 'tags' not in overlay
+    assert pickle.loads(pickle.dumps(FeatureOverlay({}))) == {}
+
+
+def test_clean_all_features_parity():
+    """to_dict للطبقة المنظفة يطابق مسار النسخ السابق بالقيم والترتيب"""
+    bridge = StrategicBridgeProtocol()
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        projects = json.load(f)[:30]
+    projects.append({'budget': '25%', 'team_size': 'غير معروف', 'roi': None, 'extra': {'a': 1}})
+    for project in projects:
+        cleaned = bridge._clean_all_features(project)
+        old = _old_clean_all_features(bridge, project)
+        assert isinstance(cleaned, FeatureOverlay)
+        assert cleaned.to_dict() == old
+        assert list(cleaned.to_dict()) == list(old)
+        assert json.dumps(cleaned.to_dict(), ensure_ascii=False) == json.dumps(old, ensure_ascii=False)
+
+
+def test_isolated_from_caller_changes():
+    """تعديل قاموس المستدعي بعد الإنشاء لا يظهر في الطبقة أو في مراحل التحليل اللاحقة"""
+    project = dict(BASE)
+    overlay = FeatureOverlay(project, {'budget': 1.0})
+    project['sector'] = 'health'
+    project['new_field'] = True
+    del project['title']
+    assert overlay['sector'] == 'fintech' and overlay['title'] == 'مشروع'
+    assert 'new_field' not in overlay
+
+    bridge = StrategicBridgeProtocol()
+    cleaned = bridge._clean_all_features(project)
+    project['budget'] = '999999999'
+    assert cleaned['budget'] == 150000.0
+
+    # خط التحليل المرحلي يحتفظ بالبيانات بين المراحل
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        project = json.load(f)[0]
+    expected = [stage for _, stage in bridge.iter_analysis_stages(dict(project))]
+    stages = bridge.iter_analysis_stages(project)
+    received = [next(stages)[1]]
+    for key in NUMERIC_FIELDS:
+        project[key] = 0
+    received.extend(stage for _, stage in stages)
+    assert json.dumps(received, default=str, sort_keys=True) == json.dumps(expected, default=str, sort_keys=True)
+
+    # سيناريوهات What-If تشترك في لقطة واحدة من الأساس
+    simulator = WhatIfSimulator(max_workers=1)
+    results = simulator.simulate_multiple_scenarios(BASE, [{'budget': '+1000'}, {'team_size': '+1'}])
+    assert BASE == {'title': 'مشروع', 'budget': '150000', 'team_size': 3, 'tags': ['edtech'], 'sector': 'fintech'}
+    assert {(r['modified_features']['budget'], r['modified_features']['team_size']) for r in results} == {
+        ('151000.0', 3), ('150000', 4)
+    }
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار طبقات الخصائص...")
+    print("=" * 70)
+    for test in (
+        test_mapping_semantics,
+        test_pickle_round_trip,
+        test_clean_all_features_parity,
+        test_isolated_from_caller_changes
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,132 @@
+"""
+اختبار محاكي جولات التمويل (FundingRoundSimulator)
+الاحتمالات التجريبية مقابل الاحتمالات النظرية، وحدود التخفيف والملكية، والأداء
+"""
+
+import time
+import warnings
+
+from funding_round_simulator import MAX_ATTEMPTS, FundingRoundSimulator, investor_fit
+from investment_simulator import (
+    EQUITY_DILUTION_BOUNDS,
+    InvestmentSimulator,
+    InvestorType,
+    closing_probability
+)
+
+FEATURES = {
+    "budget": 500000,
+    "team_size": 6,
+    "market_demand": 70,
+    "technical_feasibility": 75,
+    "hypothesis_validation_rate": 0.6,
+    "rat_completion_rate": 0.5,
+    "user_count": 2000,
+    "revenue_growth": 0.4,
+    "user_engagement": 60,
+    "market_share": 0.02,
+    "roi": 0.3
+}
+
+
+def _irl():
+    return InvestmentSimulator().calculate_irl(FEATURES, "fintech", "startup", "seed", 60)
+
+
+def test_closing_probability_matches_theory():
+    """احتمالية إغلاق الجولة الأولى تطابق 1 - ∏(1 - p_i)^المحاولات لاحتمالات المستثمرين"""
+    simulator = FundingRoundSimulator()
+    investors = [InvestorType.VC_SEED, InvestorType.ANGEL]
+    for irl_score in (30, 55, 70, 85):
+        result = simulator.simulate(
+            irl_score, (4_000_000, 6_000_000), "seed", investors,
+            n_paths=100_000, max_rounds=1, seed=3
+        )
+        assert result["closing_probability"] == closing_probability(irl_score)
+        probabilities = result["rounds"][0]["investor_closing_probability"]
+        miss = 1.0
+        for investor in investors:
+            p = probabilities[investor.value]
+            assert p == closing_probability(irl_score) * investor_fit(investor, "seed", irl_score)
+            miss *= (1 - p) ** MAX_ATTEMPTS
+        assert abs(result["time_to_funding"]["probability"] - (1 - miss)) < 0.01, (irl_score, 1 - miss)
+
+
+def test_probability_depends_on_investor_type():
+    """احتمالية الإغلاق تختلف حسب نوع المستثمر ومدى تحقيق المشروع لمعاييره"""
+    breakdown = {"traction": 35, "team_quality": 65, "technical_feasibility": 62, "financial_health": 52}
+    investors = [InvestorType.VC_SEED, InvestorType.ANGEL, InvestorType.PIF]
+    result = FundingRoundSimulator().simulate(
+        70, (4_000_000, 6_000_000), "seed", investors,
+        n_paths=50_000, max_rounds=2, seed=5, readiness_breakdown=breakdown, sector="fintech"
+    )
+    first, second = result["rounds"]
+    probabilities = first["investor_closing_probability"]
+    # VC Seed: كل المعايير الستة؛ Angel: المرحلة غير مفضلة؛ PIF: القطاع فقط
+    assert probabilities == {
+        "vc_seed": closing_probability(70),
+        "angel": closing_probability(70) * 5 / 6,
+        "pif": closing_probability(70) * 1 / 6
+    }
+    # الأسرع إغلاقاً (Angel) يفوز أكثر، و PIF نادراً
+    mix = first["investor_mix"]
+    assert mix["angel"] > mix["vc_seed"] > mix["pif"]
+    assert mix["pif"] < 0.05
+
+    # الجولة التالية تقيّم المستثمرين مقابل مرحلتها
+    assert second["stage"] == "series_a"
+    assert second["investor_closing_probability"]["pif"] == closing_probability(70) * 2 / 6
+    # بدون تفصيل الجاهزية تُقارن درجة IRL بكل حد (70 أقل من حد الفريق 75)
+    assert investor_fit(InvestorType.PIF, "series_a", 70) == 4 / 5
+    assert investor_fit(InvestorType.PIF, "series_a", 70, sector="fintech") == 5 / 6
+
+
+def test_distributions_are_consistent():
+    """التخفيف ضمن الحدود، والملكية تتناقص، واحتمالات الجولات متناقصة"""
+    result = InvestmentSimulator().simulate_funding_rounds(_irl(), "seed", n_paths=50_000, max_rounds=3, seed=1)
+    assert result["stages"] == ["seed", "series_a", "series_b"]
+
+    probabilities = [r["probability"] for r in result["rounds"]]
+    assert probabilities == sorted(probabilities, reverse=True)
+    assert abs(sum(result["rounds_closed"].values()) - 1) < 1e-9
+
+    for round_result in result["rounds"]:
+        bands = round_result["dilution"]["bands"]
+        if bands:
+            assert EQUITY_DILUTION_BOUNDS[0] <= bands["p5"] and bands["p95"] <= EQUITY_DILUTION_BOUNDS[1]
+            assert abs(sum(round_result["investor_mix"].values()) - 1) < 1e-9
+
+    final = result["ownership"]["final"]["bands"]
+    closed_all = result["ownership"]["if_all_rounds_closed"]["bands"]
+    assert final["p95"] <= 1.0
+    assert closed_all["p95"] <= (1 - EQUITY_DILUTION_BOUNDS[0]) ** 3 + 1e-9
+
+    # نفس البذرة = نفس التوزيعات
+    again = InvestmentSimulator().simulate_funding_rounds(_irl(), "seed", n_paths=50_000, max_rounds=3, seed=1)
+    assert again == result
+
+
+def test_funding_rounds_timing():
+    """100 ألف مسار لكل مشروع ضمن زمن استدعاء API"""
+    irl = _irl()
+    simulator = FundingRoundSimulator()
+    start = time.perf_counter()
+    simulator.simulate_irl(irl, "pre_seed", n_paths=100_000, max_rounds=4, seed=7)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"     100000 مسار × 4 جولات: {elapsed_ms:.0f} ms")
+    assert elapsed_ms < 2000
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار محاكي جولات التمويل...")
+    print("=" * 70)
+    for test in (
+        test_closing_probability_matches_theory,
+        test_probability_depends_on_investor_type,
+        test_distributions_are_consistent,
+        test_funding_rounds_timing
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,126 @@
+"""
+اختبار محرك مطابقة المشاريع بالمستثمرين (InvestorMatchingEngine)
+الأهلية تطابق _recommend_investor_types، والتعيين الأمثل يطابق البحث الشامل ويحترم السعة
+"""
+
+import itertools
+import time
+import warnings
+
+import numpy as np
+
+import investor_matching
+from investment_simulator import CRITERIA_ORDER
+from investor_matching import InvestorMatchingEngine, InvestorProfile
+from portfolio_irl import columns_from_projects
+from test_batch_irl_parity import _load_portfolio
+
+
+def _default_profiles(capacity=1):
+    return [
+        InvestorProfile(criteria.investor_type.value, criteria, capacity)
+        for criteria in CRITERIA_ORDER
+    ]
+
+
+def test_eligibility_matches_recommendations():
+    """الأهلية في المصفوفة تطابق أنواع المستثمرين الموصى بهم لكل مشروع"""
+    engine = InvestorMatchingEngine()
+    inputs = columns_from_projects(_load_portfolio())
+    portfolio = engine.portfolio_engine.score(**inputs)
+    eligible = engine.compatibility(portfolio, inputs["sector"], inputs["stage"], _default_profiles())["eligible"]
+    assert (eligible == portfolio.investor_matches).all()
+
+
+def _brute_force(score, capacity):
+    n, m = score.shape
+    best = 0.0
+    for choice in itertools.product(range(-1, m), repeat=n):
+        load = np.bincount([j for j in choice if j >= 0], minlength=m)
+        if (load > capacity).any() or any(j >= 0 and score[i, j] <= 0 for i, j in enumerate(choice)):
+            continue
+        best = max(best, sum(score[i, j] for i, j in enumerate(choice) if j >= 0))
+    return best
+
+
+def test_optimal_assignment_matches_brute_force():
+    """التعيين الأمثل يطابق البحث الشامل، والجشع لا يتجاوزه، والسعة محترمة"""
+    engine = InvestorMatchingEngine()
+    rng = np.random.default_rng(2)
+    for _ in range(40):
+        n, m = int(rng.integers(1, 7)), int(rng.integers(1, 4))
+        score = np.where(rng.random((n, m)) < 0.7, rng.uniform(1, 100, (n, m)), 0.0)
+        capacity = rng.integers(0, 3, m)
+
+        rows, cols = engine._assign_optimal(score, capacity)
+        optimal = score[rows, cols].sum()
+        assert abs(optimal - _brute_force(score, capacity)) < 1e-9
+        assert len(set(rows.tolist())) == len(rows)
+        assert (np.bincount(cols, minlength=m) <= capacity).all()
+
+        rows, cols = engine._assign_greedy(score, capacity)
+        assert score[rows, cols].sum() <= optimal + 1e-9
+        assert (np.bincount(cols, minlength=m) <= capacity).all()
+
+
+def test_match_portfolio():
+    """مطابقة المحفظة كاملة مع ملفات مستثمرين مخصصة (أمثل ثم جشع بدون scipy)"""
+    portfolio = _load_portfolio()
+    investors = [
+        {"id": f"inv-{k}", "investor_type": criteria.investor_type.value, "capacity": 20}
+        for k, criteria in enumerate(CRITERIA_ORDER * 5)
+    ]
+    investors.append({"id": "pif-fintech", "investor_type": "pif", "capacity": 5,
+                      "preferred_sectors": ["fintech"], "min_traction": 40})
+
+    engine = InvestorMatchingEngine()
+    optimal = engine.match(portfolio, investors)
+    assert optimal["method"] == "optimal"
+    assert len(optimal["assignments"]) + len(optimal["unmatched_projects"]) == len(portfolio)
+    assert all(optimal["investor_load"][inv["id"]] <= inv["capacity"] for inv in investors)
+
+    greedy = engine.match(portfolio, investors, method="greedy")
+    assert greedy["total_compatibility"] <= optimal["total_compatibility"] + 1e-6
+
+    available = investor_matching.SCIPY_AVAILABLE
+    investor_matching.SCIPY_AVAILABLE = False
+    try:
+        assert engine.match(portfolio, investors)["method"] == "greedy"
+    finally:
+        investor_matching.SCIPY_AVAILABLE = available
+
+
+def test_matching_timing():
+    """آلاف المشاريع × مئات المستثمرين ضمن زمن استدعاء API، والحل الأمثل لا يقل عن الجشع"""
+    portfolio = _load_portfolio() * 10
+    investors = [
+        {"id": f"inv-{k}", "investor_type": criteria.investor_type.value, "capacity": 10}
+        for k, criteria in enumerate(CRITERIA_ORDER * 50)
+    ]
+    engine = InvestorMatchingEngine()
+    totals = {}
+    for method in ("optimal", "greedy"):
+        start = time.perf_counter()
+        result = engine.match(portfolio, investors, method=method)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        totals[method] = result['total_compatibility']
+        print(f"     {len(portfolio)} × {len(investors)} ({method}): {elapsed_ms:.0f} ms، "
+              f"{len(result['assignments'])} تعيين، مجموع التوافق {result['total_compatibility']:.0f}")
+        # يستغرق نحو 1.5 ثانية (الأمثل) و 0.15 ثانية (الجشع)؛ الحد متساهل للأجهزة البطيئة
+        assert elapsed_ms < 10_000, method
+    assert totals["optimal"] >= totals["greedy"]
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار محرك مطابقة المستثمرين...")
+    print("=" * 70)
+    for test in (
+        test_eligibility_matches_recommendations,
+        test_optimal_assignment_matches_brute_force,
+        test_match_portfolio,
+        test_matching_timing
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,189 @@
+"""
+اختبار المقارنة المئينية للمحفظة (PortfolioBenchmarks)
+الترتيب الدقيق مطابق للعد المباشر، والتقريب بـ t-digest محدود الخطأ
+"""
+
+import json
+import math
+import warnings
+
+import numpy as np
+
+from portfolio_benchmarks import MIN_PENDING, PortfolioBenchmarks, ScoreDistribution, TDigest
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _brute_force_percentile(values, value):
+    below = sum(1 for v in values if v < value)
+    ties = sum(1 for v in values if v == value)
+    return 100.0 * (below + ties / 2) / len(values)
+
+
+def test_exact_percentile_matches_brute_force():
+    """الترتيب المئيني في المصفوفة المرتبة يطابق العد المباشر (مع احتساب التعادل نصفاً)"""
+    rng = np.random.default_rng(7)
+    values = np.round(rng.uniform(0, 100, 2000), 1).tolist()
+    distribution = ScoreDistribution()
+    for value in values[:1000]:
+        distribution.add(value)
+    distribution.extend(values[1000:])
+    assert distribution.exact and len(distribution) == len(values)
+    for value in values[:200] + [-1.0, 50.0, 101.0]:
+        assert abs(distribution.percentile(value) - _brute_force_percentile(values, value)) < 1e-9
+
+    # البحث والتسجيل المتناوبان: القيم غير المدمجة بعد تُحتسب أيضاً
+    for value in values[:300]:
+        distribution.add(value + 0.05)
+        values.append(value + 0.05)
+        assert abs(distribution.percentile(value) - _brute_force_percentile(values, value)) < 1e-9
+    assert distribution._pending and len(distribution) == len(values)
+    assert distribution.quantile(0.5) == float(np.quantile(values, 0.5))
+
+
+def test_cohort_fallback():
+    """المجموعات الصغيرة تُستبدل بالأوسع: القطاع والمرحلة ثم القطاع ثم المرحلة ثم المحفظة كاملة"""
+    benchmarks = PortfolioBenchmarks(min_cohort=10)
+    assert benchmarks.lookup("fintech", "seed", {"ici_score": 50})["cohort"] is None
+
+    benchmarks.record_many(
+        ["fintech"] * 10 + ["edtech"] * 30,
+        ["seed"] * 5 + ["series_a"] * 5 + ["seed"] * 30,
+        {"ici_score": np.arange(40, dtype=float)}
+    )
+    assert benchmarks.lookup("fintech", "seed", {"ici_score": 3})["cohort"] == \
+        {"sector": "fintech", "stage": None, "size": 10}
+    assert benchmarks.lookup("edtech", "seed", {"ici_score": 3})["cohort"] == \
+        {"sector": "edtech", "stage": "seed", "size": 30}
+    assert benchmarks.lookup("proptech", "seed", {"ici_score": 3})["cohort"] == \
+        {"sector": None, "stage": "seed", "size": 35}
+    assert benchmarks.lookup("proptech", "growth", {"ici_score": 3})["cohort"] == \
+        {"sector": None, "stage": None, "size": 40}
+
+    for _ in range(5):
+        benchmarks.record("fintech", "seed", {"ici_score": 100})
+    result = benchmarks.lookup("fintech", "seed", {"ici_score": 95})
+    assert result["cohort"]["stage"] == "seed"
+    assert result["metrics"]["ici_score"] == {"value": 95.0, "percentile": 50.0, "top_percent": 50}
+
+
+def test_digest_accuracy():
+    """بعد تجاوز الحد الدقيق يتحول التوزيع إلى t-digest بخطأ ترتيب صغير"""
+    rng = np.random.default_rng(11)
+    values = np.clip(rng.normal(60, 15, 120_000), 0, 100)
+    distribution = ScoreDistribution(max_exact=50_000)
+    distribution.extend(values[:60_000].tolist())
+    for value in values[60_000:].tolist():
+        distribution.add(value)
+    assert not distribution.exact and len(distribution) == values.size
+
+    ordered = np.sort(values)
+    probes = np.linspace(5, 95, 50)
+    exact = 100.0 * np.searchsorted(ordered, probes) / values.size
+    approx = np.array([distribution.percentile(p) for p in probes])
+    assert np.max(np.abs(approx - exact)) < 0.5
+    assert abs(distribution.quantile(0.85) - np.quantile(values, 0.85)) < 0.5
+
+    digest = TDigest()
+    assert np.isnan(digest.percentile(50.0))
+
+
+def test_bridge_benchmarks_dashboard():
+    """الجسر يضيف ترتيب المشروع ضمن المحفظة عند الطلب فقط ثم يضيفه إليها"""
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        projects = json.load(f)[:30]
+    bridge = StrategicBridgeProtocol()
+    plain = bridge.analyze_project(dict(projects[0]), benchmark=True).strategic_dashboard
+    assert "benchmarks" not in plain
+
+    bridge.portfolio_benchmarks = PortfolioBenchmarks(min_cohort=5)
+    assert "benchmarks" not in bridge.analyze_project(dict(projects[0])).strategic_dashboard
+    assert bridge.portfolio_benchmarks.stats()["projects"] == 0
+
+    dashboards = [
+        bridge.analyze_project(dict(project), benchmark=True).strategic_dashboard
+        for project in projects
+    ]
+    assert dashboards[0]["benchmarks"] == {"cohort": None, "metrics": {}}
+    assert bridge.portfolio_benchmarks.stats()["projects"] == len(projects)
+
+    # بيانات البذور بلا مرحلة فتُقارن بكل مراحل القطاع؛ أضيق مجموعة بخمسة مشاريع سابقة على الأقل
+    last = dashboards[-1]["benchmarks"]
+    sector = projects[-1]["sector"]
+    peers = sum(1 for project in projects[:-1] if project["sector"] == sector)
+    expected = {"sector": sector, "stage": None, "size": peers} if peers >= 5 else \
+        {"sector": None, "stage": None, "size": len(projects) - 1}
+    assert last["cohort"] == expected
+    ici = last["metrics"]["ici_score"]
+    assert ici["value"] == dashboards[-1]["ici"]["ici_score"]
+    assert ici["label"].startswith(f"ضمن أعلى {ici['top_percent']}% من ")
+    assert {k: v for k, v in dashboards[-1].items() if k != "benchmarks"} == \
+        StrategicBridgeProtocol().analyze_project(dict(projects[-1])).strategic_dashboard
+
+
+def test_missing_cohort_and_repeat_projects():
+    """المشروع بلا قطاع أو مرحلة يُسجل في المجموعات الشاملة فقط، وإعادة تحليل المشروع لا تُحتسب مرتين"""
+    benchmarks = PortfolioBenchmarks(min_cohort=1)
+    assert benchmarks.record(None, None, {"ici_score": 10})
+    assert benchmarks.record("fintech", None, {"ici_score": 20})
+    assert benchmarks.record(None, "seed", {"ici_score": 30})
+    assert set(benchmarks._cohorts) == {("*", "*"), ("fintech", "*"), ("*", "seed")}
+    assert benchmarks.summary("fintech", "seed")["size"] == 0
+    assert benchmarks.summary()["size"] == 3
+    assert benchmarks.lookup(None, None, {"ici_score": 25})["cohort"] == {"sector": None, "stage": None, "size": 3}
+    assert benchmarks.lookup("fintech", None, {"ici_score": 25})["cohort"] == {"sector": "fintech", "stage": None, "size": 1}
+
+    assert benchmarks.record("fintech", "seed", {"ici_score": 40}, project_id="p-1")
+    assert not benchmarks.record("fintech", "seed", {"ici_score": 90}, project_id="p-1")
+    assert benchmarks.summary("fintech", "seed")["size"] == 1 and benchmarks.stats()["projects"] == 4
+    benchmarks.clear()
+    assert benchmarks.record("fintech", "seed", {"ici_score": 90}, project_id="p-1")
+
+    # عبر الجسر: مشروع من الواجهة بلا قطاع أو مرحلة، يُعاد تحليله
+    bridge = StrategicBridgeProtocol()
+    bridge.portfolio_benchmarks = PortfolioBenchmarks()
+    project = {"id": "ui-1", "title": "مشروع", "budget": "200000", "team_size": "3"}
+    for _ in range(3):
+        bridge.analyze_project(dict(project), benchmark=True)
+    assert set(bridge.portfolio_benchmarks._cohorts) == {("*", "*")}
+    assert bridge.portfolio_benchmarks.stats()["projects"] == 1
+
+
+def test_interleaved_requests_merge_rarely():
+    """البحث والتسجيل المتناوبان لا يعيدان فرز المجموعة لكل طلب: الدمج مرة كل sqrt(n) تسجيل تقريباً"""
+    rng = np.random.default_rng(3)
+    n = 40_000
+    benchmarks = PortfolioBenchmarks()
+    benchmarks.record_many(["fintech"] * n, ["seed"] * n, {"ici_score": rng.uniform(0, 100, n)})
+    distribution = benchmarks._cohorts[("fintech", "seed")]["ici_score"]
+
+    merges = 0
+    merged = distribution._sorted
+    values = rng.uniform(0, 100, 600).tolist()
+    # كل طلب تحليل: بحث ثم تسجيل (كما في StrategicBridgeProtocol._benchmark_project)
+    for value in values:
+        result = benchmarks.lookup("fintech", "seed", {"ici_score": value})
+        assert result["cohort"]["size"] == len(distribution)
+        benchmarks.record("fintech", "seed", {"ici_score": value})
+        assert len(distribution._pending) <= max(MIN_PENDING, math.isqrt(distribution._sorted.size))
+        if distribution._sorted is not merged:
+            merges += 1
+            merged = distribution._sorted
+    assert len(distribution) == n + len(values)
+    assert merges <= len(values) // math.isqrt(n) + 1
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار المقارنة المئينية للمحفظة...")
+    print("=" * 70)
+    for test in (
+        test_exact_percentile_matches_brute_force,
+        test_cohort_fallback,
+        test_digest_accuracy,
+        test_bridge_benchmarks_dashboard,
+        test_missing_cohort_and_repeat_projects,
+        test_interleaved_requests_merge_rarely
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,258 @@
+"""
+اختبار تصدير التقارير (pdf_export و excel_export)
+مُصدّر PDF واحد على مستوى العملية، والتقارير تُنشأ في الذاكرة وتُرسل كاستجابة HTTP،
+وتصدير المحفظة إلى Excel بوضع الكتابة فقط وبذاكرة محدودة
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from analysis_store import AnalysisStore, to_report_data
+from excel_export import (
+    PORTFOLIO_COLUMNS,
+    render_excel,
+    stream_portfolio_excel,
+    write_portfolio_excel
+)
+from pdf_export import (
+    StrategicAnalysisPDFExporter,
+    export_to_pdf,
+    get_pdf_exporter,
+    render_pdf
+)
+from result_serializer import dumps
+from strategic_bridge_protocol import StrategicBridgeProtocol
+
+
+def _analyses(n=3):
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        projects = json.load(f)[:n]
+    bridge = StrategicBridgeProtocol()
+    return [json.loads(dumps(bridge.analyze_project(dict(project)))) for project in projects]
+
+
+def _report_data(n=3):
+    return [to_report_data(analysis) for analysis in _analyses(n)]
+
+
+def _portfolio_store(n_analyses, n_projects):
+    store = AnalysisStore(":memory:", max_entries=0)
+    documents = _analyses(5)
+    for i in range(n_analyses):
+        store.save({**documents[i % len(documents)], "project_id": f"p{i % n_projects:05d}"}, analysis_id=f"a{i:06d}")
+    return store
+
+
+@contextmanager
+def _installed_store(store):
+    import analysis_store
+
+    previous = analysis_store._analysis_store, analysis_store._analysis_store_configured
+    analysis_store._analysis_store, analysis_store._analysis_store_configured = store, True
+    try:
+        yield
+    finally:
+        analysis_store._analysis_store, analysis_store._analysis_store_configured = previous
+
+
+def test_shared_pdf_exporter():
+    """المُصدّر مشترك في العملية، والأنماط تُجهز مرة واحدة فقط"""
+    exporter = get_pdf_exporter()
+    assert get_pdf_exporter() is exporter
+    styles = exporter.styles
+    for data in _report_data(2):
+        exporter.render(data)
+    assert exporter.styles is styles
+    assert "CustomTitle" in styles and "ArabicBody" in styles
+
+
+def test_render_pdf_in_memory():
+    """التقرير في الذاكرة مستند PDF كامل بنفس حجم التقرير المكتوب إلى ملف"""
+    data = _report_data(1)[0]
+    pdf = render_pdf(data)
+    assert pdf.startswith(b"%PDF-") and pdf.rstrip().endswith(b"%%EOF")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.pdf")
+        assert export_to_pdf(data, path) == path
+        # يختلف فقط في الطوابع الزمنية ومعرّف المستند
+        assert abs(os.path.getsize(path) - len(pdf)) < 64
+
+    # البيانات الناقصة تُعرض بالقيم الافتراضية
+    assert render_pdf({}).startswith(b"%PDF-")
+    assert StrategicAnalysisPDFExporter().render({"project_title": "مشروع"}).startswith(b"%PDF-")
+
+
+def test_export_pdf_endpoint():
+    """نقطة /export/pdf ترسل ملف PDF للتحليل المخزن دون ملفات مؤقتة، و404 لمعرّف غير معروف"""
+    from fastapi.testclient import TestClient
+
+    import api_strategic
+
+    store = AnalysisStore(":memory:")
+    analysis_id = store.save({"project_id": "p-1", "project_title": "مشروع"})
+    with _installed_store(store):
+        client = TestClient(api_strategic.app)
+        response = client.post("/export/pdf", json={"analysis_id": analysis_id})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert f"strategic_analysis_{analysis_id}.pdf" in response.headers["content-disposition"]
+        assert response.content.startswith(b"%PDF-")
+        assert not os.path.exists(f"/tmp/strategic_analysis_{analysis_id}.pdf")
+
+        assert client.post("/export/pdf", json={"analysis_id": "missing"}).status_code == 404
+
+
+def test_export_with_analyze_header():
+    """معرّف X-Analysis-Id من /analyze (كما تمرره واجهة tRPC) يكفي لتصدير التحليل"""
+    from fastapi.testclient import TestClient
+
+    import api_strategic
+
+    project = {
+        'title': 'منصة تعليمية', 'description': 'منصة تعليم إلكتروني', 'budget': '250000',
+        'team_size': '4', 'timeline_months': '9', 'market_demand': '70',
+        'technical_feasibility': '80', 'user_engagement': '60', 'hypothesis_validation_rate': '0.6',
+        'rat_completion_rate': '0.5', 'user_count': '1200', 'revenue_growth': '0.2'
+    }
+    with _installed_store(AnalysisStore(":memory:")):
+        client = TestClient(api_strategic.app)
+        analysis_id = client.post("/analyze", json=project).headers["X-Analysis-Id"]
+        for endpoint in ("/export/pdf", "/export/excel"):
+            response = client.post(endpoint, json={"analysis_id": analysis_id})
+            assert response.status_code == 200, endpoint
+            assert analysis_id in response.headers["content-disposition"]
+
+
+def test_render_excel_in_memory():
+    """تقرير Excel لتحليل واحد يُنشأ في الذاكرة بجميع أوراقه"""
+    workbook = load_workbook(BytesIO(render_excel(_report_data(1)[0])))
+    assert workbook.sheetnames[0] == "Executive Summary"
+    assert len(workbook.sheetnames) == 6
+
+
+def test_iter_analyses_batches():
+    """قراءة المخزن على دفعات تعيد كل التحليلات مرة واحدة، أو أحدث تحليل لكل مشروع"""
+    store = _portfolio_store(23, 5)
+    everything = [analysis_id for analysis_id, _, _ in store.iter_analyses()]
+    assert everything == [f"a{i:06d}" for i in range(23)]
+    assert [a for a, _, _ in store.iter_analyses(batch_size=4)] == everything
+
+    latest = list(store.iter_analyses(latest_per_project=True, batch_size=2))
+    assert [analysis["project_id"] for _, _, analysis in latest] == [f"p{i:05d}" for i in range(5)]
+    assert [analysis_id for analysis_id, _, _ in latest] == ["a000020", "a000021", "a000022", "a000018", "a000019"]
+
+
+def test_portfolio_workbook():
+    """مصنف المحفظة: صف لكل مشروع بأنماط مسماة وقيم مطابقة لبيانات التقرير"""
+    store = _portfolio_store(60, 20)
+    output = BytesIO()
+    assert write_portfolio_excel(store.iter_analyses(latest_per_project=True), output) == 20
+
+    ws = load_workbook(BytesIO(output.getvalue())).active
+    assert ws.max_row == 21 and ws.max_column == len(PORTFOLIO_COLUMNS)
+    assert [cell.value for cell in ws[1]] == [title for title, _, _ in PORTFOLIO_COLUMNS]
+    assert ws.freeze_panes == "A2" and ws.auto_filter.ref == "A1:R21"
+    assert ws["A1"].style == "portfolio_header"
+
+    analysis_id, _, analysis = next(store.iter_analyses(latest_per_project=True))
+    data = to_report_data(analysis)
+    row = {title: cell for (title, _, _), cell in zip(PORTFOLIO_COLUMNS, ws[2])}
+    assert row["Analysis ID"].value == analysis_id
+    assert row["IRL Score"].value == data["irl_score"]
+    assert row["IRL Score"].style == "portfolio_score"
+    assert row["Success Probability"].number_format == "0.0%"
+    assert row["CEO Insights"].value == len(data["ceo_insights"])
+
+    streamed = b"".join(stream_portfolio_excel(store.iter_analyses(), chunk_size=4096))
+    assert load_workbook(BytesIO(streamed)).active.max_row == 61
+
+
+def test_portfolio_keeps_anonymous_analyses():
+    """التحليلات بلا معرّف مشروع (ومنها المحفوظة سابقاً تحت "unknown") صف لكل منها في المحفظة"""
+    document = _analyses(1)[0]
+    anonymous = {key: value for key, value in document.items() if key != "project_id"}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "store.sqlite3")
+        store = AnalysisStore(path)
+        store.save({**document, "project_id": "p-1"}, analysis_id="named-1")
+        store.save({**document, "project_id": "p-1"}, analysis_id="named-2")
+        store.save(anonymous, analysis_id="new-1")
+        # صفوف بالشكل القديم: كل التحليلات المجهولة في سجل واحد
+        for i in range(3):
+            store.save_json(dumps(document), "p-legacy", analysis_id=f"legacy-{i}")
+        store._conn.execute("UPDATE analyses SET project_id = 'unknown' WHERE project_id = 'p-legacy'")
+        store.close()
+
+        store = AnalysisStore(path)
+        latest = sorted(analysis_id for analysis_id, _, _ in store.iter_analyses(latest_per_project=True))
+        assert latest == ["legacy-0", "legacy-1", "legacy-2", "named-2", "new-1"]
+        output = BytesIO()
+        assert write_portfolio_excel(store.iter_analyses(latest_per_project=True), output) == 5
+        store.close()
+
+
+def test_portfolio_memory_is_bounded():
+    """ذاكرة تصدير المحفظة لا تنمو مع عدد الصفوف"""
+    peaks = {}
+    for n in (1000, 4000):
+        store = _portfolio_store(n, n)
+        tracemalloc.start()
+        size = sum(len(chunk) for chunk in stream_portfolio_excel(store.iter_analyses()))
+        peaks[n] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert size > 0
+    assert peaks[4000] < 1.25 * peaks[1000]
+    print(f"     ذروة الذاكرة: {peaks[1000] / 1e6:.1f} MB لـ 1000 صف، {peaks[4000] / 1e6:.1f} MB لـ 4000 صف")
+
+
+def test_export_excel_endpoints():
+    """نقطتا /export/excel و /export/portfolio/excel ترسلان ملفات xlsx مباشرة"""
+    from fastapi.testclient import TestClient
+
+    import api_strategic
+
+    store = _portfolio_store(12, 4)
+    with _installed_store(store):
+        client = TestClient(api_strategic.app)
+        response = client.post("/export/excel", json={"analysis_id": "a000000"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == api_strategic.XLSX_MEDIA_TYPE
+        assert response.content.startswith(b"PK")
+        assert client.post("/export/excel", json={"analysis_id": "missing"}).status_code == 404
+
+        response = client.post("/export/portfolio/excel")
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        assert load_workbook(BytesIO(response.content)).active.max_row == 5
+
+        response = client.post("/export/portfolio/excel", json={"all_analyses": True})
+        assert load_workbook(BytesIO(response.content)).active.max_row == 13
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تصدير التقارير...")
+    print("=" * 70)
+    for test in (
+        test_shared_pdf_exporter,
+        test_render_pdf_in_memory,
+        test_export_pdf_endpoint,
+        test_export_with_analyze_header,
+        test_render_excel_in_memory,
+        test_iter_analyses_batches,
+        test_portfolio_workbook,
+        test_portfolio_keeps_anonymous_analyses,
+        test_portfolio_memory_is_bounded,
+        test_export_excel_endpoints
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,194 @@
+"""
+اختبار التسلسل السريع لنتائج التحليل (result_serializer)
+المخرجات مطابقة لما يرسله FastAPI، وفئات البيانات مضغوطة بـ __slots__
+"""
+
+import dataclasses
+import datetime
+import json
+import uuid
+import warnings
+
+import numpy as np
+
+import result_serializer
+from actionable_roadmap_engine import ActionableRoadmap, ActionableRoadmapEngine, TacticalMove
+from ceo_insights_engine import CEOInsightsOutput, CriticalInsight
+from investment_simulator import InvestmentScenario, InvestorReadinessLevel, InvestorType
+from result_serializer import dumps
+from strategic_bridge_protocol import StrategicAnalysisResult, StrategicBridgeProtocol
+from strategic_dashboard_generator import (
+    DashboardVisualization,
+    InnovationConfidenceIndex,
+    StrategicDashboard
+)
+
+
+def _results(n=20):
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        projects = json.load(f)[:n]
+    bridge = StrategicBridgeProtocol()
+    return [bridge.analyze_project(dict(project)) for project in projects]
+
+
+def _both_paths(obj, **kwargs):
+    outputs = [dumps(obj, **kwargs)]
+    available = result_serializer.ORJSON_AVAILABLE
+    result_serializer.ORJSON_AVAILABLE = False
+    try:
+        outputs.append(dumps(obj, **kwargs))
+    finally:
+        result_serializer.ORJSON_AVAILABLE = available
+    return outputs
+
+
+def test_matches_fastapi_encoding():
+    """مخرجات dumps (orjson والوحدة json) مطابقة لترميز FastAPI الافتراضي للنتيجة"""
+    from fastapi.encoders import jsonable_encoder
+
+    for result in _results():
+        expected = jsonable_encoder(result)
+        for output in _both_paths(result):
+            assert json.loads(output) == expected
+
+
+def test_enums_tuples_and_numpy():
+    """القيم التعدادية تُسلسل بقيمها، والصفوف والقيم العددية من NumPy كقوائم وأرقام"""
+    scenario = InvestmentScenario(
+        scenario_name="seed",
+        probability=np.float64(0.4),
+        funding_amount=np.int64(500000),
+        equity_dilution=0.15,
+        post_money_valuation=3.0e6,
+        investor_type=InvestorType.VC_SEED,
+        timeline_months=6,
+        conditions=["شرط"]
+    )
+    payload = {"scenario": scenario, "range": (1.0, 2.0), "scores": np.array([1.5, 2.5])}
+    for output in _both_paths(payload):
+        document = json.loads(output)
+        assert document["scenario"]["investor_type"] == InvestorType.VC_SEED.value
+        assert document["scenario"]["funding_amount"] == 500000
+        assert document["range"] == [1.0, 2.0]
+        assert document["scores"] == [1.5, 2.5]
+        assert "شرط" in output.decode("utf-8")
+
+    indented = _both_paths({"a": [1, {"b": "ج"}]}, indent=True)
+    assert indented[0] == indented[1] == json.dumps(
+        {"a": [1, {"b": "ج"}]}, ensure_ascii=False, indent=2
+    ).encode("utf-8")
+
+
+def test_json_fallback_matches_orjson():
+    """مسار الوحدة json يطابق orjson: NaN واللانهاية null، والمفاتيح غير النصية نصوص، والأنواع المجهولة str"""
+    scenario = InvestmentScenario(
+        scenario_name="nan",
+        probability=float("nan"),
+        funding_amount=np.float64("inf"),
+        equity_dilution=np.float32("nan"),
+        post_money_valuation=-float("inf"),
+        investor_type=InvestorType.ANGEL,
+        timeline_months=6,
+        conditions=[]
+    )
+    payload = {
+        "scenario": scenario,
+        "scores": np.array([np.nan, 1.5]),
+        "pair": (float("nan"), 2),
+        "by_year": {2024: 1.0, 2.5: "x", None: True},
+        "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 600),
+        "day": datetime.date(2024, 1, 2),
+        "id": uuid.UUID(int=1),
+        "tags": {"ب"}
+    }
+    expected = {
+        "scenario": {
+            "scenario_name": "nan",
+            "probability": None,
+            "funding_amount": None,
+            "equity_dilution": None,
+            "post_money_valuation": None,
+            "investor_type": InvestorType.ANGEL.value,
+            "timeline_months": 6,
+            "conditions": []
+        },
+        "scores": [None, 1.5],
+        "pair": [None, 2],
+        "by_year": {"2024": 1.0, "2.5": "x", "null": True},
+        "created_at": "2024-01-02T03:04:05.000600",
+        "day": "2024-01-02",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "tags": "{'ب'}"
+    }
+    outputs = _both_paths(payload)
+    assert outputs[0] == outputs[1]
+    assert json.loads(outputs[1]) == expected
+
+    # بدون orjson: القيم المنتهية لا تُنسخ، والاستثناءات الأخرى تمر كما هي
+    available = result_serializer.ORJSON_AVAILABLE
+    result_serializer.ORJSON_AVAILABLE = False
+    try:
+        assert dumps({"value": 1.5}) == b'{"value":1.5}'
+        circular = []
+        circular.append(circular)
+        try:
+            dumps(circular)
+            assert False, "ValueError expected"
+        except ValueError as exc:
+            assert "Circular" in str(exc)
+    finally:
+        result_serializer.ORJSON_AVAILABLE = available
+
+
+def test_result_dataclasses_are_slotted():
+    """فئات بيانات النتائج تستخدم __slots__ (بدون قاموس سمات لكل كائن)"""
+    for cls in (
+        CriticalInsight,
+        CEOInsightsOutput,
+        TacticalMove,
+        ActionableRoadmap,
+        InvestorReadinessLevel,
+        InvestmentScenario,
+        InnovationConfidenceIndex,
+        DashboardVisualization,
+        StrategicDashboard,
+        StrategicAnalysisResult
+    ):
+        assert "__slots__" in cls.__dict__, cls.__name__
+        instance = cls(*([None] * len(dataclasses.fields(cls))))
+        assert not hasattr(instance, "__dict__"), cls.__name__
+
+
+def test_roadmap_moves_without_asdict():
+    """تحويل الخطوات التكتيكية مطابق لـ asdict ولا يشارك قوائم خرائط الطريق المحفوظة"""
+    engine = ActionableRoadmapEngine()
+    insight = {
+        "category": "financial_risk",
+        "severity": "high",
+        "title": "فجوة تمويلية",
+        "feature_name": "budget",
+        "feature_value": 150000
+    }
+    roadmap = engine.generate_roadmap(insight, sector="fintech", organization="منشأة")
+    roadmap_dict = engine.to_dict(roadmap)
+    assert roadmap_dict["tactical_moves"] == [dataclasses.asdict(m) for m in roadmap.tactical_moves]
+
+    roadmap_dict["tactical_moves"][0]["deliverables"].append("تعديل")
+    cached = engine.generate_roadmap(insight, sector="fintech", organization="منشأة")
+    assert engine.to_dict(cached) != roadmap_dict
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار التسلسل السريع لنتائج التحليل...")
+    print("=" * 70)
+    for test in (
+        test_matches_fastapi_encoding,
+        test_enums_tuples_and_numpy,
+        test_json_fallback_matches_orjson,
+        test_result_dataclasses_are_slotted,
+        test_roadmap_moves_without_asdict
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,128 @@
+"""
+اختبار قاعدة معرفة ISO 56002 المحمّلة من ملف البيانات وذاكرة خرائط الطريق المُولَّدة
+في ActionableRoadmapEngine
+"""
+
+import json
+import os
+import tempfile
+import warnings
+
+from actionable_roadmap_engine import (
+    KNOWLEDGE_BASE_PATH,
+    ActionableRoadmapEngine,
+    ISO56002KnowledgeBase
+)
+from ceo_insights_engine import TranslationDictionary
+
+SECTORS = ["fintech", "tourism", "unknown_sector"]
+
+
+def _insights():
+    """رؤية لكل قالب في SHAP_TO_CEO_MAPPING مع قيم ميزات مختلفة"""
+    for feature_name, classes in TranslationDictionary.SHAP_TO_CEO_MAPPING.items():
+        for template in classes.values():
+            for feature_value in (150000, 400000, 0.3):
+                yield {
+                    "category": template["category"],
+                    "severity": template["severity"],
+                    "title": template["title"],
+                    "feature_name": feature_name,
+                    "feature_value": feature_value
+                }
+
+
+def test_knowledge_base_index():
+    """الفهرس يغطي كل أنواع المخاطر وقالبها الافتراضي هو أول قالب في الملف"""
+    kb = ISO56002KnowledgeBase()
+    engine = ActionableRoadmapEngine(kb)
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert kb.version == data["version"]
+
+    for insight in _insights():
+        risk_type = engine._map_category_to_risk_type(insight["category"])
+        templates = data["best_practices"][risk_type]["tactical_moves_templates"]
+        first_key = list(templates)[0]
+        assert kb.default_template_keys[risk_type] == first_key
+        assert kb.move_templates(risk_type) == templates[first_key]
+    assert kb.move_templates("unknown_risk") == []
+
+
+def test_unsupported_schema_rejected():
+    """ملف بإصدار مخطط غير مدعوم يُرفض"""
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["schema_version"] = 999
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(data, f)
+    try:
+        ISO56002KnowledgeBase(f.name)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    finally:
+        os.unlink(f.name)
+
+
+def test_cached_roadmaps_match_fresh():
+    """خرائط الطريق المحفوظة تطابق التوليد الكامل لكل رؤية وقطاع"""
+    cached = ActionableRoadmapEngine()
+    fresh = ActionableRoadmapEngine(cache_size=0)
+
+    for _ in range(2):
+        for insight in _insights():
+            for sector in SECTORS:
+                expected = fresh.to_dict(fresh.generate_roadmap(insight, sector, "startup"))
+                assert cached.to_dict(cached.generate_roadmap(insight, sector, "startup")) == expected
+
+    stats = cached.cache_stats()
+    assert stats["hits"] >= stats["misses"] > 0
+    assert fresh.cache_stats()["entries"] == 0
+
+
+def test_budget_value_in_cache_key():
+    """قيمة الميزانية تدخل في المفتاح لأنها تحدد هدف التمويل في معايير النجاح"""
+    engine = ActionableRoadmapEngine()
+    insight = next(i for i in _insights() if i["feature_name"] == "budget")
+    low = engine.generate_roadmap(dict(insight, feature_value=100000), "fintech", "startup")
+    high = engine.generate_roadmap(dict(insight, feature_value=900000), "fintech", "startup")
+    assert low.success_metrics[0] != high.success_metrics[0]
+    assert engine.generate_roadmap(dict(insight, feature_value=100000), "fintech", "startup") is low
+
+
+def test_bridge_reuses_cached_roadmap():
+    """تحليل المشروع نفسه مرتين عبر البروتوكول يولد خارطة الطريق مرة ويعيدها من الذاكرة"""
+    from strategic_bridge_protocol import StrategicBridgeProtocol
+
+    bridge = StrategicBridgeProtocol()
+    project = {"id": "roadmap-1", "title": "مشروع", "budget": "90000", "team_size": "2", "sector": "fintech"}
+    shap_values = {"budget": -0.35, "hypothesis_validation_rate": -0.42, "market_demand": -0.05}
+
+    first = bridge.analyze_project(dict(project), shap_values=dict(shap_values))
+    after_first = bridge.roadmap_engine.cache_stats()
+    second = bridge.analyze_project(dict(project), shap_values=dict(shap_values))
+    after_second = bridge.roadmap_engine.cache_stats()
+
+    assert first.actionable_roadmap["roadmap_id"] != "default"
+    assert first.actionable_roadmap["tactical_moves"]
+    assert second.actionable_roadmap == first.actionable_roadmap
+    assert after_first["misses"] > 0
+    assert after_second["misses"] == after_first["misses"]
+    assert after_second["hits"] > after_first["hits"]
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار قاعدة معرفة ISO 56002 وذاكرة خرائط الطريق...")
+    print("=" * 70)
+    for test in (
+        test_knowledge_base_index,
+        test_unsupported_schema_rejected,
+        test_cached_roadmaps_match_fresh,
+        test_budget_value_in_cache_key,
+        test_bridge_reuses_cached_roadmap
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
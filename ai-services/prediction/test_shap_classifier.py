@@ -0,0 +1,142 @@
+"""
+اختبار تصنيف SHAP المعتمد على جدول العتبات والتصنيف الدفعي (classify_batch)
+وتطابق رؤى المحفظة الدفعية مع generate_ceo_insights مشروعاً بمشروع
+"""
+
+import warnings
+
+import numpy as np
+
+from ceo_insights_engine import CEOInsightsEngine, SHAPClassifier, SHAP_THRESHOLD_TABLE
+
+FEATURES = [
+    "budget",
+    "team_size",
+    "market_demand",
+    "technical_feasibility",
+    "hypothesis_validation_rate",
+    "rat_completion_rate",
+    "competitive_advantage",
+    "user_count"
+]
+SECTORS = ["fintech", "digital_health", "smart_agriculture", "tourism", "unknown_sector"]
+
+
+def _legacy_classify(shap_value, feature_name):
+    """سلسلة if/elif الأصلية قبل جدول العتبات"""
+    abs_value = abs(shap_value)
+    sign = "negative" if shap_value < 0 else "positive"
+    if feature_name in ["hypothesis_validation_rate", "rat_completion_rate"]:
+        if abs_value > 0.35:
+            return f"{sign}_high"
+        elif abs_value > 0.20:
+            return f"{sign}_medium"
+        elif abs_value > 0.10:
+            return f"{sign}_low"
+    elif feature_name == "budget":
+        if abs_value > 0.30:
+            return f"{sign}_high"
+        elif abs_value > 0.15:
+            return f"{sign}_medium"
+        elif abs_value > 0.08:
+            return f"{sign}_low"
+    elif feature_name in ["market_demand", "competitive_advantage"]:
+        if abs_value > 0.25:
+            return f"{sign}_high"
+        elif abs_value > 0.15:
+            return f"{sign}_medium"
+        elif abs_value > 0.08:
+            return f"{sign}_low"
+    elif feature_name == "team_size":
+        if abs_value > 0.20:
+            return f"{sign}_medium"
+        elif abs_value > 0.10:
+            return f"{sign}_low"
+    elif feature_name == "technical_feasibility":
+        if abs_value > 0.25:
+            return f"{sign}_high"
+        elif abs_value > 0.15:
+            return f"{sign}_medium"
+    return "neutral"
+
+
+def _shap_matrix(n, seed=3):
+    """قيم عشوائية مع قيم تساوي العتبات تماماً (بالموجب والسالب)"""
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(-0.5, 0.5, (n, len(FEATURES)))
+    bounds = sorted({b for rule in SHAP_THRESHOLD_TABLE for b in rule.bounds} | {0.05, 0.0})
+    edges = np.array(bounds + [-b for b in bounds])
+    mask = rng.random(matrix.shape) < 0.3
+    matrix[mask] = edges[rng.integers(len(edges), size=int(mask.sum()))]
+    return matrix
+
+
+def test_table_matches_legacy_chain():
+    """جدول العتبات يطابق سلسلة if/elif الأصلية بما فيها القيم الحدية"""
+    matrix = _shap_matrix(2000)
+    for row in matrix:
+        for feature_name, shap_value in zip(FEATURES, row):
+            assert SHAPClassifier.classify_shap_impact(shap_value, feature_name) == \
+                _legacy_classify(shap_value, feature_name), (feature_name, shap_value)
+
+
+def test_batch_matches_scalar():
+    """التصنيف الدفعي لمصفوفة N×F يطابق classify_shap_impact لكل خلية"""
+    matrix = _shap_matrix(2000, seed=8)
+    matrix[0, 0] = np.nan
+    impact = SHAPClassifier.classify_batch(matrix, FEATURES)
+    assert impact.shape == matrix.shape
+    for i, row in enumerate(matrix):
+        for j, (feature_name, shap_value) in enumerate(zip(FEATURES, row)):
+            assert impact[i, j] == SHAPClassifier.classify_shap_impact(shap_value, feature_name), (i, j)
+
+
+def test_batch_insights_match_scalar():
+    """رؤى المحفظة الدفعية تطابق generate_ceo_insights لكل مشروع"""
+    n = 500
+    matrix = _shap_matrix(n, seed=13)
+    rng = np.random.default_rng(21)
+    feature_values = [
+        {
+            "budget": float(rng.uniform(10_000, 3_000_000)),
+            "team_size": int(rng.integers(1, 15)),
+            "market_demand": float(rng.uniform(0, 100)),
+            "technical_feasibility": float(rng.uniform(0, 100)),
+            "hypothesis_validation_rate": float(rng.uniform(0, 1)),
+            "rat_completion_rate": float(rng.uniform(0, 1))
+        }
+        for _ in range(n)
+    ]
+    sectors = [SECTORS[k] for k in rng.integers(len(SECTORS), size=n)]
+    probabilities = rng.uniform(0, 100, n).tolist()
+
+    engine = CEOInsightsEngine()
+    batch = engine.generate_ceo_insights_batch(
+        matrix, FEATURES, feature_values, sectors, ["startup"] * n, probabilities
+    )
+    candidates = engine.critical_insight_candidates(matrix, FEATURES)
+    assert (candidates["shap_value"] < -0.05).all()
+
+    for i in range(n):
+        expected = engine.generate_ceo_insights(
+            shap_values=dict(zip(FEATURES, matrix[i].tolist())),
+            feature_values=feature_values[i],
+            sector=sectors[i],
+            organization="startup",
+            success_probability=probabilities[i]
+        )
+        assert engine.to_dict(batch[i]) == engine.to_dict(expected), i
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تصنيف SHAP الدفعي...")
+    print("=" * 70)
+    for test in (
+        test_table_matches_legacy_chain,
+        test_batch_matches_scalar,
+        test_batch_insights_match_scalar
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,217 @@
+"""
+اختبار تتبع مراحل خط التحليل (stage_tracing)
+تداخل الامتدادات ومعرّفات الآباء عبر السياقات، ومعدل العينة، وحد المخزن، وتصدير Chrome
+"""
+
+import contextvars
+import json
+import threading
+import warnings
+
+from stage_tracing import StageTracer, traced, tracer
+
+
+def _spans(trace):
+    return {span.name: span for span in trace.spans}
+
+
+def test_span_nesting():
+    """الامتدادات المتداخلة تسجل معرّف الأب، والسياق يعود للأب بعد الخروج"""
+    local = StageTracer(sample_rate=1.0)
+    with local.trace("root") as handle:
+        with local.span("outer"):
+            with local.span("inner", rows=3):
+                local.annotate(cache_hit=True)
+            with local.span("sibling"):
+                pass
+        assert local.active
+    assert not local.active
+
+    trace, = local.recent_traces()
+    spans = _spans(trace)
+    assert spans["root"].parent_id is None and spans["root"].args["trace_id"] == trace.trace_id
+    assert spans["outer"].parent_id == spans["root"].span_id
+    assert spans["inner"].parent_id == spans["outer"].span_id
+    assert spans["sibling"].parent_id == spans["outer"].span_id
+    assert spans["inner"].args == {"rows": 3, "cache_hit": True}
+    assert spans["root"].start_us <= spans["outer"].start_us <= spans["inner"].start_us
+    assert spans["inner"].end_us <= spans["outer"].end_us <= spans["root"].end_us
+    assert handle.root is spans["root"]
+
+
+def test_parents_across_contexts():
+    """المقبض المستأنف في خيط آخر أو مولّد أو سياق منسوخ يربط الامتدادات بالجذر نفسه"""
+    local = StageTracer(sample_rate=1.0)
+    handle = local.begin("pipeline")
+
+    def worker():
+        with local.stage(handle, "thread_stage"):
+            with local.span("thread_child"):
+                pass
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    def stages():
+        with local.stage(handle, "generator_stage"):
+            pass
+        yield "first"
+        with local.stage(handle, "after_yield"):
+            pass
+        yield "second"
+
+    assert list(stages()) == ["first", "second"]
+
+    def copied():
+        with local.stage(handle, "copied_context"):
+            pass
+    contextvars.copy_context().run(copied)
+
+    # خارج المقبض لا يوجد تتبع نشط في السياق الحالي
+    assert not local.active
+    with local.span("orphan") as span:
+        assert span is None
+    local.end(handle)
+
+    trace, = local.recent_traces()
+    spans = _spans(trace)
+    root_id = spans["pipeline"].span_id
+    for name in ("thread_stage", "generator_stage", "after_yield", "copied_context"):
+        assert spans[name].parent_id == root_id, name
+    assert spans["thread_child"].parent_id == spans["thread_stage"].span_id
+    assert spans["thread_stage"].thread_id != spans["pipeline"].thread_id
+    assert "orphan" not in spans
+
+    # begin() داخل تتبع نشط يفتح امتداداً فرعياً لا تتبعاً جديداً
+    with local.trace("outer") as outer:
+        child = local.begin("nested")
+        assert not child.owned and child.trace is outer.trace
+        assert child.root.parent_id == outer.root.span_id
+        local.end(child)
+    assert len(local.recent_traces()) == 2
+
+
+def test_sample_rate():
+    """معدل 0 لا يسجل شيئاً (والمزخرف يمرر الاستدعاء)، ومعدل 1 يسجل كل تتبع"""
+    @traced("scaled")
+    def scale(values, factor=2):
+        return [v * factor for v in values]
+
+    off = StageTracer(sample_rate=0.0)
+    for _ in range(50):
+        with off.trace("request") as handle:
+            assert handle is None
+    assert off.recent_traces() == []
+    with off.trace("forced", force=True) as handle:
+        assert handle is not None
+    assert len(off.recent_traces()) == 1
+
+    on = StageTracer(sample_rate=1.0)
+    for _ in range(50):
+        with on.trace("request"):
+            pass
+    assert len(on.recent_traces()) == 50
+
+    assert StageTracer(sample_rate=7).sample_rate == 1.0
+    assert StageTracer(sample_rate=-1).sample_rate == 0.0
+
+    # المزخرف يستخدم المتتبع العام: بلا تتبع نشط لا امتدادات
+    tracer.clear()
+    assert scale([1, 2, 3]) == [2, 4, 6]
+    with tracer.trace("decorated", force=True):
+        assert scale([1, 2, 3], factor=3) == [3, 6, 9]
+    trace, = tracer.recent_traces()
+    span = _spans(trace)["scaled"]
+    assert span.category == "call" and span.args == {"values": 3}
+    tracer.clear()
+
+
+def test_buffer_bound():
+    """المخزن يحتفظ بأحدث التتبعات فقط، ويمكن تغيير حجمه أثناء التشغيل"""
+    local = StageTracer(sample_rate=1.0, max_traces=5)
+    for i in range(12):
+        with local.trace(f"t{i}"):
+            pass
+    assert [trace.name for trace in local.recent_traces()] == [f"t{i}" for i in range(7, 12)]
+    assert [trace.name for trace in local.recent_traces(limit=2)] == ["t10", "t11"]
+
+    local.configure(max_traces=2)
+    assert [trace.name for trace in local.recent_traces()] == ["t10", "t11"]
+    local.clear()
+    assert local.recent_traces() == []
+
+
+def test_capture_and_adopt():
+    """امتدادات مسجلة بمعزل (كما في عملية عامل) تُضاف تحت الامتداد الحالي بمعرّفات جديدة"""
+    import pickle
+
+    local = StageTracer(sample_rate=0.0)
+    with local.capture("worker", pid=1) as handle:
+        assert local.active
+        with local.span("work"):
+            pass
+    assert local.recent_traces() == []
+    spans = pickle.loads(pickle.dumps(handle.trace.spans))
+    old_ids = {span.span_id for span in spans}
+
+    # خارج تتبع نشط تُهمل الامتدادات
+    local.adopt(spans)
+    with local.trace("parent", force=True):
+        with local.span("parallel") as parallel:
+            local.adopt(spans)
+            local.adopt(None)
+
+    trace, = local.recent_traces()
+    named = _spans(trace)
+    assert named["worker"].parent_id == parallel.span_id
+    assert named["work"].parent_id == named["worker"].span_id
+    assert not old_ids & {named["worker"].span_id, named["work"].span_id}
+    assert len({span.span_id for span in trace.spans}) == len(trace.spans) == 4
+    assert named["worker"].args == {"pid": 1}
+
+
+def test_chrome_trace_export():
+    """التصدير أحداث Chrome كاملة (ph=X) مرتبة زمنياً مع معرّفات التتبع والآباء"""
+    local = StageTracer(sample_rate=1.0)
+    with local.trace("analyze_project", project_id="p-1"):
+        with local.span("stage:ceo_insights"):
+            with local.span("CEOInsightsEngine.generate_insights", "call"):
+                pass
+
+    exported = json.loads(json.dumps(local.export_chrome_trace()))
+    assert exported["displayTimeUnit"] == "ms"
+    events = exported["traceEvents"]
+    assert [event["name"] for event in events] == [
+        "analyze_project", "stage:ceo_insights", "CEOInsightsEngine.generate_insights"
+    ]
+    trace_id = local.recent_traces()[0].trace_id
+    for event in events:
+        assert event["ph"] == "X" and event["dur"] >= 0
+        assert set(event) == {"name", "cat", "ph", "ts", "dur", "pid", "tid", "args"}
+        assert event["args"]["trace_id"] == trace_id
+    assert [event["cat"] for event in events] == ["trace", "stage", "call"]
+    assert "parent_id" not in events[0]["args"]
+    assert events[1]["args"]["parent_id"] == events[0]["args"]["span_id"]
+    assert events[2]["args"]["parent_id"] == events[1]["args"]["span_id"]
+    assert events[0]["args"]["project_id"] == "p-1"
+    assert events[0]["ts"] <= events[1]["ts"] <= events[2]["ts"]
+
+    assert local.export_chrome_trace([])["traceEvents"] == []
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تتبع مراحل خط التحليل...")
+    print("=" * 70)
+    for test in (
+        test_span_nesting,
+        test_parents_across_contexts,
+        test_sample_rate,
+        test_buffer_bound,
+        test_capture_and_adopt,
+        test_chrome_trace_export
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
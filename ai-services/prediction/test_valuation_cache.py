@@ -0,0 +1,147 @@
+"""
+اختبار الذاكرة المؤقتة لتقديرات التقييم والتمويل (ValuationCache)
+وضع الجدول يطابق وضع الحفظ، والخطأ محدود بدقة التقريب
+"""
+
+import warnings
+
+import numpy as np
+
+from investment_simulator import (
+    InvestmentSimulator,
+    KNOWN_SECTORS,
+    KNOWN_STAGES,
+    estimate_funding_potential,
+    estimate_valuation_range
+)
+from valuation_cache import ValuationCache
+
+
+def _random_inputs(n, seed=4):
+    rng = np.random.default_rng(seed)
+    sectors = KNOWN_SECTORS + ("قطاع غير معروف",)
+    stages = KNOWN_STAGES + ("unknown_stage",)
+    for _ in range(n):
+        yield (
+            float(rng.uniform(-5, 105)),
+            sectors[rng.integers(len(sectors))],
+            stages[rng.integers(len(stages))],
+            float(rng.uniform(-0.2, 3.5))
+        )
+
+
+def test_table_matches_memo():
+    """وضع الجدول يعطي نفس نتيجة وضع الحفظ عند نفس الدقة"""
+    memo = ValuationCache("memo", irl_precision=0.1, growth_precision=0.05)
+    table = ValuationCache("table", irl_precision=0.1, growth_precision=0.05)
+    for inputs in _random_inputs(5000):
+        assert table.estimate(*inputs) == memo.estimate(*inputs), inputs
+    # المدخلات خارج الجدول (IRL سالب أو نمو يتجاوز 300%) تمر عبر وضع الحفظ
+    assert table.stats()["hit_rate"] > 0.5
+
+
+def test_exact_at_bucket_centres():
+    """عند مراكز الفئات تطابق النتيجة الحساب المباشر تماماً"""
+    cache = ValuationCache("memo", irl_precision=0.5, growth_precision=0.1)
+    for i in range(0, 201, 7):
+        for j in range(0, 30, 3):
+            irl, growth = i * 0.5, j * 0.1
+            valuation = estimate_valuation_range(irl, "fintech", "seed", growth)
+            expected = (valuation, estimate_funding_potential(irl, valuation, "seed"))
+            assert cache.estimate(irl, "fintech", "seed", growth) == expected
+
+
+def test_error_bounded_by_precision():
+    """خطأ التقييم النسبي محدود بنصف عرض الفئة"""
+    cache = ValuationCache("memo")
+    for irl, sector, stage, growth in _random_inputs(5000, seed=9):
+        valuation, _ = cache.estimate(irl, sector, stage, growth)
+        exact = estimate_valuation_range(irl, sector, stage, growth)
+        # d(valuation)/valuation <= 1.5 * dIRL/100 / 0.5 + 0.5 * dGrowth / (1 + 0.5 * growth)
+        bound = 1.5 * cache.irl_precision / 2 / 100 / (0.5 + max(irl, 0) / 100 * 1.5) + \
+            0.5 * cache.growth_precision / 2 / max(1 + 0.5 * growth, 0.5)
+        assert abs(valuation[0] - exact[0]) <= abs(exact[0]) * bound * 1.01 + 1e-6, (irl, growth)
+
+
+def test_funding_thresholds_use_exact_irl():
+    """مضاعفات التمويل عند حدي IRL 50 و 80 تُطبق على الدرجة الفعلية لا على مركز الفئة"""
+    for mode in ("memo", "table"):
+        cache = ValuationCache(mode)
+        for irl in (49.96, 49.99, 50.0, 50.04, 79.96, 80.0, 80.01, 80.04):
+            for growth in (0.0, 0.3):
+                valuation, funding = cache.estimate(irl, "fintech", "seed", growth)
+                assert funding == estimate_funding_potential(irl, valuation, "seed"), (mode, irl)
+                # نسبة التمويل إلى التقييم مطابقة للحساب المباشر (نفس جانب الحد)
+                exact_valuation = estimate_valuation_range(irl, "fintech", "seed", growth)
+                exact_funding = estimate_funding_potential(irl, exact_valuation, "seed")
+                assert abs(funding[0] / valuation[0] - exact_funding[0] / exact_valuation[0]) < 1e-12, (mode, irl)
+                assert abs(funding[0] - exact_funding[0]) <= exact_funding[0] * 0.002, (mode, irl)
+
+
+def test_simulator_uses_cache():
+    """calculate_irl يستخدم الذاكرة المؤقتة عند تمريرها"""
+    cache = ValuationCache("table")
+    simulator = InvestmentSimulator(valuation_cache=cache)
+    features = {"budget": 100000, "team_size": 4, "market_demand": 60, "revenue_growth": 0.3}
+    for _ in range(3):
+        simulator.calculate_irl(features, "fintech", "startup", "seed", 55)
+    assert cache.stats()["hits"] == 3
+
+
+def test_concurrent_hits_counted():
+    """عدادات الإصابة تبقى دقيقة عند الاستدعاء من عدة خيوط في الوضعين"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def lookups(cache):
+        for k in range(2000):
+            cache.valuation_range(40 + k % 20, "fintech", "seed", 0.3)
+
+    for mode in ("table", "memo"):
+        cache = ValuationCache(mode)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lookups, [cache] * 8))
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 8 * 2000
+
+
+
+def test_pool_workers_share_cache_settings():
+    """عمال What-If يستخدمون إعدادات الذاكرة المؤقتة نفسها: الدفعة المتوازية تطابق التنفيذ المتسلسل"""
+    from strategic_bridge_protocol import StrategicBridgeProtocol
+    from whatif_simulator import PARALLEL_MIN_SCENARIOS, WhatIfSimulator
+
+    baseline = {"title": "مشروع", "budget": "150000", "team_size": "3", "market_demand": "35",
+                "technical_feasibility": "75", "revenue_growth": "0.12"}
+    scenarios = [{"name": f"s{i}", "budget": f"+{50000 * i}", "revenue_growth": f"{0.1 * i:.2f}"}
+                 for i in range(PARALLEL_MIN_SCENARIOS)]
+
+    results = {}
+    for workers in (1, 2):
+        bridge = StrategicBridgeProtocol()
+        # دقة خشنة تجعل أي فرق بين التقييم المقرب والدقيق ظاهراً
+        bridge.investment_simulator.valuation_cache = ValuationCache("memo", irl_precision=5.0, growth_precision=0.5)
+        simulator = WhatIfSimulator(strategic_bridge=bridge, max_workers=workers)
+        try:
+            results[workers] = simulator.simulate_multiple_scenarios(baseline, scenarios)
+        finally:
+            simulator.shutdown()
+    assert [r["full_analysis"]["investor_readiness"] for r in results[1]] == \
+        [r["full_analysis"]["investor_readiness"] for r in results[2]]
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار الذاكرة المؤقتة لتقديرات التقييم...")
+    print("=" * 70)
+    for test in (
+        test_table_matches_memo,
+        test_exact_at_bucket_centres,
+        test_error_bounded_by_precision,
+        test_funding_thresholds_use_exact_irl,
+        test_simulator_uses_cache,
+        test_concurrent_hits_counted,
+        test_pool_workers_share_cache_settings
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
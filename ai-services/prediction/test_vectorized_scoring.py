@@ -0,0 +1,242 @@
+"""
+اختبار تطابق الحساب المتجه (vectorized_scoring) مع محركات ICI و IRL
+وتطابق WhatIfSimulator.sweep مع analyze_project نقطةً بنقطة
+وتطابق WhatIfSimulator.goal_seek مع البحث الشامل
+واتساق نطاقات WhatIfSimulator.simulate_uncertainty ومخطط WhatIfSimulator.sensitivity
+وحدود باريتو في ترتيب السيناريوهات
+"""
+
+import itertools
+import json
+import warnings
+
+import numpy as np
+
+from model_runtime import get_model_runtime
+from strategic_bridge_protocol import StrategicBridgeProtocol
+from vectorized_scoring import score_features
+from whatif_simulator import WhatIfSimulator
+
+TOLERANCE = 1e-9
+# XGBoost يحسب الاحتمالية بدقة float32 وقد تختلف بين حجم دفعة وآخر
+MODEL_TOLERANCE = 1e-6
+
+BASELINE = {
+    'title': 'مشروع تجريبي',
+    'description': 'وصف المشروع',
+    'budget': '150000',
+    'team_size': '3',
+    'timeline_months': '6',
+    'market_demand': '35',
+    'technical_feasibility': '75',
+    'user_engagement': '40',
+    'hypothesis_validation_rate': '0.2',
+    'rat_completion_rate': '0.3',
+    'user_count': '0',
+    'revenue_growth': '0'
+}
+
+
+def _analysis_scores(protocol, project):
+    result = protocol.analyze_project(project).to_dict()
+    return result['ici_score'], result['irl_score'], result['success_probability']
+
+
+def test_score_features_matches_engines():
+    """score_features يطابق analyze_project على عينات البيانات"""
+    with open("ideas_outcomes_seed_data.json", "r", encoding="utf-8") as f:
+        samples = json.load(f)[:100]
+
+    protocol = StrategicBridgeProtocol()
+    for sample in samples:
+        cleaned = protocol._clean_all_features(sample)
+        scores = score_features(
+            cleaned,
+            sector=cleaned.get('sector', 'fintech'),
+            organization=cleaned.get('organization', 'startup'),
+            success_probability=cleaned.get('success_probability', 50)
+        )
+        ici, irl, prob = _analysis_scores(protocol, sample)
+        assert abs(float(scores['ici_score']) - ici) < TOLERANCE, sample.get('id')
+        assert abs(float(scores['irl_score']) - irl) < TOLERANCE, sample.get('id')
+        assert abs(float(scores['success_probability']) - prob) < TOLERANCE, sample.get('id')
+
+
+def _check_sweep(simulator, tolerance=TOLERANCE):
+    ranges = {
+        'budget': (0, 2000000, 7),
+        'team_size': [2, 3, 4, 5, 8, 12],
+        'market_demand': (20, 90, 4)
+    }
+    sweep = simulator.sweep(BASELINE, ranges)
+    assert sweep['shape'] == [7, 6, 4]
+
+    ici = np.array(sweep['ici_score'])
+    irl = np.array(sweep['irl_score'])
+    prob = np.array(sweep['success_probability'])
+
+    for index in np.ndindex(*sweep['shape']):
+        point = dict(BASELINE)
+        for name, i in zip(sweep['features'], index):
+            point[name] = sweep['axes'][name][i]
+        expected = _analysis_scores(simulator.strategic_bridge, point)
+        assert abs(ici[index] - expected[0]) < tolerance, (index, ici[index], expected[0])
+        assert abs(irl[index] - expected[1]) < tolerance, (index, irl[index], expected[1])
+        assert abs(prob[index] - expected[2]) < tolerance, (index, prob[index], expected[2])
+
+    assert sweep['best']['ici_score'] == float(ici.max())
+
+
+def test_sweep_matches_analyze_project():
+    """الشبكة المتجهة تطابق التحليل الكامل لكل نقطة (بدون نموذج)"""
+    _check_sweep(WhatIfSimulator(max_workers=1))
+
+
+def test_sweep_with_model_matches_analyze_project():
+    """الشبكة المتجهة تطابق التحليل الكامل لكل نقطة (مع النموذج المدرب)"""
+    runtime = get_model_runtime()
+    if not runtime.available:
+        print("  ⏭️ النموذج غير متوفر - تم التخطي")
+        return
+    _check_sweep(
+        WhatIfSimulator(StrategicBridgeProtocol(model_runtime=runtime), max_workers=1),
+        tolerance=MODEL_TOLERANCE
+    )
+
+
+def test_goal_seek_matches_brute_force():
+    """goal_seek يجد أقل تكلفة يجدها البحث الشامل"""
+    from whatif_simulator import GOAL_SEEK_UPPER_BOUNDS
+
+    simulator = WhatIfSimulator(max_workers=1)
+    baseline = simulator.strategic_bridge._clean_all_features(BASELINE)
+    features = ['team_size', 'market_demand', 'technical_feasibility',
+                'hypothesis_validation_rate', 'user_engagement']
+    rng = np.random.default_rng(7)
+
+    for trial in range(6):
+        metric = ('ici_score', 'irl_score')[trial % 2]
+        target = float(rng.uniform(45, 65))
+        weights = {name: float(rng.uniform(0.1, 3)) for name in features}
+        result = simulator.goal_seek(BASELINE, target, metric=metric, cost_weights=weights, steps=4)
+
+        levels = [
+            simulator._goal_seek_levels(name, float(baseline[name]), GOAL_SEEK_UPPER_BOUNDS[name], 4)
+            for name in features
+        ]
+        combos = np.array(list(itertools.product(*[range(len(l)) for l in levels])))
+        columns = {name: levels[i][combos[:, i]] for i, name in enumerate(features)}
+        scores = simulator._score_points(baseline, columns, len(combos))[metric]
+        costs = sum(weights[name] * (columns[name] - levels[i][0]) for i, name in enumerate(features))
+
+        reached = scores >= target
+        assert result['reachable'] == bool(reached.any()), (metric, target)
+        if reached.any():
+            assert abs(result['cost'] - costs[reached].min()) < TOLERANCE, (metric, target)
+            assert result['achieved_score'] >= target - TOLERANCE
+
+
+def test_uncertainty_bands():
+    """نطاقات مونت كارلو متسقة وتطابق التحليل عند انعدام عدم اليقين"""
+    simulator = WhatIfSimulator(max_workers=1)
+    ici, irl, prob = _analysis_scores(simulator.strategic_bridge, BASELINE)
+
+    fixed = simulator.simulate_uncertainty(
+        BASELINE, {'market_demand': {'type': 'normal', 'std': 0}}, n_samples=100, seed=1
+    )
+    for band in fixed['ici_score']['bands'].values():
+        assert abs(band - ici) < TOLERANCE
+    for band in fixed['irl_score']['bands'].values():
+        assert abs(band - irl) < TOLERANCE
+
+    result = simulator.simulate_uncertainty(
+        BASELINE,
+        {
+            'market_demand': {'type': 'normal', 'std': 15, 'max': 100},
+            'revenue_growth': {'type': 'uniform', 'low': 0, 'high': 0.5},
+            'user_count': {'type': 'lognormal', 'median': 1000, 'sigma': 1}
+        },
+        n_samples=20000,
+        seed=1
+    )
+    for metric in ('ici_score', 'irl_score', 'success_probability'):
+        bands = list(result[metric]['bands'].values())
+        assert bands == sorted(bands), metric
+        assert result[metric]['min'] <= bands[0] and bands[-1] <= result[metric]['max']
+    assert result['inputs']['market_demand']['bands']['p95'] <= 100
+
+
+def test_sensitivity_matches_analyze_project():
+    """مخطط الحساسية يطابق التحليل الكامل لكل ميزة صعوداً وهبوطاً"""
+    simulator = WhatIfSimulator(max_workers=1)
+    result = simulator.sensitivity(BASELINE, step=0.2, absolute_steps={'team_size': 2})
+    ici, irl, _ = _analysis_scores(simulator.strategic_bridge, BASELINE)
+    assert abs(result['baseline']['ici_score'] - ici) < TOLERANCE
+    assert abs(result['baseline']['irl_score'] - irl) < TOLERANCE
+
+    swings = [entry['swing'] for entry in result['tornado']]
+    assert swings == sorted(swings, reverse=True)
+
+    for entry in result['tornado']:
+        for side in ('low', 'high'):
+            point = dict(BASELINE)
+            point[entry['feature']] = entry[f'{side}_value']
+            expected = _analysis_scores(simulator.strategic_bridge, point)
+            assert abs(entry['ici_score'][side] - expected[0]) < TOLERANCE, (entry['feature'], side)
+            assert abs(entry['irl_score'][side] - expected[1]) < TOLERANCE, (entry['feature'], side)
+
+
+def test_pareto_front_matches_brute_force():
+    """حدود باريتو (O(n log n)) تطابق المقارنة الشاملة بين كل زوج"""
+    from whatif_simulator import pareto_front_mask
+
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        n = int(rng.integers(1, 50))
+        # قيم صحيحة صغيرة لاختبار حالات التساوي
+        ici, irl, cost = (rng.integers(0, 5, n).astype(float) for _ in range(3))
+        expected = np.array([
+            not np.any(
+                (ici >= ici[i]) & (irl >= irl[i]) & (cost <= cost[i]) &
+                ((ici > ici[i]) | (irl > irl[i]) | (cost < cost[i]))
+            )
+            for i in range(n)
+        ])
+        assert (pareto_front_mask(ici, irl, cost) == expected).all()
+
+    # حد كامل من 50 ألف نقطة (كل نقطة أرخص تقدم ICI أقل و IRL أعلى)، ثم نقطة تهيمن على نصفها
+    cost = np.arange(50000, dtype=float)
+    ici, irl = -cost, cost.copy()
+    assert pareto_front_mask(ici, irl, cost).all()
+    mask = pareto_front_mask(np.append(ici, -24999.5), np.append(irl, 50000.0), np.append(cost, 0.0))
+    assert mask[-1] and mask[:25000].all() and not mask[25000:-1].any()
+
+    simulator = WhatIfSimulator(max_workers=1)
+    ranked = simulator.rank_scenarios(BASELINE, [
+        {'name': 'ميزانية', 'budget': '+75000'},
+        {'name': 'فريق', 'team_size': '+2'},
+        {'name': 'فرضيات', 'hypothesis_validation_rate': '+0.3'},
+        {'name': 'شامل', 'team_size': '+2', 'hypothesis_validation_rate': '+0.3', 'market_demand': '+20'}
+    ])
+    assert len(ranked['frontier']) + len(ranked['dominated']) == 4
+    assert all(r['pareto_optimal'] for r in ranked['frontier'])
+    costs = [r['implementation_cost'] for r in ranked['frontier']]
+    assert costs == sorted(costs)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تطابق الحساب المتجه...")
+    print("=" * 70)
+    for test in (
+        test_score_features_matches_engines,
+        test_sweep_matches_analyze_project,
+        test_sweep_with_model_matches_analyze_project,
+        test_goal_seek_matches_brute_force,
+        test_uncertainty_bands,
+        test_sensitivity_matches_analyze_project,
+        test_pareto_front_matches_brute_force
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
@@ -0,0 +1,136 @@
+"""
+اختبار الاستجابات التفاضلية لمحاكي What-If (analysis_delta)
+تطبيق الفروق على التحليل الأساسي يعيد التحليل الكامل نفسه
+"""
+
+import warnings
+
+from analysis_delta import analysis_etag, apply_patch, json_patch
+from result_serializer import dumps
+from whatif_simulator import WhatIfSimulator
+
+BASELINE = {
+    'title': 'مشروع تجريبي',
+    'description': 'وصف المشروع',
+    'budget': '150000',
+    'team_size': '3',
+    'timeline_months': '6',
+    'market_demand': '35',
+    'technical_feasibility': '75',
+    'user_engagement': '40',
+    'hypothesis_validation_rate': '0.2',
+    'rat_completion_rate': '0.3',
+    'user_count': '0',
+    'revenue_growth': '0'
+}
+
+SCENARIOS = [
+    {'name': 'تمويل إضافي', 'budget': '+500000'},
+    {'name': 'توسيع الفريق', 'team_size': '+3'},
+    {'name': 'تحقق من الفرضيات', 'hypothesis_validation_rate': '0.8', 'rat_completion_rate': '0.9'},
+    {'name': 'طلب السوق', 'market_demand': '+40%'},
+    {'name': 'نمو الإيرادات', 'revenue_growth': '0.5', 'user_count': '+2000'},
+    {'name': 'بدون تغيير', 'budget': '150000'},
+    {'name': 'شامل', 'budget': '+1000000', 'team_size': '+5', 'market_demand': '90'},
+    {'name': 'تقليص', 'budget': '-100000', 'team_size': '-1'}
+]
+
+
+def _assert_delta_matches_full(baseline_analysis, full, delta):
+    assert apply_patch(baseline_analysis, delta['analysis_delta']) == full['full_analysis']
+    assert {**BASELINE, **delta['features_delta']} == full['modified_features']
+    for key in ('baseline', 'modified', 'impact', 'modifications'):
+        assert delta[key] == full[key]
+    assert 'full_analysis' not in delta and 'modified_features' not in delta
+
+
+def test_json_patch_round_trip():
+    """فروق JSON Patch تغطي الإضافة والحذف والاستبدال وتغيّر طول القوائم والمفاتيح الخاصة"""
+    base = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "e/f": {"~g": 1}, "h": [1], "gone": True}
+    target = {"a": 1.5, "b": {"c": [1, 5, 3], "d": "x", "new": None}, "e/f": {"~g": 2}, "h": [1, 2]}
+    patch = json_patch(base, target)
+    assert apply_patch(base, patch) == target
+    assert {"op": "remove", "path": "/gone"} in patch
+    assert {"op": "replace", "path": "/b/c/1", "value": 5} in patch
+    assert {"op": "replace", "path": "/e~1f/~0g", "value": 2} in patch
+    assert {"op": "replace", "path": "/h", "value": [1, 2]} in patch
+    assert json_patch(target, target) == []
+    assert base["b"]["c"] == [1, 2, 3]
+
+    for bad in ({"op": "move", "path": "/a"}, {"op": "replace", "path": "/missing", "value": 1}):
+        try:
+            apply_patch(base, [bad])
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_single_scenario_delta():
+    """الاستجابة التفاضلية لسيناريو واحد تعيد بناء التحليل والميزات المعدلة بالكامل"""
+    simulator = WhatIfSimulator(max_workers=1)
+    baseline_analysis, etag = simulator.analyze_baseline_with_etag(BASELINE)
+    assert etag == analysis_etag(baseline_analysis)
+
+    for modifications in SCENARIOS:
+        full = simulator.simulate_scenario(BASELINE, modifications)
+        delta = simulator.simulate_scenario(BASELINE, modifications, response_mode='delta')
+        assert delta['baseline_etag'] == etag and 'baseline_etag' not in full
+        _assert_delta_matches_full(baseline_analysis, full, delta)
+
+    # القيمة تُعاد كتابتها بصيغة '150000.0' لكن التحليل لا يتغير
+    unchanged = simulator.simulate_scenario(BASELINE, {'budget': '150000'}, response_mode='delta')
+    assert unchanged['analysis_delta'] == []
+    assert simulator.simulate_scenario(BASELINE, {}, response_mode='delta')['features_delta'] == {}
+
+
+def test_stale_etag_gets_full_result():
+    """بصمة أساس قديمة تعيد نتيجة كاملة مع البصمة الحالية، ووضع غير معروف يُرفض"""
+    simulator = WhatIfSimulator(max_workers=1)
+    result = simulator.simulate_scenario(BASELINE, SCENARIOS[0], response_mode='delta', baseline_etag='stale')
+    assert 'full_analysis' in result and 'analysis_delta' not in result
+    assert result['baseline_etag'] == simulator.analyze_baseline_with_etag(BASELINE)[1]
+    try:
+        simulator.simulate_scenario(BASELINE, SCENARIOS[0], response_mode='compact')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_multiple_scenarios_delta():
+    """السيناريوهات المتعددة (تسلسلياً وعلى مجمع العمليات) بنفس التكلفة والترتيب في الوضعين"""
+    for max_workers in (1, 2):
+        simulator = WhatIfSimulator(max_workers=max_workers)
+        try:
+            baseline_analysis, etag = simulator.analyze_baseline_with_etag(BASELINE)
+            full = simulator.simulate_multiple_scenarios(BASELINE, SCENARIOS)
+            delta = simulator.simulate_multiple_scenarios(BASELINE, SCENARIOS, response_mode='delta', baseline_etag=etag)
+            for f, d in zip(full, delta):
+                for key in ('scenario_name', 'implementation_cost', 'pareto_optimal'):
+                    assert f[key] == d[key], key
+                _assert_delta_matches_full(baseline_analysis, f, d)
+
+            ranked = simulator.rank_scenarios(BASELINE, SCENARIOS, response_mode='delta')
+            assert [r['scenario_name'] for r in ranked['frontier']] == \
+                [r['scenario_name'] for r in simulator.rank_scenarios(BASELINE, SCENARIOS)['frontier']]
+        finally:
+            simulator.shutdown()
+
+    full_bytes = len(dumps(full))
+    delta_bytes = len(dumps(delta))
+    print(f"     {len(SCENARIOS)} سيناريوهات: {full_bytes / 1024:.1f} KB كاملة، "
+          f"{delta_bytes / 1024:.1f} KB تفاضلية ({full_bytes / delta_bytes:.1f}×)")
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار الاستجابات التفاضلية لمحاكي What-If...")
+    print("=" * 70)
+    for test in (
+        test_json_patch_round_trip,
+        test_single_scenario_delta,
+        test_stale_etag_gets_full_result,
+        test_multiple_scenarios_delta
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
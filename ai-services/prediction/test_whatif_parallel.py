@@ -0,0 +1,134 @@
+"""
+اختبار تقييم سيناريوهات What-If على مجموعة العمليات
+ذاكرة التحليل الأساسي المؤقتة، وتطابق التقييم المتوازي مع المتسلسل، وتتبع العمال،
+والرجوع إلى التنفيذ المتسلسل عند تعطل المجموعة
+"""
+
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from stage_tracing import tracer
+from whatif_simulator import PARALLEL_MIN_SCENARIOS, WhatIfSimulator
+
+BASELINE = {
+    'title': 'مشروع تجريبي',
+    'budget': '150000',
+    'team_size': '3',
+    'market_demand': '35',
+    'technical_feasibility': '75',
+    'hypothesis_validation_rate': '0.2',
+    'rat_completion_rate': '0.3',
+    'revenue_growth': '0.1'
+}
+
+SCENARIOS = [
+    {'name': f'سيناريو {i}', 'budget': f'+{100000 * i}', 'team_size': f'+{i % 4}', 'market_demand': f'{40 + 5 * i}'}
+    for i in range(PARALLEL_MIN_SCENARIOS + 2)
+]
+
+
+def _broken_initializer():
+    raise RuntimeError("worker failed to start")
+
+
+def _simulate(workers, scenarios=SCENARIOS, response_mode='full'):
+    simulator = WhatIfSimulator(max_workers=workers)
+    try:
+        return simulator.simulate_multiple_scenarios(BASELINE, scenarios, response_mode)
+    finally:
+        simulator.shutdown()
+
+
+def test_baseline_cache_hit_and_eviction():
+    """التحليل الأساسي يُحسب مرة لكل بصمة، والأقدم استخداماً يُحذف عند امتلاء الذاكرة"""
+    simulator = WhatIfSimulator(max_workers=1, baseline_cache_size=2)
+    bridge = simulator.strategic_bridge
+    calls = []
+
+    def counting_analyze(features, *args, **kwargs):
+        calls.append(features.get('budget'))
+        return type(bridge).analyze_project(bridge, features, *args, **kwargs)
+
+    bridge.analyze_project = counting_analyze
+    a, b, c = BASELINE, {**BASELINE, 'budget': '200000'}, {**BASELINE, 'budget': '300000'}
+
+    first = simulator.analyze_baseline(a)
+    # ترتيب المفاتيح لا يغير البصمة
+    assert simulator.analyze_baseline(dict(reversed(list(a.items())))) is first
+    assert calls == ['150000']
+
+    simulator.analyze_baseline(b)
+    simulator.analyze_baseline(a)  # a أحدث استخداماً من b
+    simulator.analyze_baseline(c)  # يحذف b
+    assert calls == ['150000', '200000', '300000']
+    assert simulator.analyze_baseline(a) is first
+    simulator.analyze_baseline(b)
+    assert calls == ['150000', '200000', '300000', '200000']
+
+    simulator.clear_cache()
+    simulator.analyze_baseline(a)
+    assert len(calls) == 5
+
+
+def test_parallel_matches_serial():
+    """نتائج الدفعة على مجموعة العمليات مطابقة للتقييم المتسلسل بالوضعين الكامل والتفاضلي"""
+    for response_mode in ('full', 'delta'):
+        serial = _simulate(1, response_mode=response_mode)
+        parallel = _simulate(2, response_mode=response_mode)
+        assert len(parallel) == len(SCENARIOS)
+        assert parallel == serial, response_mode
+
+
+def test_worker_spans_are_adopted():
+    """امتدادات العمال تُضاف إلى التتبع الجاري تحت امتداد whatif.parallel"""
+    tracer.clear()
+    with tracer.trace("test_parallel", force=True):
+        _simulate(2)
+    trace, = tracer.recent_traces()
+    tracer.clear()
+
+    by_id = {span.span_id: span for span in trace.spans}
+    assert len(by_id) == len(trace.spans)
+    parallel, = [span for span in trace.spans if span.name == "whatif.parallel"]
+    workers = [span for span in trace.spans if span.name == "whatif.worker_scenario"]
+    assert len(workers) == len(SCENARIOS)
+    assert all(span.parent_id == parallel.span_id for span in workers)
+
+    modified = [span for span in trace.spans if span.name == "whatif.modified"]
+    assert len(modified) == len(SCENARIOS)
+    assert {by_id[span.parent_id].name for span in modified} == {"whatif.worker_scenario"}
+
+    # بدون تتبع نشط لا يسجل العمال شيئاً
+    _simulate(2)
+    assert tracer.recent_traces() == []
+
+
+def test_broken_pool_falls_back_to_sequential():
+    """تعطل مجموعة العمليات يعيد النتائج نفسها بالتنفيذ المتسلسل ويُعاد إنشاء المجموعة لاحقاً"""
+    simulator = WhatIfSimulator(max_workers=2)
+    simulator._executor = ProcessPoolExecutor(max_workers=2, initializer=_broken_initializer)
+    try:
+        results = simulator.simulate_multiple_scenarios(BASELINE, SCENARIOS)
+        assert simulator._executor is None
+        assert results == _simulate(1)
+
+        # المجموعة الجديدة تعمل بشكل طبيعي
+        assert simulator.simulate_multiple_scenarios(BASELINE, SCENARIOS) == results
+        assert simulator._executor is not None
+    finally:
+        simulator.shutdown()
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print("🚀 اختبار تقييم سيناريوهات What-If على مجموعة العمليات...")
+    print("=" * 70)
+    for test in (
+        test_baseline_cache_hit_and_eviction,
+        test_parallel_matches_serial,
+        test_worker_spans_are_adopted,
+        test_broken_pool_falls_back_to_sequential
+    ):
+        test()
+        print(f"  ✅ {test.__doc__}")
+    print("=" * 70)
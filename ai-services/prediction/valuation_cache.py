@@ -0,0 +1,201 @@
+"""
+Bucketed Valuation Cache for UPLINK 5.0
+Valuation range and funding potential memoized on rounded inputs
+
+estimate_valuation_range and estimate_funding_potential are pure functions
+of (IRL score, sector, stage, revenue growth). What-if scenarios and sweeps
+call them with nearly identical inputs over and over. ValuationCache rounds
+IRL score and revenue growth to a configurable precision and evaluates the
+valuation at the bucket centre. Every input in a bucket therefore gets the
+same valuation, whichever caller came first. Funding potential is derived
+from that valuation at the exact IRL score: its multipliers step at IRL 50
+and 80, and a bucket centre can sit on the other side of the threshold.
+
+Modes:
+    memo   bounded LRU filled on demand
+    table  dense NumPy grids built once at startup, one per distinct
+           (stage base valuation, sector multiplier); inputs outside the grid
+           fall back to the LRU
+
+Configuration:
+    STRATEGIC_VALUATION_CACHE             off (default), memo or table
+    STRATEGIC_VALUATION_IRL_PRECISION     IRL bucket width (default 0.01 memo, 0.1 table)
+    STRATEGIC_VALUATION_GROWTH_PRECISION  revenue growth bucket width (default 0.01 memo, 0.05 table)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from investment_simulator import (
+    KNOWN_SECTORS,
+    KNOWN_STAGES,
+    estimate_funding_potential,
+    estimate_valuation_range,
+    valuation_multiples
+)
+
+CACHE_MODES = ("memo", "table")
+
+# (irl_precision, growth_precision) per mode
+DEFAULT_PRECISION = {
+    "memo": (0.01, 0.01),
+    "table": (0.1, 0.05)
+}
+
+DEFAULT_MAX_ENTRIES = 65536
+
+# Revenue growth covered by the precomputed table (0 to 300%)
+MAX_TABLE_REVENUE_GROWTH = 3.0
+
+# IRL scores covered by the precomputed table
+MAX_TABLE_IRL = 100.0
+
+Estimate = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+class ValuationCache:
+    """(valuation_range, funding_potential) on bucketed IRL score and revenue growth"""
+
+    def __init__(
+        self,
+        mode: str = "memo",
+        irl_precision: Optional[float] = None,
+        growth_precision: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown valuation cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+        default_irl, default_growth = DEFAULT_PRECISION[mode]
+        self.mode = mode
+        self.irl_precision = float(irl_precision or default_irl)
+        self.growth_precision = float(growth_precision or default_growth)
+        if self.irl_precision <= 0 or self.growth_precision <= 0:
+            raise ValueError("Cache precision must be positive")
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._memo: "OrderedDict[tuple, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (base_valuation, sector_multiplier) -> valuation grid [irl bucket, growth bucket]
+        self._tables: Dict[Tuple[float, float], np.ndarray] = {}
+        # (sector, stage) -> its grid, for known sectors and stages
+        self._table_index: Dict[Tuple[str, str], np.ndarray] = {}
+        if mode == "table":
+            self._build_tables()
+
+    def estimate(self, irl_score: float, sector: str, stage: str, revenue_growth: float) -> Estimate:
+        """(valuation_range, funding_potential): bucketed valuation, funding at the exact IRL"""
+        valuation_range = self.valuation_range(irl_score, sector, stage, revenue_growth)
+        return valuation_range, estimate_funding_potential(irl_score, valuation_range, stage)
+
+    def valuation_range(self, irl_score: float, sector: str, stage: str, revenue_growth: float) -> Tuple[float, float]:
+        """Valuation range for the bucket containing the inputs"""
+        i = round(irl_score / self.irl_precision)
+        j = round(revenue_growth / self.growth_precision)
+
+        if self._tables:
+            table = self._table_index.get((sector, stage))
+            if table is None:
+                multiples = valuation_multiples(sector, stage)
+                table = self._tables[(multiples.base_valuation, multiples.sector_multiplier)]
+            rows, columns = table.shape
+            if 0 <= i < rows and 0 <= j < columns:
+                with self._lock:
+                    self.hits += 1
+                valuation = table.item(i, j)
+                return (valuation * 0.7, valuation * 1.3)
+
+        key = (i, j, sector, stage)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result = estimate_valuation_range(i * self.irl_precision, sector, stage, j * self.growth_precision)
+
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop memoized entries and reset the hit counters (tables are kept)"""
+        with self._lock:
+            self._memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def settings(self) -> Dict[str, Any]:
+        """Constructor arguments for an equivalent cache (e.g. in a worker process)"""
+        return {
+            "mode": self.mode,
+            "irl_precision": self.irl_precision,
+            "growth_precision": self.growth_precision,
+            "max_entries": self.max_entries
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, entries = self.hits, self.misses, len(self._memo)
+        lookups = hits + misses
+        return {
+            "mode": self.mode,
+            "irl_precision": self.irl_precision,
+            "growth_precision": self.growth_precision,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "table_cells": sum(table.size for table in self._tables.values())
+        }
+
+    def _build_tables(self):
+        """Valuation at every bucket centre, same operation order as estimate_valuation_range"""
+        irl = np.arange(round(MAX_TABLE_IRL / self.irl_precision) + 1) * self.irl_precision
+        growth = np.arange(round(MAX_TABLE_REVENUE_GROWTH / self.growth_precision) + 1) * self.growth_precision
+        irl_multiplier = 0.5 + (irl / 100) * 1.5
+        revenue_multiplier = 1.0 + (growth * 0.5)
+
+        # The empty sector/stage stands for unknown values (default multiples)
+        for sector in KNOWN_SECTORS + ("",):
+            for stage in KNOWN_STAGES + ("",):
+                multiples = valuation_multiples(sector, stage)
+                key = (multiples.base_valuation, multiples.sector_multiplier)
+                if key not in self._tables:
+                    base_times_irl = multiples.base_valuation * irl_multiplier
+                    self._tables[key] = (base_times_irl * multiples.sector_multiplier)[:, None] * revenue_multiplier
+                if sector and stage:
+                    self._table_index[(sector, stage)] = self._tables[key]
+
+
+_valuation_cache: Optional[ValuationCache] = None
+_valuation_cache_configured = False
+_configure_lock = threading.Lock()
+
+def get_valuation_cache() -> Optional[ValuationCache]:
+    """
+    Process-wide cache configured from STRATEGIC_VALUATION_CACHE (None when off)
+
+    Table mode builds its grids on the first call, so call this at startup.
+    """
+    global _valuation_cache, _valuation_cache_configured
+    with _configure_lock:
+        if not _valuation_cache_configured:
+            mode = os.getenv("STRATEGIC_VALUATION_CACHE", "off").strip().lower()
+            if mode not in ("", "off"):
+                _valuation_cache = ValuationCache(
+                    mode,
+                    irl_precision=float(os.getenv("STRATEGIC_VALUATION_IRL_PRECISION", "0") or 0) or None,
+                    growth_precision=float(os.getenv("STRATEGIC_VALUATION_GROWTH_PRECISION", "0") or 0) or None
+                )
+            _valuation_cache_configured = True
+    return _valuation_cache
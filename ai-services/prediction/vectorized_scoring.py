@@ -0,0 +1,286 @@
+"""
+Vectorized ICI / IRL Scoring for UPLINK 5.0
+NumPy mirror of the scoring formulas in InvestmentSimulator.calculate_irl and
+StrategicDashboardGenerator._calculate_ici
+
+Every function accepts scalars or arrays (broadcast against each other), so a
+whole grid of what-if points is scored with a handful of array operations
+instead of one analyze_project call per point. Keep these formulas in sync
+with the engines; test_vectorized_scoring.py checks parity point by point.
+"""
+
+from typing import Any, Dict, Mapping, Tuple, Union
+
+import numpy as np
+
+from investment_simulator import ORGANIZATION_TEAM_SCORES, SECTOR_TAM
+
+ArrayLike = Union[float, np.ndarray]
+Categorical = Union[str, np.ndarray]
+
+# Defaults the Strategic Bridge uses for missing numeric fields
+NUMERIC_FEATURE_DEFAULTS = {
+    "budget": 0.0,
+    "team_size": 0.0,
+    "market_demand": 50.0,
+    "technical_feasibility": 50.0,
+    "hypothesis_validation_rate": 0.5,
+    "rat_completion_rate": 0.5,
+    "user_count": 0.0,
+    "revenue_growth": 0.0,
+    "user_engagement": 50.0,
+    "market_share": 0.0,
+    "roi": 0.0
+}
+
+# Used when neither the project nor the model provides a probability (0-100)
+DEFAULT_SUCCESS_PROBABILITY = 50.0
+
+IRL_WEIGHTS = {
+    "traction": 0.30,
+    "team": 0.20,
+    "market": 0.20,
+    "technical": 0.15,
+    "financial": 0.15
+}
+
+
+# Both scores are linear in success_probability (0-100):
+# IRL = 0.7 * (...) + 0.3 * p  and  ICI = 0.30 * p + 0.25 * IRL + (...)
+PROBABILITY_WEIGHT = {
+    "irl_score": 0.3,
+    "ici_score": 0.30 + 0.25 * 0.3
+}
+
+
+def factorize(keys: np.ndarray) -> Tuple[list, np.ndarray]:
+    """(distinct keys in first-seen order, code of each key)"""
+    keys = np.asarray(keys, dtype=object)
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(key, len(index)) for key in keys.ravel()),
+        dtype=np.intp,
+        count=keys.size
+    )
+    return list(index), codes.reshape(keys.shape)
+
+
+def lookup(table: Mapping[str, float], keys: Categorical, default: float) -> np.ndarray:
+    """
+    table.get(key, default) for a single key or an array of keys
+
+    Each distinct key is looked up once, so a portfolio of N projects costs
+    one dict lookup per sector/organization/stage rather than one per row.
+    """
+    if isinstance(keys, str):
+        return np.asarray(float(table.get(keys, default)))
+    unique, codes = factorize(keys)
+    values = np.array([table.get(key, default) for key in unique], dtype=float)
+    return values[codes]
+
+
+def _runway_score(budget: ArrayLike) -> np.ndarray:
+    """Runway score assuming a 10% monthly burn (18 months = 100)"""
+    budget = np.asarray(budget, dtype=float)
+    monthly_burn = budget * 0.10
+    runway_months = np.divide(budget, monthly_burn, out=np.zeros_like(monthly_burn), where=monthly_burn > 0)
+    return np.minimum(100, (runway_months / 18) * 100)
+
+
+def _positive_pct_score(value: ArrayLike) -> np.ndarray:
+    """min(100, value * 100) for positive values, else 0"""
+    value = np.asarray(value, dtype=float)
+    return np.where(value > 0, np.minimum(100, value * 100), 0.0)
+
+
+# ----------------------------------------------------------------------
+# IRL (InvestmentSimulator.calculate_irl)
+# ----------------------------------------------------------------------
+
+def traction_scores(features: Mapping[str, ArrayLike]) -> np.ndarray:
+    user_count = np.asarray(features["user_count"], dtype=float)
+    user_score = np.where(user_count > 0, np.minimum(100, (user_count / 10000) * 100), 0.0)
+    revenue_score = _positive_pct_score(features["revenue_growth"])
+    engagement_score = np.asarray(features["user_engagement"], dtype=float)
+    market_score = np.asarray(features["market_share"], dtype=float) * 100
+
+    traction = (
+        user_score * 0.30 +
+        revenue_score * 0.35 +
+        engagement_score * 0.20 +
+        market_score * 0.15
+    )
+    return np.minimum(100, traction)
+
+
+def team_quality_scores(features: Mapping[str, ArrayLike], organization: Categorical) -> np.ndarray:
+    team_size = np.asarray(features["team_size"], dtype=float)
+    base_score = lookup(ORGANIZATION_TEAM_SCORES, organization, 50)
+    team_size, base_score = np.broadcast_arrays(team_size, base_score)
+    return np.select(
+        [team_size < 3, team_size < 5, team_size < 8],
+        [base_score * 0.7, base_score * 0.85, base_score],
+        default=np.minimum(100, base_score * 1.1)
+    ).astype(float)
+
+
+def market_size_scores(features: Mapping[str, ArrayLike], sector: Categorical) -> np.ndarray:
+    market_demand = np.asarray(features["market_demand"], dtype=float)
+    tam = lookup(SECTOR_TAM, sector, 10000)
+    sam = tam * (market_demand / 100 * 0.3)
+    score = np.where(sam < 100, sam / 100 * 50, 50 + ((sam - 100) / 400) * 50)
+    return np.minimum(100, score)
+
+
+def financial_health_scores(features: Mapping[str, ArrayLike]) -> np.ndarray:
+    rat_score = np.asarray(features["rat_completion_rate"], dtype=float) * 100
+    return (
+        _runway_score(features["budget"]) * 0.40 +
+        rat_score * 0.35 +
+        _positive_pct_score(features["roi"]) * 0.25
+    )
+
+
+def irl_scores(
+    features: Mapping[str, ArrayLike],
+    sector: Categorical,
+    organization: Categorical,
+    success_probability: ArrayLike
+) -> Dict[str, np.ndarray]:
+    """
+    IRL score and its breakdown
+
+    Args:
+        features: Cleaned numeric features (scalars or arrays)
+        sector: Project sector (one for all rows, or one per row)
+        organization: Organization type (one for all rows, or one per row)
+        success_probability: 0-100, as passed by the Strategic Bridge
+
+    Returns:
+        {'irl_score', 'traction', 'team_quality', 'market_size',
+         'technical_feasibility', 'financial_health'}
+    """
+    traction = traction_scores(features)
+    team_quality = team_quality_scores(features, organization)
+    market_size = market_size_scores(features, sector)
+    technical = np.asarray(features["technical_feasibility"], dtype=float)
+    financial = financial_health_scores(features)
+
+    irl_score = (
+        traction * IRL_WEIGHTS["traction"] +
+        team_quality * IRL_WEIGHTS["team"] +
+        market_size * IRL_WEIGHTS["market"] +
+        technical * IRL_WEIGHTS["technical"] +
+        financial * IRL_WEIGHTS["financial"]
+    )
+    irl_score = (irl_score * 0.7) + (np.asarray(success_probability, dtype=float) * 0.3)
+
+    return {
+        "irl_score": irl_score,
+        "traction": traction,
+        "team_quality": team_quality,
+        "market_size": market_size,
+        "technical_feasibility": technical,
+        "financial_health": financial
+    }
+
+
+# ----------------------------------------------------------------------
+# ICI (StrategicDashboardGenerator._calculate_ici)
+# ----------------------------------------------------------------------
+
+def market_fit_scores(features: Mapping[str, ArrayLike]) -> np.ndarray:
+    market_fit = (
+        np.asarray(features["market_demand"], dtype=float) * 0.40 +
+        np.asarray(features["hypothesis_validation_rate"], dtype=float) * 100 * 0.35 +
+        np.asarray(features["user_engagement"], dtype=float) * 0.25
+    )
+    return np.minimum(100, market_fit)
+
+
+def execution_readiness_scores(features: Mapping[str, ArrayLike]) -> np.ndarray:
+    team_score = np.minimum(100, (np.asarray(features["team_size"], dtype=float) / 10) * 100)
+    return (
+        team_score * 0.30 +
+        np.asarray(features["technical_feasibility"], dtype=float) * 0.40 +
+        np.asarray(features["rat_completion_rate"], dtype=float) * 100 * 0.30
+    )
+
+
+def financial_sustainability_scores(features: Mapping[str, ArrayLike]) -> np.ndarray:
+    revenue_score = np.minimum(100, np.asarray(features["revenue_growth"], dtype=float) * 100)
+    return (
+        _runway_score(features["budget"]) * 0.50 +
+        revenue_score * 0.30 +
+        _positive_pct_score(features["roi"]) * 0.20
+    )
+
+
+def ici_scores(
+    features: Mapping[str, ArrayLike],
+    irl_score: ArrayLike,
+    success_probability: ArrayLike
+) -> Dict[str, np.ndarray]:
+    """
+    ICI score and its dimensions
+
+    Args:
+        features: Cleaned numeric features (scalars or arrays)
+        irl_score: IRL score (0-100)
+        success_probability: 0-100, as passed by the Strategic Bridge
+
+    Returns:
+        {'ici_score', 'success_probability' (0-1), 'investor_readiness',
+         'market_fit', 'execution_readiness', 'financial_sustainability'}
+    """
+    success_prob = np.asarray(success_probability, dtype=float) / 100
+    investor_readiness = np.asarray(irl_score, dtype=float)
+    market_fit = market_fit_scores(features)
+    execution_readiness = execution_readiness_scores(features)
+    financial_sustainability = financial_sustainability_scores(features)
+
+    ici_score = (
+        success_prob * 100 * 0.30 +
+        investor_readiness * 0.25 +
+        market_fit * 0.20 +
+        execution_readiness * 0.15 +
+        financial_sustainability * 0.10
+    )
+
+    return {
+        "ici_score": ici_score,
+        "success_probability": success_prob,
+        "investor_readiness": investor_readiness,
+        "market_fit": market_fit,
+        "execution_readiness": execution_readiness,
+        "financial_sustainability": financial_sustainability
+    }
+
+
+def score_features(
+    features: Mapping[str, Any],
+    sector: str = "fintech",
+    organization: str = "startup",
+    success_probability: ArrayLike = DEFAULT_SUCCESS_PROBABILITY
+) -> Dict[str, np.ndarray]:
+    """
+    ICI, IRL and success probability for scalar or array features
+
+    Missing numeric fields fall back to NUMERIC_FEATURE_DEFAULTS. All outputs
+    are broadcast to a common shape.
+
+    Returns:
+        {'ici_score', 'irl_score', 'success_probability' (0-1), 'market_fit',
+         'execution_readiness', 'investor_readiness', 'financial_sustainability'}
+    """
+    merged = {
+        name: np.asarray(features.get(name, default), dtype=float)
+        for name, default in NUMERIC_FEATURE_DEFAULTS.items()
+    }
+
+    irl = irl_scores(merged, sector, organization, success_probability)
+    ici = ici_scores(merged, irl["irl_score"], success_probability)
+
+    scores = {"irl_score": irl["irl_score"], **ici}
+    shape = np.broadcast_shapes(*(np.shape(v) for v in scores.values()))
+    return {name: np.broadcast_to(value, shape) for name, value in scores.items()}
@@ -3,23 +3,231 @@ What-If Simulator for UPLINK 5.0
 Allows users to simulate different scenarios and see their impact on ICI and IRL
 """
 
-import copy
-from typing import Dict, List, Any
-from strategic_bridge_protocol import StrategicBridgeProtocol
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from strategic_bridge_protocol import StrategicBridgeProtocol, NUMERIC_FIELDS
+from feature_overlay import FeatureOverlay
+from analysis_delta import analysis_etag, json_patch
+from stage_tracing import tracer, traced
+from model_runtime import MODEL_FEATURES, MODEL_FEATURE_DIVISORS, project_to_model_row
+from vectorized_scoring import (
+    NUMERIC_FEATURE_DEFAULTS, DEFAULT_SUCCESS_PROBABILITY, PROBABILITY_WEIGHT, score_features
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker pool size for simulate_multiple_scenarios (1 = evaluate in-process)
+DEFAULT_MAX_WORKERS = int(os.getenv("WHATIF_MAX_WORKERS", "0") or 0) or min(4, os.cpu_count() or 1)
+
+# Scenario batches smaller than this are evaluated in-process: forking work
+# out only pays off once the batch outweighs the inter-process round trip
+PARALLEL_MIN_SCENARIOS = int(os.getenv("WHATIF_PARALLEL_MIN_SCENARIOS", "8") or 8)
+
+# Number of baseline analyses kept across calls
+BASELINE_CACHE_SIZE = int(os.getenv("WHATIF_BASELINE_CACHE_SIZE", "128") or 128)
+
+# Upper bound on the number of grid points a single sweep may evaluate
+MAX_SWEEP_POINTS = int(os.getenv("WHATIF_MAX_SWEEP_POINTS", "250000") or 250000)
+
+# Features a sweep can vary: the scored fields plus model-only inputs
+SWEEPABLE_FEATURES = tuple(NUMERIC_FEATURE_DEFAULTS) + ('timeline_months', 'competitive_advantage')
+
+# Upper limits used by goal_seek (beyond these the scores no longer improve)
+GOAL_SEEK_UPPER_BOUNDS = {
+    'budget': 5000000,
+    'team_size': 20,
+    'market_demand': 100,
+    'technical_feasibility': 100,
+    'hypothesis_validation_rate': 1.0,
+    'rat_completion_rate': 1.0,
+    'user_count': 10000,
+    'revenue_growth': 1.0,
+    'user_engagement': 100,
+    'market_share': 1.0,
+    'roi': 1.0
+}
+
+# Features goal_seek only moves in whole units
+INTEGER_FEATURES = ('team_size', 'user_count')
+
+# Cap on partial solutions kept per search depth
+GOAL_SEEK_MAX_FRONTIER = int(os.getenv("WHATIF_GOAL_SEEK_MAX_FRONTIER", "200000") or 200000)
+
+# Upper bound on Monte Carlo samples per request
+MAX_MONTE_CARLO_SAMPLES = int(os.getenv("WHATIF_MAX_MONTE_CARLO_SAMPLES", "200000") or 200000)
+
+# Percentile bands reported by simulate_uncertainty
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+SweepRange = Union[Tuple[float, float, int], Sequence[float]]
+
+# Scenario result encodings: 'full' returns modified_features and full_analysis,
+# 'delta' returns features_delta and analysis_delta (a JSON Patch against the
+# cached baseline analysis identified by baseline_etag)
+RESPONSE_MODES = ('full', 'delta')
+
+
+# Roadmap area (ActionableRoadmapEngine risk type) whose tactical moves
+# change each feature; used to price scenarios
+FEATURE_RISK_TYPES = {
+    'budget': 'financial_risk',
+    'revenue_growth': 'financial_risk',
+    'roi': 'financial_risk',
+    'market_demand': 'market_risk',
+    'market_share': 'market_risk',
+    'hypothesis_validation_rate': 'market_validation',
+    'user_engagement': 'market_validation',
+    'user_count': 'market_validation',
+    'technical_feasibility': 'execution_risk',
+    'rat_completion_rate': 'execution_risk',
+    'team_size': 'team_capacity'
+}
+
+
+def pareto_front_mask(ici_gain: Sequence[float], irl_gain: Sequence[float], cost: Sequence[float]) -> np.ndarray:
+    """
+    Non-dominated points for (maximize ICI gain, maximize IRL gain, minimize cost)
+    
+    A point is dominated if another is at least as good on all three
+    objectives and strictly better on one. O(n log n) skyline: sort by cost
+    (better points first on ties), so every possible dominator of a point is
+    seen before it. A Fenwick tree over ICI ranks answers "highest IRL among
+    points seen with a strictly higher ICI" in O(log n); points with the
+    same ICI are checked against the best (IRL, cost) seen at that ICI.
+    """
+    ici_gain = np.asarray(ici_gain, dtype=float)
+    irl_gain = np.asarray(irl_gain, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    optimal = np.zeros(len(cost), dtype=bool)
+    
+    # Cheapest first; on equal cost, better points first so they can dominate
+    order = np.lexsort((-irl_gain, -ici_gain, cost))
+    
+    # Tree positions run from the highest ICI (1) to the lowest, so a prefix
+    # query covers every ICI above a point
+    ici_values, ici_rank = np.unique(ici_gain, return_inverse=True)
+    size = len(ici_values)
+    positions = (size - ici_rank).tolist()
+    tree = [-np.inf] * (size + 1)
+    # ICI position -> (highest IRL seen, lowest cost at that IRL)
+    best_at_ici: Dict[int, Tuple[float, float]] = {}
+    
+    for idx in order.tolist():
+        irl, c, position = irl_gain[idx], cost[idx], positions[idx]
+        
+        best_irl = -np.inf
+        i = position - 1
+        while i > 0:
+            best_irl = max(best_irl, tree[i])
+            i -= i & -i
+        if best_irl >= irl:
+            continue  # dominated by a point with higher ICI
+        
+        same = best_at_ici.get(position)
+        if same is not None and (same[0] > irl or (same[0] == irl and same[1] < c)):
+            continue  # dominated by a point with the same ICI
+        
+        optimal[idx] = True
+        if same is None or same[0] < irl:
+            best_at_ici[position] = (irl, c)
+        i = position
+        while i <= size:
+            if tree[i] < irl:
+                tree[i] = irl
+            i += i & -i
+    
+    return optimal
+
+
+def features_fingerprint(features: Dict[str, Any]) -> str:
+    """Stable fingerprint of a feature dict (key order does not matter)"""
+    payload = json.dumps(features, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Per-process simulator used by pool workers (created by _init_worker)
+_worker_simulator = None
+
+def _init_worker(bridge_config: Dict[str, Any]):
+    """
+    Build one warm simulator per worker process
+    
+    The worker bridge is rebuilt from WhatIfSimulator._bridge_config(), so a
+    scenario scores the same whether or not the batch was large enough to go
+    to the pool.
+    """
+    global _worker_simulator
+    model_runtime = None
+    if bridge_config['model_path'] is not None:
+        from model_runtime import get_model_runtime
+        model_runtime = get_model_runtime(bridge_config['model_path'])
+    bridge = StrategicBridgeProtocol(model_runtime=model_runtime)
+    if bridge_config['valuation_cache'] is not None:
+        from valuation_cache import ValuationCache
+        bridge.investment_simulator.valuation_cache = ValuationCache(**bridge_config['valuation_cache'])
+    _worker_simulator = WhatIfSimulator(strategic_bridge=bridge, max_workers=1)
+
+def _evaluate_in_worker(
+    task: Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], bool, bool]
+) -> Tuple[Dict[str, Any], Optional[List[Any]]]:
+    """(scenario result, spans recorded for it when the caller is tracing)"""
+    baseline_features, baseline_analysis, modifications, delta, trace_spans = task
+    if not trace_spans:
+        return _worker_simulator._evaluate_scenario(baseline_features, baseline_analysis, modifications, delta), None
+    with tracer.capture("whatif.worker_scenario", pid=os.getpid()) as handle:
+        result = _worker_simulator._evaluate_scenario(baseline_features, baseline_analysis, modifications, delta)
+    return result, handle.trace.spans
+
 
 class WhatIfSimulator:
     """
     Simulates "what-if" scenarios by modifying project features
     and analyzing the impact on ICI, IRL, and other metrics
+    
+    The baseline analysis is cached by feature fingerprint, so repeated
+    scenarios against the same project analyze it only once. Large scenario
+    batches are spread over a reusable process pool.
     """
     
-    def __init__(self):
-        self.strategic_bridge = StrategicBridgeProtocol()
+    def __init__(
+        self,
+        strategic_bridge: Optional[StrategicBridgeProtocol] = None,
+        max_workers: Optional[int] = None,
+        baseline_cache_size: int = BASELINE_CACHE_SIZE
+    ):
+        self.strategic_bridge = strategic_bridge or StrategicBridgeProtocol()
+        self.max_workers = max(1, max_workers if max_workers is not None else DEFAULT_MAX_WORKERS)
+        self.baseline_cache_size = baseline_cache_size
+        # fingerprint -> (baseline analysis, its ETag)
+        self._baseline_cache: "OrderedDict[str, Tuple[Dict[str, Any], str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Roadmap program cost (SAR) per risk type, from TacticalMove.cost_estimate
+        roadmap_engine = self.strategic_bridge.roadmap_engine
+        self._program_costs = {
+            risk_type: roadmap_engine.estimate_program_cost(risk_type)
+            for risk_type in set(FEATURE_RISK_TYPES.values())
+        }
         
     def simulate_scenario(
         self,
         baseline_features: Dict[str, Any],
-        modifications: Dict[str, Any]
+        modifications: Dict[str, Any],
+        response_mode: str = 'full',
+        baseline_etag: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Simulate a what-if scenario
@@ -27,20 +235,888 @@ class WhatIfSimulator:
         Args:
             baseline_features: Original project features
             modifications: Changes to apply (e.g., {'budget': '+50000', 'team_size': '+2'})
+            response_mode: 'full' or 'delta' (see RESPONSE_MODES)
+            baseline_etag: ETag of the baseline the client holds; in delta mode
+                a mismatch falls back to a full result
             
         Returns:
             Comparison between baseline and modified scenario
         """
-        # Analyze baseline
-        baseline_result = self.strategic_bridge.analyze_project(baseline_features)
-        baseline_analysis = baseline_result.to_dict() if hasattr(baseline_result, 'to_dict') else baseline_result
+        with tracer.trace("whatif.simulate_scenario", modifications=len(modifications)):
+            baseline_analysis, etag = self.analyze_baseline_with_etag(baseline_features)
+            delta = self._use_delta(response_mode, baseline_etag, etag)
+            result = self._evaluate_scenario(baseline_features, baseline_analysis, modifications, delta)
+            if response_mode == 'delta':
+                result['baseline_etag'] = etag
+            return result
+    
+    def simulate_multiple_scenarios(
+        self,
+        baseline_features: Dict[str, Any],
+        scenarios: List[Dict[str, Any]],
+        response_mode: str = 'full',
+        baseline_etag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Simulate multiple what-if scenarios
+        
+        The baseline is analyzed once; scenarios run in parallel on the worker
+        pool when there are at least PARALLEL_MIN_SCENARIOS of them.
+        
+        Args:
+            baseline_features: Original project features
+            scenarios: List of modification dictionaries
+            response_mode: 'full' or 'delta' (see simulate_scenario)
+            baseline_etag: ETag of the baseline the client holds
+            
+        Returns:
+            List of scenario results
+        """
+        with tracer.trace("whatif.simulate_multiple_scenarios", scenarios=len(scenarios)):
+            baseline_analysis, etag = self.analyze_baseline_with_etag(baseline_features)
+            delta = self._use_delta(response_mode, baseline_etag, etag)
+            # One snapshot of the caller's dict shared by every scenario overlay
+            snapshot = FeatureOverlay(baseline_features)
+            
+            results = None
+            if self.max_workers > 1 and len(scenarios) >= PARALLEL_MIN_SCENARIOS:
+                with tracer.span("whatif.parallel", workers=self.max_workers):
+                    results = self._evaluate_parallel(snapshot, baseline_analysis, scenarios, delta)
+            
+            if results is None:
+                results = [
+                    self._evaluate_scenario(snapshot, baseline_analysis, modifications, delta)
+                    for modifications in scenarios
+                ]
+            
+            for i, (modifications, result) in enumerate(zip(scenarios, results)):
+                result['scenario_name'] = modifications.get('name', f'Scenario {i+1}')
+                # Unchanged features cost nothing, so the delta prices the same
+                result['implementation_cost'] = self.estimate_implementation_cost(
+                    baseline_features, result['features_delta'] if delta else result['modified_features']
+                )
+                if response_mode == 'delta':
+                    result['baseline_etag'] = etag
+            
+            with tracer.span("whatif.pareto", scenarios=len(results)):
+                optimal = pareto_front_mask(
+                    [r['impact']['ici_improvement'] for r in results],
+                    [r['impact']['irl_improvement'] for r in results],
+                    [r['implementation_cost'] for r in results]
+                )
+            for result, is_optimal in zip(results, optimal):
+                result['pareto_optimal'] = bool(is_optimal)
+        
+        # Rank scenarios by improvement
+        results.sort(key=lambda x: x['impact']['ici_improvement'], reverse=True)
+        
+        return results
+    
+    def rank_scenarios(
+        self,
+        baseline_features: Dict[str, Any],
+        scenarios: List[Dict[str, Any]],
+        response_mode: str = 'full',
+        baseline_etag: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Split scenarios into the Pareto frontier and the dominated set
+        
+        Objectives: ICI gain (max), IRL gain (max), implementation cost (min).
+        
+        Returns:
+            {'frontier': [...] cheapest first, 'dominated': [...] by ICI gain}
+        """
+        results = self.simulate_multiple_scenarios(baseline_features, scenarios, response_mode, baseline_etag)
+        frontier = [r for r in results if r['pareto_optimal']]
+        dominated = [r for r in results if not r['pareto_optimal']]
+        frontier.sort(key=lambda x: (x['implementation_cost'], -x['impact']['ici_improvement']))
+        return {'frontier': frontier, 'dominated': dominated}
+    
+    def estimate_implementation_cost(
+        self,
+        baseline_features: Dict[str, Any],
+        modified_features: Dict[str, Any]
+    ) -> float:
+        """
+        Estimated implementation cost of a scenario (SAR)
+        
+        Each changed feature costs the roadmap program that moves it (sum of
+        its TacticalMove cost estimates) scaled by the size of the change as a
+        fraction of the feature's range (GOAL_SEEK_UPPER_BOUNDS).
+        """
+        cost = 0.0
+        for name, risk_type in FEATURE_RISK_TYPES.items():
+            if name not in modified_features or name not in baseline_features:
+                continue
+            change = abs(self._to_float(modified_features[name]) - self._to_float(baseline_features[name]))
+            if change == 0:
+                continue
+            feature_range = GOAL_SEEK_UPPER_BOUNDS.get(name, 0) or 1.0
+            cost += self._program_costs[risk_type] * change / feature_range
+        return round(cost, 2)
+    
+    def sweep(
+        self,
+        baseline_features: Dict[str, Any],
+        ranges: Dict[str, SweepRange]
+    ) -> Dict[str, Any]:
+        """
+        Evaluate ICI, IRL and success probability over a Cartesian feature grid
+        
+        The grid is scored with NumPy array math (vectorized_scoring) instead
+        of one analyze_project call per point. When the bridge has a model
+        runtime and the baseline has no explicit success_probability, the
+        probability of every point comes from one batched model call.
+        
+        Args:
+            baseline_features: Original project features
+            ranges: Values per feature, either (start, stop, steps) for an
+                evenly spaced range or an explicit list of values, e.g.
+                {'budget': (100000, 2000000, 20), 'team_size': list(range(2, 16))}
+            
+        Returns:
+            {'features': [...], 'axes': {feature: [...]}, 'shape': [...],
+             'ici_score', 'irl_score', 'success_probability': nested lists
+             indexed in 'features' order, 'baseline': {...}, 'best': {...}}
+        """
+        if not ranges:
+            raise ValueError("At least one feature range is required")
+        unknown = [name for name in ranges if name not in SWEEPABLE_FEATURES]
+        if unknown:
+            raise ValueError(f"Cannot sweep features: {', '.join(unknown)}")
+        
+        names = list(ranges)
+        axes = [self._sweep_axis(name, ranges[name]) for name in names]
+        shape = tuple(len(axis) for axis in axes)
+        n_points = int(np.prod(shape))
+        if n_points > MAX_SWEEP_POINTS:
+            raise ValueError(f"Sweep grid has {n_points} points (max {MAX_SWEEP_POINTS})")
+        
+        with tracer.trace("whatif.sweep", points=n_points, features=len(names)):
+            baseline = self.strategic_bridge._clean_all_features(baseline_features)
+            columns = {
+                name: grid.ravel()
+                for name, grid in zip(names, np.meshgrid(*axes, indexing='ij'))
+            }
+            
+            with tracer.span("whatif.sweep.score"):
+                scores = {
+                    name: value.reshape(shape)
+                    for name, value in self._score_points(baseline, columns, n_points).items()
+                }
+            
+            baseline_analysis = self.analyze_baseline(baseline_features)
+        
+        ici = scores['ici_score']
+        best_index = np.unravel_index(int(np.argmax(ici)), shape)
+        
+        return {
+            'features': names,
+            'axes': {name: axis.tolist() for name, axis in zip(names, axes)},
+            'shape': list(shape),
+            'points': n_points,
+            'ici_score': ici.tolist(),
+            'irl_score': scores['irl_score'].tolist(),
+            'success_probability': scores['success_probability'].tolist(),
+            'baseline': {
+                'ici_score': baseline_analysis['ici_score'],
+                'irl_score': baseline_analysis['irl_score'],
+                'success_probability': baseline_analysis['success_probability']
+            },
+            'best': {
+                'features': {name: float(axis[i]) for name, axis, i in zip(names, axes, best_index)},
+                'ici_score': float(ici[best_index]),
+                'irl_score': float(scores['irl_score'][best_index]),
+                'success_probability': float(scores['success_probability'][best_index])
+            }
+        }
+    
+    def goal_seek(
+        self,
+        baseline_features: Dict[str, Any],
+        target: float,
+        metric: str = 'ici_score',
+        cost_weights: Optional[Dict[str, float]] = None,
+        steps: int = 10,
+        upper_bounds: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Find the cheapest modifications that bring ICI or IRL up to a target
+        
+        Each adjustable feature can be raised from its baseline value to one of
+        `steps` evenly spaced levels up to its upper bound. The cost of a
+        solution is sum(cost_weights[f] * increase_f). The search is a
+        breadth-first branch and bound over features, scoring every frontier
+        of partial solutions in one vectorized pass:
+        - a partial solution that already reaches the target is recorded and
+          not extended (extensions only add cost)
+        - anything costing at least the cheapest solution so far is pruned
+        - anything that cannot reach the target even with all remaining
+          features at their upper bound is pruned (every ICI/IRL input is
+          non-decreasing; the model probability is bounded by 100%)
+        
+        Args:
+            baseline_features: Original project features
+            target: Target score (0-100)
+            metric: 'ici_score' or 'irl_score'
+            cost_weights: Cost per unit increase of each adjustable feature.
+                Only features present in the baseline can change (as in
+                _apply_modifications). Default: every such feature, weighted
+                1 / upper bound.
+            steps: Candidate levels per feature
+            upper_bounds: Overrides for GOAL_SEEK_UPPER_BOUNDS
+            
+        Returns:
+            {'reachable', 'metric', 'target', 'baseline_score', 'achieved_score',
+             'cost', 'modifications' (_apply_modifications syntax), 'changes',
+             'exhaustive', 'evaluated_points', 'pruned_points', 'scenario'}
+        """
+        if metric not in ('ici_score', 'irl_score'):
+            raise ValueError("metric must be 'ici_score' or 'irl_score'")
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        
+        bounds = dict(GOAL_SEEK_UPPER_BOUNDS)
+        bounds.update(upper_bounds or {})
+        if cost_weights is None:
+            cost_weights = {name: 1.0 / bound for name, bound in bounds.items() if bound > 0}
+        unknown = [name for name in cost_weights if name not in GOAL_SEEK_UPPER_BOUNDS]
+        if unknown:
+            raise ValueError(f"Cannot adjust features: {', '.join(unknown)}")
+        if any(weight < 0 for weight in cost_weights.values()):
+            raise ValueError("Cost weights must be non-negative")
+        
+        with tracer.trace("whatif.goal_seek", metric=metric, target=target):
+            baseline = self.strategic_bridge._clean_all_features(baseline_features)
+            
+            names, levels, level_costs = [], [], []
+            for name, weight in cost_weights.items():
+                if name not in baseline_features:
+                    continue
+                base_value = self._to_float(baseline.get(name))
+                candidates = self._goal_seek_levels(name, base_value, bounds[name], steps)
+                if len(candidates) < 2:
+                    continue
+                names.append(name)
+                levels.append(candidates)
+                level_costs.append(weight * (candidates - base_value))
+            
+            baseline_score = float(self._score_points(baseline, {}, 1)[metric][0])
+            search = self._branch_and_bound(baseline, names, levels, level_costs, metric, target)
+        
+        result = {
+            'reachable': baseline_score >= target or search['assignment'] is not None,
+            'metric': metric,
+            'target': target,
+            'baseline_score': baseline_score,
+            'achieved_score': baseline_score,
+            'cost': 0.0,
+            'modifications': {},
+            'changes': {},
+            'exhaustive': search['exhaustive'],
+            'evaluated_points': search['evaluated'],
+            'pruned_points': search['pruned'],
+            'scenario': None
+        }
+        if baseline_score >= target or search['assignment'] is None:
+            if search['assignment'] is None:
+                best_possible = search['best_possible']
+                result['best_possible_score'] = baseline_score if best_possible is None else best_possible
+            return result
+        
+        modifications = {}
+        for name, candidates, costs, level in zip(names, levels, level_costs, search['assignment']):
+            if level == 0:
+                continue
+            delta = float(candidates[level] - candidates[0])
+            modifications[name] = self._format_delta(delta)
+            result['changes'][name] = {
+                'from': float(candidates[0]),
+                'to': float(candidates[level]),
+                'delta': delta,
+                'cost': float(costs[level])
+            }
+        
+        # Confirm with the full pipeline and return it in /whatif format
+        scenario = self.simulate_scenario(baseline_features, modifications)
+        result.update({
+            'achieved_score': scenario['modified'][metric],
+            'cost': float(sum(change['cost'] for change in result['changes'].values())),
+            'modifications': modifications,
+            'scenario': {key: scenario[key] for key in ('baseline', 'modified', 'impact', 'modified_features')}
+        })
+        return result
+    
+    def simulate_uncertainty(
+        self,
+        baseline_features: Dict[str, Any],
+        distributions: Dict[str, Dict[str, Any]],
+        n_samples: int = 20000,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo percentile bands for ICI, IRL and success probability
+        
+        Uncertain inputs are drawn from distributions and all samples are
+        scored in one vectorized pass (no analyze_project per sample).
+        
+        Args:
+            baseline_features: Original project features
+            distributions: Distribution per uncertain feature. Supported:
+                {'type': 'normal', 'mean': m, 'std': s}
+                {'type': 'uniform', 'low': a, 'high': b}
+                {'type': 'triangular', 'low': a, 'mode': m, 'high': b}
+                {'type': 'lognormal', 'median': m, 'sigma': s}
+                'mean', 'mode' and 'median' default to the baseline value.
+                Optional 'min'/'max' clip the samples (always clipped at 0).
+            n_samples: Number of samples
+            percentiles: Percentiles to report
+            seed: Random seed for reproducible bands
+            
+        Returns:
+            {'n_samples', 'percentiles', 'baseline': {...},
+             'ici_score' / 'irl_score' / 'success_probability':
+                 {'mean', 'std', 'min', 'max', 'bands': {'p5': ..., ...}},
+             'inputs': {feature: {'mean', 'std', 'bands'}}}
+        """
+        if not distributions:
+            raise ValueError("At least one feature distribution is required")
+        unknown = [name for name in distributions if name not in SWEEPABLE_FEATURES]
+        if unknown:
+            raise ValueError(f"Cannot sample features: {', '.join(unknown)}")
+        n_samples = int(n_samples)
+        if not 1 <= n_samples <= MAX_MONTE_CARLO_SAMPLES:
+            raise ValueError(f"n_samples must be between 1 and {MAX_MONTE_CARLO_SAMPLES}")
+        percentiles = [float(p) for p in percentiles]
+        
+        with tracer.trace("whatif.simulate_uncertainty", samples=n_samples, features=len(distributions)):
+            baseline = self.strategic_bridge._clean_all_features(baseline_features)
+            rng = np.random.default_rng(seed)
+            
+            with tracer.span("whatif.uncertainty.sample"):
+                columns = {
+                    name: self._sample_distribution(
+                        name, spec, self._to_float(baseline.get(name, NUMERIC_FEATURE_DEFAULTS.get(name, 0.0))),
+                        n_samples, rng
+                    )
+                    for name, spec in distributions.items()
+                }
+            
+            with tracer.span("whatif.uncertainty.score"):
+                scores = self._score_points(baseline, columns, n_samples)
+            
+            baseline_analysis = self.analyze_baseline(baseline_features)
+        
+        def summarize(values: np.ndarray) -> Dict[str, Any]:
+            bands = np.percentile(values, percentiles)
+            return {
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'bands': {f"p{p:g}": float(v) for p, v in zip(percentiles, bands)}
+            }
+        
+        return {
+            'n_samples': n_samples,
+            'percentiles': percentiles,
+            'baseline': {
+                'ici_score': baseline_analysis['ici_score'],
+                'irl_score': baseline_analysis['irl_score'],
+                'success_probability': baseline_analysis['success_probability']
+            },
+            'ici_score': summarize(scores['ici_score']),
+            'irl_score': summarize(scores['irl_score']),
+            'success_probability': summarize(scores['success_probability']),
+            'inputs': {
+                name: {key: value for key, value in summarize(values).items() if key in ('mean', 'std', 'bands')}
+                for name, values in columns.items()
+            }
+        }
+    
+    def _sample_distribution(
+        self,
+        name: str,
+        spec: Dict[str, Any],
+        base_value: float,
+        n_samples: int,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        """Draw samples for one feature (see simulate_uncertainty)"""
+        dist = spec.get('type', 'normal')
+        try:
+            if dist == 'normal':
+                samples = rng.normal(float(spec.get('mean', base_value)), float(spec['std']), n_samples)
+            elif dist == 'uniform':
+                samples = rng.uniform(float(spec['low']), float(spec['high']), n_samples)
+            elif dist == 'triangular':
+                samples = rng.triangular(
+                    float(spec['low']), float(spec.get('mode', base_value)), float(spec['high']), n_samples
+                )
+            elif dist == 'lognormal':
+                median = float(spec.get('median', base_value))
+                if median <= 0:
+                    raise ValueError("lognormal median must be positive")
+                samples = rng.lognormal(np.log(median), float(spec['sigma']), n_samples)
+            else:
+                raise ValueError(f"unknown distribution type '{dist}'")
+        except KeyError as e:
+            raise ValueError(f"Distribution for '{name}' is missing {e}")
+        except ValueError as e:
+            raise ValueError(f"Invalid distribution for '{name}': {e}")
+        
+        # Same clamp as _apply_modifications, plus optional bounds
+        return np.clip(samples, max(0.0, float(spec.get('min', 0.0))), float(spec.get('max', np.inf)))
+    
+    def sensitivity(
+        self,
+        baseline_features: Dict[str, Any],
+        step: float = 0.10,
+        absolute_steps: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        One-at-a-time sensitivity of ICI, IRL and probability (tornado chart)
+        
+        Every numeric field handled by _clean_all_features is moved down and
+        up from its baseline value; all 2 x N perturbed points are scored in
+        one vectorized evaluation.
+        
+        Args:
+            baseline_features: Original project features
+            step: Relative step (0.10 = +/-10% of the baseline value). Fields
+                whose baseline is 0 move by step x their GOAL_SEEK_UPPER_BOUNDS
+                range instead.
+            absolute_steps: Per-feature absolute steps overriding `step`
+            
+        Returns:
+            {'baseline': {...}, 'step': step,
+             'tornado': [{'feature', 'baseline_value', 'low_value', 'high_value',
+                          'ici_score' / 'irl_score' / 'success_probability':
+                              {'low', 'high', 'delta_low', 'delta_high'},
+                          'swing'}, ...]}  sorted by ICI swing
+        """
+        if step <= 0:
+            raise ValueError("step must be positive")
+        absolute_steps = absolute_steps or {}
+        unknown = [name for name in absolute_steps if name not in NUMERIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown numeric fields: {', '.join(unknown)}")
+        
+        with tracer.trace("whatif.sensitivity", features=len(NUMERIC_FIELDS)):
+            baseline = self.strategic_bridge._clean_all_features(baseline_features)
+            names = list(NUMERIC_FIELDS)
+            base_values = np.array([
+                self._to_float(baseline.get(name, NUMERIC_FEATURE_DEFAULTS[name])) for name in names
+            ])
+            deltas = np.array([
+                float(absolute_steps[name]) if name in absolute_steps
+                else abs(value) * step if value != 0
+                else GOAL_SEEK_UPPER_BOUNDS[name] * step
+                for name, value in zip(names, base_values)
+            ])
+            low = np.maximum(0, base_values - deltas)
+            high = base_values + deltas
+            
+            # Row 0: baseline; rows 1..N: one feature down; rows N+1..2N: one feature up
+            n_features = len(names)
+            n_points = 2 * n_features + 1
+            columns = {}
+            for i, name in enumerate(names):
+                column = np.full(n_points, base_values[i])
+                column[1 + i] = low[i]
+                column[1 + n_features + i] = high[i]
+                columns[name] = column
+            
+            scores = self._score_points(baseline, columns, n_points)
+        
+        tornado = []
+        for i, name in enumerate(names):
+            entry = {
+                'feature': name,
+                'baseline_value': float(base_values[i]),
+                'low_value': float(low[i]),
+                'high_value': float(high[i])
+            }
+            for metric in ('ici_score', 'irl_score', 'success_probability'):
+                base_score = float(scores[metric][0])
+                low_score = float(scores[metric][1 + i])
+                high_score = float(scores[metric][1 + n_features + i])
+                entry[metric] = {
+                    'low': low_score,
+                    'high': high_score,
+                    'delta_low': low_score - base_score,
+                    'delta_high': high_score - base_score
+                }
+            entry['swing'] = abs(entry['ici_score']['high'] - entry['ici_score']['low'])
+            tornado.append(entry)
+        
+        tornado.sort(key=lambda x: x['swing'], reverse=True)
+        
+        return {
+            'baseline': {
+                'ici_score': float(scores['ici_score'][0]),
+                'irl_score': float(scores['irl_score'][0]),
+                'success_probability': float(scores['success_probability'][0])
+            },
+            'step': step,
+            'tornado': tornado
+        }
+    
+    def _goal_seek_levels(self, name: str, base_value: float, upper: float, steps: int) -> np.ndarray:
+        """Candidate values for one feature; index 0 is the baseline value"""
+        if upper <= base_value:
+            return np.array([base_value])
+        raised = np.linspace(base_value, upper, steps + 1)[1:]
+        if name in INTEGER_FEATURES:
+            raised = np.unique(np.ceil(raised))
+            raised = raised[raised > base_value]
+        return np.concatenate(([base_value], raised))
+    
+    def _branch_and_bound(
+        self,
+        baseline: Dict[str, Any],
+        names: List[str],
+        levels: List[np.ndarray],
+        level_costs: List[np.ndarray],
+        metric: str,
+        target: float
+    ) -> Dict[str, Any]:
+        """Vectorized breadth-first branch and bound (see goal_seek)"""
+        n_features = len(names)
+        
+        # The model probability can move with the features: bound it by 100%
+        model_runtime = getattr(self.strategic_bridge, 'model_runtime', None)
+        probability_bound = None
+        if 'success_probability' not in baseline and model_runtime is not None and model_runtime.available:
+            probability_bound = 100.0
+        
+        best_cost = np.inf
+        best_assignment = None
+        evaluated = pruned = 0
+        exhaustive = True
+        
+        # score = H(features) + weight * probability, where H has diminishing
+        # returns per feature (sums of single-feature terms, some capped at
+        # 100). So the best gain per unit cost of a feature, measured at the
+        # baseline, bounds its gain per unit cost anywhere in the search.
+        probability_weight = PROBABILITY_WEIGHT[metric]
+        efficiency = np.zeros(n_features)
+        for i, name in enumerate(names):
+            gains = self._score_points(
+                baseline, {name: levels[i][1:]}, len(levels[i]) - 1,
+                success_probability=DEFAULT_SUCCESS_PROBABILITY
+            )[metric] - self._score_points(
+                baseline, {}, 1, success_probability=DEFAULT_SUCCESS_PROBABILITY
+            )[metric][0]
+            costs = level_costs[i][1:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.where(costs > 0, gains / costs, np.where(gains > 0, np.inf, 0.0))
+            efficiency[i] = max(0.0, float(ratio.max()))
+        # Best efficiency among features after each depth
+        remaining_efficiency = np.append(np.maximum.accumulate(efficiency[::-1])[::-1][1:], 0.0)
+        
+        # A greedy solution gives the initial cost bound for pruning
+        greedy = self._greedy_assignment(baseline, names, levels, level_costs, metric, target)
+        if greedy is not None:
+            best_assignment, best_cost = greedy
+        
+        # Frontier of partial solutions: level index per feature + cost so far
+        frontier = np.zeros((1, n_features), dtype=np.int64)
+        frontier_cost = np.zeros(1)
+        
+        top = {name: candidates[-1] for name, candidates in zip(names, levels)}
+        best_possible = float(self._score_points(
+            baseline, {name: np.array([value]) for name, value in top.items()}, 1
+        )[metric][0]) if names else None
+        
+        for depth in range(n_features):
+            n_levels = len(levels[depth])
+            
+            # Expand: every partial solution x every level of this feature
+            # (level 0 = unchanged, already covered by the parent)
+            expanded = np.repeat(frontier, n_levels - 1, axis=0)
+            expanded[:, depth] = np.tile(np.arange(1, n_levels), len(frontier))
+            cost = np.repeat(frontier_cost, n_levels - 1) + level_costs[depth][expanded[:, depth]]
+            
+            # Keep the parents too (this feature left unchanged)
+            expanded = np.vstack([frontier, expanded])
+            cost = np.concatenate([frontier_cost, cost])
+            
+            keep = cost < best_cost
+            pruned += int((~keep).sum())
+            expanded, cost = expanded[keep], cost[keep]
+            if len(expanded) == 0:
+                break
+            
+            columns = {
+                name: levels[i][expanded[:, i]] for i, name in enumerate(names)
+            }
+            scored = self._score_points(baseline, columns, len(expanded))
+            actual = scored[metric]
+            evaluated += len(expanded)
+            
+            reached = actual >= target
+            if reached.any():
+                idx = np.flatnonzero(reached)
+                cheapest = idx[np.argmin(cost[idx])]
+                if cost[cheapest] < best_cost:
+                    best_cost = float(cost[cheapest])
+                    best_assignment = expanded[cheapest].copy()
+            
+            if depth + 1 == n_features:
+                break
+            
+            # Partial solutions that reached the target are final
+            keep = ~reached & (cost < best_cost)
+            
+            # Optimistic bound: every remaining feature at its upper bound
+            if keep.any():
+                optimistic = dict(columns)
+                for i in range(depth + 1, n_features):
+                    optimistic[names[i]] = np.full(len(expanded), levels[i][-1])
+                bound = self._score_points(
+                    baseline, optimistic, len(expanded),
+                    success_probability=probability_bound
+                )[metric]
+                keep &= bound >= target
+            
+            # Cost bound: the remaining features must close the gap that the
+            # probability (at most probability_bound) cannot
+            if keep.any():
+                probability = scored['success_probability'] * 100
+                reachable_probability = probability if probability_bound is None else probability_bound
+                gap = target - (actual - probability_weight * probability) - probability_weight * reachable_probability
+                rate = remaining_efficiency[depth]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    extra = np.where(gap > 0, gap / rate if rate > 0 else np.inf, 0.0)
+                keep &= cost + extra < best_cost
+            
+            pruned += int((~reached & ~keep).sum())
+            frontier, frontier_cost = expanded[keep], cost[keep]
+            
+            if len(frontier) > GOAL_SEEK_MAX_FRONTIER:
+                order = np.argsort(frontier_cost, kind='stable')[:GOAL_SEEK_MAX_FRONTIER]
+                pruned += len(frontier) - len(order)
+                frontier, frontier_cost = frontier[order], frontier_cost[order]
+                exhaustive = False
+            if len(frontier) == 0:
+                break
+        
+        return {
+            'assignment': best_assignment,
+            'cost': best_cost,
+            'best_possible': best_possible,
+            'evaluated': evaluated,
+            'pruned': pruned,
+            'exhaustive': exhaustive
+        }
+    
+    def _greedy_assignment(
+        self,
+        baseline: Dict[str, Any],
+        names: List[str],
+        levels: List[np.ndarray],
+        level_costs: List[np.ndarray],
+        metric: str,
+        target: float
+    ) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Cheap feasible solution: repeatedly take the single-feature raise with
+        the best score gain per unit cost (one vectorized call per step)
+        """
+        current = np.zeros(len(names), dtype=np.int64)
+        current_score = float(self._score_points(baseline, {}, 1)[metric][0])
+        
+        while current_score < target:
+            moves = [
+                (i, j) for i in range(len(names))
+                for j in range(current[i] + 1, len(levels[i]))
+            ]
+            if not moves:
+                return None
+            candidates = np.repeat(current[None, :], len(moves), axis=0)
+            for row, (i, j) in enumerate(moves):
+                candidates[row, i] = j
+            columns = {name: levels[i][candidates[:, i]] for i, name in enumerate(names)}
+            scores = self._score_points(baseline, columns, len(moves))[metric]
+            
+            extra_cost = np.array([level_costs[i][j] - level_costs[i][current[i]] for i, j in moves])
+            gain = scores - current_score
+            if not (gain > 0).any():
+                return None
+            # Prefer moves that reach the target, then gain per unit cost
+            efficiency = np.where(gain > 0, gain / np.maximum(extra_cost, 1e-12), -np.inf)
+            reaching = (scores >= target) & (gain > 0)
+            if reaching.any():
+                idx = np.flatnonzero(reaching)
+                best = idx[np.argmin(extra_cost[idx])]
+            else:
+                best = int(np.argmax(efficiency))
+            current = candidates[best]
+            current_score = float(scores[best])
         
+        cost = float(sum(level_costs[i][current[i]] for i in range(len(names))))
+        return current, cost
+    
+    def _format_delta(self, delta: float) -> str:
+        """Relative change in _apply_modifications syntax ('+2', '+0.25')"""
+        if float(delta).is_integer():
+            return f"+{int(delta)}"
+        return f"+{round(delta, 6)}"
+    
+    def _sweep_axis(self, name: str, spec: SweepRange) -> np.ndarray:
+        """Grid values for one feature"""
+        if isinstance(spec, dict):
+            spec = (spec['start'], spec['stop'], spec['steps'])
+        if isinstance(spec, tuple) and len(spec) == 3:
+            start, stop, steps = spec
+            if int(steps) < 1:
+                raise ValueError(f"Sweep range for '{name}' needs at least one step")
+            axis = np.linspace(float(start), float(stop), int(steps))
+        else:
+            axis = np.asarray([self._to_float(v) for v in spec], dtype=float)
+        if axis.size == 0:
+            raise ValueError(f"Sweep range for '{name}' is empty")
+        # Same clamp as _apply_modifications
+        return np.maximum(0, axis)
+    
+    def _points_probability(
+        self,
+        baseline: Dict[str, Any],
+        columns: Dict[str, np.ndarray],
+        n_points: int
+    ) -> Union[float, np.ndarray]:
+        """
+        Success probability (0-100) per point, as analyze_project would use
+        
+        Args:
+            baseline: Cleaned baseline features
+            columns: Flat (n_points,) value arrays for the varied features
+            n_points: Number of points
+        """
+        if 'success_probability' in baseline:
+            return self._to_float(baseline['success_probability'])
+        
+        model_runtime = getattr(self.strategic_bridge, 'model_runtime', None)
+        if model_runtime is None:
+            return DEFAULT_SUCCESS_PROBABILITY
+        try:
+            if not model_runtime.available:
+                return DEFAULT_SUCCESS_PROBABILITY
+            X = np.tile(np.asarray(project_to_model_row(baseline), dtype=float), (n_points, 1))
+            for name, values in columns.items():
+                if name in MODEL_FEATURES:
+                    X[:, MODEL_FEATURES.index(name)] = values / MODEL_FEATURE_DIVISORS.get(name, 1)
+            return model_runtime.predict_proba(X) * 100
+        except Exception as e:
+            logger.warning(f"⚠️ Model probability failed, using default: {e}")
+            return DEFAULT_SUCCESS_PROBABILITY
+    
+    def _score_points(
+        self,
+        baseline: Dict[str, Any],
+        columns: Dict[str, np.ndarray],
+        n_points: int,
+        success_probability: Optional[Union[float, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized ICI/IRL/probability for points that vary `columns` of a baseline
+        
+        Args:
+            baseline: Cleaned baseline features
+            columns: Flat (n_points,) value arrays for the varied features
+            n_points: Number of points
+            success_probability: Override (0-100); computed like analyze_project if None
+        """
+        if success_probability is None:
+            success_probability = self._points_probability(baseline, columns, n_points)
+        features = {
+            name: columns.get(name, baseline.get(name, default))
+            for name, default in NUMERIC_FEATURE_DEFAULTS.items()
+        }
+        scores = score_features(
+            features,
+            sector=baseline.get('sector', 'fintech'),
+            organization=baseline.get('organization', 'startup'),
+            success_probability=success_probability
+        )
+        return {name: np.broadcast_to(value, (n_points,)) for name, value in scores.items()}
+    
+    def analyze_baseline(self, baseline_features: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Baseline analysis dict, served from the fingerprint cache when possible
+        
+        The returned dict is shared between callers and must not be mutated.
+        """
+        return self.analyze_baseline_with_etag(baseline_features)[0]
+    
+    def analyze_baseline_with_etag(self, baseline_features: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """
+        (baseline analysis, ETag) - delta-mode results are JSON Patches
+        against exactly this analysis document
+        """
+        key = features_fingerprint(baseline_features)
+        with self._cache_lock:
+            cached = self._baseline_cache.get(key)
+            if cached is not None:
+                self._baseline_cache.move_to_end(key)
+        
+        with tracer.span("whatif.baseline", cache_hit=cached is not None):
+            if cached is not None:
+                return cached
+            baseline_result = self.strategic_bridge.analyze_project(baseline_features)
+            analysis = baseline_result.to_dict() if hasattr(baseline_result, 'to_dict') else baseline_result
+            cached = (analysis, analysis_etag(analysis))
+        
+        with self._cache_lock:
+            self._baseline_cache[key] = cached
+            self._baseline_cache.move_to_end(key)
+            while len(self._baseline_cache) > self.baseline_cache_size:
+                self._baseline_cache.popitem(last=False)
+        return cached
+    
+    def clear_cache(self):
+        """Drop all cached baseline analyses"""
+        with self._cache_lock:
+            self._baseline_cache.clear()
+    
+    def shutdown(self):
+        """Stop the worker pool (it is recreated on next use)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    def _use_delta(self, response_mode: str, client_etag: Optional[str], etag: str) -> bool:
+        """Delta encoding unless the client's baseline is stale"""
+        if response_mode not in RESPONSE_MODES:
+            raise ValueError(f"Unknown response_mode: {response_mode} (expected one of {', '.join(RESPONSE_MODES)})")
+        return response_mode == 'delta' and (client_etag is None or client_etag == etag)
+    
+    def _evaluate_scenario(
+        self,
+        baseline_features: Dict[str, Any],
+        baseline_analysis: Dict[str, Any],
+        modifications: Dict[str, Any],
+        delta: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Analyze one modified scenario against an already analyzed baseline
+        
+        With delta=True the result carries features_delta (changed fields only)
+        and analysis_delta (JSON Patch against baseline_analysis) instead of
+        modified_features and full_analysis. The diff is taken here, so pool
+        workers send back the small result.
+        """
         # Apply modifications
         modified_features = self._apply_modifications(baseline_features, modifications)
         
         # Analyze modified scenario
-        modified_result = self.strategic_bridge.analyze_project(modified_features)
-        modified_analysis = modified_result.to_dict() if hasattr(modified_result, 'to_dict') else modified_result
+        with tracer.span("whatif.modified"):
+            modified_result = self.strategic_bridge.analyze_project(modified_features)
+            modified_analysis = modified_result.to_dict() if hasattr(modified_result, 'to_dict') else modified_result
         
         # Calculate impact
         impact = self._calculate_impact(baseline_analysis, modified_analysis)
@@ -58,43 +1134,93 @@ class WhatIfSimulator:
             },
             'impact': impact,
             'modifications': modifications,
-            'modified_features': modified_features,
-            'full_analysis': modified_analysis
+            **self._encode_scenario(baseline_features, baseline_analysis, modified_features, modified_analysis, delta)
         }
     
-    def simulate_multiple_scenarios(
+    def _encode_scenario(
         self,
         baseline_features: Dict[str, Any],
-        scenarios: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        baseline_analysis: Dict[str, Any],
+        modified_features: FeatureOverlay,
+        modified_analysis: Dict[str, Any],
+        delta: bool
+    ) -> Dict[str, Any]:
+        if not delta:
+            return {
+                'modified_features': modified_features.to_dict(),
+                'full_analysis': modified_analysis
+            }
+        with tracer.span("whatif.delta"):
+            return {
+                'features_delta': {
+                    key: value for key, value in modified_features.delta.items()
+                    if key not in baseline_features or baseline_features[key] != value
+                },
+                'analysis_delta': json_patch(baseline_analysis, modified_analysis)
+            }
+    
+    def _bridge_config(self) -> Dict[str, Any]:
         """
-        Simulate multiple what-if scenarios
+        Picklable description of the bridge, rebuilt by _init_worker
         
-        Args:
-            baseline_features: Original project features
-            scenarios: List of modification dictionaries
-            
-        Returns:
-            List of scenario results
+        portfolio_benchmarks is left out: scenario analyses never benchmark
+        (that would record hypothetical projects into the portfolio).
         """
-        results = []
-        
-        for i, modifications in enumerate(scenarios):
-            scenario_name = modifications.get('name', f'Scenario {i+1}')
-            result = self.simulate_scenario(baseline_features, modifications)
-            result['scenario_name'] = scenario_name
-            results.append(result)
+        model_runtime = getattr(self.strategic_bridge, 'model_runtime', None)
+        valuation_cache = self.strategic_bridge.investment_simulator.valuation_cache
+        return {
+            'model_path': model_runtime.model_path if model_runtime is not None else None,
+            'valuation_cache': valuation_cache.settings() if valuation_cache is not None else None
+        }
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self._bridge_config(),)
+                )
+            return self._executor
+    
+    def _evaluate_parallel(
+        self,
+        baseline_features: Dict[str, Any],
+        baseline_analysis: Dict[str, Any],
+        scenarios: List[Dict[str, Any]],
+        delta: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Evaluate scenarios on the worker pool; None if the pool is unusable
         
-        # Rank scenarios by improvement
-        results.sort(key=lambda x: x['impact']['ici_improvement'], reverse=True)
+        When the caller is inside a sampled trace, workers record their spans
+        and the spans are attached under the current span.
+        """
+        trace_spans = tracer.active
+        tasks = [
+            (baseline_features, baseline_analysis, modifications, delta, trace_spans)
+            for modifications in scenarios
+        ]
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        try:
+            evaluated = list(self._get_executor().map(_evaluate_in_worker, tasks, chunksize=chunksize))
+        except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+            logger.warning(f"⚠️ Parallel what-if evaluation failed ({e}) - falling back to sequential")
+            self.shutdown()
+            return None
         
+        results = []
+        for result, spans in evaluated:
+            tracer.adopt(spans)
+            results.append(result)
         return results
     
+    @traced()
     def _apply_modifications(
         self,
         features: Dict[str, Any],
         modifications: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> FeatureOverlay:
         """
         Apply modifications to features
         
@@ -102,8 +1228,11 @@ class WhatIfSimulator:
         - Absolute values: {'budget': 500000}
         - Relative changes: {'budget': '+100000', 'team_size': '+2'}
         - Percentage changes: {'budget': '+20%', 'market_demand': '+15%'}
+        
+        Returns a copy-on-write FeatureOverlay: the baseline is shared and
+        only the modified fields are stored.
         """
-        modified = copy.deepcopy(features)
+        modified = FeatureOverlay(features)
         
         for key, value in modifications.items():
             if key == 'name':  # Skip scenario name
@@ -148,6 +1277,7 @@ class WhatIfSimulator:
         
         return modified
     
+    @traced()
     def _calculate_impact(
         self,
         baseline: Dict[str, Any],
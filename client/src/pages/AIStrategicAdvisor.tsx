@@ -9,6 +9,17 @@ import { trpc } from '@/lib/trpc';
 import { toast } from 'sonner';
 import { useLanguage } from "@/contexts/LanguageContext"; // Rule 1
 
+// Save a report returned by the export mutations (base64 body) as a file
+function downloadExport(file: { data: string; contentType: string; fileName: string }) {
+  const bytes = Uint8Array.from(atob(file.data), (c) => c.charCodeAt(0));
+  const url = URL.createObjectURL(new Blob([bytes], { type: file.contentType }));
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = file.fileName;
+  link.click();
+  setTimeout(() => URL.revokeObjectURL(url), 0);
+}
+
 export default function AIStrategicAdvisor() {
   const { language } = useLanguage(); // Rule 2
   const isAr = language === 'ar'; // Rule 2
@@ -58,7 +69,11 @@ export default function AIStrategicAdvisor() {
     
     try {
       // Call tRPC endpoint for strategic analysis
-      const result = await analyzeMutation.mutateAsync(formData);
+      // ?ideaId= links the analysis to its idea's stored analysis history
+      const ideaId = new URLSearchParams(window.location.search).get('ideaId');
+      const result = await analyzeMutation.mutateAsync(
+        ideaId ? { ...formData, project_id: ideaId } : formData
+      );
       
       setAnalysis(result);
       toast.success(isAr ? 'تم التحليل الاستراتيجي بنجاح' : 'Strategic analysis completed successfully'); // Rule 3
@@ -201,7 +216,7 @@ export default function AIStrategicAdvisor() {
       if (result.success) {
         toast.success(isAr ? 'تم تصدير التقرير إلى PDF بنجاح!' : 'Report exported to PDF successfully!'); // Rule 3
         // Download file
-        window.open(result.filePath, '_blank');
+        downloadExport(result);
       }
     } catch (error: any) {
       console.error('PDF export error:', error);
@@ -226,7 +241,7 @@ export default function AIStrategicAdvisor() {
       if (result.success) {
         toast.success(isAr ? 'تم تصدير التقرير إلى Excel بنجاح!' : 'Report exported to Excel successfully!'); // Rule 3
         // Download file
-        window.open(result.filePath, '_blank');
+        downloadExport(result);
       }
     } catch (error: any) {
       console.error('Excel export error:', error);
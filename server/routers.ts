@@ -3238,6 +3238,8 @@ Provide response in JSON format:
         rat_completion_rate: z.string(),
         user_count: z.string(),
         revenue_growth: z.string(),
+        // Idea/project the analysis belongs to (keys its stored analysis history)
+        project_id: z.string().optional(),
       }))
       .mutation(async ({ ctx, input }) => {
         try {
@@ -3253,6 +3255,8 @@ Provide response in JSON format:
           }
           
           const result = await response.json();
+          // Stored analysis id for the export endpoints (sent as a header, not in the body)
+          result.analysis_id = response.headers.get('X-Analysis-Id');
           
           // Save analysis to database
           try {
@@ -3440,7 +3444,7 @@ Provide response in JSON format:
 
     exportPdf: protectedProcedure
       .input(z.object({
-        analysisId: z.number()
+        analysisId: z.string()
       }))
       .mutation(async ({ input }) => {
         try {
@@ -3454,8 +3458,14 @@ Provide response in JSON format:
             throw new Error('PDF export failed');
           }
 
-          const data = await response.json();
-          return { success: true, filePath: data.file_path };
+          // The API sends the report itself (application/pdf attachment)
+          const disposition = response.headers.get('Content-Disposition') ?? '';
+          return {
+            success: true,
+            fileName: /filename="([^"]+)"/.exec(disposition)?.[1] ?? `strategic_analysis_${input.analysisId}.pdf`,
+            contentType: 'application/pdf',
+            data: Buffer.from(await response.arrayBuffer()).toString('base64')
+          };
         } catch (error) {
           console.error('PDF export error:', error);
           throw new Error('Failed to export PDF');
@@ -3464,7 +3474,7 @@ Provide response in JSON format:
 
     exportExcel: protectedProcedure
       .input(z.object({
-        analysisId: z.number()
+        analysisId: z.string()
       }))
       .mutation(async ({ input }) => {
         try {
@@ -3478,8 +3488,14 @@ Provide response in JSON format:
             throw new Error('Excel export failed');
           }
 
-          const data = await response.json();
-          return { success: true, filePath: data.file_path };
+          // The API sends the workbook itself (.xlsx attachment)
+          const disposition = response.headers.get('Content-Disposition') ?? '';
+          return {
+            success: true,
+            fileName: /filename="([^"]+)"/.exec(disposition)?.[1] ?? `strategic_analysis_${input.analysisId}.xlsx`,
+            contentType: response.headers.get('Content-Type') ?? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            data: Buffer.from(await response.arrayBuffer()).toString('base64')
+          };
         } catch (error) {
           console.error('Excel export error:', error);
           throw new Error('Failed to export Excel');